@@ -10,6 +10,7 @@
 
 #include "CircuitSimulator.hpp"
 #include "DeterministicNoiseSimulator.hpp"
+#include "NoiseModel.hpp"
 #include "StochasticNoiseSimulator.hpp"
 #include "ir/QuantumComputation.hpp"
 #include "qasm3/Importer.hpp"
@@ -18,11 +19,13 @@
 #include <cstddef>
 #include <cstdlib>
 #include <cxxopts.hpp>
+#include <fstream>
 #include <iomanip>
 #include <iostream>
 #include <memory>
 #include <nlohmann/json.hpp>
 #include <optional>
+#include <sstream>
 #include <string>
 #include <utility>
 
@@ -31,6 +34,11 @@ namespace nl = nlohmann;
 int main(int argc, char** argv) { // NOLINT(bugprone-exception-escape)
   cxxopts::Options options(
       "MQT DDSIM", "see for more information https://www.cda.cit.tum.de/");
+  const auto defaultValue = [](const double value) {
+    std::ostringstream ss;
+    ss << value;
+    return ss.str();
+  };
   // clang-format off
     options.add_options()
         ("h,help", "produce help message")
@@ -43,9 +51,10 @@ int main(int argc, char** argv) { // NOLINT(bugprone-exception-escape)
         ("steps", "number of approximation steps", cxxopts::value<unsigned int>()->default_value("1"))
         // Parameters for noise aware simulation
         ("noise_effects", "Noise effects (A (=amplitude damping),D (=depolarization),P (=phase flip)) in the form of a character string describing the noise effects", cxxopts::value<std::string>()->default_value("APD"))
-        ("noise_prob", "Probability for applying noise.", cxxopts::value<double>()->default_value("0.001"))
+        ("noise_prob", "Probability for applying noise.", cxxopts::value<double>()->default_value(defaultValue(NoiseModel::DEFAULT_NOISE_PROBABILITY)))
         ("noise_prob_t1", "Probability for applying amplitude damping noise (default:2 x noise_prob)", cxxopts::value<double>())
-        ("noise_prob_multi", "Noise factor for multi qubit operations", cxxopts::value<double>()->default_value("2"))
+        ("noise_prob_multi", "Noise factor for multi qubit operations", cxxopts::value<double>()->default_value(defaultValue(NoiseModel::DEFAULT_MULTI_QUBIT_GATE_FACTOR)))
+        ("noise_model", "JSON file describing per-qubit and per-gate noise (overrides the noise probabilities above)", cxxopts::value<std::string>())
         ("use_density_matrix_simulator", "Set this flag to use the density matrix simulator. Per default the stochastic simulator is used")
         ("shots", "Specify the number of shots that shall be generated", cxxopts::value<std::size_t>()->default_value("0"))
 
@@ -80,6 +89,13 @@ int main(int argc, char** argv) { // NOLINT(bugprone-exception-escape)
     noiseProbT1 = vm["noise_prob_t1"].as<double>();
   }
 
+  auto noiseModel = NoiseModel(vm["noise_prob"].as<double>(), noiseProbT1,
+                               vm["noise_prob_multi"].as<double>());
+  if (vm.count("noise_model") > 0) {
+    std::ifstream ifs(vm["noise_model"].as<std::string>());
+    noiseModel = NoiseModel::fromJson(nl::json::parse(ifs));
+  }
+
   if (vm.count("use_density_matrix_simulator") == 0) {
     const auto approxSteps = vm["steps"].as<unsigned int>();
     const auto stepFidelity = vm["step_fidelity"].as<double>();
@@ -89,8 +105,7 @@ int main(int argc, char** argv) { // NOLINT(bugprone-exception-escape)
     // Using stochastic simulator
     auto ddsim = std::make_unique<StochasticNoiseSimulator>(
         std::move(quantumComputation), approxInfo, vm["seed"].as<std::size_t>(),
-        vm["noise_effects"].as<std::string>(), vm["noise_prob"].as<double>(),
-        noiseProbT1, vm["noise_prob_multi"].as<double>());
+        noiseModel, vm["noise_effects"].as<std::string>());
 
     auto t1 = std::chrono::steady_clock::now();
 
@@ -126,9 +141,8 @@ int main(int argc, char** argv) { // NOLINT(bugprone-exception-escape)
     // Using deterministic simulator
     auto ddsim = std::make_unique<DeterministicNoiseSimulator>(
         std::move(quantumComputation), ApproximationInfo{},
-        vm["seed"].as<std::size_t>(), vm["noise_effects"].as<std::string>(),
-        vm["noise_prob"].as<double>(), noiseProbT1,
-        vm["noise_prob_multi"].as<double>());
+        vm["seed"].as<std::size_t>(), noiseModel,
+        vm["noise_effects"].as<std::string>());
 
     auto t1 = std::chrono::steady_clock::now();
 
@@ -11,32 +11,48 @@
 #include "CircuitSimulator.hpp"
 #include "DeterministicNoiseSimulator.hpp"
 #include "HybridSchrodingerFeynmanSimulator.hpp"
+#include "NoiseModel.hpp"
 #include "PathSimulator.hpp"
 #include "StochasticNoiseSimulator.hpp"
 #include "UnitarySimulator.hpp"
+#include "dd/DDDefinitions.hpp"
+#include "ir/Definitions.hpp"
 #include "ir/QuantumComputation.hpp"
+#include "ir/operations/OpType.hpp"
 
+#include <algorithm>
+#include <complex>
 #include <cstddef>
 #include <cstdint>
+#include <functional>
 #include <list>
 #include <memory>
 #include <nanobind/nanobind.h>
-#include <nanobind/stl/complex.h>  // NOLINT(misc-include-cleaner)
-#include <nanobind/stl/list.h>     // NOLINT(misc-include-cleaner)
-#include <nanobind/stl/map.h>      // NOLINT(misc-include-cleaner)
-#include <nanobind/stl/optional.h> // NOLINT(misc-include-cleaner)
-#include <nanobind/stl/pair.h>     // NOLINT(misc-include-cleaner)
-#include <nanobind/stl/string.h>   // NOLINT(misc-include-cleaner)
-#include <nanobind/stl/vector.h>   // NOLINT(misc-include-cleaner)
+#include <nanobind/ndarray.h>
+#include <nanobind/stl/complex.h>    // NOLINT(misc-include-cleaner)
+#include <nanobind/stl/filesystem.h> // NOLINT(misc-include-cleaner)
+#include <nanobind/stl/function.h>   // NOLINT(misc-include-cleaner)
+#include <nanobind/stl/list.h>       // NOLINT(misc-include-cleaner)
+#include <nanobind/stl/map.h>        // NOLINT(misc-include-cleaner)
+#include <nanobind/stl/optional.h>   // NOLINT(misc-include-cleaner)
+#include <nanobind/stl/pair.h>       // NOLINT(misc-include-cleaner)
+#include <nanobind/stl/string.h>     // NOLINT(misc-include-cleaner)
+#include <nanobind/stl/vector.h>     // NOLINT(misc-include-cleaner)
+#include <nlohmann/json.hpp>
 #include <optional>
+#include <stdexcept>
 #include <string>
 #include <utility>
+#include <vector>
 
 namespace nb = nanobind;
 using namespace nb::literals;
 
 namespace {
 
+using StateVectorArray = nb::ndarray<std::complex<double>, nb::ndim<1>,
+                                     nb::c_contig, nb::device::cpu>;
+
 template <class Sim>
 nb::class_<Sim> createSimulator(nb::module_ m, const std::string& name) {
   auto sim = nb::class_<Sim>(std::move(m), name.c_str());
@@ -65,6 +81,53 @@ nb::class_<Sim> createSimulator(nb::module_ m, const std::string& name) {
             "counts.");
     sim.def("get_constructed_dd", &Sim::getCurrentDD,
             "Get the vector DD resulting from the simulation.");
+    sim.def(
+        "reduced_density_matrix",
+        [](const Sim& self, const std::vector<qc::Qubit>& qubits) {
+          auto* matrix = new std::vector<std::complex<double>>(
+              self.reducedDensityMatrix(qubits));
+          const nb::capsule owner(matrix, [](void* p) noexcept {
+            delete static_cast<std::vector<std::complex<double>>*>(p);
+          });
+          const auto dim = std::size_t{1} << qubits.size();
+          return nb::ndarray<nb::numpy, std::complex<double>, nb::ndim<2>>(
+              matrix->data(), {dim, dim}, owner);
+        },
+        "qubits"_a,
+        "Get the reduced density matrix of the given qubits in the final "
+        "state, where bit j of the row and column indices corresponds to "
+        "qubits[j].");
+    sim.def(
+        "get_state_vector",
+        [](const Sim& self, const nb::handle out) -> nb::object {
+          if (out.is_none()) {
+            const auto nqubits = self.getNumberOfQubits();
+            if (nqubits >= 60) {
+              throw std::range_error(
+                  "The state vector only supports less than 60 qubits.");
+            }
+            auto* amplitudes = new std::vector<std::complex<double>>(
+                std::size_t{1} << nqubits);
+            const nb::capsule owner(amplitudes, [](void* p) noexcept {
+              delete static_cast<std::vector<std::complex<double>>*>(p);
+            });
+            self.writeStateVector(*amplitudes);
+            return nb::cast(
+                nb::ndarray<nb::numpy, std::complex<double>, nb::ndim<1>>(
+                    amplitudes->data(), {amplitudes->size()}, owner));
+          }
+          StateVectorArray array;
+          if (!nb::try_cast(out, array, false)) {
+            throw nb::type_error("The output must be a contiguous, writable "
+                                 "complex128 array.");
+          }
+          self.writeStateVector({array.data(), array.shape(0)});
+          return nb::borrow(out);
+        },
+        "out"_a = nb::none(),
+        "Get the amplitudes of the final state as a NumPy array, which is "
+        "written directly into `out` if given (a contiguous complex128 array "
+        "of 2^n entries) instead of allocating a new one.");
   }
   return sim;
 }
@@ -103,6 +166,64 @@ NB_MODULE(MQT_DDSIM_MODULE_NAME, m) {
            "observable"_a,
            "Compute the expectation value for the given observable.");
 
+  // Noise model
+  nb::class_<NoiseModel>(
+      m, "NoiseModel",
+      R"pb(Per-qubit and per-gate noise model for the noise-aware simulators.)pb")
+      .def(nb::init<double, std::optional<double>, double>(),
+           "noise_probability"_a = NoiseModel::DEFAULT_NOISE_PROBABILITY,
+           "amp_damping_probability"_a = nb::none(),
+           "multi_qubit_gate_factor"_a =
+               NoiseModel::DEFAULT_MULTI_QUBIT_GATE_FACTOR)
+      .def_ro_static("DEFAULT_NOISE_PROBABILITY",
+                     &NoiseModel::DEFAULT_NOISE_PROBABILITY)
+      .def_ro_static("DEFAULT_MULTI_QUBIT_GATE_FACTOR",
+                     &NoiseModel::DEFAULT_MULTI_QUBIT_GATE_FACTOR)
+      .def("set_qubit_noise", &NoiseModel::setQubitNoise, "qubit"_a,
+           "noise_probability"_a = nb::none(),
+           "amp_damping_probability"_a = nb::none(),
+           "Override the noise probabilities of a single qubit.")
+      .def("set_qubit_relaxation", &NoiseModel::setQubitRelaxation, "qubit"_a,
+           "t1"_a, "t2"_a, "gate_time"_a,
+           "Override the noise probabilities of a single qubit from its "
+           "relaxation and dephasing times and the duration of a gate.")
+      .def(
+          "set_gate_noise",
+          [](NoiseModel& model, const std::string& gate,
+             const std::vector<qc::Qubit>& qubits,
+             const double noiseProbability) {
+            model.setGateNoise(qc::opTypeFromString(gate), qubits,
+                               noiseProbability);
+          },
+          "gate"_a, "qubits"_a, "noise_probability"_a,
+          "Set the noise probability of a gate acting on specific qubits "
+          "(controls before targets).")
+      .def_static(
+          "from_json",
+          [](const std::string& json) {
+            return NoiseModel::fromJson(nlohmann::json::parse(json));
+          },
+          "json"_a, "Load a noise model from a JSON string.")
+      .def_static(
+          "from_dict",
+          [](const nb::dict& dict) {
+            const auto json = nb::module_::import_("json");
+            const auto dumps = json.attr("dumps");
+            return NoiseModel::fromJson(
+                nlohmann::json::parse(nb::cast<std::string>(dumps(dict))));
+          },
+          "noise_model"_a, "Load a noise model from a dictionary.")
+      .def(
+          "json",
+          [](const NoiseModel& model) {
+            const auto json = nb::module_::import_("json");
+            const auto loads = json.attr("loads");
+            const auto dict = loads(model.json().dump());
+            return nb::cast<nb::dict>(dict);
+          },
+          "Return the noise model as a dictionary.")
+      .def("__repr__", &NoiseModel::toString);
+
   // Stoch simulator
   auto stochasticNoiseSimulator =
       createSimulator<StochasticNoiseSimulator>(m, "StochasticNoiseSimulator");
@@ -131,8 +252,51 @@ NB_MODULE(MQT_DDSIM_MODULE_NAME, m) {
       },
       "circ"_a, "approximation_step_fidelity"_a = 1.,
       "approximation_steps"_a = 1, "approximation_strategy"_a = "fidelity",
-      "seed"_a = -1, "noise_effects"_a = "APD", "noise_probability"_a = 0.01,
-      "amp_damping_probability"_a = 0.02, "multi_qubit_gate_factor"_a = 2);
+      "seed"_a = -1, "noise_effects"_a = "APD",
+      "noise_probability"_a = NoiseModel::DEFAULT_NOISE_PROBABILITY,
+      "amp_damping_probability"_a = nb::none(),
+      "multi_qubit_gate_factor"_a =
+          NoiseModel::DEFAULT_MULTI_QUBIT_GATE_FACTOR);
+  stochasticNoiseSimulator.def(
+      "__init__",
+      [](StochasticNoiseSimulator* self, const qc::QuantumComputation& circ,
+         const NoiseModel& noiseModel, const double stepFidelity,
+         const unsigned int stepNumber,
+         const std::string& approximationStrategy, const std::int64_t seed,
+         const std::string& noiseEffects) {
+        auto qc = std::make_unique<qc::QuantumComputation>(circ);
+        const auto approx = ApproximationInfo{
+            stepFidelity, stepNumber,
+            ApproximationInfo::fromString(approximationStrategy)};
+        if (seed < 0) {
+          new (self) StochasticNoiseSimulator(std::move(qc), approx, noiseModel,
+                                              noiseEffects);
+        } else {
+          new (self) StochasticNoiseSimulator(std::move(qc), approx,
+                                              static_cast<std::size_t>(seed),
+                                              noiseModel, noiseEffects);
+        }
+      },
+      "circ"_a, "noise_model"_a, "approximation_step_fidelity"_a = 1.,
+      "approximation_steps"_a = 1, "approximation_strategy"_a = "fidelity",
+      "seed"_a = -1, "noise_effects"_a = "APD");
+  stochasticNoiseSimulator.def(
+      "expectation_values", &StochasticNoiseSimulator::expectationValues,
+      "observables"_a, "trajectories"_a,
+      "Estimate the expectation values of the given observables over the "
+      "given number of stochastic trajectories. Returns the mean and the "
+      "standard error for each observable.");
+  stochasticNoiseSimulator
+      .def("get_samples_per_trajectory",
+           &StochasticNoiseSimulator::getSamplesPerTrajectory,
+           "Get the number of samples drawn from the final state of every "
+           "trajectory of a circuit without measurements.")
+      .def("set_samples_per_trajectory",
+           &StochasticNoiseSimulator::setSamplesPerTrajectory, "samples"_a,
+           "Set the number of (non-collapsing) samples drawn from the final "
+           "state of every trajectory of a circuit without measurements, so "
+           "that simulating the given number of trajectories yields "
+           "trajectories * samples outcomes.");
 
   // Deterministic simulator
   auto deterministicNoiseSimulator =
@@ -163,8 +327,138 @@ NB_MODULE(MQT_DDSIM_MODULE_NAME, m) {
       },
       "circ"_a, "approximation_step_fidelity"_a = 1.,
       "approximation_steps"_a = 1, "approximation_strategy"_a = "fidelity",
-      "seed"_a = -1, "noise_effects"_a = "APD", "noise_probability"_a = 0.01,
-      "amp_damping_probability"_a = 0.02, "multi_qubit_gate_factor"_a = 2);
+      "seed"_a = -1, "noise_effects"_a = "APD",
+      "noise_probability"_a = NoiseModel::DEFAULT_NOISE_PROBABILITY,
+      "amp_damping_probability"_a = nb::none(),
+      "multi_qubit_gate_factor"_a =
+          NoiseModel::DEFAULT_MULTI_QUBIT_GATE_FACTOR);
+  deterministicNoiseSimulator.def(
+      "__init__",
+      [](DeterministicNoiseSimulator* self, const qc::QuantumComputation& circ,
+         const NoiseModel& noiseModel, const double stepFidelity,
+         const unsigned int stepNumber,
+         const std::string& approximationStrategy, const std::int64_t seed,
+         const std::string& noiseEffects) {
+        auto qc = std::make_unique<qc::QuantumComputation>(circ);
+        const auto approx = ApproximationInfo{
+            stepFidelity, stepNumber,
+            ApproximationInfo::fromString(approximationStrategy)};
+        if (seed < 0) {
+          new (self) DeterministicNoiseSimulator(std::move(qc), approx,
+                                                 noiseModel, noiseEffects);
+        } else {
+          new (self) DeterministicNoiseSimulator(std::move(qc), approx,
+                                                 static_cast<std::size_t>(seed),
+                                                 noiseModel, noiseEffects);
+        }
+      },
+      "circ"_a, "noise_model"_a, "approximation_step_fidelity"_a = 1.,
+      "approximation_steps"_a = 1, "approximation_strategy"_a = "fidelity",
+      "seed"_a = -1, "noise_effects"_a = "APD");
+  deterministicNoiseSimulator
+      .def("get_measurement_threshold",
+           &DeterministicNoiseSimulator::getMeasurementThreshold,
+           "Get the probability below which outcomes are discarded when "
+           "sampling.")
+      .def("set_measurement_threshold",
+           &DeterministicNoiseSimulator::setMeasurementThreshold, "threshold"_a,
+           "Set the probability below which outcomes are discarded when "
+           "sampling. A threshold of zero samples from the exact "
+           "distribution.")
+      .def("expectation_values",
+           &DeterministicNoiseSimulator::expectationValues, "pauli_strings"_a,
+           "Compute the exact expectation values of the given Pauli strings "
+           "(one of I, X, Y, and Z per qubit, where the last character "
+           "corresponds to qubit 0) on the final density matrix.")
+      .def("get_number_of_threads",
+           &DeterministicNoiseSimulator::getNumberOfThreads,
+           "Get the number of threads used for circuits simulated shot by "
+           "shot.")
+      .def("set_number_of_threads",
+           &DeterministicNoiseSimulator::setNumberOfThreads, "nthreads"_a,
+           "Set the number of threads used for circuits simulated shot by "
+           "shot (i.e., with classically controlled operations).")
+      .def("get_layered_noise", &DeterministicNoiseSimulator::getLayeredNoise,
+           "Get whether the noise of gates on disjoint qubits is applied in a "
+           "single pass.")
+      .def("set_layered_noise", &DeterministicNoiseSimulator::setLayeredNoise,
+           "layered"_a,
+           "Collect the noise of gates on disjoint qubits and apply it in a "
+           "single pass per layer of gates (with the same result).")
+      .def("get_approximation_trace_distance",
+           &DeterministicNoiseSimulator::getApproximationTraceDistance,
+           "Get the maximum trace distance introduced by approximations.")
+      .def("set_approximation_trace_distance",
+           &DeterministicNoiseSimulator::setApproximationTraceDistance,
+           "budget"_a,
+           "Limit the trace distance introduced by approximations. Every "
+           "approximation step discarding a probability of epsilon adds at "
+           "most sqrt(epsilon) to the trace distance.")
+      .def(
+          "for_each_probability",
+          [](const DeterministicNoiseSimulator& self,
+             const std::function<void(std::uint64_t, double)>& callback,
+             const double threshold) {
+            self.forEachProbability(
+                [&callback](const std::size_t index,
+                            const dd::fp& probability) {
+                  callback(index, probability);
+                },
+                threshold);
+          },
+          "callback"_a, "threshold"_a = 0.,
+          "Call the callback with the index (bit i corresponds to qubit i) "
+          "and the probability of every basis state of the final state.")
+      .def(
+          "get_probabilities",
+          [](const DeterministicNoiseSimulator& self,
+             nb::ndarray<std::uint64_t, nb::ndim<1>, nb::c_contig,
+                         nb::device::cpu>
+                 indices,
+             nb::ndarray<double, nb::ndim<1>, nb::c_contig, nb::device::cpu>
+                 probabilities,
+             const double threshold) {
+            const auto capacity =
+                std::min(indices.shape(0), probabilities.shape(0));
+            auto* indexData = indices.data();
+            auto* probabilityData = probabilities.data();
+            std::size_t count = 0;
+            self.forEachProbability(
+                [&](const std::size_t index, const dd::fp& probability) {
+                  if (count < capacity) {
+                    indexData[count] = index;
+                    probabilityData[count] = probability;
+                  }
+                  ++count;
+                },
+                threshold);
+            if (count > capacity) {
+              throw nb::value_error(
+                  ("The buffers hold " + std::to_string(capacity) +
+                   " entries, but " + std::to_string(count) + " are required.")
+                      .c_str());
+            }
+            return count;
+          },
+          "indices"_a, "probabilities"_a, "threshold"_a = 0.,
+          "Write the indices and probabilities of the basis states of the "
+          "final state into the given (preallocated) arrays and return the "
+          "number of entries.")
+      .def(
+          "get_marginal_probabilities",
+          [](const DeterministicNoiseSimulator& self,
+             const std::vector<qc::Qubit>& qubits) {
+            auto* marginal =
+                new std::vector<double>(self.getMarginalProbabilities(qubits));
+            const nb::capsule owner(marginal, [](void* p) noexcept {
+              delete static_cast<std::vector<double>*>(p);
+            });
+            return nb::ndarray<nb::numpy, double, nb::ndim<1>>(
+                marginal->data(), {marginal->size()}, owner);
+          },
+          "qubits"_a,
+          "Get the exact marginal distribution of the given qubits in the "
+          "final state, where bit j of the index corresponds to qubits[j].");
 
   // Hybrid Schrödinger-Feynman Simulator
   nb::enum_<HybridSchrodingerFeynmanSimulator::Mode>(
@@ -204,9 +498,140 @@ NB_MODULE(MQT_DDSIM_MODULE_NAME, m) {
           "nthreads"_a = 2)
       .def("get_mode", &HybridSchrodingerFeynmanSimulator::getMode,
            "Get the mode of the hybrid simulator.")
-      .def("get_final_amplitudes",
-           &HybridSchrodingerFeynmanSimulator::getVectorFromHybridSimulation,
-           "Get the final amplitudes from the hybrid simulation.");
+      .def(
+          "get_final_amplitudes",
+          [](nb::handle_t<HybridSchrodingerFeynmanSimulator> self)
+              -> nb::object {
+            const auto& sim =
+                nb::cast<const HybridSchrodingerFeynmanSimulator&>(self);
+            if (sim.getMode() == HybridSchrodingerFeynmanSimulator::Mode::DD) {
+              return self.attr("get_state_vector")();
+            }
+            // a read-only view that shares ownership of the amplitudes, which
+            // stay valid after further simulations or sampling
+            auto* amplitudes =
+                new std::shared_ptr<const dd::CVec>(sim.shareFinalAmplitudes());
+            const nb::capsule owner(amplitudes, [](void* p) noexcept {
+              delete static_cast<std::shared_ptr<const dd::CVec>*>(p);
+            });
+            return nb::cast(
+                nb::ndarray<nb::numpy, const std::complex<double>, nb::ndim<1>>(
+                    (*amplitudes)->data(), {(*amplitudes)->size()}, owner));
+          },
+          "Get the final amplitudes from the hybrid simulation. In the "
+          "amplitude mode, the read-only array shares the memory of the "
+          "simulator and keeps the amplitudes of this simulation alive.")
+      .def("set_memory_budget",
+           &HybridSchrodingerFeynmanSimulator::setMemoryBudget, "budget"_a,
+           "Set the number of bytes the partial results of the DD mode may "
+           "occupy before they are spilled to disk (0 uses half of the "
+           "available "
+           "memory).")
+      .def("get_memory_budget",
+           &HybridSchrodingerFeynmanSimulator::getMemoryBudget,
+           "Get the memory budget for partial results of the DD mode.")
+      .def("set_spill_directory",
+           &HybridSchrodingerFeynmanSimulator::setSpillDirectory, "directory"_a,
+           "Set the directory for spilled partial results (the system's "
+           "temporary directory if empty).")
+      .def("get_spill_directory",
+           &HybridSchrodingerFeynmanSimulator::getSpillDirectory,
+           "Get the directory for spilled partial results.")
+      .def("get_spilled_slices",
+           &HybridSchrodingerFeynmanSimulator::getSpilledSlices,
+           "Get the number of partial results spilled to disk during the "
+           "last DD simulation.")
+      .def("set_split_qubit", &HybridSchrodingerFeynmanSimulator::setSplitQubit,
+           "split_qubit"_a.none(),
+           "Fix the first qubit of the upper slice instead of choosing the "
+           "cheapest cut (None chooses the cut automatically).")
+      .def("get_split_qubit", &HybridSchrodingerFeynmanSimulator::getSplitQubit,
+           "Get the fixed split qubit, if any.")
+      .def("set_cuts", &HybridSchrodingerFeynmanSimulator::setCuts, "cuts"_a,
+           "Fix the cuts, each being the first qubit of the next slice, "
+           "instead of planning them (an empty list plans them).")
+      .def("get_cuts", &HybridSchrodingerFeynmanSimulator::getCuts,
+           "Get the fixed cuts, if any.")
+      .def("set_max_slice_qubits",
+           &HybridSchrodingerFeynmanSimulator::setMaxSliceQubits, "qubits"_a,
+           "Let the cut planner add cuts until no slice holds more than the "
+           "given number of qubits (0 uses a single cut).")
+      .def("get_max_slice_qubits",
+           &HybridSchrodingerFeynmanSimulator::getMaxSliceQubits,
+           "Get the maximum number of qubits per slice for the cut planner.")
+      .def("set_qubit_relabeling",
+           &HybridSchrodingerFeynmanSimulator::setQubitRelabeling, "enable"_a,
+           "Let the cut planner relabel the qubits such that strongly "
+           "interacting qubits end up in the same slice.")
+      .def("get_qubit_relabeling",
+           &HybridSchrodingerFeynmanSimulator::getQubitRelabeling,
+           "Get whether the cut planner may relabel the qubits.")
+      .def("set_half_slice_memoization",
+           &HybridSchrodingerFeynmanSimulator::setHalfSliceMemoization,
+           "enable"_a,
+           "Simulate the halves of the slices as a tree of decisions, such "
+           "that slices share the half-slices before their first differing "
+           "decision.")
+      .def("get_half_slice_memoization",
+           &HybridSchrodingerFeynmanSimulator::getHalfSliceMemoization,
+           "Get whether the slices share their half-slices.")
+      .def("set_retain_amplitudes",
+           &HybridSchrodingerFeynmanSimulator::setRetainAmplitudes, "enable"_a,
+           "Keep the final amplitudes of the amplitude mode after sampling "
+           "from them instead of freeing them, after which accessing them "
+           "raises an error.")
+      .def("get_retain_amplitudes",
+           &HybridSchrodingerFeynmanSimulator::getRetainAmplitudes,
+           "Get whether the final amplitudes are kept after sampling.")
+      .def(
+          "plan_cuts",
+          [](const HybridSchrodingerFeynmanSimulator& self) {
+            return self.planCut().cuts;
+          },
+          "Get the cuts the simulation would use, either the fixed ones or "
+          "the ones chosen by the cut planner.")
+      .def("get_number_of_decisions",
+           nb::overload_cast<const std::vector<qc::Qubit>&>(
+               &HybridSchrodingerFeynmanSimulator::getNDecisions),
+           "cuts"_a,
+           "Get the number of decisions for the given cuts, i.e., the "
+           "simulation runs through 2^n paths.")
+      .def(
+          "simulate_range",
+          [](HybridSchrodingerFeynmanSimulator& self,
+             const std::vector<qc::Qubit>& cuts, const std::size_t begin,
+             const std::size_t end) {
+            const auto partial = self.simulateRange(cuts, begin, end);
+            return nb::bytes(partial.data(), partial.size());
+          },
+          "cuts"_a, "control_begin"_a, "control_end"_a,
+          "Simulate the paths `control_begin <= i < control_end` through the "
+          "given cuts (without relabeling the qubits) and return their sum "
+          "as a serialized partial result.")
+      .def(
+          "combine_partial_results",
+          [](HybridSchrodingerFeynmanSimulator& self,
+             const std::vector<nb::bytes>& partials, const std::size_t shots) {
+            std::vector<std::string> buffers;
+            buffers.reserve(partials.size());
+            for (const auto& partial : partials) {
+              buffers.emplace_back(partial.c_str(), partial.size());
+            }
+            return self.combinePartialResults(buffers, shots);
+          },
+          "partials"_a, "shots"_a,
+          "Sum up the partial results of disjoint ranges covering all paths "
+          "into the final state and return the counts sampled from it.")
+      .def_static("get_available_memory",
+                  &HybridSchrodingerFeynmanSimulator::getAvailableMemory,
+                  "Get the physical memory currently available in bytes (0 if "
+                  "unknown).")
+      .def("get_amplitude_accumulator_limit",
+           &HybridSchrodingerFeynmanSimulator::getAmplitudeAccumulatorLimit,
+           "available_memory"_a,
+           "Get the number of amplitude vectors, i.e., threads of the "
+           "amplitude mode, that fit into the given memory in bytes (0 if "
+           "unknown, which does not limit the number of threads).");
 
   // Path Simulator
   nb::enum_<PathSimulator::Configuration::Mode>(
@@ -217,7 +642,8 @@ NB_MODULE(MQT_DDSIM_MODULE_NAME, m) {
              PathSimulator::Configuration::Mode::PairwiseRecursiveGrouping)
       .value("bracket", PathSimulator::Configuration::Mode::BracketGrouping)
       .value("alternating", PathSimulator::Configuration::Mode::Alternating)
-      .value("gate_cost", PathSimulator::Configuration::Mode::GateCost);
+      .value("gate_cost", PathSimulator::Configuration::Mode::GateCost)
+      .value("optimized", PathSimulator::Configuration::Mode::Optimized);
 
   nb::class_<PathSimulator::Configuration>(
       m, "PathSimulatorConfiguration",
@@ -234,6 +660,12 @@ NB_MODULE(MQT_DDSIM_MODULE_NAME, m) {
           R"pb(A list that contains the number of gates which are considered in each step.)pb")
       .def_rw("seed", &PathSimulator::Configuration::seed,
               R"pb(Seed for the simulator.)pb")
+      .def_rw(
+          "nthreads", &PathSimulator::Configuration::nthreads,
+          R"pb(Number of threads contracting independent parts of the simulation path.)pb")
+      .def_rw(
+          "planning_time", &PathSimulator::Configuration::planningTime,
+          R"pb(Time (in seconds) the optimized mode may spend searching for a simulation path.)pb")
       .def(
           "json",
           [](const PathSimulator::Configuration& config) {
@@ -260,14 +692,17 @@ NB_MODULE(MQT_DDSIM_MODULE_NAME, m) {
           [](PathSimulator* self, const qc::QuantumComputation& circ,
              PathSimulator::Configuration::Mode mode,
              const std::size_t bracketSize, const std::size_t startingPoint,
-             const std::list<std::size_t>& gateCost, const std::size_t seed) {
+             const std::list<std::size_t>& gateCost, const std::size_t seed,
+             const std::size_t nthreads, const double planningTime) {
             auto qc = std::make_unique<qc::QuantumComputation>(circ);
-            new (self) PathSimulator(std::move(qc), mode, bracketSize,
-                                     startingPoint, gateCost, seed);
+            new (self)
+                PathSimulator(std::move(qc), mode, bracketSize, startingPoint,
+                              gateCost, seed, nthreads, planningTime);
           },
           "circ"_a, "mode"_a = PathSimulator::Configuration::Mode::Sequential,
           "bracket_size"_a = 2, "starting_point"_a = 0,
-          "gate_cost"_a = std::list<std::size_t>{}, "seed"_a = 0)
+          "gate_cost"_a = std::list<std::size_t>{}, "seed"_a = 0,
+          "nthreads"_a = 1, "planning_time"_a = 0.1)
       .def("set_simulation_path",
            nb::overload_cast<const PathSimulator::SimulationPath::Components&,
                              bool>(&PathSimulator::setSimulationPath),
@@ -276,7 +711,15 @@ NB_MODULE(MQT_DDSIM_MODULE_NAME, m) {
 
 Args:
     path: The components of the simulation path.
-    assume_correct_order: Whether the provided path is assumed to be in the correct order. Defaults to False.)pb");
+    assume_correct_order: Whether the provided path is assumed to be in the correct order. Defaults to False.)pb")
+      .def("estimate_simulation_path_cost",
+           &PathSimulator::estimateSimulationPathCost,
+           R"pb(Estimate the cost of contracting the current simulation path.
+
+The estimate is derived from the supports of the gates and is used by the ``optimized`` mode to compare simulation paths.
+
+Returns:
+    The estimated number of node operations.)pb");
 
   // Unitary Simulator
   nb::enum_<UnitarySimulator::Mode>(
@@ -123,7 +123,18 @@ public:
   [[nodiscard]] std::string getName() const override { return qc->getName(); };
 
 protected:
-  std::unique_ptr<qc::QuantumComputation> qc;
+  /// Simulate a circuit that is shared with other simulators, which must not
+  /// modify it
+  CircuitSimulator(std::shared_ptr<qc::QuantumComputation> qc_,
+                   const ApproximationInfo& approximationInfo_,
+                   const std::uint64_t seed_,
+                   const dd::DDPackageConfig& config = dd::DDPackageConfig())
+      : Simulator(seed_, config), qc(std::move(qc_)),
+        approximationInfo(approximationInfo_) {
+    dd->resize(qc->getNqubits());
+  }
+
+  std::shared_ptr<qc::QuantumComputation> qc;
   std::size_t singleShots{0};
 
   ApproximationInfo approximationInfo;
@@ -144,4 +155,13 @@ protected:
 
   virtual void reset(qc::NonUnitaryOperation* nonUnitaryOp);
   virtual void applyOperationToState(std::unique_ptr<qc::Operation>& op);
+
+  /// Approximate the state after the given operation according to the
+  /// approximation strategy
+  void approximateAfterOperation(std::size_t opNum);
+  /// Approximate the state to the given fidelity and return the fidelity
+  /// actually achieved
+  virtual double approximateState(double targetFidelity);
+  /// Whether the memory-driven strategy should approximate the state
+  [[nodiscard]] virtual bool stateMemoryExhausted() const;
 };
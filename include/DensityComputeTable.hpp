@@ -17,6 +17,13 @@
  * encoded in the node pointer) and the `useDensityMatrix` discrimination on
  * lookup. Both are required for the correctness of the reduced density-matrix
  * representation.
+ *
+ * Entries are valid if they carry the current generation of the table, so
+ * clearing the table only advances the generation.
+ *
+ * Unlike the Core table, the table may grow: once a window of as many inserts
+ * as there are buckets has overwritten too many entries, the number of buckets
+ * is doubled (up to a given maximum) and the table is cleared.
  */
 
 #pragma once
@@ -25,7 +32,9 @@
 #include "dd/statistics/TableStatistics.hpp"
 #include "ir/Definitions.hpp"
 
+#include <algorithm>
 #include <cstddef>
+#include <cstdint>
 #include <functional>
 #include <iostream>
 #include <stdexcept>
@@ -42,22 +51,30 @@ template <class LeftOperandType, class RightOperandType, class ResultType>
 class DensityComputeTable {
 public:
   static constexpr std::size_t DEFAULT_NUM_BUCKETS = 16384U;
-
+  static constexpr double DEFAULT_MAX_COLLISION_RATIO = 0.5;
+
+  /**
+   * @param numBuckets The initial number of buckets (a power of two)
+   * @param maxNumBuckets The number of buckets up to which the table may grow
+   * (no growth if not larger than the initial number)
+   * @param maxCollisionRatio The fraction of inserts overwriting an entry
+   * above which the table grows
+   */
   explicit DensityComputeTable(
-      const std::size_t numBuckets = DEFAULT_NUM_BUCKETS) {
-    if ((numBuckets & (numBuckets - 1)) != 0) {
-      throw std::invalid_argument("Number of buckets must be a power of two.");
-    }
+      const std::size_t numBuckets = DEFAULT_NUM_BUCKETS,
+      const std::size_t maxNumBuckets = 0U,
+      const double maxCollisionRatio = DEFAULT_MAX_COLLISION_RATIO)
+      : maxBuckets(maxNumBuckets), maxColRatio(maxCollisionRatio) {
     stats.entrySize = sizeof(Entry);
-    stats.numBuckets = numBuckets;
-    valid = std::vector(numBuckets, false);
-    table = std::vector<Entry>(numBuckets);
+    resize(numBuckets);
   }
 
   struct Entry {
     LeftOperandType leftOperand;
     RightOperandType rightOperand;
     ResultType result;
+    /// The generation of the table the entry was inserted in
+    std::uint32_t generation;
   };
 
   [[nodiscard]] std::size_t hash(const LeftOperandType& leftOperand,
@@ -86,14 +103,18 @@ public:
 
   void insert(const LeftOperandType& leftOperand,
               const RightOperandType& rightOperand, const ResultType& result) {
+    if (windowInserts >= stats.numBuckets) {
+      growIfOverloaded();
+    }
+    ++windowInserts;
     const auto key = hash(leftOperand, rightOperand);
-    if (valid[key]) {
+    if (table[key].generation == generation) {
       ++stats.collisions;
+      ++windowCollisions;
     } else {
       stats.trackInsert();
-      valid[key] = true;
     }
-    table[key] = {leftOperand, rightOperand, result};
+    table[key] = {leftOperand, rightOperand, result, generation};
   }
 
   ResultType* lookup(const LeftOperandType& leftOperand,
@@ -102,11 +123,10 @@ public:
     ResultType* result = nullptr;
     ++stats.lookups;
     const auto key = hash(leftOperand, rightOperand);
-    if (!valid[key]) {
+    auto& entry = table[key];
+    if (entry.generation != generation) {
       return result;
     }
-
-    auto& entry = table[key];
     if (entry.leftOperand != leftOperand) {
       return result;
     }
@@ -129,7 +149,33 @@ public:
     return &entry.result;
   }
 
-  void clear() { valid = std::vector(stats.numBuckets, false); }
+  void clear() {
+    if (++generation == 0U) {
+      // the generation wrapped around, so old entries might become valid again
+      for (auto& entry : table) {
+        entry.generation = 0U;
+      }
+      generation = 1U;
+    }
+    stats.numEntries = 0U;
+  }
+
+  /// Change the number of buckets, which clears the table
+  void resize(const std::size_t numBuckets) {
+    if (numBuckets == 0U || (numBuckets & (numBuckets - 1)) != 0) {
+      throw std::invalid_argument("Number of buckets must be a power of two.");
+    }
+    stats.numBuckets = numBuckets;
+    table = std::vector<Entry>(numBuckets);
+    generation = 1U;
+    windowInserts = 0U;
+    windowCollisions = 0U;
+    stats.numEntries = 0U;
+  }
+
+  [[nodiscard]] std::size_t getMaxNumBuckets() const noexcept {
+    return std::max(maxBuckets, stats.numBuckets);
+  }
 
   std::ostream& printStatistics(std::ostream& os = std::cout) const {
     return os << stats;
@@ -137,8 +183,25 @@ public:
 
 private:
   std::vector<Entry> table;
-  std::vector<bool> valid;
+  /// Entries of other generations are invalid (new entries have generation 0)
+  std::uint32_t generation = 1U;
   dd::TableStatistics stats{};
+
+  std::size_t maxBuckets;
+  double maxColRatio;
+  /// Inserts and collisions since the last check for growth
+  std::size_t windowInserts = 0U;
+  std::size_t windowCollisions = 0U;
+
+  void growIfOverloaded() {
+    const auto ratio = static_cast<double>(windowCollisions) /
+                       static_cast<double>(windowInserts);
+    windowInserts = 0U;
+    windowCollisions = 0U;
+    if (ratio > maxColRatio && 2 * stats.numBuckets <= maxBuckets) {
+      resize(2 * stats.numBuckets);
+    }
+  }
 };
 
 } // namespace dd::ddsim
@@ -26,6 +26,9 @@
  * collection, every density root is additionally registered in the package's
  * matrix root set (again via reinterpretation). The density node space itself
  * is collected by this engine's own @ref garbageCollect.
+ *
+ * An engine and its borrowed package are not thread-safe, and all operations
+ * run on the calling thread. Parallel simulations use one engine per thread.
  */
 
 #pragma once
@@ -40,22 +43,76 @@
 #include "dd/Node.hpp"
 #include "dd/Package.hpp"
 #include "dd/UnaryComputeTable.hpp"
+#include "dd/statistics/TableStatistics.hpp"
+#include "ir/Definitions.hpp"
 
 #include <array>
+#include <complex>
 #include <cstddef>
+#include <functional>
+#include <map>
+#include <nlohmann/json.hpp>
 #include <random>
+#include <string>
 #include <unordered_map>
+#include <unordered_set>
+#include <utility>
 #include <vector>
 
 namespace dd::ddsim {
 
 /// Bucket sizes for the density-matrix compute and unique tables.
 struct DensityDDPackageConfig {
+  static constexpr std::size_t DEFAULT_TABLE_MEMORY_BUDGET = 512U << 20U;
+
   std::size_t utDmNumBucket = 65536U;
   std::size_t utDmInitialAllocationSize = 4096U;
   std::size_t ctDmDmMultNumBucket = 16384U;
   std::size_t ctDmAddNumBucket = 16384U;
   std::size_t ctDmTraceNumBucket = 4096U;
+  std::size_t ctDmNoiseNumBucket = 16384U;
+
+  /// Number of buckets up to which the unique table may grow (0: fixed size)
+  std::size_t utDmMaxNumBucket = 0U;
+  /// Number of buckets up to which the add, multiplication, and noise compute
+  /// tables may grow (0: fixed size)
+  std::size_t ctDmMaxNumBucket = 0U;
+  /// Average number of nodes per bucket above which the unique table grows
+  double utDmMaxLoadFactor = DensityUniqueTable::DEFAULT_MAX_LOAD_FACTOR;
+  /// Fraction of inserts overwriting an entry above which a compute table
+  /// grows
+  double ctDmMaxCollisionRatio =
+      DensityComputeTable<dCachedEdge, dCachedEdge,
+                          dCachedEdge>::DEFAULT_MAX_COLLISION_RATIO;
+
+  /**
+   * @brief Table sizes derived from the number of qubits and a memory budget
+   * @details The tables start out no larger than the number of distinct
+   * nodes a density matrix on `nqubits` qubits may have (but never larger
+   * than the defaults above) and may grow under load until they use up the
+   * memory budget: a quarter of it for the unique table, the rest split evenly
+   * among the growable compute tables.
+   * @param nqubits The number of qubits
+   * @param memoryBudget The memory (in bytes) the tables may use at most
+   */
+  static DensityDDPackageConfig
+  autoSized(std::size_t nqubits,
+            std::size_t memoryBudget = DEFAULT_TABLE_MEMORY_BUDGET);
+};
+
+/**
+ * @brief Second operand of the noise compute table.
+ * @details Identifies the noise applied to a density-matrix node: the noise
+ * channel (see @ref DensityDDPackage::registerNoiseChannel), the level the
+ * node is reached at, and whether the node is on the first path (and hence
+ * stored as a full matrix).
+ */
+struct NoiseComputeKey {
+  std::size_t channel{};
+  dd::Qubit level{};
+  bool firstPathEdge{};
+
+  bool operator==(const NoiseComputeKey& other) const = default;
 };
 
 /// Configuration for the (borrowed) matrix/vector `dd::Package` used by the
@@ -105,10 +162,18 @@ public:
       : pkg(&package), dMemoryManager(dd::MemoryManager::create<dNode>(
                            config.utDmInitialAllocationSize)),
         dUniqueTable(dMemoryManager,
-                     {.nVars = nqubits, .nBuckets = config.utDmNumBucket}),
-        densityAdd(config.ctDmAddNumBucket),
-        densityDensityMultiplication(config.ctDmDmMultNumBucket),
-        densityTrace(config.ctDmTraceNumBucket) {}
+                     {.nVars = nqubits,
+                      .nBuckets = config.utDmNumBucket,
+                      .maxNBuckets = config.utDmMaxNumBucket,
+                      .maxLoadFactor = config.utDmMaxLoadFactor}),
+        densityAdd(config.ctDmAddNumBucket, config.ctDmMaxNumBucket,
+                   config.ctDmMaxCollisionRatio),
+        densityDensityMultiplication(config.ctDmDmMultNumBucket,
+                                     config.ctDmMaxNumBucket,
+                                     config.ctDmMaxCollisionRatio),
+        densityTrace(config.ctDmTraceNumBucket),
+        densityNoise(config.ctDmNoiseNumBucket, config.ctDmMaxNumBucket,
+                     config.ctDmMaxCollisionRatio) {}
 
   /**
    * @brief Construct the all-zero density operator \f$|0...0><0...0|\f$.
@@ -120,6 +185,13 @@ public:
    */
   dEdge applyOperationToDensity(dEdge& e, const dd::mEdge& operation);
 
+  /**
+   * @brief Apply a matrix operation with a precomputed conjugate transpose to
+   * a density matrix.
+   */
+  dEdge applyOperationToDensity(dEdge& e, const dd::mEdge& operation,
+                                const dd::mEdge& adjoint);
+
   /**
    * @brief Perform a collapsing measurement of a single qubit.
    */
@@ -141,6 +213,66 @@ public:
    */
   dd::ComplexValue trace(const dEdge& a, std::size_t numQubits);
 
+  /**
+   * @brief Trace out all qubits except for the lowest `numQubits` ones.
+   * @details Qubits that are not represented by a node (i.e., whose part of
+   * the density matrix is the identity) are accounted for.
+   * @return The reduced density matrix, aligned and with a weight from the
+   * complex number table (but not referenced).
+   */
+  dEdge partialTrace(const dEdge& e, std::size_t numQubits);
+
+  /**
+   * @brief Compute the reduced density matrix of some qubits.
+   * @details All other qubits are traced out by a single memoized traversal
+   * of the density matrix, whose result is a dense matrix.
+   * @param e The density matrix
+   * @param numQubits The number of qubits of the density matrix
+   * @param qubits The qubits to keep, where bit `j` of the row and column
+   * indices corresponds to `qubits[j]`
+   * @return The `2^k x 2^k` matrix (for `k` qubits) in row-major order
+   */
+  [[nodiscard]] static std::vector<std::complex<dd::fp>>
+  reducedDensityMatrix(const dEdge& e, std::size_t numQubits,
+                       const std::vector<qc::Qubit>& qubits);
+
+  /**
+   * @brief Compute the expectation value of a Pauli string.
+   * @details Computes \f$\mathrm{tr}(\rho P)\f$ by a single memoized traversal
+   * of the density matrix, without constructing a DD for the Pauli string.
+   * @param e The density matrix
+   * @param pauli One of `I`, `X`, `Y`, and `Z` per qubit, where the last
+   * character corresponds to qubit 0
+   */
+  dd::fp expectationValue(const dEdge& e, const std::string& pauli);
+
+  /**
+   * @brief Compute the expectation value of a (Hermitian) observable.
+   * @details Computes \f$\mathrm{tr}(\rho O)\f$ by a joint memoized traversal
+   * of both DDs, without computing the product \f$\rho O\f$.
+   */
+  dd::fp expectationValue(const dEdge& e, const dd::mEdge& observable,
+                          std::size_t numQubits);
+
+  /**
+   * @brief Approximate a density matrix by discarding improbable basis states.
+   * @details The probability mass of a node on the diagonal is the total
+   * probability of the basis states whose paths pass through it. On the level
+   * where this removes the most nodes, the nodes with the smallest mass are
+   * discarded as long as their total mass stays below the budget. The result
+   * is \f$P\rho P / \mathrm{tr}(P\rho P)\f$, where \f$P\f$ projects onto the
+   * remaining basis states. For a discarded probability \f$\epsilon\f$, its
+   * fidelity to \f$\rho\f$ is at least \f$1 - \epsilon\f$ and its trace
+   * distance to \f$\rho\f$ at most \f$\sqrt{\epsilon}\f$.
+   * @param e The density matrix, which is replaced by its approximation
+   * @param numQubits The number of qubits of the density matrix
+   * @param maxDiscardedProbability The budget \f$\epsilon\f$ relative to the
+   * trace of the density matrix
+   * @return The discarded probability (zero if nothing was discarded)
+   */
+  dd::fp approximate(dEdge& e, std::size_t numQubits,
+                     dd::fp maxDiscardedProbability);
+
   /**
    * @brief Create a normalized density-matrix node from a list of edges.
    */
@@ -150,11 +282,55 @@ public:
                          const std::array<dCachedEdge, dd::NEDGE>& edges,
                          bool generateDensityMatrix = false);
 
+  /**
+   * @brief Obtain a new identifier for a noise channel.
+   * @details Noise channels must be identified uniquely across all users of
+   * this package, as they share the noise compute table.
+   */
+  std::size_t registerNoiseChannel() { return nNoiseChannels++; }
+
+  /**
+   * @brief Look up the result of applying noise to a (weight-one) node.
+   */
+  dCachedEdge* lookupNoise(dNode* p, const NoiseComputeKey& key) {
+    return densityNoise.lookup(p, key);
+  }
+
+  /**
+   * @brief Store the result of applying noise to a (weight-one) node.
+   */
+  void insertNoise(dNode* p, const NoiseComputeKey& key,
+                   const dCachedEdge& result) {
+    densityNoise.insert(p, key, result);
+  }
+
+  [[nodiscard]] const dd::TableStatistics& getNoiseTableStatistics() const {
+    return densityNoise.getStats();
+  }
+
+  /**
+   * @brief Statistics of the density-matrix tables
+   * @returns A JSON object with the (accumulated) statistics of the unique
+   * table under `unique_table` and those of the compute tables under
+   * `add_table`, `multiplication_table`, `trace_table`, and `noise_table`.
+   * The number of garbage collections that were run and the time they took
+   * in total (in seconds) are given under `garbage_collection`.
+   */
+  [[nodiscard]] nlohmann::json getStatistics() const;
+
   /// Increase the reference count of a density DD.
   void incRef(const dEdge& e);
   /// Decrease the reference count of a density DD.
   void decRef(const dEdge& e);
 
+  /// Resize the density node space to the given number of qubits.
+  void resize(std::size_t nqubits) { dUniqueTable.resize(nqubits); }
+
+  /// Whether the density unique table might need garbage collection.
+  [[nodiscard]] bool possiblyNeedsCollection() const {
+    return dUniqueTable.possiblyNeedsCollection();
+  }
+
   /// Trigger garbage collection of the density node space.
   bool garbageCollect(bool force = false);
 
@@ -170,13 +346,48 @@ private:
   dCachedEdge trace(const dEdge& a, const std::vector<bool>& eliminate,
                     std::size_t level, std::size_t alreadyEliminated = 0);
 
+  dCachedEdge partialTrace(const dEdge& a, std::size_t level,
+                           std::size_t numQubits,
+                           std::unordered_map<const dNode*, dCachedEdge>& memo);
+
+  std::complex<dd::fp>
+  pauliTrace(dEdge e, std::size_t level, const std::string& pauli,
+             std::unordered_map<const dNode*, std::complex<dd::fp>>& memo);
+
+  static std::vector<std::complex<dd::fp>> reducedDensityMatrix(
+      dEdge e, std::size_t level, const std::vector<bool>& keep,
+      std::unordered_map<const dNode*, std::vector<std::complex<dd::fp>>>&
+          memo);
+
+  std::complex<dd::fp>
+  traceOfProduct(dNode* a, const dd::mNode* b, std::size_t level,
+                 std::map<std::pair<const dNode*, const dd::mNode*>,
+                          std::complex<dd::fp>>& memo);
+
+  dd::mEdge
+  diagonalProjector(const dEdge& a, std::size_t level,
+                    const std::unordered_set<const dNode*>& removed,
+                    std::unordered_map<const dNode*, dd::mEdge>& memo);
+
   dd::Package* pkg;
   dd::MemoryManager dMemoryManager;
   DensityUniqueTable dUniqueTable;
   DensityComputeTable<dCachedEdge, dCachedEdge, dCachedEdge> densityAdd;
   DensityComputeTable<dNode*, dNode*, dCachedEdge> densityDensityMultiplication;
   dd::UnaryComputeTable<dNode*, dCachedEdge> densityTrace;
+  DensityComputeTable<dNode*, NoiseComputeKey, dCachedEdge> densityNoise;
+  std::size_t nNoiseChannels = 0;
   std::unordered_map<dEdge, std::size_t> dRoots;
+  /// Garbage collections that were run (i.e., not skipped) and their duration
+  std::size_t gcRuns = 0;
+  double gcSeconds = 0.;
 };
 
 } // namespace dd::ddsim
+
+template <> struct std::hash<dd::ddsim::NoiseComputeKey> {
+  std::size_t operator()(const dd::ddsim::NoiseComputeKey& key) const noexcept {
+    auto h = qc::combineHash(key.channel, static_cast<std::size_t>(key.level));
+    return qc::combineHash(h, static_cast<std::size_t>(key.firstPathEdge));
+  }
+};
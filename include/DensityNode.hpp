@@ -33,6 +33,8 @@
 #include <cstddef>
 #include <cstdint>
 #include <functional>
+#include <unordered_map>
+#include <vector>
 
 namespace dd::ddsim {
 
@@ -109,6 +111,37 @@ struct dEdge { // NOLINT(readability-identifier-naming)
   getSparseProbabilityVectorStrKeys(std::size_t numQubits,
                                     dd::fp threshold = 0.) const;
 
+  /**
+   * @brief Get the sparse probability vector indexed by the basis states.
+   * @details Qubits that are not represented by a node contribute both of
+   * their basis states.
+   */
+  [[nodiscard]] dd::SparsePVec
+  getSparseProbabilityVector(std::size_t numQubits,
+                             dd::fp threshold = 0.) const;
+
+  /**
+   * @brief Call a function for every entry on the diagonal.
+   * @details The function receives the index of the basis state (where bit
+   * `i` corresponds to qubit `i`) and its probability. Subtrees whose
+   * probability is below the threshold are skipped.
+   */
+  void forEachProbability(const dd::ProbabilityFunc& f, std::size_t numQubits,
+                          dd::fp threshold = 0.) const;
+
+  /**
+   * @brief Get the marginal distribution of a subset of the qubits.
+   * @details The distribution is computed directly on the DD, i.e., the other
+   * qubits are summed out without enumerating the basis states.
+   * @param numQubits The number of qubits of the density matrix
+   * @param qubits The qubits to keep, where bit `j` of the index into the
+   * result corresponds to `qubits[j]`
+   * @return The probabilities of all `2^qubits.size()` outcomes
+   */
+  [[nodiscard]] std::vector<dd::fp>
+  getMarginalProbabilities(std::size_t numQubits,
+                           const std::vector<std::size_t>& qubits) const;
+
 private:
   [[nodiscard]] std::size_t
   size(std::unordered_set<const dNode*>& visited) const;
@@ -116,6 +149,10 @@ private:
   void traverseDiagonal(const dd::fp& prob, std::size_t i,
                         const dd::ProbabilityFunc& f, std::size_t level,
                         dd::fp threshold = 0.) const;
+
+  [[nodiscard]] std::vector<dd::fp> marginalizeDiagonal(
+      std::size_t level, const std::vector<bool>& keep,
+      std::unordered_map<const dNode*, std::vector<dd::fp>>& memo) const;
 };
 
 using DensityMatrixDD = dEdge;
@@ -17,6 +17,8 @@
  * `dd::ddsim::dNode`. Unlike the (post-removal) Core unique table, the node
  * equality check accounts for the persistent density-matrix flag, which is
  * required for the correctness of the reduced density-matrix representation.
+ * The number of buckets may grow (up to a given maximum) once the nodes of a
+ * level exceed a given load factor.
  */
 
 #pragma once
@@ -38,10 +40,17 @@ class DensityUniqueTable {
 public:
   static constexpr std::size_t INITIAL_GC_LIMIT = 131072U;
 
+  static constexpr double DEFAULT_MAX_LOAD_FACTOR = 2.;
+
   struct UniqueTableConfig {
     std::size_t nVars = 0U;
     std::size_t nBuckets = 32768;
     std::size_t initialGCLimit = INITIAL_GC_LIMIT;
+    /// Number of buckets up to which the table may grow
+    std::size_t maxNBuckets = 0U;
+    /// Average number of nodes per bucket (of any level) above which the
+    /// number of buckets is doubled
+    double maxLoadFactor = DEFAULT_MAX_LOAD_FACTOR;
   };
 
   DensityUniqueTable(dd::MemoryManager& manager,
@@ -49,6 +58,16 @@ public:
 
   void resize(std::size_t nVars);
 
+  /// Change the number of buckets (of every level) and rehash all nodes
+  void rehash(std::size_t nBuckets);
+
+  void setMaxNumBuckets(const std::size_t nBuckets) {
+    cfg.maxNBuckets = nBuckets;
+  }
+  [[nodiscard]] std::size_t getNumBuckets() const noexcept {
+    return cfg.nBuckets;
+  }
+
   [[nodiscard]] std::size_t hash(const dNode& p) const {
     const std::size_t mask = cfg.nBuckets - 1;
     std::size_t key = 0U;
@@ -84,6 +103,11 @@ public:
     tables[v][key] = p;
     stats[v].trackInsert();
 
+    if (2 * cfg.nBuckets <= cfg.maxNBuckets &&
+        static_cast<double>(stats[v].numEntries) >
+            cfg.maxLoadFactor * static_cast<double>(cfg.nBuckets)) {
+      rehash(2 * cfg.nBuckets);
+    }
     return p;
   }
 
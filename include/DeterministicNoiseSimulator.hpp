@@ -14,53 +14,83 @@
 #include "DensityDDPackage.hpp"
 #include "DensityNode.hpp"
 #include "NoiseFunctionality.hpp"
+#include "NoiseModel.hpp"
 #include "Simulator.hpp"
 #include "dd/DDDefinitions.hpp"
 #include "dd/Package.hpp"
+#include "ir/Definitions.hpp"
 #include "ir/QuantumComputation.hpp"
+#include "ir/operations/Control.hpp"
 #include "ir/operations/NonUnitaryOperation.hpp"
+#include "ir/operations/OpType.hpp"
 #include "ir/operations/Operation.hpp"
 
+#include <complex>
 #include <cstddef>
 #include <map>
 #include <memory>
 #include <optional>
+#include <span>
+#include <stdexcept>
 #include <string>
+#include <unordered_map>
 #include <utility>
+#include <vector>
 
 class DeterministicNoiseSimulator : public CircuitSimulator {
 public:
+  DeterministicNoiseSimulator(std::unique_ptr<qc::QuantumComputation>&& qc_,
+                              const ApproximationInfo& approximationInfo_,
+                              const NoiseModel& noiseModel_,
+                              std::string noiseEffects_ = "APD")
+      : CircuitSimulator(std::move(qc_), approximationInfo_,
+                         dd::ddsim::DENSITY_MATRIX_SIMULATOR_DD_PACKAGE_CONFIG),
+        noiseEffects(std::move(noiseEffects_)),
+        noiseModel(std::make_shared<const NoiseModel>(noiseModel_)),
+        densityDD(*dd, CircuitSimulator::getNumberOfQubits(),
+                  dd::ddsim::DensityDDPackageConfig::autoSized(
+                      CircuitSimulator::getNumberOfQubits())),
+        deterministicNoiseFunctionality(densityDD,
+                                        CircuitSimulator::getNumberOfQubits(),
+                                        noiseModel, noiseEffects) {}
+
+  DeterministicNoiseSimulator(std::unique_ptr<qc::QuantumComputation>&& qc_,
+                              const ApproximationInfo& approximationInfo_,
+                              const std::size_t seed_,
+                              const NoiseModel& noiseModel_,
+                              std::string noiseEffects_ = "APD")
+      : CircuitSimulator(std::move(qc_), approximationInfo_, seed_,
+                         dd::ddsim::DENSITY_MATRIX_SIMULATOR_DD_PACKAGE_CONFIG),
+        noiseEffects(std::move(noiseEffects_)),
+        noiseModel(std::make_shared<const NoiseModel>(noiseModel_)),
+        densityDD(*dd, CircuitSimulator::getNumberOfQubits(),
+                  dd::ddsim::DensityDDPackageConfig::autoSized(
+                      CircuitSimulator::getNumberOfQubits())),
+        deterministicNoiseFunctionality(densityDD,
+                                        CircuitSimulator::getNumberOfQubits(),
+                                        noiseModel, noiseEffects) {}
+
   DeterministicNoiseSimulator(
       std::unique_ptr<qc::QuantumComputation>&& qc_,
       const ApproximationInfo& approximationInfo_,
-      std::string noiseEffects_ = "APD", double noiseProbability_ = 0.001,
+      std::string noiseEffects_ = "APD",
+      double noiseProbability_ = NoiseModel::DEFAULT_NOISE_PROBABILITY,
       std::optional<double> ampDampingProbability_ = std::nullopt,
-      double multiQubitGateFactor_ = 2)
-      : CircuitSimulator(std::move(qc_), approximationInfo_,
-                         dd::ddsim::DENSITY_MATRIX_SIMULATOR_DD_PACKAGE_CONFIG),
-        noiseEffects(std::move(noiseEffects_)),
-        noiseProbSingleQubit(noiseProbability_),
-        ampDampingProbSingleQubit(ampDampingProbability_
-                                      ? ampDampingProbability_.value()
-                                      : noiseProbability_ * 2),
-        noiseProbMultiQubit(noiseProbability_ * multiQubitGateFactor_),
-        ampDampingProbMultiQubit(ampDampingProbSingleQubit *
-                                 multiQubitGateFactor_),
-        densityDD(*dd, CircuitSimulator::getNumberOfQubits()),
-        deterministicNoiseFunctionality(
-            densityDD, CircuitSimulator::getNumberOfQubits(),
-            noiseProbSingleQubit, noiseProbMultiQubit,
-            ampDampingProbSingleQubit, ampDampingProbMultiQubit, noiseEffects) {
-    dd::ddsim::sanityCheckOfNoiseProbabilities(
-        noiseProbability_, ampDampingProbSingleQubit, multiQubitGateFactor_);
-  }
+      double multiQubitGateFactor_ =
+          NoiseModel::DEFAULT_MULTI_QUBIT_GATE_FACTOR)
+      : DeterministicNoiseSimulator(std::move(qc_), approximationInfo_,
+                                    NoiseModel(noiseProbability_,
+                                               ampDampingProbability_,
+                                               multiQubitGateFactor_),
+                                    std::move(noiseEffects_)) {}
 
   explicit DeterministicNoiseSimulator(
       std::unique_ptr<qc::QuantumComputation>&& qc_,
       const std::string& noiseEffects_ = "APD",
-      double noiseProbability_ = 0.001,
+      double noiseProbability_ = NoiseModel::DEFAULT_NOISE_PROBABILITY,
       std::optional<double> ampDampingProbability_ = std::nullopt,
-      double multiQubitGateFactor_ = 2)
+      double multiQubitGateFactor_ =
+          NoiseModel::DEFAULT_MULTI_QUBIT_GATE_FACTOR)
       : DeterministicNoiseSimulator(std::move(qc_), {}, noiseEffects_,
                                     noiseProbability_, ampDampingProbability_,
                                     multiQubitGateFactor_) {}
@@ -68,28 +98,124 @@ public:
   DeterministicNoiseSimulator(
       std::unique_ptr<qc::QuantumComputation>&& qc_,
       const ApproximationInfo& approximationInfo_, const std::size_t seed_,
-      std::string noiseEffects_ = "APD", double noiseProbability_ = 0.001,
+      std::string noiseEffects_ = "APD",
+      double noiseProbability_ = NoiseModel::DEFAULT_NOISE_PROBABILITY,
       std::optional<double> ampDampingProbability_ = std::nullopt,
-      double multiQubitGateFactor_ = 2)
-      : CircuitSimulator(std::move(qc_), approximationInfo_, seed_,
-                         dd::ddsim::DENSITY_MATRIX_SIMULATOR_DD_PACKAGE_CONFIG),
-        noiseEffects(std::move(noiseEffects_)),
-        noiseProbSingleQubit(noiseProbability_),
-        ampDampingProbSingleQubit(ampDampingProbability_
-                                      ? ampDampingProbability_.value()
-                                      : noiseProbability_ * 2),
-        noiseProbMultiQubit(noiseProbability_ * multiQubitGateFactor_),
-        ampDampingProbMultiQubit(ampDampingProbSingleQubit *
-                                 multiQubitGateFactor_),
-        densityDD(*dd, CircuitSimulator::getNumberOfQubits()),
-        deterministicNoiseFunctionality(
-            densityDD, CircuitSimulator::getNumberOfQubits(),
-            noiseProbSingleQubit, noiseProbMultiQubit,
-            ampDampingProbSingleQubit, ampDampingProbMultiQubit, noiseEffects) {
-    dd::ddsim::sanityCheckOfNoiseProbabilities(
-        noiseProbability_, ampDampingProbSingleQubit, multiQubitGateFactor_);
+      double multiQubitGateFactor_ =
+          NoiseModel::DEFAULT_MULTI_QUBIT_GATE_FACTOR)
+      : DeterministicNoiseSimulator(std::move(qc_), approximationInfo_, seed_,
+                                    NoiseModel(noiseProbability_,
+                                               ampDampingProbability_,
+                                               multiQubitGateFactor_),
+                                    std::move(noiseEffects_)) {}
+
+  /**
+   * @brief Simulate the circuit and sample the classical outcomes
+   * @details Circuits with mid-circuit measurements or resets but without
+   * classically controlled operations are simulated only once (unless disabled
+   * via @ref setNonSelectiveMeasurements): measurements and resets are applied
+   * as non-selective channels, and every classical bit whose qubit is modified
+   * after its final measurement is recorded in an additional (noiseless)
+   * qubit. The joint distribution of the classical bits is then read from the
+   * diagonal of the final density matrix. Afterwards, the state only covers the
+   * circuit qubits again.
+   */
+  std::map<std::string, std::size_t> simulate(std::size_t shots) override;
+
+  void setNonSelectiveMeasurements(const bool enabled) {
+    nonSelectiveMeasurements = enabled;
+  }
+  [[nodiscard]] bool getNonSelectiveMeasurements() const {
+    return nonSelectiveMeasurements;
+  }
+
+  /**
+   * @brief Set the number of threads used for circuits simulated shot by shot
+   * @details Circuits with classically controlled operations (or all dynamic
+   * circuits, if non-selective measurements are disabled) are simulated once
+   * per shot. With more than one thread, the shots are distributed among
+   * independent copies of the simulator, each with its own DD packages and
+   * seeded from this simulator. Afterwards, the state is the final state of
+   * the last shot simulated by this simulator. The density-matrix operations
+   * of a single shot always run on one thread, so circuits simulated in a
+   * single pass do not benefit from more threads.
+   */
+  void setNumberOfThreads(std::size_t threads);
+  [[nodiscard]] std::size_t getNumberOfThreads() const { return nthreads; }
+
+  /**
+   * @brief Apply the noise of gates on disjoint qubits in a single pass
+   * @details In layered mode, the noise following a gate is not applied right
+   * away but collected until a gate acts on a qubit with pending noise, or
+   * until the state is measured, reset, approximated, or the simulation ends.
+   * The channels on disjoint qubits commute with each other and with the gates
+   * on other qubits, so the final state is the same, while every layer of gates
+   * requires only a single traversal of the density matrix for its noise.
+   */
+  void setLayeredNoise(const bool layered) { layeredNoise = layered; }
+  [[nodiscard]] bool getLayeredNoise() const { return layeredNoise; }
+
+  /**
+   * @brief Set the probability below which outcomes are discarded
+   * @details Outcomes (or rather, subtrees of the density matrix) whose
+   * probability is below the threshold are ignored when sampling from the
+   * final state. The default of 0.01 trades accuracy for speed on large noisy
+   * registers; a threshold of zero samples from the exact distribution.
+   */
+  void setMeasurementThreshold(double threshold);
+  [[nodiscard]] double getMeasurementThreshold() const {
+    return measurementThreshold;
+  }
+
+  /**
+   * @brief Call a function for every basis state of the final state
+   * @details The function receives the index of the basis state (where bit `i`
+   * corresponds to qubit `i`) and its probability, without building the
+   * (string-keyed) probability vector.
+   */
+  void forEachProbability(const dd::ProbabilityFunc& f,
+                          dd::fp threshold = 0.) const;
+
+  /// The reduced density matrix of the given qubits in the final state (see
+  /// @ref Simulator::reducedDensityMatrix)
+  [[nodiscard]] std::vector<std::complex<dd::fp>>
+  reducedDensityMatrix(const std::vector<qc::Qubit>& qubits) const override {
+    return dd::ddsim::DensityDDPackage::reducedDensityMatrix(
+        rootEdge, getNumberOfQubits(), qubits);
+  }
+
+  /// The final state is a density matrix and cannot be written as a vector
+  void writeStateVector(
+      std::span<std::complex<dd::fp>> /*amplitudes*/) const override {
+    throw std::runtime_error("The deterministic noise simulator represents "
+                             "its state as a density matrix.");
   }
 
+  /// The exact marginal distribution of the given qubits in the final state,
+  /// where bit `j` of the index corresponds to `qubits[j]`
+  [[nodiscard]] std::vector<dd::fp>
+  getMarginalProbabilities(const std::vector<qc::Qubit>& qubits) const;
+
+  /**
+   * @brief Compute the exact expectation value of an observable under noise
+   * @details Simulates the circuit (ignoring non-unitary operations) and
+   * computes \f$\mathrm{tr}(\rho O)\f$ for the final density matrix.
+   * @param observable The observable given as a (Hermitian) circuit acting on
+   * the same number of qubits as the simulated circuit
+   */
+  dd::fp expectationValue(const qc::QuantumComputation& observable) override;
+
+  /**
+   * @brief Compute the exact expectation values of Pauli strings under noise
+   * @details Simulates the circuit once (ignoring non-unitary operations).
+   * Every Pauli string is then evaluated by a single traversal of the final
+   * density matrix, without constructing a DD for the observable.
+   * @param pauliStrings One of `I`, `X`, `Y`, and `Z` per qubit, where the
+   * last character corresponds to qubit 0 (as in Qiskit)
+   */
+  std::vector<dd::fp>
+  expectationValues(const std::vector<std::string>& pauliStrings);
+
   std::map<std::string, std::size_t>
   measureAllNonCollapsing(std::size_t shots) override {
     return sampleFromProbabilityMap(
@@ -98,10 +224,28 @@ public:
         shots);
   }
 
+  std::map<std::string, std::string> additionalStatistics() override;
+
+  /**
+   * @brief Limit the total trace distance introduced by approximations
+   * @details Every approximation step discards basis states of some total
+   * probability \f$\epsilon\f$ (at most one minus the step fidelity), which
+   * changes the state by a trace distance of at most \f$\sqrt{\epsilon}\f$.
+   * Approximation steps are limited such that the sum of these bounds stays
+   * within the given budget.
+   */
+  void setApproximationTraceDistance(double budget);
+  [[nodiscard]] double getApproximationTraceDistance() const {
+    return traceDistanceBudget;
+  }
+
   void initializeSimulation(std::size_t nQubits) override;
+  std::map<std::size_t, bool> singleShot(bool ignoreNonUnitaries) override;
   char measure(dd::Qubit i) override;
   void reset(qc::NonUnitaryOperation* nonUnitaryOp) override;
   void applyOperationToState(std::unique_ptr<qc::Operation>& op) override;
+  double approximateState(double targetFidelity) override;
+  [[nodiscard]] bool stateMemoryExhausted() const override;
 
   std::map<std::string, std::size_t>
   sampleFromProbabilityMap(const dd::SparsePVecStrKeys& resultProbabilityMap,
@@ -118,17 +262,90 @@ public:
     return tmp;
   }
 
+  /**
+   * @brief Limit the number of gate DDs kept alive between operations
+   * @details Gate DDs are cached by the type, qubits and parameters of the
+   * operation, so that repeated gates (e.g., in the layers of variational or
+   * Trotterized circuits and across the shots of dynamic circuits) are only
+   * constructed once. The cache is emptied once it exceeds the given size. A
+   * size of zero disables the cache.
+   */
+  void setGateCacheSize(std::size_t size);
+  [[nodiscard]] std::size_t getGateCacheSize() const {
+    return maxGateCacheSize;
+  }
+
   dd::ddsim::DensityMatrixDD rootEdge{};
 
 private:
-  std::string noiseEffects;
+  /// Exact signature of a standard operation used as gate cache key
+  struct GateSignature {
+    qc::OpType type;
+    qc::Controls controls;
+    qc::Targets targets;
+    std::vector<qc::fp> parameters;
 
-  double noiseProbSingleQubit{};
-  double ampDampingProbSingleQubit{};
-  double noiseProbMultiQubit{};
-  double ampDampingProbMultiQubit{};
+    explicit GateSignature(const qc::Operation& op)
+        : type(op.getType()), controls(op.getControls()),
+          targets(op.getTargets()), parameters(op.getParameter()) {}
+
+    bool operator==(const GateSignature& other) const = default;
+  };
+
+  struct GateSignatureHash {
+    std::size_t operator()(const GateSignature& signature) const noexcept;
+  };
+
+  /// A gate DD and its conjugate transpose, both referenced in the package
+  struct CachedGate {
+    dd::mEdge operation;
+    dd::mEdge adjoint;
+  };
+
+  /// Simulate the circuit once and return the distribution of the classical
+  /// bits (see @ref simulate)
+  dd::SparsePVecStrKeys simulateNonSelectively();
+
+  /// Minimum number of shots a worker needs to amortize its own simulator
+  static constexpr std::size_t MIN_SHOTS_PER_WORKER = 16U;
+
+  /**
+   * @brief Create a worker simulating the shots of another simulator
+   * @details The worker shares the (read-only) circuit and noise model with
+   * the simulator it is created for, but has its own DD packages, whose tables
+   * are limited to the given memory budget.
+   */
+  DeterministicNoiseSimulator(const DeterministicNoiseSimulator& other,
+                              std::size_t seed_, std::size_t tableMemoryBudget);
+
+  /// Distribute the single-shot simulations among several threads
+  std::map<std::string, std::size_t> simulateShotsInParallel(std::size_t shots);
+
+  void applyGateToDensity(const qc::Operation& op);
+  void clearGateCache();
+
+  /// Apply the noise collected in layered mode (see @ref setLayeredNoise)
+  void applyPendingNoise();
+
+  std::unordered_map<GateSignature, CachedGate, GateSignatureHash> gateCache;
+  std::size_t maxGateCacheSize = 1024U;
+  std::size_t gateCacheHits = 0U;
+  std::size_t gateCacheMisses = 0U;
+
+  std::string noiseEffects;
+  std::shared_ptr<const NoiseModel> noiseModel;
 
   double measurementThreshold = 0.01;
+  double traceDistanceBudget = 1.;
+  /// Upper bound on the trace distance introduced by approximations so far
+  double traceDistanceBound = 0.;
+  bool nonSelectiveMeasurements = true;
+  std::size_t nthreads = 1U;
+  bool layeredNoise = false;
+  /// Noise of the current layer of gates that has not been applied yet
+  std::map<qc::Qubit, NoiseParameters> pendingNoise;
+  /// Number of traversals of the density matrix applying gate noise
+  std::size_t noisePasses = 0U;
   dd::ddsim::DensityDDPackage densityDD;
   dd::ddsim::DeterministicNoiseFunctionality deterministicNoiseFunctionality;
 };
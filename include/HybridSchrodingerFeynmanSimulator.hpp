@@ -20,13 +20,20 @@
 #include "ir/QuantumComputation.hpp"
 #include "ir/operations/Operation.hpp"
 
+#include <algorithm>
+#include <complex>
 #include <cstddef>
 #include <cstdint>
+#include <filesystem>
+#include <functional>
 #include <map>
 #include <memory>
+#include <optional>
+#include <span>
 #include <stdexcept>
 #include <string>
 #include <utility>
+#include <vector>
 
 class HybridSchrodingerFeynmanSimulator final : public CircuitSimulator {
 public:
@@ -62,6 +69,36 @@ public:
 
   std::map<std::string, std::size_t> simulate(std::size_t shots) override;
 
+  /**
+   * @brief Simulate a contiguous range of the paths through the cuts
+   * @details The paths `firstControl <= i < lastControl` of the
+   * `2^getNDecisions(cuts)` paths are summed up and returned in a serialized
+   * buffer, the binary serialization of the decision diagram in the DD mode
+   * and the raw amplitudes in the amplitude mode. Disjoint ranges may be
+   * simulated independently, e.g., in different processes or on different
+   * machines, by simulators of the same circuit and mode, and are merged by
+   * `combinePartialResults`. The cuts are used as given, without relabeling
+   * the qubits.
+   * @param cuts The cuts through the circuit, e.g., `planCut().cuts`
+   * @param firstControl The first path of the range
+   * @param lastControl One past the last path of the range
+   * @return the serialized partial result
+   */
+  std::string simulateRange(const std::vector<qc::Qubit>& cuts,
+                            std::size_t firstControl, std::size_t lastControl);
+
+  /**
+   * @brief Merge the partial results of disjoint ranges into the final state
+   * @details The final state is the sum of the partial results, which must
+   * cover all paths through the cuts exactly once.
+   * @param partials The results of `simulateRange`
+   * @param shots The number of shots to sample from the final state
+   * @return the sampled counts, as returned by `simulate`
+   */
+  std::map<std::string, std::size_t>
+  combinePartialResults(const std::vector<std::string>& partials,
+                        std::size_t shots);
+
   Mode mode = Mode::Amplitude;
 
   [[nodiscard]] dd::CVec getVectorFromHybridSimulation() const {
@@ -71,26 +108,297 @@ public:
       throw std::range_error("getVector only supports less than 60 qubits.");
     }
     if (getMode() == Mode::Amplitude) {
-      return finalAmplitudes;
+      return getFinalAmplitudes();
     }
     return CircuitSimulator::rootEdge.getVector();
   }
 
+  /// The final amplitudes of the amplitude mode, without copying them
+  [[nodiscard]] const dd::CVec& getFinalAmplitudes() const {
+    return *shareFinalAmplitudes();
+  }
+
+  /// Share ownership of the final amplitudes of the amplitude mode. Every
+  /// simulation allocates a new buffer, so the shared one stays valid and
+  /// unchanged after further simulations or sampling.
+  [[nodiscard]] std::shared_ptr<const dd::CVec> shareFinalAmplitudes() const {
+    if (amplitudesFreed) {
+      throw std::runtime_error(
+          "The final amplitudes were freed after sampling from them. Use "
+          "setRetainAmplitudes(true) to keep them.");
+    }
+    return finalAmplitudes;
+  }
+
+  /// Write the final amplitudes, which are not held as a DD in the amplitude
+  /// mode
+  void
+  writeStateVector(std::span<std::complex<dd::fp>> amplitudes) const override;
+
   //  Get # of decisions for given split_qubit, so that lower slice: q0 < i <
   //  qubit; upper slice: qubit <= i < nqubits
   std::size_t getNDecisions(qc::Qubit splitQubit);
 
+  /// Get # of decisions for the given cuts, where every cut is the first qubit
+  /// of the next slice
+  std::size_t getNDecisions(const std::vector<qc::Qubit>& cuts);
+
   [[nodiscard]] Mode getMode() const { return mode; }
 
+  /// Cut through the circuit chosen for the hybrid simulation
+  struct CutPlan {
+    /// First qubit of the upper slice (in the relabeled order)
+    qc::Qubit splitQubit = 0;
+    /// Number of decisions, i.e., the simulation runs through 2^n slices
+    std::size_t nDecisions = 0;
+    /// Estimated cost in amplitudes, see `estimateCost`
+    double cost = 0.;
+    /// Position of every qubit during the simulation
+    std::vector<qc::Qubit> layout;
+    /// Whether the layout differs from the identity
+    bool relabeled = false;
+    /// First qubit of every slice but the lowest one, in ascending order
+    std::vector<qc::Qubit> cuts;
+  };
+
+  /**
+   * @brief Choose the cheapest cut through the circuit
+   * @details Every split qubit for which the gates crossing the cut can be
+   * decomposed is evaluated. If qubit relabeling is enabled, the cuts are also
+   * evaluated after reordering the qubits such that strongly interacting
+   * qubits are adjacent, and the relabeling is used if it yields a cheaper cut.
+   * If the slices may hold at most `getMaxSliceQubits` qubits, further cuts
+   * are added greedily, each time choosing the cheapest cut through a slice
+   * that is still too large. Cuts set via `setCuts` or `setSplitQubit` take
+   * precedence over the planner.
+   * @return the plan with the lowest estimated cost
+   */
+  [[nodiscard]] CutPlan planCut() const;
+
+  /**
+   * @brief Estimate the cost of simulating through a cut
+   * @details Every one of the 2^nDecisions slices is bounded by the sizes of
+   * the decision diagrams of its two halves, 2^splitQubit + 2^(n - splitQubit)
+   * nodes. In the amplitude mode, the amplitude vectors that are summed up are
+   * added to the cost.
+   */
+  [[nodiscard]] double estimateCost(qc::Qubit splitQubit,
+                                    std::size_t nDecisions) const;
+
+  /// Estimate the cost of simulating through several cuts, where every slice
+  /// contributes the size of its decision diagram, 2^(number of its qubits)
+  [[nodiscard]] double estimateCost(const std::vector<qc::Qubit>& cuts,
+                                    std::size_t nDecisions) const;
+
+  /// Fix the split qubit instead of planning the cut (`std::nullopt` plans it)
+  void setSplitQubit(const std::optional<qc::Qubit> qubit) {
+    cutsOverride.clear();
+    if (qubit.has_value()) {
+      cutsOverride.emplace_back(*qubit);
+    }
+  }
+  [[nodiscard]] std::optional<qc::Qubit> getSplitQubit() const {
+    if (cutsOverride.empty()) {
+      return std::nullopt;
+    }
+    return cutsOverride.front();
+  }
+
+  /**
+   * @brief Fix the cuts instead of planning them (an empty list plans them)
+   * @details Every cut is the first qubit of the next slice, so k cuts split
+   * the circuit into k + 1 slices, which are simulated separately for every
+   * assignment of the decisions of all gates crossing any of the cuts.
+   */
+  void setCuts(std::vector<qc::Qubit> cuts) {
+    std::sort(cuts.begin(), cuts.end());
+    cuts.erase(std::unique(cuts.begin(), cuts.end()), cuts.end());
+    cutsOverride = std::move(cuts);
+  }
+  [[nodiscard]] const std::vector<qc::Qubit>& getCuts() const {
+    return cutsOverride;
+  }
+
+  /// Let the planner cut the circuit into slices of at most the given number
+  /// of qubits (zero, the default, uses a single cut)
+  void setMaxSliceQubits(const std::size_t qubits) { maxSliceQubits = qubits; }
+  [[nodiscard]] std::size_t getMaxSliceQubits() const { return maxSliceQubits; }
+
+  /// Let the planner consider relabeling the qubits (disabled by default)
+  void setQubitRelabeling(const bool enable) { qubitRelabeling = enable; }
+  [[nodiscard]] bool getQubitRelabeling() const { return qubitRelabeling; }
+
+  /// Plan used by the last simulation
+  [[nodiscard]] const CutPlan& getCutPlan() const { return cutPlan; }
+
+  /**
+   * @brief Share half-slices between slices (disabled by default)
+   * @details The state of each part of a slice only depends on the decisions
+   * involving it made so far. If enabled, the slices handled by a task are
+   * simulated as a tree of these decisions per part, where every part between
+   * two decisions is simulated once, and the slices are formed as Kronecker
+   * products of the cached parts.
+   */
+  void setHalfSliceMemoization(const bool enable) {
+    halfSliceMemoization = enable;
+  }
+  [[nodiscard]] bool getHalfSliceMemoization() const {
+    return halfSliceMemoization;
+  }
+
+  /**
+   * @brief Keep the final amplitudes after sampling from them
+   * @details In the amplitude mode, shots are sampled block-wise from the
+   * probabilities of the blocks computed while summing up the amplitude
+   * vectors of the threads, without modifying the amplitudes. Unless they are
+   * kept (disabled by default), the amplitudes are freed after sampling, and
+   * accessing them afterwards throws. Without shots, the amplitudes are always
+   * kept.
+   */
+  void setRetainAmplitudes(const bool enable) { retainAmplitudes = enable; }
+  [[nodiscard]] bool getRetainAmplitudes() const { return retainAmplitudes; }
+
+  /**
+   * @brief Limit the memory held by partial results in DD mode
+   * @details Every thread adds the slices it simulates to a partial sum held
+   * in its own package. Once the decision diagrams of these sums would exceed
+   * the given number of bytes, a sum is spilled to the spill directory until
+   * all slices are combined. A budget of zero (the default) uses half of the
+   * memory available when the simulation starts.
+   */
+  void setMemoryBudget(const std::size_t bytes) { memoryBudget = bytes; }
+  [[nodiscard]] std::size_t getMemoryBudget() const { return memoryBudget; }
+
+  /// Directory for spilled partial results (the system's temporary directory
+  /// if empty), in which every simulation creates and finally removes a
+  /// directory of its own
+  void setSpillDirectory(std::filesystem::path directory) {
+    spillDirectory = std::move(directory);
+  }
+  [[nodiscard]] const std::filesystem::path& getSpillDirectory() const {
+    return spillDirectory;
+  }
+
+  /// Number of partial results spilled to disk during the last DD simulation
+  [[nodiscard]] std::size_t getSpilledSlices() const { return spilledSlices; }
+
+  /// Physical memory currently available in bytes (zero if unknown), which on
+  /// Linux is limited to what is left within the memory limit of the cgroup
+  [[nodiscard]] static std::size_t getAvailableMemory();
+
+  /**
+   * @brief Number of amplitude vectors that fit into the given memory
+   * @details In amplitude mode, every thread accumulates its slices in its
+   * own vector of 2^n amplitudes, so the number of threads is limited by the
+   * number of vectors that fit into the available memory.
+   * @param availableMemory The available memory in bytes (zero if unknown,
+   * which does not limit the number of threads)
+   */
+  [[nodiscard]] std::size_t
+  getAmplitudeAccumulatorLimit(std::size_t availableMemory) const;
+
+  std::map<std::string, std::string> additionalStatistics() override {
+    auto stats = CircuitSimulator::additionalStatistics();
+    if (mode == Mode::DD) {
+      stats["spilled_slices"] = std::to_string(spilledSlices);
+    } else {
+      stats["amplitude_accumulators"] = std::to_string(amplitudeAccumulators);
+    }
+    stats["split_qubit"] = std::to_string(cutPlan.splitQubit);
+    stats["slices"] = std::to_string(cutPlan.cuts.size() + 1);
+    stats["decisions"] = std::to_string(cutPlan.nDecisions);
+    stats["estimated_cost"] = std::to_string(cutPlan.cost);
+    stats["relabeled"] = cutPlan.relabeled ? "true" : "false";
+    return stats;
+  }
+
 private:
   std::size_t nthreads = 2;
-  dd::CVec finalAmplitudes;
+  /// Replaced rather than modified once shared, see shareFinalAmplitudes()
+  std::shared_ptr<dd::CVec> finalAmplitudes = std::make_shared<dd::CVec>();
+  /// Whether the final amplitudes were freed after sampling from them
+  bool amplitudesFreed = false;
+  std::size_t memoryBudget = 0;
+  std::filesystem::path spillDirectory;
+  std::size_t spilledSlices = 0;
+  std::size_t amplitudeAccumulators = 0;
+  std::vector<qc::Qubit> cutsOverride;
+  std::size_t maxSliceQubits = 0;
+  bool qubitRelabeling = false;
+  bool halfSliceMemoization = false;
+  bool retainAmplitudes = false;
+  CutPlan cutPlan{};
+  /// Total probability of every block of `amplitudeBlockSize` final amplitudes
+  std::vector<dd::fp> blockProbabilities;
+  std::size_t amplitudeBlockSize = 0;
 
-  void simulateHybridTaskflow(qc::Qubit splitQubit);
-  void simulateHybridAmplitudes(qc::Qubit splitQubit);
+  /// Factor of an operator Schmidt term acting on the qubits of one slice
+  struct SchmidtFactor {
+    /// Qubits of the factor, the first one being the least significant
+    std::vector<qc::Qubit> qubits;
+    /// Matrix of the factor in row-major order
+    std::vector<std::complex<dd::fp>> matrix;
+  };
+
+  /// Operation crossing one of the cuts, i.e., requiring decisions
+  struct CrossingOp {
+    /// The slices of the targets and of the control, or the lower and the
+    /// upper slice of a gate decomposed into its operator Schmidt terms
+    std::pair<std::size_t, std::size_t> slices;
+    /// Number of decisions, which select the Schmidt term if there are any
+    std::size_t nDecisions = 1;
+    /// Factors of the operator Schmidt terms in the lower and the upper slice
+    /// (empty for a gate with a single control across the cut)
+    std::vector<std::pair<SchmidtFactor, SchmidtFactor>> schmidtTerms;
+  };
+  using SplitOps = std::vector<std::optional<CrossingOp>>;
+
+  [[nodiscard]] std::size_t
+  getNDecisions(const std::vector<qc::Qubit>& cuts,
+                const std::vector<qc::Qubit>& layout) const;
+  /// How an operation crosses the cuts, if it does
+  [[nodiscard]] static std::optional<CrossingOp>
+  crossingOp(const qc::Operation& op, const std::vector<qc::Qubit>& cuts,
+             const std::vector<qc::Qubit>& layout);
+  /// How every operation of the circuit crosses the cuts
+  [[nodiscard]] SplitOps getSplitOps(const std::vector<qc::Qubit>& cuts) const;
+  /// Add cuts until no slice exceeds the maximum number of qubits
+  [[nodiscard]] std::optional<CutPlan>
+  planCuts(const std::vector<qc::Qubit>& layout, bool relabeled) const;
+  /// Order in which the qubits are placed such that strongly interacting
+  /// qubits are adjacent
+  [[nodiscard]] std::vector<qc::Qubit> interactionLayout() const;
+  /// Move every qubit of the circuit to its position in the layout
+  void relabelCircuit(const std::vector<qc::Qubit>& layout);
+  /// Undo the layout on the final state (but not on the circuit)
+  void restoreQubitOrder(const std::vector<qc::Qubit>& layout);
+
+  /// Partial sum of the slices simulated by one thread, held in its own package
+  struct PartialResult {
+    std::unique_ptr<dd::Package> package;
+    dd::VectorDD edge{};
+    std::size_t bytes = 0;
+  };
+
+  /// Throw if the circuit contains operations the simulator cannot handle
+  void checkCircuit() const;
+  std::map<std::string, std::size_t> sampleFinalState(std::size_t shots);
+  /// Sample from the final amplitudes by scanning only the blocks in which
+  /// the sorted random numbers fall
+  std::map<std::string, std::size_t>
+  sampleAmplitudesBlockwise(std::size_t shots);
+
+  /// Sum up the paths `firstControl <= i < lastControl` through the cuts
+  void simulateHybridTaskflow(const std::vector<qc::Qubit>& cuts,
+                              std::size_t firstControl,
+                              std::size_t lastControl);
+  void simulateHybridAmplitudes(const std::vector<qc::Qubit>& cuts,
+                                std::size_t firstControl,
+                                std::size_t lastControl);
 
   dd::VectorDD simulateSlicing(std::unique_ptr<dd::Package>& sliceDD,
-                               qc::Qubit splitQubit, std::size_t controls);
+                               const std::vector<qc::Qubit>& cuts,
+                               const SplitOps& splitOps, std::size_t controls);
 
   class Slice {
   protected:
@@ -130,5 +438,39 @@ private:
     // returns true if this operation was a split operation
     bool apply(std::unique_ptr<dd::Package>& sliceDD,
                const std::unique_ptr<qc::Operation>& op);
+
+    // applies the factor of the Schmidt term selected by the next decisions
+    void applySchmidtTerm(std::unique_ptr<dd::Package>& sliceDD,
+                          const CrossingOp& op, bool lowerSlice);
+
+    // passes the decisions of a split operation not involving this slice
+    void skipDecisions(const std::size_t n) {
+      nextControlIdx += static_cast<qc::Qubit>(n);
+      nDecisionsExecuted += n;
+    }
   };
+
+  /// Apply an operation to a slice, passing the decisions not involving it
+  static void applyToSlice(std::unique_ptr<dd::Package>& sliceDD, Slice& slice,
+                           std::size_t sliceIdx,
+                           const std::unique_ptr<qc::Operation>& op,
+                           const std::optional<CrossingOp>& split);
+
+  /// Pass the slices `firstControl <= controls < lastControl` to `onSlice`,
+  /// where the first decision is the most significant bit of `controls`
+  void simulateSlicesMemoized(
+      std::unique_ptr<dd::Package>& sliceDD, const std::vector<qc::Qubit>& cuts,
+      const SplitOps& splitOps, std::size_t firstControl,
+      std::size_t lastControl,
+      const std::function<void(const dd::VectorDD&)>& onSlice);
+
+  /// Continue a slice from the given operation, branching at every decision
+  /// involving the slice as long as one of the needed assignments of these
+  /// decisions remains, and passing each leaf to `onLeaf`
+  void walkSlice(std::unique_ptr<dd::Package>& sliceDD, Slice slice,
+                 std::size_t sliceIdx, std::size_t opIdx,
+                 std::size_t assignedMask,
+                 const std::vector<std::size_t>& neededControls,
+                 const SplitOps& splitOps,
+                 const std::function<void(const Slice&)>& onLeaf);
 };
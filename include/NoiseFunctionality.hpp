@@ -24,6 +24,7 @@
 
 #include "DensityDDPackage.hpp"
 #include "DensityNode.hpp"
+#include "NoiseModel.hpp"
 #include "StochasticNoiseOperationTable.hpp"
 #include "dd/DDDefinitions.hpp"
 #include "dd/Package.hpp"
@@ -33,7 +34,10 @@
 #include <array>
 #include <cstddef>
 #include <cstdint>
+#include <functional>
+#include <map>
 #include <memory>
+#include <optional>
 #include <random>
 #include <set>
 #include <string>
@@ -60,6 +64,10 @@ void sanityCheckOfNoiseProbabilities(double noiseProbability,
 
 class StochasticNoiseFunctionality {
 public:
+  StochasticNoiseFunctionality(dd::Package& dd, std::size_t nq,
+                               const NoiseModel& model,
+                               const std::string& cNoiseEffects);
+
   StochasticNoiseFunctionality(dd::Package& dd, std::size_t nq,
                                double gateNoiseProbability,
                                double amplitudeDampingProb,
@@ -83,58 +91,115 @@ protected:
     StochasticNoiseKindEnd
   };
 
+  /// Maximum number of qubits whose amplitude damping is decided jointly (up
+  /// to this number of targets, the operation and its noise are applied with a
+  /// single multiplication)
+  static constexpr std::size_t MAX_JOINT_NOISE_TARGETS = 4U;
+
+  /// The noise of a single qubit compiled from the noise model
+  struct QubitNoiseOperations {
+    double noiseProbability;
+    double noiseProbabilityMulti;
+    dd::GateMatrix ampDampingTrue;
+    dd::GateMatrix ampDampingTrueMulti;
+    dd::GateMatrix ampDampingFalse;
+    dd::GateMatrix ampDampingFalseMulti;
+  };
+
   dd::Package* package;
   std::size_t nQubits;
   std::uniform_real_distribution<dd::fp> dist;
 
-  double noiseProbability;
-  double noiseProbabilityMulti;
-  dd::fp sqrtAmplitudeDampingProbability;
-  dd::fp oneMinusSqrtAmplitudeDampingProbability;
-  dd::fp sqrtAmplitudeDampingProbabilityMulti;
-  dd::fp oneMinusSqrtAmplitudeDampingProbabilityMulti;
-  dd::GateMatrix ampDampingTrue{};
-  dd::GateMatrix ampDampingTrueMulti{};
-  dd::GateMatrix ampDampingFalse{};
-  dd::GateMatrix ampDampingFalseMulti{};
+  NoiseModel noiseModel;
+  std::vector<QubitNoiseOperations> qubitNoise;
   std::vector<NoiseOperations> noiseEffects;
   dd::mEdge identityDD;
   StochasticNoiseOperationTable<dd::mEdge> stochasticNoiseOperationCache;
 
   [[nodiscard]] std::size_t getNumberOfQubits() const { return nQubits; }
-  [[nodiscard]] double getNoiseProbability(bool multiQubitNoiseFlag) const;
+  [[nodiscard]] double getNoiseProbability(qc::Qubit target,
+                                           bool multiQubitNoiseFlag) const;
 
   [[nodiscard]] static StochasticNoiseKind
   getAmplitudeDampingOperationType(bool multiQubitNoiseFlag,
                                    bool amplitudeDampingFlag);
 
   [[nodiscard]] dd::GateMatrix
-  getAmplitudeDampingOperationMatrix(bool multiQubitNoiseFlag,
+  getAmplitudeDampingOperationMatrix(qc::Qubit target, bool multiQubitNoiseFlag,
                                      bool amplitudeDampingFlag) const;
 
 public:
+  /// Apply the operation, which must only act on the targets, and their noise
   void applyNoiseOperation(const std::set<qc::Qubit>& targets,
                            dd::mEdge operation, dd::vEdge& state,
                            std::mt19937_64& generator);
 
+  /// Apply the operation and the noise the noise model assigns to it
+  void applyNoiseOperation(const qc::Operation& qcOperation,
+                           dd::mEdge operation, dd::vEdge& state,
+                           std::mt19937_64& generator);
+
 protected:
+  void applyNoiseOperation(const std::set<qc::Qubit>& targets,
+                           std::optional<double> gateNoiseProbability,
+                           dd::mEdge operation, dd::vEdge& state,
+                           std::mt19937_64& generator);
+
   [[nodiscard]] dd::mEdge stackOperation(const dd::mEdge& operation,
                                          qc::Qubit target,
                                          StochasticNoiseKind noiseOperation,
                                          const dd::GateMatrix& matrix);
 
-  dd::mEdge generateNoiseOperation(dd::mEdge operation, qc::Qubit target,
-                                   std::mt19937_64& generator,
-                                   bool amplitudeDamping,
-                                   bool multiQubitOperation);
+  /**
+   * @brief Sample the noise effects for a single qubit
+   * @details Amplitude damping is represented by a placeholder, since whether
+   * it occurs depends on the state and is decided separately.
+   */
+  [[nodiscard]] std::vector<StochasticNoiseKind>
+  sampleNoiseKinds(std::mt19937_64& generator, double noiseProbability,
+                   bool multiQubitOperation);
+
+  [[nodiscard]] dd::mEdge
+  stackNoiseOperations(dd::mEdge operation, qc::Qubit target,
+                       const std::vector<StochasticNoiseKind>& kinds,
+                       bool amplitudeDamping, bool multiQubitOperation);
 
-  [[nodiscard]] StochasticNoiseKind
+  /**
+   * @brief Sample the noise of a group of targets and stack it onto an
+   * operation
+   * @details The amplitude damping decision for every target is conditioned
+   * on the decisions for the previous targets via their joint probabilities.
+   * These are only computed if a random number could decide for amplitude
+   * damping, which is rare for small damping probabilities.
+   * @param operation the operation the noise is stacked onto
+   * @param group the (sorted) targets
+   * @param computeWeights computes the joint probabilities of the targets,
+   * where bit `j` of the index corresponds to `group[j]`
+   */
+  [[nodiscard]] dd::mEdge
+  stackDampedNoise(dd::mEdge operation, const std::vector<qc::Qubit>& group,
+                   const std::function<std::vector<dd::fp>()>& computeWeights,
+                   std::optional<double> gateNoiseProbability,
+                   bool multiQubitOperation, std::mt19937_64& generator);
+
+  void applyToState(const dd::mEdge& operation, dd::vEdge& state);
+
+  [[nodiscard]] static StochasticNoiseKind
   returnNoiseOperation(NoiseOperations noiseOperation, double prob,
-                       bool multiQubitNoiseFlag) const;
+                       double noiseProbability);
 };
 
 class DeterministicNoiseFunctionality {
 public:
+  DeterministicNoiseFunctionality(DensityDDPackage& dd, std::size_t nq,
+                                  const NoiseModel& model,
+                                  const std::string& cNoiseEffects);
+
+  /// Apply noise according to a model that is shared with other instances
+  DeterministicNoiseFunctionality(DensityDDPackage& dd, std::size_t nq,
+                                  std::shared_ptr<const NoiseModel> model,
+                                  const std::string& cNoiseEffects);
+
   DeterministicNoiseFunctionality(DensityDDPackage& dd, std::size_t nq,
                                   double noiseProbabilitySingleQubit,
                                   double noiseProbabilityMultiQubit,
@@ -146,23 +211,45 @@ protected:
   DensityDDPackage* package;
   std::size_t nQubits;
 
-  double noiseProbSingleQubit;
-  double noiseProbMultiQubit;
-  double ampDampingProbSingleQubit;
-  double ampDampingProbMultiQubit;
+  std::shared_ptr<const NoiseModel> noiseModel;
+  /// The noise of every qubit after single-qubit gates, compiled from the model
+  std::vector<NoiseParameters> singleQubitNoise;
+  /// The noise of every qubit after multi-qubit gates, compiled from the model
+  std::vector<NoiseParameters> multiQubitNoise;
 
   std::vector<NoiseOperations> noiseEffects;
 
+  /// The noise channels registered with the package by their parameters
+  std::map<std::vector<std::tuple<qc::Qubit, double, double>>, std::size_t>
+      noiseChannels;
+
   [[nodiscard]] std::size_t getNumberOfQubits() const { return nQubits; }
 
 public:
+  /// The noise parameters for every qubit used by an operation
+  [[nodiscard]] std::map<qc::Qubit, NoiseParameters>
+  getNoise(const qc::Operation& qcOperation) const;
+
   void applyNoiseEffects(dEdge& originalEdge,
                          const std::unique_ptr<qc::Operation>& qcOperation);
 
+  /**
+   * @brief Apply the noise effects to the given qubits
+   * @param originalEdge The density matrix
+   * @param noise The noise parameters for every qubit subject to noise
+   */
+  void applyNoiseEffects(dEdge& originalEdge,
+                         const std::map<qc::Qubit, NoiseParameters>& noise);
+
 private:
-  dCachedEdge applyNoiseEffects(dEdge& originalEdge,
-                                const std::set<qc::Qubit>& usedQubits,
-                                bool firstPathEdge, dd::Qubit level);
+  /// The identifier of a noise channel in the noise compute table
+  std::size_t
+  getNoiseChannel(const std::map<qc::Qubit, NoiseParameters>& noise);
+
+  dCachedEdge
+  applyNoiseEffects(dEdge& originalEdge,
+                    const std::map<qc::Qubit, NoiseParameters>& noise,
+                    std::size_t channel, bool firstPathEdge, dd::Qubit level);
 
   static void applyPhaseFlipToEdges(ArrayOfEdges& e, double probability);
 
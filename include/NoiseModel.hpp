@@ -0,0 +1,159 @@
+/*
+ * Copyright (c) 2023 - 2026 Chair for Design Automation, TUM
+ * Copyright (c) 2025 - 2026 Munich Quantum Software Company GmbH
+ * All rights reserved.
+ *
+ * SPDX-License-Identifier: MIT
+ *
+ * Licensed under the MIT License
+ */
+
+/**
+ * @file NoiseModel.hpp
+ * @brief Per-qubit and per-gate noise model for the noise-aware simulators.
+ */
+
+#pragma once
+
+#include "ir/Definitions.hpp"
+#include "ir/operations/OpType.hpp"
+#include "ir/operations/Operation.hpp"
+
+#include <cstddef>
+#include <map>
+#include <nlohmann/json.hpp>
+#include <optional>
+#include <string>
+#include <utility>
+#include <vector>
+
+/// Parameters of the noise channels applied to a qubit after a gate
+struct NoiseParameters {
+  /// Probability of phase flips and depolarization
+  double noiseProbability{};
+  /// Probability of amplitude damping
+  double amplitudeDampingProbability{};
+
+  bool operator==(const NoiseParameters& other) const = default;
+};
+
+/**
+ * @brief Noise model mapping gates and qubits to noise channel parameters
+ * @details Without further information, every qubit used by a gate is subject
+ * to the global noise and amplitude damping probabilities, which are scaled by
+ * the multi-qubit gate factor for gates acting on more than one qubit.
+ * Individual qubits may override these probabilities, either directly or
+ * through their relaxation (T1) and dephasing (T2) times. Finally, the noise
+ * probability of a gate acting on specific qubits may be set explicitly, which
+ * takes precedence over the per-qubit and global values and is not scaled.
+ *
+ * A noise model can be loaded from JSON of the form
+ * @code{.json}
+ * {
+ *   "noise_probability": 0.001,
+ *   "amp_damping_probability": 0.002,
+ *   "multi_qubit_gate_factor": 2,
+ *   "qubits": [
+ *     {"qubit": 0, "t1": 50e-6, "t2": 70e-6, "gate_time": 50e-9},
+ *     {"qubit": 1, "noise_probability": 0.002}
+ *   ],
+ *   "gates": [{"gate": "cx", "qubits": [0, 1], "noise_probability": 0.01}]
+ * }
+ * @endcode
+ * where the qubits of a gate list the controls before the targets.
+ */
+class NoiseModel {
+public:
+  /// Default probability of phase flips and depolarization
+  static constexpr double DEFAULT_NOISE_PROBABILITY = 0.01;
+  /// Default scaling of the probabilities for gates acting on multiple qubits
+  static constexpr double DEFAULT_MULTI_QUBIT_GATE_FACTOR = 2.;
+
+  /**
+   * @param noiseProbability The probability of phase flips and depolarization
+   * @param amplitudeDampingProbability The probability of amplitude damping
+   * (twice the noise probability if not given)
+   * @param multiQubitGateFactor The factor by which the probabilities are
+   * scaled for gates acting on more than one qubit
+   */
+  explicit NoiseModel(
+      double noiseProbability = DEFAULT_NOISE_PROBABILITY,
+      std::optional<double> amplitudeDampingProbability = std::nullopt,
+      double multiQubitGateFactor = DEFAULT_MULTI_QUBIT_GATE_FACTOR);
+
+  /**
+   * @brief Override the probabilities of a single qubit
+   * @param qubit The qubit
+   * @param noiseProbability The probability of phase flips and depolarization
+   * (the global probability if not given)
+   * @param amplitudeDampingProbability The probability of amplitude damping
+   * (the global probability if not given)
+   */
+  void setQubitNoise(qc::Qubit qubit, std::optional<double> noiseProbability,
+                     std::optional<double> amplitudeDampingProbability);
+
+  /**
+   * @brief Override the probabilities of a single qubit from its calibration
+   * @details The amplitude damping probability is `1 - exp(-t/T1)` and the
+   * noise probability is the phase flip probability `(1 - exp(-t/Tphi)) / 2`
+   * of the pure dephasing time `1/Tphi = 1/T2 - 1/(2 T1)`, where `t` is the
+   * duration of a gate.
+   * @param qubit The qubit
+   * @param t1 The relaxation time
+   * @param t2 The dephasing time, which must not exceed `2 T1`
+   * @param gateTime The duration of a gate in the same unit as `t1` and `t2`
+   */
+  void setQubitRelaxation(qc::Qubit qubit, double t1, double t2,
+                          double gateTime);
+
+  /**
+   * @brief Set the noise probability of a gate acting on specific qubits
+   * @param type The type of the gate
+   * @param qubits The qubits of the gate, controls before targets
+   * @param noiseProbability The probability of phase flips and depolarization
+   * on every qubit of the gate
+   */
+  void setGateNoise(qc::OpType type, std::vector<qc::Qubit> qubits,
+                    double noiseProbability);
+
+  /// The noise parameters of a qubit for single- or multi-qubit gates
+  [[nodiscard]] NoiseParameters getQubitNoise(qc::Qubit qubit,
+                                              bool multiQubitGate) const;
+
+  /// The noise parameters for every qubit used by an operation
+  [[nodiscard]] std::map<qc::Qubit, NoiseParameters>
+  getNoise(const qc::Operation& op) const;
+
+  /// The noise probability of a gate, if set explicitly
+  [[nodiscard]] std::optional<double>
+  getGateNoise(const qc::Operation& op) const;
+
+  [[nodiscard]] bool hasGateNoise() const { return !gateNoise.empty(); }
+
+  [[nodiscard]] double getNoiseProbability() const { return noiseProbability; }
+  [[nodiscard]] double getAmplitudeDampingProbability() const {
+    return amplitudeDampingProbability;
+  }
+  [[nodiscard]] double getMultiQubitGateFactor() const {
+    return multiQubitGateFactor;
+  }
+
+  static NoiseModel fromJson(const nlohmann::json& j);
+  [[nodiscard]] nlohmann::json json() const;
+  [[nodiscard]] std::string toString() const { return json().dump(2); }
+
+private:
+  struct QubitNoise {
+    std::optional<double> noiseProbability;
+    std::optional<double> amplitudeDampingProbability;
+  };
+
+  double noiseProbability;
+  double amplitudeDampingProbability;
+  double multiQubitGateFactor;
+
+  std::map<qc::Qubit, QubitNoise> qubitNoise;
+  std::map<std::pair<qc::OpType, std::vector<qc::Qubit>>, double> gateNoise;
+
+  static std::vector<qc::Qubit> gateQubits(const qc::Operation& op);
+};
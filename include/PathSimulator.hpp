@@ -14,14 +14,17 @@
 #include "Simulator.hpp"
 #include "circuit_optimizer/CircuitOptimizer.hpp"
 #include "dd/Node.hpp"
+#include "dd/Package.hpp"
 #include "ir/QuantumComputation.hpp"
 
+#include <algorithm>
 #include <cstddef>
 #include <cstdint>
 #include <limits>
 #include <list>
 #include <map>
 #include <memory>
+#include <mutex>
 #include <nlohmann/json.hpp>
 #include <stdexcept>
 #include <string>
@@ -75,7 +78,8 @@ public:
       PairwiseRecursiveGrouping,
       BracketGrouping,
       Alternating,
-      GateCost
+      GateCost,
+      Optimized
     };
 
     // mode to use
@@ -90,15 +94,22 @@ public:
     std::list<std::size_t> gateCost;
     // random seed
     std::size_t seed;
+    // number of threads contracting independent parts of the path
+    std::size_t nthreads;
+    // time (in seconds) the optimized mode may spend searching for a path
+    double planningTime;
 
     // Add new variables here
     explicit Configuration(const Mode mode_ = Mode::Sequential,
                            const std::size_t bracketSize_ = 2,
                            const std::size_t startingPoint_ = 0,
                            std::list<std::size_t> gateCost_ = {},
-                           const std::size_t seed_ = 0)
+                           const std::size_t seed_ = 0,
+                           const std::size_t nthreads_ = 1,
+                           const double planningTime_ = 0.1)
         : mode(mode_), bracketSize(bracketSize_), startingPoint(startingPoint_),
-          gateCost(std::move(gateCost_)), seed(seed_) {};
+          gateCost(std::move(gateCost_)), seed(seed_), nthreads(nthreads_),
+          planningTime(planningTime_) {};
 
     static Mode modeFromString(const std::string& mode) {
       if (mode == "sequential" || mode == "0") {
@@ -116,6 +127,9 @@ public:
       if (mode == "gate_cost" || mode == "4") {
         return Mode::GateCost;
       }
+      if (mode == "optimized" || mode == "5") {
+        return Mode::Optimized;
+      }
 
       throw std::invalid_argument("Invalid simulation path mode: " + mode);
     }
@@ -132,6 +146,8 @@ public:
         return "alternating";
       case Mode::GateCost:
         return "gate_cost";
+      case Mode::Optimized:
+        return "optimized";
       default:
         throw std::invalid_argument("Invalid simulation path mode");
       }
@@ -147,10 +163,15 @@ public:
       } else if (mode == Mode::GateCost) {
         conf["starting_point"] = startingPoint;
         conf["gate_cost"] = gateCost;
+      } else if (mode == Mode::Optimized) {
+        conf["planning_time"] = planningTime;
       }
       if (seed != 0) {
         conf["seed"] = seed;
       }
+      if (nthreads > 1) {
+        conf["nthreads"] = nthreads;
+      }
       return conf;
     }
 
@@ -159,7 +180,9 @@ public:
 
   explicit PathSimulator(std::unique_ptr<qc::QuantumComputation>&& qc_,
                          Configuration configuration = Configuration())
-      : CircuitSimulator(std::move(qc_)), executor(1) {
+      : CircuitSimulator(std::move(qc_)),
+        executor(std::max<std::size_t>(1, configuration.nthreads)),
+        nthreads(std::max<std::size_t>(1, configuration.nthreads)) {
     if (configuration.seed != 0) {
       // override seed in case a non-trivial one is given
       Simulator::mt.seed(Simulator::seed);
@@ -189,6 +212,10 @@ public:
       generateGatecostSimulationPath(configuration.startingPoint,
                                      configuration.gateCost);
       break;
+    case Configuration::Mode::Optimized:
+      generateOptimizedSimulationPath(configuration.planningTime,
+                                      configuration.seed);
+      break;
     default:
       generateSequentialSimulationPath();
       break;
@@ -198,13 +225,21 @@ public:
   PathSimulator(std::unique_ptr<qc::QuantumComputation>&& qc_,
                 typename Configuration::Mode mode_, std::size_t bracketSize_,
                 std::size_t startingPoint_, std::list<std::size_t> gateCost_,
-                std::size_t seed_)
+                std::size_t seed_, std::size_t nthreads_ = 1,
+                double planningTime_ = 0.1)
       : PathSimulator(std::move(qc_),
                       Configuration{mode_, bracketSize_, startingPoint_,
-                                    std::move(gateCost_), seed_}) {}
+                                    std::move(gateCost_), seed_, nthreads_,
+                                    planningTime_}) {}
 
   std::map<std::string, std::size_t> simulate(std::size_t shots) override;
 
+  std::map<std::string, std::string> additionalStatistics() override {
+    auto stats = CircuitSimulator::additionalStatistics();
+    stats["packages"] = std::to_string(packages.size());
+    return stats;
+  }
+
   const SimulationPath& getSimulationPath() const { return simulationPath; }
   void setSimulationPath(const SimulationPath& path) { simulationPath = path; }
   void setSimulationPath(const typename SimulationPath::Components& components,
@@ -221,6 +256,33 @@ public:
   void generateAlternatingSimulationPath(std::size_t startingPoint);
   void generateGatecostSimulationPath(std::size_t startingPoint,
                                       std::list<std::size_t>& gateCosts);
+  /**
+   * @brief Search for a simulation path with a low estimated cost
+   * @details Candidates are the sequential and the pairwise recursive path as
+   * well as paths that greedily contract the cheapest pair of neighboring
+   * parts of the circuit. After a deterministic greedy run, randomized greedy
+   * runs are restarted until several restarts in a row did not find a cheaper
+   * path. With a seed, the number of restarts is also capped, so the same seed
+   * yields the same path unless the planning time runs out first.
+   * @param planningTime time (in seconds) after which randomized runs are
+   * stopped, even in the middle of a run
+   * @param seed seed for the randomized restarts (0 for no restart limit)
+   */
+  void generateOptimizedSimulationPath(double planningTime,
+                                       std::size_t seed = 0);
+
+  /**
+   * @brief Estimate the cost of contracting the current simulation path
+   * @details The estimate is derived from the supports of the gates. Qubits
+   * entangled by the gates of a part of the circuit (its light cone) form a
+   * block. The number of nodes per level of its decision diagram is assumed
+   * to grow exponentially with the targets of the entangling gates acting on
+   * it, while single-qubit gates and controls do not widen the levels. A
+   * multiplication costs the product of the estimated sizes of the blocks it
+   * joins.
+   * @return the estimated number of node operations
+   */
+  [[nodiscard]] double estimateSimulationPathCost() const;
 
 private:
   std::unordered_map<std::size_t, tf::Task> tasks;
@@ -229,8 +291,30 @@ private:
 
   tf::Taskflow taskflow;
   tf::Executor executor;
+  std::size_t nthreads;
   SimulationPath simulationPath{};
 
+  /// Index of the package every step is contracted in (zero is the package of
+  /// the simulator)
+  std::vector<std::size_t> packageOf;
+  /// Packages of independent subtrees of the path, which are released once
+  /// their result has been transferred into the package of the parent step
+  std::vector<std::unique_ptr<dd::Package>> packages;
+  /// Steps contracted in the same package never run concurrently
+  std::vector<std::mutex> packageMutexes;
+  std::mutex resultsMutex;
+
+  /**
+   * @brief Decide which subtrees of the path are contracted in packages of
+   * their own
+   * @details Every step shares the package of its parent, except for the
+   * right child of a step, which gets a new package if the subtrees of both
+   * children contain enough steps to be worth running concurrently. With a
+   * single thread, all steps use the package of the simulator.
+   */
+  void assignPackages();
+  dd::Package& getPackage(std::size_t stepID);
+
   void constructTaskGraph();
   void addSimulationTask(std::size_t leftID, std::size_t rightID,
                          std::size_t resultID);
@@ -16,6 +16,7 @@
 #include "dd/Node.hpp"
 #include "dd/Package.hpp"
 #include "dd/RealNumber.hpp"
+#include "ir/Definitions.hpp"
 
 #include <algorithm>
 #include <array>
@@ -27,6 +28,7 @@
 #include <memory>
 #include <queue>
 #include <random>
+#include <span>
 #include <string>
 #include <unordered_map>
 #include <utility>
@@ -104,6 +106,29 @@ public:
   [[nodiscard]] std::pair<dd::ComplexValue, std::string>
   getPathOfLeastResistance() const;
 
+  /**
+   * @brief Compute the reduced density matrix of some qubits of the state
+   * @details All other qubits are traced out directly on the DD by contracting
+   * the state with its conjugate, i.e., without constructing the state vector.
+   * The cost grows with the square of the dimension of the result, so this is
+   * meant for a few qubits of (possibly) large states.
+   * @param qubits The qubits to keep, where bit `j` of the row and column
+   * indices corresponds to `qubits[j]`
+   * @return The `2^k x 2^k` matrix (for `k` qubits) in row-major order
+   */
+  [[nodiscard]] virtual std::vector<std::complex<dd::fp>>
+  reducedDensityMatrix(const std::vector<qc::Qubit>& qubits) const;
+
+  /**
+   * @brief Write the amplitudes of the final state into a buffer
+   * @details The whole buffer is overwritten, such that the caller may
+   * allocate it, e.g., as a NumPy array, instead of copying a vector returned
+   * by the simulator.
+   * @param amplitudes The buffer of `2^n` amplitudes (for `n` qubits)
+   */
+  virtual void
+  writeStateVector(std::span<std::complex<dd::fp>> amplitudes) const;
+
   [[nodiscard]] std::string getSeed() const {
     return hasFixedSeed ? std::to_string(seed) : "-1";
   }
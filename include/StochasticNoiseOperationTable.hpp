@@ -16,6 +16,8 @@
  * `dd::StochasticNoiseOperationTable` that was removed alongside the
  * density-matrix support. The number of cached operations is provided
  * explicitly instead of being derived from the (removed) noise `OpType`s.
+ * All entries are stored in a single flat array and clearing the table only
+ * advances its generation, which invalidates the entries of the previous one.
  */
 
 #pragma once
@@ -23,7 +25,6 @@
 #include "dd/statistics/TableStatistics.hpp"
 #include "ir/Definitions.hpp"
 
-#include <algorithm>
 #include <cassert>
 #include <cstddef>
 #include <cstdint>
@@ -36,12 +37,18 @@ public:
   StochasticNoiseOperationTable(const std::size_t nv,
                                 const std::size_t numberOfStochasticOperations)
       : nvars(nv), numberOfOperations(numberOfStochasticOperations),
-        table(nv, std::vector<Edge>(numberOfStochasticOperations)) {
-    stats.entrySize = sizeof(Edge);
+        table(nv * numberOfStochasticOperations) {
+    stats.entrySize = sizeof(Entry);
     stats.numBuckets = nv * numberOfStochasticOperations;
   }
 
-  /// Get a reference to the table
+  struct Entry {
+    Edge edge;
+    /// The generation of the table the entry was inserted in
+    std::uint32_t generation;
+  };
+
+  /// Get a reference to the table (the entries of a qubit are contiguous)
   [[nodiscard]] const auto& getTable() const { return table; }
 
   /// Get a reference to the statistics
@@ -49,42 +56,59 @@ public:
 
   void resize(const std::size_t nq) {
     nvars = nq;
-    table.resize(nvars, std::vector<Edge>(numberOfOperations));
+    table.resize(nvars * numberOfOperations);
+    stats.numBuckets = table.size();
   }
 
   void insert(std::uint8_t kind, qc::Qubit target, const Edge& r) {
     // Increase numberOfOperations if this assertion is hit for a valid kind.
     assert(kind < numberOfOperations);
-    table.at(target).at(kind) = r;
-    stats.trackInsert();
+    auto& entry = table.at(index(kind, target));
+    if (entry.generation != generation) {
+      stats.trackInsert();
+    }
+    entry = {r, generation};
   }
 
   Edge* lookup(std::uint8_t kind, qc::Qubit target) {
     // Increase numberOfOperations if this assertion is hit for a valid kind.
     assert(kind < numberOfOperations);
     ++stats.lookups;
-    auto& entry = table.at(target).at(kind);
-    if (entry.w.r == nullptr) {
+    auto& entry = table.at(index(kind, target));
+    if (entry.generation != generation) {
       return nullptr;
     }
     ++stats.hits;
-    return &entry;
+    return &entry.edge;
   }
 
+  /// Invalidate all entries by advancing the generation of the table
   void clear() {
-    if (stats.numEntries > 0) {
-      for (auto& t : table) {
-        std::fill(t.begin(), t.end(), Edge{});
+    if (stats.numEntries == 0) {
+      return;
+    }
+    if (++generation == 0U) {
+      // the generation wrapped around, so old entries might become valid again
+      for (auto& entry : table) {
+        entry.generation = 0U;
       }
-      stats.numEntries = 0;
+      generation = 1U;
     }
+    stats.numEntries = 0;
   }
 
 private:
   std::size_t nvars;
   std::size_t numberOfOperations;
-  std::vector<std::vector<Edge>> table;
+  std::vector<Entry> table;
+  /// Entries of other generations are invalid (new entries have generation 0)
+  std::uint32_t generation = 1U;
   dd::TableStatistics stats{};
+
+  [[nodiscard]] std::size_t index(const std::uint8_t kind,
+                                  const qc::Qubit target) const {
+    return (static_cast<std::size_t>(target) * numberOfOperations) + kind;
+  }
 };
 
 } // namespace dd::ddsim
@@ -13,6 +13,8 @@
 #include "CircuitSimulator.hpp"
 #include "DensityDDPackage.hpp"
 #include "NoiseFunctionality.hpp"
+#include "NoiseModel.hpp"
+#include "dd/DDDefinitions.hpp"
 #include "ir/Definitions.hpp"
 #include "ir/QuantumComputation.hpp"
 
@@ -28,33 +30,54 @@
 
 class StochasticNoiseSimulator final : public CircuitSimulator {
 public:
-  StochasticNoiseSimulator(
-      std::unique_ptr<qc::QuantumComputation>&& qc_,
-      const ApproximationInfo& approximationInfo_,
-      std::string noiseEffects_ = "APD", double noiseProbability_ = 0.001,
-      std::optional<double> ampDampingProbability_ = std::nullopt,
-      double multiQubitGateFactor_ = 2)
+  StochasticNoiseSimulator(std::unique_ptr<qc::QuantumComputation>&& qc_,
+                           const ApproximationInfo& approximationInfo_,
+                           const NoiseModel& noiseModel_,
+                           std::string noiseEffects_ = "APD")
       : CircuitSimulator(
             std::move(qc_), approximationInfo_,
             dd::ddsim::STOCHASTIC_NOISE_SIMULATOR_DD_PACKAGE_CONFIG),
-        noiseProbability(noiseProbability_),
-        amplitudeDampingProb((ampDampingProbability_)
-                                 ? ampDampingProbability_.value()
-                                 : noiseProbability_ * 2),
-        multiQubitGateFactor(multiQubitGateFactor_),
+        noiseModel(noiseModel_),
         maxInstances(std::thread::hardware_concurrency() > 4
                          ? std::thread::hardware_concurrency() - 4
                          : 1),
-        noiseEffects(std::move(noiseEffects_)) {
-    dd::ddsim::sanityCheckOfNoiseProbabilities(
-        noiseProbability, amplitudeDampingProb, multiQubitGateFactor);
-  }
+        noiseEffects(std::move(noiseEffects_)) {}
+
+  StochasticNoiseSimulator(std::unique_ptr<qc::QuantumComputation>&& qc_,
+                           const ApproximationInfo& approximationInfo_,
+                           const std::size_t seed_,
+                           const NoiseModel& noiseModel_,
+                           std::string noiseEffects_ = "APD")
+      : CircuitSimulator(
+            std::move(qc_), approximationInfo_, seed_,
+            dd::ddsim::STOCHASTIC_NOISE_SIMULATOR_DD_PACKAGE_CONFIG),
+        noiseModel(noiseModel_),
+        maxInstances(std::thread::hardware_concurrency() > 4
+                         ? std::thread::hardware_concurrency() - 4
+                         : 1),
+        noiseEffects(std::move(noiseEffects_)) {}
+
+  StochasticNoiseSimulator(
+      std::unique_ptr<qc::QuantumComputation>&& qc_,
+      const ApproximationInfo& approximationInfo_,
+      std::string noiseEffects_ = "APD",
+      double noiseProbability_ = NoiseModel::DEFAULT_NOISE_PROBABILITY,
+      std::optional<double> ampDampingProbability_ = std::nullopt,
+      double multiQubitGateFactor_ =
+          NoiseModel::DEFAULT_MULTI_QUBIT_GATE_FACTOR)
+      : StochasticNoiseSimulator(std::move(qc_), approximationInfo_,
+                                 NoiseModel(noiseProbability_,
+                                            ampDampingProbability_,
+                                            multiQubitGateFactor_),
+                                 std::move(noiseEffects_)) {}
 
   explicit StochasticNoiseSimulator(
       std::unique_ptr<qc::QuantumComputation>&& qc_,
-      std::string noiseEffects_ = "APD", double noiseProbability_ = 0.001,
+      std::string noiseEffects_ = "APD",
+      double noiseProbability_ = NoiseModel::DEFAULT_NOISE_PROBABILITY,
       std::optional<double> ampDampingProbability_ = std::nullopt,
-      double multiQubitGateFactor_ = 2)
+      double multiQubitGateFactor_ =
+          NoiseModel::DEFAULT_MULTI_QUBIT_GATE_FACTOR)
       : StochasticNoiseSimulator(std::move(qc_), {}, std::move(noiseEffects_),
                                  noiseProbability_, ampDampingProbability_,
                                  multiQubitGateFactor_) {}
@@ -62,30 +85,51 @@ public:
   StochasticNoiseSimulator(
       std::unique_ptr<qc::QuantumComputation>&& qc_,
       const ApproximationInfo& approximationInfo_, const std::size_t seed_,
-      std::string noiseEffects_ = "APD", double noiseProbability_ = 0.001,
+      std::string noiseEffects_ = "APD",
+      double noiseProbability_ = NoiseModel::DEFAULT_NOISE_PROBABILITY,
       std::optional<double> ampDampingProbability_ = std::nullopt,
-      double multiQubitGateFactor_ = 2)
-      : CircuitSimulator(
-            std::move(qc_), approximationInfo_, seed_,
-            dd::ddsim::STOCHASTIC_NOISE_SIMULATOR_DD_PACKAGE_CONFIG),
-        noiseProbability(noiseProbability_),
-        amplitudeDampingProb((ampDampingProbability_)
-                                 ? ampDampingProbability_.value()
-                                 : noiseProbability_ * 2),
-        multiQubitGateFactor(multiQubitGateFactor_),
-        maxInstances(std::thread::hardware_concurrency() > 4
-                         ? std::thread::hardware_concurrency() - 4
-                         : 1),
-        noiseEffects(std::move(noiseEffects_)) {
-    dd::ddsim::sanityCheckOfNoiseProbabilities(
-        noiseProbability, amplitudeDampingProb, multiQubitGateFactor);
-  }
+      double multiQubitGateFactor_ =
+          NoiseModel::DEFAULT_MULTI_QUBIT_GATE_FACTOR)
+      : StochasticNoiseSimulator(std::move(qc_), approximationInfo_, seed_,
+                                 NoiseModel(noiseProbability_,
+                                            ampDampingProbability_,
+                                            multiQubitGateFactor_),
+                                 std::move(noiseEffects_)) {}
 
   std::vector<std::map<std::string, size_t>> classicalMeasurementsMaps;
   std::map<std::string, size_t> finalClassicalMeasurementsMap;
 
   std::map<std::string, std::size_t> simulate(std::size_t shots) override;
 
+  /**
+   * @brief Set the number of samples drawn from the final state of every
+   * trajectory
+   * @details Only circuits without measurements are sampled on their final
+   * state. Drawing several (non-collapsing) samples per trajectory amortizes
+   * the cost of simulating the trajectory, so a simulation with the given
+   * number of shots (i.e., trajectories) yields shots * samples outcomes.
+   * Circuits with measurements still yield a single outcome per trajectory.
+   */
+  void setSamplesPerTrajectory(std::size_t samples);
+  [[nodiscard]] std::size_t getSamplesPerTrajectory() const {
+    return samplesPerTrajectory;
+  }
+
+  /**
+   * @brief Estimate expectation values of observables under noise
+   * @details Every stochastic trajectory evaluates the exact expectation value
+   * of each observable on its final state. The values are averaged over all
+   * trajectories.
+   * @param observables The observables given as (Hermitian) circuits acting on
+   * the same number of qubits as the simulated circuit
+   * @param trajectories The number of stochastic trajectories
+   * @return For every observable, the mean over all trajectories and the
+   * standard error of the mean
+   */
+  std::vector<std::pair<dd::fp, dd::fp>>
+  expectationValues(const std::vector<qc::QuantumComputation>& observables,
+                    std::size_t trajectories);
+
   [[nodiscard]] std::size_t getMatrixActiveNodeCount() const override {
     return 0U;
   } // Not available for stochastic simulation
@@ -96,18 +140,26 @@ public:
   std::map<std::string, std::string> additionalStatistics() override;
 
 private:
-  double noiseProbability{};
-  double amplitudeDampingProb{};
-  double multiQubitGateFactor{};
+  NoiseModel noiseModel;
   std::size_t stochasticRuns{};
+  std::size_t samplesPerTrajectory = 1U;
   std::size_t maxInstances{};
 
   std::string noiseEffects;
 
   double stochRunTime{};
 
+  /// Per-thread sums and sums of squares of the observed expectation values
+  std::vector<std::vector<std::pair<dd::fp, dd::fp>>> expectationValueSums;
+
+  void runStochasticTrajectories(
+      std::size_t trajectories,
+      const std::vector<qc::QuantumComputation>& observables);
+
   void runStochSimulationForId(
       std::size_t stochRun, qc::Qubit nQubits,
       std::map<std::string, size_t>& classicalMeasurementsMap,
-      std::uint64_t localSeed);
+      const std::vector<qc::QuantumComputation>& observables,
+      std::vector<std::pair<dd::fp, dd::fp>>& observableSums,
+      bool sampleFinalState, std::uint64_t localSeed);
 };
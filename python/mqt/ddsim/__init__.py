@@ -35,6 +35,7 @@ from .pyddsim import (
     DeterministicNoiseSimulator,
     HybridSimulator,
     HybridSimulatorMode,
+    NoiseModel,
     PathSimulator,
     PathSimulatorConfiguration,
     PathSimulatorMode,
@@ -49,6 +50,7 @@ __all__ = [
     "DeterministicNoiseSimulator",
     "HybridSimulator",
     "HybridSimulatorMode",
+    "NoiseModel",
     "PathSimulator",
     "PathSimulatorConfiguration",
     "PathSimulatorMode",
@@ -17,7 +17,7 @@ from mqt.core import load
 from qiskit.providers import Options
 from qiskit.result.models import ExperimentResult, ExperimentResultData
 
-from mqt.ddsim.pyddsim import DeterministicNoiseSimulator
+from mqt.ddsim.pyddsim import DeterministicNoiseSimulator, NoiseModel
 
 from .experiment_header import DDSIMExperimentHeader
 from .qasm_simulator_backend import QasmSimulatorBackend
@@ -44,30 +44,54 @@ class DeterministicNoiseSimulatorBackend(QasmSimulatorBackend):
             parameter_binds=None,
             simulator_seed=None,
             noise_effects="APD",
-            noise_probability=0.01,
-            amp_damping_probability=0.02,
-            multi_qubit_gate_factor=2,
+            noise_probability=NoiseModel.DEFAULT_NOISE_PROBABILITY,
+            amp_damping_probability=None,
+            multi_qubit_gate_factor=NoiseModel.DEFAULT_MULTI_QUBIT_GATE_FACTOR,
+            noise_model=None,
+            measurement_threshold=None,
+            nthreads=1,
+            layered_noise=False,
         )
 
     def _run_experiment(self, qc: QuantumCircuit, **options: Any) -> ExperimentResult:  # ruff:ignore[no-self-use]
         start_time = time.time()
         noise_effects = cast("str", options.get("noise_effects", "APD"))
-        noise_probability = cast("float", options.get("noise_probability", 0.01))
-        amp_damping_probability = cast("float", options.get("amp_damping_probability", 0.02))
-        multi_qubit_gate_factor = cast("float", options.get("multi_qubit_gate_factor", 2))
+        noise_probability = cast("float", options.get("noise_probability", NoiseModel.DEFAULT_NOISE_PROBABILITY))
+        amp_damping_probability = cast("float | None", options.get("amp_damping_probability"))
+        multi_qubit_gate_factor = cast(
+            "float", options.get("multi_qubit_gate_factor", NoiseModel.DEFAULT_MULTI_QUBIT_GATE_FACTOR)
+        )
+        noise_model = cast("NoiseModel | dict[str, Any] | None", options.get("noise_model"))
+        measurement_threshold = cast("float | None", options.get("measurement_threshold"))
+        nthreads = int(options.get("nthreads", 1))
+        layered_noise = bool(options.get("layered_noise"))
         seed = cast("int", options.get("simulator_seed", -1))
         shots = cast("int", options.get("shots", 1024))
 
         circ = load(qc)
-        sim = DeterministicNoiseSimulator(
-            circ=circ,
-            seed=seed,
-            noise_effects=noise_effects,
-            noise_probability=noise_probability,
-            amp_damping_probability=amp_damping_probability,
-            multi_qubit_gate_factor=multi_qubit_gate_factor,
-        )
-
+        if noise_model is None:
+            sim = DeterministicNoiseSimulator(
+                circ=circ,
+                seed=seed,
+                noise_effects=noise_effects,
+                noise_probability=noise_probability,
+                amp_damping_probability=amp_damping_probability,
+                multi_qubit_gate_factor=multi_qubit_gate_factor,
+            )
+        else:
+            if isinstance(noise_model, dict):
+                noise_model = NoiseModel.from_dict(noise_model)
+            sim = DeterministicNoiseSimulator(
+                circ=circ,
+                noise_model=noise_model,
+                seed=seed,
+                noise_effects=noise_effects,
+            )
+
+        if measurement_threshold is not None:
+            sim.set_measurement_threshold(measurement_threshold)
+        sim.set_number_of_threads(nthreads)
+        sim.set_layered_noise(layered_noise)
         counts = sim.simulate(shots=shots)
         end_time = time.time()
 
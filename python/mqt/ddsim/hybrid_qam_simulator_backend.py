@@ -16,7 +16,6 @@ from typing import TYPE_CHECKING, Any
 if TYPE_CHECKING:
     from qiskit import QuantumCircuit
 
-import numpy as np
 from mqt.core import load
 from qiskit import QiskitError
 from qiskit.providers import Options
@@ -42,7 +41,7 @@ class HybridQasmSimulatorBackend(QasmSimulatorBackend):
     def _add_operations_to_target(target: Target) -> None:
         DDSIMTargetBuilder.add_0q_gates(target)
         DDSIMTargetBuilder.add_1q_gates(target)
-        DDSIMTargetBuilder.add_2q_controlled_gates(target)
+        DDSIMTargetBuilder.add_2q_gates(target)
         DDSIMTargetBuilder.add_barrier(target)
         DDSIMTargetBuilder.add_measure(target)
 
@@ -62,6 +61,13 @@ class HybridQasmSimulatorBackend(QasmSimulatorBackend):
             simulator_seed=None,
             mode="amplitude",
             nthreads=local_hardware_info()["cpus"],
+            memory_budget=None,
+            spill_directory=None,
+            split_qubit=None,
+            cuts=None,
+            max_slice_qubits=None,
+            qubit_relabeling=False,
+            memoize_half_slices=False,
         )
 
     @property
@@ -77,13 +83,6 @@ class HybridQasmSimulatorBackend(QasmSimulatorBackend):
 
         if mode == "amplitude":
             hybrid_mode = HybridSimulatorMode.amplitude
-            max_qubits = 30  # hard-coded 16GiB memory limit
-            algorithm_qubits = qc.num_qubits
-            if algorithm_qubits > max_qubits:
-                msg = "Not enough memory available to simulate the circuit even on a single thread"
-                raise QiskitError(msg)
-            qubit_diff = max_qubits - algorithm_qubits
-            nthreads = int(min(2**qubit_diff, nthreads))
         elif mode == "dd":
             hybrid_mode = HybridSimulatorMode.DD
         else:
@@ -92,6 +91,30 @@ class HybridQasmSimulatorBackend(QasmSimulatorBackend):
 
         circuit = load(qc)
         sim = HybridSimulator(circuit, seed=seed, mode=hybrid_mode, nthreads=nthreads)
+        if hybrid_mode == HybridSimulatorMode.amplitude:
+            # every thread accumulates its own vector of amplitudes
+            vectors = sim.get_amplitude_accumulator_limit(HybridSimulator.get_available_memory())
+            if vectors == 0:
+                msg = "Not enough memory available to simulate the circuit even on a single thread"
+                raise QiskitError(msg)
+            nthreads = min(vectors, nthreads)
+        memory_budget = options.get("memory_budget")
+        if memory_budget is not None:
+            sim.set_memory_budget(int(memory_budget))
+        spill_directory = options.get("spill_directory")
+        if spill_directory is not None:
+            sim.set_spill_directory(spill_directory)
+        split_qubit = options.get("split_qubit")
+        if split_qubit is not None:
+            sim.set_split_qubit(int(split_qubit))
+        cuts = options.get("cuts")
+        if cuts is not None:
+            sim.set_cuts([int(cut) for cut in cuts])
+        max_slice_qubits = options.get("max_slice_qubits")
+        if max_slice_qubits is not None:
+            sim.set_max_slice_qubits(int(max_slice_qubits))
+        sim.set_qubit_relabeling(bool(options.get("qubit_relabeling")))
+        sim.set_half_slice_memoization(bool(options.get("memoize_half_slices")))
 
         shots = options.get("shots", 1024)
         if self._SHOW_STATE_VECTOR and shots > 0:
@@ -102,11 +125,7 @@ class HybridQasmSimulatorBackend(QasmSimulatorBackend):
 
         data = ExperimentResultData(
             counts={hex(int(result, 2)): count for result, count in counts.items()},
-            statevector=None
-            if not self._SHOW_STATE_VECTOR
-            else np.array(sim.get_constructed_dd().get_vector(), copy=False)
-            if sim.get_mode() == HybridSimulatorMode.DD
-            else sim.get_final_amplitudes(),
+            statevector=None if not self._SHOW_STATE_VECTOR else sim.get_final_amplitudes(),
             time_taken=end_time - start_time,
             mode=mode,
             nthreads=nthreads,
@@ -0,0 +1,136 @@
+# Copyright (c) 2023 - 2026 Chair for Design Automation, TUM
+# Copyright (c) 2025 - 2026 Munich Quantum Software Company GmbH
+# All rights reserved.
+#
+# SPDX-License-Identifier: MIT
+#
+# Licensed under the MIT License
+
+"""Sharding of the hybrid Schrodinger-Feynman simulation across processes or machines.
+
+The paths through the cuts of a hybrid simulation are independent of each other.
+A coordinator plans the cuts, splits the paths into contiguous ranges and hands every
+range to a worker, which only needs the circuit, the mode, the cuts and the range.
+The workers return their partial results as bytes, which the coordinator sums up.
+Any :class:`concurrent.futures.Executor` can run the workers, e.g., a local process
+pool or an executor submitting the ranges to other machines.
+"""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import TYPE_CHECKING
+
+from mqt.core.ir import QuantumComputation
+
+from .pyddsim import HybridSimulator, HybridSimulatorMode
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+
+def shard_ranges(num_paths: int, shards: int) -> list[tuple[int, int]]:
+    """Split the paths ``0 <= i < num_paths`` into at most ``shards`` contiguous ranges of similar size.
+
+    Args:
+        num_paths: The number of paths through the cuts.
+        shards: The maximum number of ranges.
+
+    Returns:
+        The ranges as pairs of the first path and one past the last path.
+    """
+    if num_paths < 1 or shards < 1:
+        msg = "The number of paths and shards must be positive."
+        raise ValueError(msg)
+    shards = min(shards, num_paths)
+    size, remainder = divmod(num_paths, shards)
+    ranges = []
+    begin = 0
+    for shard in range(shards):
+        end = begin + size + (1 if shard < remainder else 0)
+        ranges.append((begin, end))
+        begin = end
+    return ranges
+
+
+def simulate_shard(
+    qasm: str,
+    mode: HybridSimulatorMode,
+    cuts: Sequence[int],
+    control_begin: int,
+    control_end: int,
+    nthreads: int = 1,
+) -> bytes:
+    """Simulate a range of the paths through the cuts of a circuit.
+
+    This is the work of a single shard. It only takes arguments that can be pickled,
+    so it can be run in another process or on another machine.
+
+    Args:
+        qasm: The circuit as OpenQASM 3.
+        mode: The mode of the hybrid simulator.
+        cuts: The cuts through the circuit.
+        control_begin: The first path of the range.
+        control_end: One past the last path of the range.
+        nthreads: The number of threads used for the range.
+
+    Returns:
+        The serialized partial result of the range.
+    """
+    sim = HybridSimulator(QuantumComputation.from_qasm_str(qasm), mode=mode, nthreads=nthreads)
+    return sim.simulate_range(cuts, control_begin, control_end)
+
+
+def simulate_sharded(
+    circ: QuantumComputation,
+    shots: int = 0,
+    *,
+    mode: HybridSimulatorMode = HybridSimulatorMode.amplitude,
+    cuts: Sequence[int] | None = None,
+    shards: int | None = None,
+    executor: Executor | None = None,
+    nthreads_per_shard: int = 1,
+    seed: int = -1,
+) -> tuple[HybridSimulator, dict[str, int]]:
+    """Run a hybrid simulation with the paths through the cuts sharded across workers.
+
+    Args:
+        circ: The circuit to simulate.
+        shots: The number of shots to sample from the final state.
+        mode: The mode of the hybrid simulator.
+        cuts: The cuts through the circuit (planned without relabeling the qubits if not given).
+        shards: The number of ranges the paths are split into (the number of CPUs if not given).
+        executor: The executor running the shards (a local process pool if not given).
+        nthreads_per_shard: The number of threads every shard uses.
+        seed: The seed for sampling (random if negative).
+
+    Returns:
+        The simulator holding the final state, e.g., for :meth:`~HybridSimulator.get_final_amplitudes`, and the counts.
+    """
+    sim = HybridSimulator(circ, seed=seed, mode=mode, nthreads=nthreads_per_shard)
+    if cuts is not None:
+        sim.set_cuts(cuts)
+    cuts = sim.plan_cuts()
+    num_paths = 1 << sim.get_number_of_decisions(cuts)
+    ranges = shard_ranges(num_paths, shards if shards is not None else os.cpu_count() or 1)
+
+    qasm = circ.qasm3_str()
+    if executor is None:
+        with ProcessPoolExecutor(max_workers=len(ranges)) as pool:
+            partials = _run_shards(pool, qasm, mode, cuts, ranges, nthreads_per_shard)
+    else:
+        partials = _run_shards(executor, qasm, mode, cuts, ranges, nthreads_per_shard)
+    return sim, sim.combine_partial_results(partials, shots)
+
+
+def _run_shards(
+    executor: Executor,
+    qasm: str,
+    mode: HybridSimulatorMode,
+    cuts: Sequence[int],
+    ranges: Sequence[tuple[int, int]],
+    nthreads: int,
+) -> list[bytes]:
+    futures = [executor.submit(simulate_shard, qasm, mode, cuts, begin, end, nthreads) for begin, end in ranges]
+    return [future.result() for future in futures]
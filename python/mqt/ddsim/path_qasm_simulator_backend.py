@@ -17,7 +17,6 @@ if TYPE_CHECKING:
     from qiskit import QuantumCircuit
 
 
-import numpy as np
 from mqt.core import load
 from qiskit.providers import Options
 from qiskit.result.models import ExperimentResult, ExperimentResultData
@@ -67,6 +66,8 @@ class PathQasmSimulatorBackend(QasmSimulatorBackend):
             alternating_start=None,
             gate_cost=None,
             seed=None,
+            nthreads=None,
+            planning_time=None,
         )
 
     @property
@@ -99,6 +100,14 @@ class PathQasmSimulatorBackend(QasmSimulatorBackend):
         if seed is not None:
             pathsim_configuration.seed = seed
 
+        nthreads = options.get("nthreads")
+        if nthreads is not None:
+            pathsim_configuration.nthreads = nthreads
+
+        planning_time = options.get("planning_time")
+        if planning_time is not None:
+            pathsim_configuration.planning_time = planning_time
+
         circuit = load(qc)
         sim = PathSimulator(circuit, config=pathsim_configuration)
 
@@ -109,7 +118,7 @@ class PathQasmSimulatorBackend(QasmSimulatorBackend):
 
         data = ExperimentResultData(
             counts={hex(int(result, 2)): count for result, count in counts.items()},
-            statevector=None if not self._SHOW_STATE_VECTOR else np.array(sim.get_constructed_dd().get_vector()),
+            statevector=None if not self._SHOW_STATE_VECTOR else sim.get_state_vector(),
             time_taken=end_time - start_time,
             time_setup=setup_time - start_time,
             time_sim=end_time - setup_time,
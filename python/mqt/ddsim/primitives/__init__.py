@@ -11,6 +11,7 @@
 from __future__ import annotations
 
 from .estimator import Estimator
+from .noise_aware_estimator import NoiseAwareEstimator
 from .sampler import Sampler
 
-__all__ = ["Estimator", "Sampler"]
+__all__ = ["Estimator", "NoiseAwareEstimator", "Sampler"]
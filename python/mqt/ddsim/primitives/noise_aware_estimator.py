@@ -0,0 +1,99 @@
+# Copyright (c) 2023 - 2026 Chair for Design Automation, TUM
+# Copyright (c) 2025 - 2026 Munich Quantum Software Company GmbH
+# All rights reserved.
+#
+# SPDX-License-Identifier: MIT
+#
+# Licensed under the MIT License
+
+"""Estimator implementation using DDSIM DeterministicNoiseSimulator."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+from mqt.core import load
+from qiskit.primitives.containers import DataBin, PubResult
+
+from mqt.ddsim.pyddsim import DeterministicNoiseSimulator, NoiseModel
+
+from .estimator import Estimator
+
+if TYPE_CHECKING:
+    from qiskit.circuit import QuantumCircuit
+    from qiskit.primitives.containers.estimator_pub import EstimatorPub
+
+
+class NoiseAwareEstimator(Estimator):
+    """DDSIM implementation of Qiskit's estimator for noisy circuits.
+
+    The expectation values are computed exactly on the density matrix obtained from the
+    `DeterministicNoiseSimulator`, i.e., without sampling. Every circuit is simulated once and all Pauli
+    strings of its observables are evaluated directly on the final density matrix.
+    """
+
+    def __init__(
+        self,
+        *,
+        default_precision: float = 0.0,
+        seed: int = -1,
+        noise_effects: str = "APD",
+        noise_probability: float = NoiseModel.DEFAULT_NOISE_PROBABILITY,
+        amp_damping_probability: float | None = None,
+        multi_qubit_gate_factor: float = NoiseModel.DEFAULT_MULTI_QUBIT_GATE_FACTOR,
+        noise_model: NoiseModel | None = None,
+    ) -> None:
+        """Create a new noise-aware DDSIM estimator.
+
+        Args:
+            default_precision: The default precision for expectation-value estimates. Defaults to `0.0`.
+            seed: The seed for the `DeterministicNoiseSimulator`. Defaults to `-1`.
+            noise_effects: The noise effects to apply. Defaults to `"APD"`.
+            noise_probability: The probability of phase flips and depolarization. Defaults to `0.01`.
+            amp_damping_probability: The probability of amplitude damping. Defaults to twice the noise probability.
+            multi_qubit_gate_factor: The factor applied to the probabilities of multi-qubit gates. Defaults to `2`.
+            noise_model: A per-qubit and per-gate noise model, which takes precedence over the individual
+                probabilities if given.
+        """
+        super().__init__(default_precision=default_precision, seed=seed)
+        self._noise_effects = noise_effects
+        self._noise_probability = noise_probability
+        self._amp_damping_probability = amp_damping_probability
+        self._multi_qubit_gate_factor = multi_qubit_gate_factor
+        self._noise_model = noise_model
+
+    def _run_pub(self, pub: EstimatorPub) -> PubResult:
+        bound_circuits = pub.parameter_values.bind_all(pub.circuit)
+        observables = np.empty(pub.observables.shape, dtype=object)
+        for index in np.ndindex(*pub.observables.shape):
+            observables[index] = pub.observables[index]
+        bc_bound_circuits, bc_observables = np.broadcast_arrays(bound_circuits, observables)
+
+        evs = np.zeros_like(bc_bound_circuits, dtype=np.float64)
+        stds = np.zeros_like(bc_bound_circuits, dtype=np.float64)
+
+        for index in np.ndindex(*bc_bound_circuits.shape):
+            pauli_strings, coeffs = zip(*bc_observables[index].items(), strict=True)
+            expectation_values = self._evaluate(bc_bound_circuits[index], list(pauli_strings))
+            evs[index] = np.real(np.dot(expectation_values, coeffs))
+
+        data = DataBin(evs=evs, stds=stds, shape=evs.shape)
+        return PubResult(data)
+
+    def _evaluate(self, bound_circuit: QuantumCircuit, pauli_strings: list[str]) -> list[float]:
+        qc = load(bound_circuit)
+        if self._noise_model is None:
+            sim = DeterministicNoiseSimulator(
+                qc,
+                seed=self.seed,
+                noise_effects=self._noise_effects,
+                noise_probability=self._noise_probability,
+                amp_damping_probability=self._amp_damping_probability,
+                multi_qubit_gate_factor=self._multi_qubit_gate_factor,
+            )
+        else:
+            sim = DeterministicNoiseSimulator(
+                qc, noise_model=self._noise_model, seed=self.seed, noise_effects=self._noise_effects
+            )
+        return sim.expectation_values(pauli_strings)
@@ -7,11 +7,15 @@
 # Licensed under the MIT License
 
 import enum
-from collections.abc import Sequence
-from typing import Any, overload
+import os
+import pathlib
+from collections.abc import Callable, Sequence
+from typing import Any, ClassVar, overload
 
 import mqt.core.dd
 import mqt.core.ir
+import numpy as np
+import numpy.typing as npt
 
 class CircuitSimulator:
     def __init__(
@@ -49,10 +53,51 @@ class CircuitSimulator:
     def get_constructed_dd(self) -> mqt.core.dd.VectorDD:
         """Get the vector DD resulting from the simulation."""
 
+    def reduced_density_matrix(self, qubits: Sequence[int]) -> npt.NDArray[np.complex128]:
+        """Get the reduced density matrix of the given qubits in the final state, where bit j of the row and column indices corresponds to qubits[j]."""
+
+    def get_state_vector(self, out: npt.NDArray[np.complex128] | None = None) -> npt.NDArray[np.complex128]:
+        """Get the amplitudes of the final state as a NumPy array, which is written directly into `out` if given (a contiguous complex128 array of 2^n entries) instead of allocating a new one."""
+
     def expectation_value(self, observable: mqt.core.ir.QuantumComputation) -> float:
         """Compute the expectation value for the given observable."""
 
+class NoiseModel:
+    DEFAULT_NOISE_PROBABILITY: ClassVar[float]
+    DEFAULT_MULTI_QUBIT_GATE_FACTOR: ClassVar[float]
+
+    def __init__(
+        self,
+        noise_probability: float = 0.01,
+        amp_damping_probability: float | None = None,
+        multi_qubit_gate_factor: float = 2,
+    ) -> None:
+        """Create a noise model with the given global probabilities, where the amplitude damping probability defaults to twice the noise probability."""
+
+    def set_qubit_noise(
+        self, qubit: int, noise_probability: float | None = None, amp_damping_probability: float | None = None
+    ) -> None:
+        """Override the noise and amplitude damping probabilities of a single qubit."""
+
+    def set_qubit_relaxation(self, qubit: int, t1: float, t2: float, gate_time: float) -> None:
+        """Override the probabilities of a single qubit from its relaxation (T1) and dephasing (T2) times and the gate duration."""
+
+    def set_gate_noise(self, gate: str, qubits: Sequence[int], noise_probability: float) -> None:
+        """Set the noise probability of a gate acting on specific qubits (controls before targets)."""
+
+    @staticmethod
+    def from_json(json: str) -> NoiseModel:
+        """Load a noise model from a JSON string."""
+
+    @staticmethod
+    def from_dict(noise_model: dict[str, Any]) -> NoiseModel:
+        """Load a noise model from a JSON-style dictionary."""
+
+    def json(self) -> dict[str, Any]:
+        """Get the noise model as a JSON-style dictionary."""
+
 class StochasticNoiseSimulator:
+    @overload
     def __init__(
         self,
         circ: mqt.core.ir.QuantumComputation,
@@ -62,9 +107,20 @@ class StochasticNoiseSimulator:
         seed: int = -1,
         noise_effects: str = "APD",
         noise_probability: float = 0.01,
-        amp_damping_probability: float | None = 0.02,
+        amp_damping_probability: float | None = None,
         multi_qubit_gate_factor: float = 2,
     ) -> None: ...
+    @overload
+    def __init__(
+        self,
+        circ: mqt.core.ir.QuantumComputation,
+        noise_model: NoiseModel,
+        approximation_step_fidelity: float = 1.0,
+        approximation_steps: int = 1,
+        approximation_strategy: str = "fidelity",
+        seed: int = -1,
+        noise_effects: str = "APD",
+    ) -> None: ...
     def get_number_of_qubits(self) -> int:
         """Get the number of qubits."""
 
@@ -92,7 +148,25 @@ class StochasticNoiseSimulator:
     def get_constructed_dd(self) -> mqt.core.dd.VectorDD:
         """Get the vector DD resulting from the simulation."""
 
+    def reduced_density_matrix(self, qubits: Sequence[int]) -> npt.NDArray[np.complex128]:
+        """Get the reduced density matrix of the given qubits in the final state, where bit j of the row and column indices corresponds to qubits[j]."""
+
+    def get_state_vector(self, out: npt.NDArray[np.complex128] | None = None) -> npt.NDArray[np.complex128]:
+        """Get the amplitudes of the final state as a NumPy array, which is written directly into `out` if given (a contiguous complex128 array of 2^n entries) instead of allocating a new one."""
+
+    def expectation_values(
+        self, observables: Sequence[mqt.core.ir.QuantumComputation], trajectories: int
+    ) -> list[tuple[float, float]]:
+        """Estimate the expectation values of the given observables over the given number of stochastic trajectories. Returns the mean and the standard error for each observable."""
+
+    def get_samples_per_trajectory(self) -> int:
+        """Get the number of samples drawn from the final state of every trajectory of a circuit without measurements."""
+
+    def set_samples_per_trajectory(self, samples: int) -> None:
+        """Set the number of (non-collapsing) samples drawn from the final state of every trajectory of a circuit without measurements, so that simulating the given number of trajectories yields trajectories * samples outcomes."""
+
 class DeterministicNoiseSimulator:
+    @overload
     def __init__(
         self,
         circ: mqt.core.ir.QuantumComputation,
@@ -102,9 +176,20 @@ class DeterministicNoiseSimulator:
         seed: int = -1,
         noise_effects: str = "APD",
         noise_probability: float = 0.01,
-        amp_damping_probability: float | None = 0.02,
+        amp_damping_probability: float | None = None,
         multi_qubit_gate_factor: float = 2,
     ) -> None: ...
+    @overload
+    def __init__(
+        self,
+        circ: mqt.core.ir.QuantumComputation,
+        noise_model: NoiseModel,
+        approximation_step_fidelity: float = 1.0,
+        approximation_steps: int = 1,
+        approximation_strategy: str = "fidelity",
+        seed: int = -1,
+        noise_effects: str = "APD",
+    ) -> None: ...
     def get_number_of_qubits(self) -> int:
         """Get the number of qubits."""
 
@@ -132,6 +217,53 @@ class DeterministicNoiseSimulator:
     def get_constructed_dd(self) -> mqt.core.dd.VectorDD:
         """Get the vector DD resulting from the simulation."""
 
+    def reduced_density_matrix(self, qubits: Sequence[int]) -> npt.NDArray[np.complex128]:
+        """Get the reduced density matrix of the given qubits in the final state, where bit j of the row and column indices corresponds to qubits[j]."""
+
+    def get_state_vector(self, out: npt.NDArray[np.complex128] | None = None) -> npt.NDArray[np.complex128]:
+        """Get the amplitudes of the final state as a NumPy array, which is written directly into `out` if given (a contiguous complex128 array of 2^n entries) instead of allocating a new one."""
+
+    def get_measurement_threshold(self) -> float:
+        """Get the probability below which outcomes are discarded when sampling."""
+
+    def set_measurement_threshold(self, threshold: float) -> None:
+        """Set the probability below which outcomes are discarded when sampling. A threshold of zero samples from the exact distribution."""
+
+    def expectation_values(self, pauli_strings: Sequence[str]) -> list[float]:
+        """Compute the exact expectation values of the given Pauli strings (one of I, X, Y, and Z per qubit, where the last character corresponds to qubit 0) on the final density matrix."""
+
+    def get_number_of_threads(self) -> int:
+        """Get the number of threads used for circuits simulated shot by shot."""
+
+    def set_number_of_threads(self, nthreads: int) -> None:
+        """Set the number of threads used for circuits simulated shot by shot (i.e., with classically controlled operations)."""
+
+    def get_layered_noise(self) -> bool:
+        """Get whether the noise of gates on disjoint qubits is applied in a single pass."""
+
+    def set_layered_noise(self, layered: bool) -> None:
+        """Collect the noise of gates on disjoint qubits and apply it in a single pass per layer of gates (with the same result)."""
+
+    def get_approximation_trace_distance(self) -> float:
+        """Get the maximum trace distance introduced by approximations."""
+
+    def set_approximation_trace_distance(self, budget: float) -> None:
+        """Limit the trace distance introduced by approximations. Every approximation step discarding a probability of epsilon adds at most sqrt(epsilon) to the trace distance."""
+
+    def for_each_probability(self, callback: Callable[[int, float], None], threshold: float = 0.0) -> None:
+        """Call the callback with the index (bit i corresponds to qubit i) and the probability of every basis state of the final state."""
+
+    def get_probabilities(
+        self,
+        indices: npt.NDArray[np.uint64],
+        probabilities: npt.NDArray[np.float64],
+        threshold: float = 0.0,
+    ) -> int:
+        """Write the indices and probabilities of the basis states of the final state into the given (preallocated) arrays and return the number of entries."""
+
+    def get_marginal_probabilities(self, qubits: Sequence[int]) -> npt.NDArray[np.float64]:
+        """Get the exact marginal distribution of the given qubits in the final state, where bit j of the index corresponds to qubits[j]."""
+
 class HybridSimulatorMode(enum.Enum):
     """Enumeration of modes for the :class:`~HybridSimulator`."""
 
@@ -177,11 +309,87 @@ class HybridSimulator:
     def get_constructed_dd(self) -> mqt.core.dd.VectorDD:
         """Get the vector DD resulting from the simulation."""
 
+    def reduced_density_matrix(self, qubits: Sequence[int]) -> npt.NDArray[np.complex128]:
+        """Get the reduced density matrix of the given qubits in the final state, where bit j of the row and column indices corresponds to qubits[j]."""
+
+    def get_state_vector(self, out: npt.NDArray[np.complex128] | None = None) -> npt.NDArray[np.complex128]:
+        """Get the amplitudes of the final state as a NumPy array, which is written directly into `out` if given (a contiguous complex128 array of 2^n entries) instead of allocating a new one."""
+
     def get_mode(self) -> HybridSimulatorMode:
         """Get the mode of the hybrid simulator."""
 
-    def get_final_amplitudes(self) -> list[complex]:
-        """Get the final amplitudes from the hybrid simulation."""
+    def get_final_amplitudes(self) -> npt.NDArray[np.complex128]:
+        """Get the final amplitudes from the hybrid simulation. In the amplitude mode, the read-only array shares the memory of the simulator and keeps the amplitudes of this simulation alive."""
+
+    def set_memory_budget(self, budget: int) -> None:
+        """Set the number of bytes the partial results of the DD mode may occupy before they are spilled to disk (0 uses half of the available memory)."""
+
+    def get_memory_budget(self) -> int:
+        """Get the memory budget for partial results of the DD mode."""
+
+    def set_spill_directory(self, directory: str | os.PathLike[str]) -> None:
+        """Set the directory for spilled partial results (the system's temporary directory if empty)."""
+
+    def get_spill_directory(self) -> pathlib.Path:
+        """Get the directory for spilled partial results."""
+
+    def get_spilled_slices(self) -> int:
+        """Get the number of partial results spilled to disk during the last DD simulation."""
+
+    def set_split_qubit(self, split_qubit: int | None) -> None:
+        """Fix the first qubit of the upper slice instead of choosing the cheapest cut (None chooses the cut automatically)."""
+
+    def get_split_qubit(self) -> int | None:
+        """Get the fixed split qubit, if any."""
+
+    def set_cuts(self, cuts: Sequence[int]) -> None:
+        """Fix the cuts, each being the first qubit of the next slice, instead of planning them (an empty list plans them)."""
+
+    def get_cuts(self) -> list[int]:
+        """Get the fixed cuts, if any."""
+
+    def set_max_slice_qubits(self, qubits: int) -> None:
+        """Let the cut planner add cuts until no slice holds more than the given number of qubits (0 uses a single cut)."""
+
+    def get_max_slice_qubits(self) -> int:
+        """Get the maximum number of qubits per slice for the cut planner."""
+
+    def set_qubit_relabeling(self, enable: bool) -> None:
+        """Let the cut planner relabel the qubits such that strongly interacting qubits end up in the same slice."""
+
+    def get_qubit_relabeling(self) -> bool:
+        """Get whether the cut planner may relabel the qubits."""
+
+    def set_half_slice_memoization(self, enable: bool) -> None:
+        """Simulate the halves of the slices as a tree of decisions, such that slices share the half-slices before their first differing decision."""
+
+    def get_half_slice_memoization(self) -> bool:
+        """Get whether the slices share their half-slices."""
+
+    def set_retain_amplitudes(self, enable: bool) -> None:
+        """Keep the final amplitudes of the amplitude mode after sampling from them instead of freeing them, after which accessing them raises an error."""
+
+    def get_retain_amplitudes(self) -> bool:
+        """Get whether the final amplitudes are kept after sampling."""
+
+    def plan_cuts(self) -> list[int]:
+        """Get the cuts the simulation would use, either the fixed ones or the ones chosen by the cut planner."""
+
+    def get_number_of_decisions(self, cuts: Sequence[int]) -> int:
+        """Get the number of decisions for the given cuts, i.e., the simulation runs through 2^n paths."""
+
+    def simulate_range(self, cuts: Sequence[int], control_begin: int, control_end: int) -> bytes:
+        """Simulate the paths `control_begin <= i < control_end` through the given cuts (without relabeling the qubits) and return their sum as a serialized partial result."""
+
+    def combine_partial_results(self, partials: Sequence[bytes], shots: int) -> dict[str, int]:
+        """Sum up the partial results of disjoint ranges covering all paths into the final state and return the counts sampled from it."""
+
+    @staticmethod
+    def get_available_memory() -> int:
+        """Get the physical memory currently available in bytes (0 if unknown)."""
+
+    def get_amplitude_accumulator_limit(self, available_memory: int) -> int:
+        """Get the number of amplitude vectors, i.e., threads of the amplitude mode, that fit into the given memory in bytes (0 if unknown, which does not limit the number of threads)."""
 
 class PathSimulatorMode(enum.Enum):
     """Enumeration of modes for the :class:`~PathSimulator`."""
@@ -196,6 +404,8 @@ class PathSimulatorMode(enum.Enum):
 
     gate_cost = 4
 
+    optimized = 5
+
 class PathSimulatorConfiguration:
     """Configuration options for the :class:`~.PathSimulator`."""
 
@@ -230,6 +440,18 @@ class PathSimulatorConfiguration:
 
     @seed.setter
     def seed(self, arg: int, /) -> None: ...
+    @property
+    def nthreads(self) -> int:
+        """Number of threads contracting independent parts of the simulation path."""
+
+    @nthreads.setter
+    def nthreads(self, arg: int, /) -> None: ...
+    @property
+    def planning_time(self) -> float:
+        """Time (in seconds) the optimized mode may spend searching for a simulation path."""
+
+    @planning_time.setter
+    def planning_time(self, arg: float, /) -> None: ...
     def json(self) -> dict[str, Any]:
         """Get the configuration as a JSON-style dictionary."""
 
@@ -245,6 +467,8 @@ class PathSimulator:
         starting_point: int = 0,
         gate_cost: Sequence[int] = [],
         seed: int = 0,
+        nthreads: int = 1,
+        planning_time: float = 0.1,
     ) -> None: ...
     def get_number_of_qubits(self) -> int:
         """Get the number of qubits."""
@@ -273,6 +497,12 @@ class PathSimulator:
     def get_constructed_dd(self) -> mqt.core.dd.VectorDD:
         """Get the vector DD resulting from the simulation."""
 
+    def reduced_density_matrix(self, qubits: Sequence[int]) -> npt.NDArray[np.complex128]:
+        """Get the reduced density matrix of the given qubits in the final state, where bit j of the row and column indices corresponds to qubits[j]."""
+
+    def get_state_vector(self, out: npt.NDArray[np.complex128] | None = None) -> npt.NDArray[np.complex128]:
+        """Get the amplitudes of the final state as a NumPy array, which is written directly into `out` if given (a contiguous complex128 array of 2^n entries) instead of allocating a new one."""
+
     def set_simulation_path(self, path: Sequence[tuple[int, int]], assume_correct_order: bool = False) -> None:
         """Set the simulation path.
 
@@ -281,6 +511,15 @@ class PathSimulator:
             assume_correct_order: Whether the provided path is assumed to be in the correct order. Defaults to False.
         """
 
+    def estimate_simulation_path_cost(self) -> float:
+        """Estimate the cost of contracting the current simulation path.
+
+        The estimate is derived from the supports of the gates and is used by the ``optimized`` mode to compare simulation paths.
+
+        Returns:
+            The estimated number of node operations.
+        """
+
 class UnitarySimulatorMode(enum.Enum):
     """Enumeration of modes for the :class:`~UnitarySimulator`."""
 
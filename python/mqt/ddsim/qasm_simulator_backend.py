@@ -14,7 +14,6 @@ import time
 import uuid
 from typing import TYPE_CHECKING, Any, cast
 
-import numpy as np
 from mqt.core import load
 from qiskit import QuantumCircuit
 from qiskit.providers import BackendV2, Options
@@ -208,7 +207,7 @@ class QasmSimulatorBackend(BackendV2):
 
         data = ExperimentResultData(
             counts={hex(int(result, 2)): count for result, count in counts.items()},
-            statevector=None if not self._SHOW_STATE_VECTOR else np.array(sim.get_constructed_dd().get_vector()),
+            statevector=None if not self._SHOW_STATE_VECTOR else sim.get_state_vector(),
             time_taken=end_time - start_time,
         )
 
@@ -17,7 +17,7 @@ from mqt.core import load
 from qiskit.providers import Options
 from qiskit.result.models import ExperimentResult, ExperimentResultData
 
-from mqt.ddsim.pyddsim import StochasticNoiseSimulator
+from mqt.ddsim.pyddsim import NoiseModel, StochasticNoiseSimulator
 
 from .experiment_header import DDSIMExperimentHeader
 from .qasm_simulator_backend import QasmSimulatorBackend
@@ -47,9 +47,10 @@ class StochasticNoiseSimulatorBackend(QasmSimulatorBackend):
             approximation_steps=1,
             approximation_strategy="fidelity",
             noise_effects="APD",
-            noise_probability=0.01,
-            amp_damping_probability=0.02,
-            multi_qubit_gate_factor=2,
+            noise_probability=NoiseModel.DEFAULT_NOISE_PROBABILITY,
+            amp_damping_probability=None,
+            multi_qubit_gate_factor=NoiseModel.DEFAULT_MULTI_QUBIT_GATE_FACTOR,
+            noise_model=None,
         )
 
     def _run_experiment(self, qc: QuantumCircuit, **options: Any) -> ExperimentResult:  # ruff:ignore[no-self-use]
@@ -58,24 +59,40 @@ class StochasticNoiseSimulatorBackend(QasmSimulatorBackend):
         approximation_steps = cast("int", options.get("approximation_steps", 1))
         approximation_strategy = cast("str", options.get("approximation_strategy", "fidelity"))
         noise_effects = cast("str", options.get("noise_effects", "APD"))
-        noise_probability = cast("float", options.get("noise_probability", 0.01))
-        amp_damping_probability = cast("float", options.get("amp_damping_probability", 0.02))
-        multi_qubit_gate_factor = cast("float", options.get("multi_qubit_gate_factor", 2))
+        noise_probability = cast("float", options.get("noise_probability", NoiseModel.DEFAULT_NOISE_PROBABILITY))
+        amp_damping_probability = cast("float | None", options.get("amp_damping_probability"))
+        multi_qubit_gate_factor = cast(
+            "float", options.get("multi_qubit_gate_factor", NoiseModel.DEFAULT_MULTI_QUBIT_GATE_FACTOR)
+        )
+        noise_model = cast("NoiseModel | dict[str, Any] | None", options.get("noise_model"))
         seed = cast("int", options.get("seed_simulator", -1))
         shots = cast("int", options.get("shots", 1024))
 
         circ = load(qc)
-        sim = StochasticNoiseSimulator(
-            circ=circ,
-            approximation_step_fidelity=approximation_step_fidelity,
-            approximation_steps=approximation_steps,
-            approximation_strategy=approximation_strategy,
-            seed=seed,
-            noise_effects=noise_effects,
-            noise_probability=noise_probability,
-            amp_damping_probability=amp_damping_probability,
-            multi_qubit_gate_factor=multi_qubit_gate_factor,
-        )
+        if noise_model is None:
+            sim = StochasticNoiseSimulator(
+                circ=circ,
+                approximation_step_fidelity=approximation_step_fidelity,
+                approximation_steps=approximation_steps,
+                approximation_strategy=approximation_strategy,
+                seed=seed,
+                noise_effects=noise_effects,
+                noise_probability=noise_probability,
+                amp_damping_probability=amp_damping_probability,
+                multi_qubit_gate_factor=multi_qubit_gate_factor,
+            )
+        else:
+            if isinstance(noise_model, dict):
+                noise_model = NoiseModel.from_dict(noise_model)
+            sim = StochasticNoiseSimulator(
+                circ=circ,
+                noise_model=noise_model,
+                approximation_step_fidelity=approximation_step_fidelity,
+                approximation_steps=approximation_steps,
+                approximation_strategy=approximation_strategy,
+                seed=seed,
+                noise_effects=noise_effects,
+            )
 
         counts = sim.simulate(shots=shots)
         end_time = time.time()
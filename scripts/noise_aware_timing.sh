@@ -0,0 +1,36 @@
+#!/usr/bin/env bash
+# Copyright (c) 2023 - 2026 Chair for Design Automation, TUM
+# Copyright (c) 2025 - 2026 Munich Quantum Software Company GmbH
+# All rights reserved.
+#
+# SPDX-License-Identifier: MIT
+#
+# Licensed under the MIT License
+
+# Times the noise-aware simulators on the given OpenQASM files, e.g., to
+# compare them between commits. Reports the trajectory throughput of the
+# stochastic simulator (trajectories per second) and, for the deterministic
+# simulator, the simulation time, the number of garbage collections of the
+# density matrix package that were run, and their mean latency in seconds.
+#
+# Usage: ./noise_aware_timing.sh circuit.qasm [circuit.qasm ...]
+
+BUILD_DIR='/tmp/cmake-build-ddsim-noise-aware'
+SHOTS='1000'
+
+echo "(Re)Building in ${BUILD_DIR} as necessary"
+cmake -DCMAKE_BUILD_TYPE=Release -S .. -B "${BUILD_DIR}" > /dev/null || exit 1
+cmake --build "${BUILD_DIR}" --config Release --target mqt-ddsim-noise_aware > /dev/null || exit 1
+
+echo "Start time: $(date +"%Y-%m-%d %H:%M:%S")"
+for file in "$@"; do
+  echo "Circuit $file"
+  printf "stochastic (trajectories/s):         "
+  "${BUILD_DIR}/apps/mqt-ddsim-noise_aware" --simulate_file "$file" --shots "${SHOTS}" --ps \
+    | jq --raw-output ".statistics.simulation_time | ${SHOTS} / ."
+  printf "deterministic (time, GC runs, GC s): "
+  "${BUILD_DIR}/apps/mqt-ddsim-noise_aware" --simulate_file "$file" --shots "${SHOTS}" --ps --use_density_matrix_simulator \
+    | jq --raw-output '.statistics | [.simulation_time, (.density_tables | fromjson | .garbage_collection
+        | .runs, (if .runs > 0 then .seconds / .runs else 0 end))] | @tsv'
+done
+echo "End time: $(date +"%Y-%m-%d %H:%M:%S")"
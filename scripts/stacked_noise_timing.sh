@@ -0,0 +1,71 @@
+#!/usr/bin/env bash
+# Copyright (c) 2023 - 2026 Chair for Design Automation, TUM
+# Copyright (c) 2025 - 2026 Munich Quantum Software Company GmbH
+# All rights reserved.
+#
+# SPDX-License-Identifier: MIT
+#
+# Licensed under the MIT License
+
+# Times the stochastic noise-aware simulator on generated circuits dominated by
+# two- and three-qubit gates, where the noise of all targets of a gate is
+# stacked into a single operator. Run it at two commits to compare them, once
+# with amplitude damping (decided from the joint probabilities of the targets)
+# and once without it (plain stacking).
+#
+# Usage: ./stacked_noise_timing.sh [qubits ...]
+
+BUILD_DIR='/tmp/cmake-build-ddsim-stacked-noise'
+BENCH_DIR="stacked-noise-$(date "+%F-%H-%M-%S")"
+LAYERS='10'
+SHOTS='100'
+SEED='42'
+
+# Brickwork layers of CX gates, interleaved with CCX and CSWAP gates on
+# overlapping triples of qubits and a layer of Hadamard gates to keep the
+# state in superposition
+generate_circuit() {
+  local qubits="$1"
+  echo 'OPENQASM 2.0;'
+  echo 'include "qelib1.inc";'
+  echo "qreg q[${qubits}];"
+  echo "creg c[${qubits}];"
+  for ((layer = 0; layer < LAYERS; ++layer)); do
+    for ((q = 0; q < qubits; ++q)); do
+      echo "h q[${q}];"
+    done
+    for ((q = layer % 2; q + 1 < qubits; q += 2)); do
+      echo "cx q[${q}], q[$((q + 1))];"
+    done
+    for ((q = layer % 3; q + 2 < qubits; q += 3)); do
+      if ((layer % 2 == 0)); then
+        echo "ccx q[${q}], q[$((q + 1))], q[$((q + 2))];"
+      else
+        echo "cswap q[${q}], q[$((q + 1))], q[$((q + 2))];"
+      fi
+    done
+  done
+  echo 'measure q -> c;'
+}
+
+if [ $# -eq 0 ]; then
+  set -- 6 8 10
+fi
+
+mkdir -p "${BENCH_DIR}"
+echo "(Re)Building in ${BUILD_DIR} as necessary"
+cmake -DCMAKE_BUILD_TYPE=Release -S .. -B "${BUILD_DIR}" > /dev/null || exit 1
+cmake --build "${BUILD_DIR}" --config Release --target mqt-ddsim-noise_aware > /dev/null || exit 1
+
+echo "Start time: $(date +"%Y-%m-%d %H:%M:%S")"
+for qubits in "$@"; do
+  file="${BENCH_DIR}/multi_qubit_gates_${qubits}.qasm"
+  generate_circuit "${qubits}" > "${file}"
+  for effects in APD PD; do
+    printf "%s qubits, noise effects %s: " "${qubits}" "${effects}"
+    "${BUILD_DIR}/apps/mqt-ddsim-noise_aware" --simulate_file "${file}" --shots "${SHOTS}" --seed "${SEED}" \
+      --noise_effects "${effects}" --ps \
+      | jq --raw-output '.statistics.simulation_time'
+  done
+done
+echo "End time: $(date +"%Y-%m-%d %H:%M:%S")"
@@ -152,10 +152,6 @@ CircuitSimulator::singleShot(const bool ignoreNonUnitaries) {
   std::size_t opNum = 0;
   std::map<std::size_t, bool> classicValues;
 
-  const auto approxMod = static_cast<std::size_t>(
-      std::ceil(static_cast<double>(qc->getNops()) /
-                (static_cast<double>(approximationInfo.stepNumber + 1))));
-
   for (auto& op : *qc) {
     if (op->isNonUnitaryOperation() && !op->isIfElseOperation()) {
       if (ignoreNonUnitaries) {
@@ -243,31 +239,40 @@ CircuitSimulator::singleShot(const bool ignoreNonUnitaries) {
         applyOperationToState(op);
       }
 
-      if (approximationInfo.stepNumber > 0 &&
-          approximationInfo.stepFidelity < 1.0) {
-        if (approximationInfo.strategy == ApproximationInfo::FidelityDriven &&
-            (opNum + 1) % approxMod == 0 &&
-            approximationRuns < approximationInfo.stepNumber) {
-          [[maybe_unused]] const auto sizeBefore = rootEdge.size();
-          const auto apFid = approximateByFidelity(
-              approximationInfo.stepFidelity, false, true);
-          approximationRuns++;
-          finalFidelity *= static_cast<long double>(apFid);
-        } else if (approximationInfo.strategy ==
-                   ApproximationInfo::MemoryDriven) {
-          [[maybe_unused]] const auto sizeBefore = rootEdge.size();
-          if (dd->template getUniqueTable<dd::vNode>()
-                  .possiblyNeedsCollection()) {
-            const auto apFid = approximateByFidelity(
-                approximationInfo.stepFidelity, false, true);
-            approximationRuns++;
-            finalFidelity *= static_cast<long double>(apFid);
-          }
-        }
-      }
+      approximateAfterOperation(opNum);
       dd->garbageCollect();
     }
     opNum++;
   }
   return classicValues;
 }
+
+void CircuitSimulator::approximateAfterOperation(const std::size_t opNum) {
+  if (approximationInfo.stepNumber == 0 ||
+      approximationInfo.stepFidelity >= 1.0) {
+    return;
+  }
+  const auto approxMod = static_cast<std::size_t>(
+      std::ceil(static_cast<double>(qc->getNops()) /
+                (static_cast<double>(approximationInfo.stepNumber + 1))));
+  if (approximationInfo.strategy == ApproximationInfo::FidelityDriven &&
+      (opNum + 1) % approxMod == 0 &&
+      approximationRuns < approximationInfo.stepNumber) {
+    const auto apFid = approximateState(approximationInfo.stepFidelity);
+    approximationRuns++;
+    finalFidelity *= static_cast<long double>(apFid);
+  } else if (approximationInfo.strategy == ApproximationInfo::MemoryDriven &&
+             stateMemoryExhausted()) {
+    const auto apFid = approximateState(approximationInfo.stepFidelity);
+    approximationRuns++;
+    finalFidelity *= static_cast<long double>(apFid);
+  }
+}
+
+double CircuitSimulator::approximateState(const double targetFidelity) {
+  return approximateByFidelity(targetFidelity, false, true);
+}
+
+bool CircuitSimulator::stateMemoryExhausted() const {
+  return dd->template getUniqueTable<dd::vNode>().possiblyNeedsCollection();
+}
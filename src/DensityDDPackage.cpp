@@ -18,15 +18,65 @@
 #include "dd/GateMatrixDefinitions.hpp"
 #include "dd/Node.hpp"
 #include "dd/Package.hpp"
+#include "dd/statistics/UniqueTableStatistics.hpp"
 
 #include <algorithm>
 #include <array>
+#include <bit>
+#include <chrono>
+#include <complex>
 #include <cstddef>
+#include <functional>
+#include <limits>
+#include <map>
+#include <nlohmann/json.hpp>
 #include <random>
+#include <stdexcept>
+#include <string>
+#include <unordered_map>
+#include <unordered_set>
+#include <utility>
 #include <vector>
 
 namespace dd::ddsim {
 
+DensityDDPackageConfig
+DensityDDPackageConfig::autoSized(const std::size_t nqubits,
+                                  const std::size_t memoryBudget) {
+  static constexpr std::size_t MIN_NUM_BUCKETS = 256U;
+  // a density matrix on n qubits has at most (4^n - 1) / 3 non-terminal nodes
+  const auto maxNodes = 2 * nqubits < std::numeric_limits<std::size_t>::digits
+                            ? ((std::size_t{1} << (2 * nqubits)) - 1) / 3
+                            : std::numeric_limits<std::size_t>::max();
+  const auto initial = [maxNodes](const std::size_t defaultBuckets) {
+    if (maxNodes >= defaultBuckets) {
+      return defaultBuckets;
+    }
+    return std::max(MIN_NUM_BUCKETS, std::bit_ceil(maxNodes));
+  };
+  const auto limit = [](const std::size_t bytes, const std::size_t entrySize) {
+    return std::bit_floor(std::max(bytes / entrySize, std::size_t{1}));
+  };
+
+  DensityDDPackageConfig config{};
+  config.utDmNumBucket = initial(config.utDmNumBucket);
+  config.ctDmDmMultNumBucket = initial(config.ctDmDmMultNumBucket);
+  config.ctDmAddNumBucket = initial(config.ctDmAddNumBucket);
+  config.ctDmTraceNumBucket = initial(config.ctDmTraceNumBucket);
+  config.ctDmNoiseNumBucket = initial(config.ctDmNoiseNumBucket);
+
+  // the unique table holds one bucket per level, the (largest) entries of the
+  // add, multiplication, and noise compute tables share the rest
+  config.utDmMaxNumBucket =
+      limit(memoryBudget / 4 / std::max(nqubits, std::size_t{1}),
+            sizeof(dd::NodeBase*));
+  config.ctDmMaxNumBucket = limit(
+      memoryBudget / 4,
+      sizeof(
+          DensityComputeTable<dCachedEdge, dCachedEdge, dCachedEdge>::Entry));
+  return config;
+}
+
 ///-----------------------------------------------------------------------------
 ///                          \n Node creation \n
 ///-----------------------------------------------------------------------------
@@ -368,6 +418,464 @@ dCachedEdge DensityDDPackage::trace(const dEdge& a,
   return r;
 }
 
+dEdge DensityDDPackage::partialTrace(const dEdge& e,
+                                     const std::size_t numQubits) {
+  auto aligned = e;
+  dEdge::alignDensityEdge(aligned);
+  if (aligned.isTerminal()) {
+    return aligned;
+  }
+  const auto level =
+      std::max(static_cast<std::size_t>(aligned.p->v) + 1U, numQubits);
+  std::unordered_map<const dNode*, dCachedEdge> memo{};
+  const auto r = partialTrace(aligned, level, numQubits, memo);
+  return dEdge{.p = r.p, .w = pkg->cn.lookup(r.w)};
+}
+
+dCachedEdge DensityDDPackage::partialTrace(
+    const dEdge& a, const std::size_t level, const std::size_t numQubits,
+    std::unordered_map<const dNode*, dCachedEdge>& memo) {
+  const auto aWeight = static_cast<dd::ComplexValue>(a.w);
+  if (level <= numQubits || aWeight.exactlyZero()) {
+    return {a.p, aWeight};
+  }
+
+  const auto nextLevel = static_cast<dd::Qubit>(level - 1U);
+  if (a.isTerminal() || a.p->v < nextLevel) {
+    // the qubit is not represented, i.e., its part is the identity of trace 2
+    auto r = partialTrace(a, level - 1U, numQubits, memo);
+    r.w = r.w * 2.;
+    return r;
+  }
+
+  if (const auto it = memo.find(a.p); it != memo.end()) {
+    return {it->second.p, it->second.w * aWeight};
+  }
+  auto r = add2(partialTrace(a.p->e[0], level - 1U, numQubits, memo),
+                partialTrace(a.p->e[3], level - 1U, numQubits, memo),
+                static_cast<dd::Qubit>(numQubits - 1U));
+  memo.emplace(a.p, r);
+  r.w = r.w * aWeight;
+  return r;
+}
+
+std::vector<std::complex<dd::fp>>
+DensityDDPackage::reducedDensityMatrix(const dEdge& e,
+                                       const std::size_t numQubits,
+                                       const std::vector<qc::Qubit>& qubits) {
+  auto aligned = e;
+  dEdge::alignDensityEdge(aligned);
+  auto levels = numQubits;
+  if (!aligned.isTerminal()) {
+    levels = std::max(levels, static_cast<std::size_t>(aligned.p->v) + 1U);
+  }
+  std::vector<bool> keep(levels, false);
+  for (const auto qubit : qubits) {
+    if (qubit >= numQubits) {
+      throw std::invalid_argument("Qubit " + std::to_string(qubit) +
+                                  " is out of range.");
+    }
+    if (keep[qubit]) {
+      throw std::invalid_argument("Qubit " + std::to_string(qubit) +
+                                  " is given more than once.");
+    }
+    keep[qubit] = true;
+  }
+
+  std::unordered_map<const dNode*, std::vector<std::complex<dd::fp>>> memo{};
+  const auto sorted = reducedDensityMatrix(e, levels, keep, memo);
+
+  // bit r of the sorted indices is the r-th kept qubit in ascending order
+  std::vector<std::size_t> bitPosition;
+  for (std::size_t q = 0; q < numQubits; ++q) {
+    if (keep[q]) {
+      bitPosition.emplace_back(static_cast<std::size_t>(
+          std::ranges::find(qubits, q) - qubits.begin()));
+    }
+  }
+  const auto toIndex = [&bitPosition](const std::size_t i) {
+    std::size_t index = 0;
+    for (std::size_t r = 0; r < bitPosition.size(); ++r) {
+      index |= ((i >> r) & 1U) << bitPosition[r];
+    }
+    return index;
+  };
+  const auto dim = std::size_t{1} << qubits.size();
+  std::vector<std::complex<dd::fp>> result(dim * dim);
+  for (std::size_t r = 0; r < dim; ++r) {
+    for (std::size_t c = 0; c < dim; ++c) {
+      result[(toIndex(r) * dim) + toIndex(c)] = sorted[(r * dim) + c];
+    }
+  }
+  return result;
+}
+
+std::vector<std::complex<dd::fp>> DensityDDPackage::reducedDensityMatrix(
+    dEdge e, const std::size_t level, const std::vector<bool>& keep,
+    std::unordered_map<const dNode*, std::vector<std::complex<dd::fp>>>& memo) {
+  const auto kept = static_cast<std::size_t>(std::count(
+      keep.begin(), keep.begin() + static_cast<std::ptrdiff_t>(level), true));
+  const auto dim = std::size_t{1} << kept;
+  if (e.w.exactlyZero()) {
+    return std::vector<std::complex<dd::fp>>(dim * dim);
+  }
+  const auto weight = static_cast<std::complex<dd::fp>>(e.w);
+  if (level == 0) {
+    return {weight};
+  }
+  const auto nextLevel = level - 1U;
+  // the kept qubit at this level is the highest bit of the indices
+  const auto half = dim / 2;
+  const auto place = [dim, half](std::vector<std::complex<dd::fp>>& result,
+                                 const std::vector<std::complex<dd::fp>>& block,
+                                 const std::size_t row,
+                                 const std::size_t column) {
+    for (std::size_t r = 0; r < half; ++r) {
+      std::copy_n(block.begin() + static_cast<std::ptrdiff_t>(r * half), half,
+                  result.begin() +
+                      static_cast<std::ptrdiff_t>(((row * half) + r) * dim +
+                                                  (column * half)));
+    }
+  };
+
+  auto aligned = e;
+  dEdge::alignDensityEdge(aligned);
+  if (aligned.isTerminal() ||
+      static_cast<std::size_t>(aligned.p->v) < nextLevel) {
+    // the qubit is not represented, i.e., its part is the identity
+    auto block = reducedDensityMatrix(e, nextLevel, keep, memo);
+    if (!keep[nextLevel]) {
+      for (auto& entry : block) {
+        entry *= 2;
+      }
+      return block;
+    }
+    std::vector<std::complex<dd::fp>> result(dim * dim);
+    place(result, block, 0, 0);
+    place(result, block, 1, 1);
+    return result;
+  }
+
+  // the temporary flags determine how the node is interpreted
+  const auto* key = e.p;
+  auto it = memo.find(key);
+  if (it == memo.end()) {
+    dNode::applyDmChangesToNode(e.p);
+    const auto& edges = e.p->e;
+    std::vector<std::complex<dd::fp>> result(dim * dim);
+    if (keep[nextLevel]) {
+      for (std::size_t i = 0; i < edges.size(); ++i) {
+        place(result, reducedDensityMatrix(edges[i], nextLevel, keep, memo),
+              i / dd::RADIX, i % dd::RADIX);
+      }
+    } else {
+      result = reducedDensityMatrix(edges[0], nextLevel, keep, memo);
+      const auto block = reducedDensityMatrix(edges[3], nextLevel, keep, memo);
+      std::transform(result.begin(), result.end(), block.begin(),
+                     result.begin(), std::plus<>{});
+    }
+    dNode::revertDmChangesToNode(e.p);
+    it = memo.emplace(key, std::move(result)).first;
+  }
+
+  auto result = it->second;
+  for (auto& entry : result) {
+    entry *= weight;
+  }
+  return result;
+}
+
+dd::fp DensityDDPackage::expectationValue(const dEdge& e,
+                                          const std::string& pauli) {
+  if (const auto pos = pauli.find_first_not_of("IXYZ");
+      pos != std::string::npos) {
+    throw std::invalid_argument("Invalid Pauli operator '" +
+                                std::string{pauli[pos]} + "'.");
+  }
+  auto aligned = e;
+  dEdge::alignDensityEdge(aligned);
+  if (!aligned.isTerminal() &&
+      static_cast<std::size_t>(aligned.p->v) >= pauli.size()) {
+    throw std::invalid_argument(
+        "The Pauli string acts on fewer qubits than the density matrix.");
+  }
+  std::unordered_map<const dNode*, std::complex<dd::fp>> memo{};
+  return pauliTrace(e, pauli.size(), pauli, memo).real();
+}
+
+std::complex<dd::fp> DensityDDPackage::pauliTrace(
+    dEdge e, const std::size_t level, const std::string& pauli,
+    std::unordered_map<const dNode*, std::complex<dd::fp>>& memo) {
+  if (e.w.exactlyZero()) {
+    return 0;
+  }
+  const auto weight = static_cast<std::complex<dd::fp>>(e.w);
+  if (level == 0) {
+    return weight;
+  }
+  const auto op = pauli[pauli.size() - level];
+  auto aligned = e;
+  dEdge::alignDensityEdge(aligned);
+  if (aligned.isTerminal() ||
+      aligned.p->v < static_cast<dd::Qubit>(level - 1U)) {
+    // the qubit is not represented, i.e., its part of the matrix is the
+    // identity, which is traceless when multiplied with X, Y, or Z
+    if (op != 'I') {
+      return 0;
+    }
+    return 2. * pauliTrace(e, level - 1U, pauli, memo);
+  }
+
+  // the temporary flags determine how the node is interpreted
+  const auto* key = e.p;
+  if (const auto it = memo.find(key); it != memo.end()) {
+    return weight * it->second;
+  }
+  dNode::applyDmChangesToNode(e.p);
+  const auto& edges = e.p->e;
+  const auto block = [&](const std::size_t i) {
+    return pauliTrace(edges[i], level - 1U, pauli, memo);
+  };
+  // tr(rho (P x Q)) = sum_ij P_ji tr(rho_ij Q)
+  std::complex<dd::fp> r{};
+  switch (op) {
+  case 'X':
+    r = block(1) + block(2);
+    break;
+  case 'Y':
+    r = std::complex<dd::fp>{0, 1} * (block(1) - block(2));
+    break;
+  case 'Z':
+    r = block(0) - block(3);
+    break;
+  default:
+    r = block(0) + block(3);
+    break;
+  }
+  dNode::revertDmChangesToNode(e.p);
+  memo.emplace(key, r);
+  return weight * r;
+}
+
+dd::fp DensityDDPackage::expectationValue(const dEdge& e,
+                                          const dd::mEdge& observable,
+                                          const std::size_t numQubits) {
+  if (e.w.exactlyZero() || observable.w.exactlyZero()) {
+    return 0;
+  }
+  auto aligned = e;
+  dEdge::alignDensityEdge(aligned);
+  auto levels = numQubits;
+  if (!aligned.isTerminal()) {
+    levels = std::max(levels, static_cast<std::size_t>(aligned.p->v) + 1U);
+  }
+  if (!observable.isTerminal()) {
+    levels = std::max(levels, static_cast<std::size_t>(observable.p->v) + 1U);
+  }
+  std::map<std::pair<const dNode*, const dd::mNode*>, std::complex<dd::fp>>
+      memo{};
+  const auto weight = static_cast<std::complex<dd::fp>>(e.w) *
+                      static_cast<std::complex<dd::fp>>(observable.w);
+  return (weight * traceOfProduct(e.p, observable.p, levels, memo)).real();
+}
+
+std::complex<dd::fp> DensityDDPackage::traceOfProduct(
+    dNode* a, const dd::mNode* b, const std::size_t level,
+    std::map<std::pair<const dNode*, const dd::mNode*>, std::complex<dd::fp>>&
+        memo) {
+  if (level == 0) {
+    return 1;
+  }
+  const auto nextLevel = static_cast<dd::Qubit>(level - 1U);
+  auto* alignedA = a;
+  dNode::alignDensityNode(alignedA);
+  const auto skipA = dNode::isTerminal(alignedA) || alignedA->v < nextLevel;
+  const auto skipB = dd::mNode::isTerminal(b) || b->v < nextLevel;
+  if (skipA && skipB) {
+    // both matrices act as the identity on this qubit
+    return 2. * traceOfProduct(a, b, level - 1U, memo);
+  }
+  const auto key = std::pair<const dNode*, const dd::mNode*>{a, b};
+  if (const auto it = memo.find(key); it != memo.end()) {
+    return it->second;
+  }
+
+  if (!skipA) {
+    dNode::applyDmChangesToNode(a);
+  }
+  // tr(A B) = sum_ij tr(A_ij B_ji)
+  std::complex<dd::fp> r{};
+  for (const auto i : {0U, 1U}) {
+    for (const auto j : {0U, 1U}) {
+      auto* blockA = a;
+      auto weightA = std::complex<dd::fp>{i == j ? 1. : 0.};
+      if (!skipA) {
+        const auto& edge = a->e[(2U * i) + j];
+        blockA = edge.p;
+        weightA = edge.w.exactlyZero()
+                      ? 0.
+                      : static_cast<std::complex<dd::fp>>(edge.w);
+      }
+      const auto* blockB = b;
+      auto weightB = std::complex<dd::fp>{i == j ? 1. : 0.};
+      if (!skipB) {
+        const auto& edge = b->e[(2U * j) + i];
+        blockB = edge.p;
+        weightB = edge.w.exactlyZero()
+                      ? 0.
+                      : static_cast<std::complex<dd::fp>>(edge.w);
+      }
+      if (weightA != 0. && weightB != 0.) {
+        r += weightA * weightB *
+             traceOfProduct(blockA, blockB, level - 1U, memo);
+      }
+    }
+  }
+  if (!skipA) {
+    dNode::revertDmChangesToNode(a);
+  }
+  memo.emplace(key, r);
+  return r;
+}
+
+dd::fp DensityDDPackage::approximate(dEdge& e, const std::size_t numQubits,
+                                     const dd::fp maxDiscardedProbability) {
+  auto aligned = e;
+  dEdge::alignDensityEdge(aligned);
+  if (aligned.isTerminal() || maxDiscardedProbability <= 0) {
+    return 0;
+  }
+  const auto levels =
+      std::max(static_cast<std::size_t>(aligned.p->v) + 1U, numQubits);
+  const auto weight = [](const dEdge& edge) {
+    return static_cast<std::complex<dd::fp>>(edge.w).real();
+  };
+  // the factor of the levels skipped between a node and its successor
+  const auto skipped = [](const std::size_t level, const dEdge& successor) {
+    const auto successorLevel =
+        successor.isTerminal() ? 0U
+                               : static_cast<std::size_t>(successor.p->v) + 1U;
+    return static_cast<dd::fp>(1ULL << (level - 1U - successorLevel));
+  };
+
+  // collect the nodes on the diagonal by level, from the bottom up
+  std::vector<std::vector<const dNode*>> nodes(levels);
+  std::unordered_map<const dNode*, dd::fp> traces{};
+  const auto collect = [&](const auto& self, const dNode* p) -> dd::fp {
+    if (dNode::isTerminal(p)) {
+      return 1;
+    }
+    if (const auto it = traces.find(p); it != traces.end()) {
+      return it->second;
+    }
+    dd::fp trace = 0;
+    for (const auto i : {0U, 3U}) {
+      const auto& successor = p->e[i];
+      if (!successor.w.exactlyZero()) {
+        trace += weight(successor) *
+                 skipped(static_cast<std::size_t>(p->v) + 1U, successor) *
+                 self(self, successor.p);
+      }
+    }
+    nodes[static_cast<std::size_t>(p->v)].emplace_back(p);
+    traces.emplace(p, trace);
+    return trace;
+  };
+  const auto total = weight(aligned) * skipped(levels + 1U, aligned) *
+                     collect(collect, aligned.p);
+  if (total <= 0) {
+    return 0;
+  }
+
+  // the probability mass passing through every node, from the top down
+  std::unordered_map<const dNode*, dd::fp> upstream{};
+  upstream[aligned.p] = weight(aligned) * skipped(levels + 1U, aligned);
+  std::unordered_set<const dNode*> removed{};
+  dd::fp discarded = 0;
+  for (auto level = levels; level-- > 0;) {
+    std::vector<std::pair<dd::fp, const dNode*>> masses{};
+    masses.reserve(nodes[level].size());
+    for (const auto* p : nodes[level]) {
+      const auto u = upstream[p];
+      masses.emplace_back(u * traces[p], p);
+      for (const auto i : {0U, 3U}) {
+        const auto& successor = p->e[i];
+        if (!successor.w.exactlyZero() && !successor.isTerminal()) {
+          upstream[successor.p] +=
+              u * weight(successor) * skipped(level + 1U, successor);
+        }
+      }
+    }
+    std::ranges::sort(
+        masses, [](const auto& a, const auto& b) { return a.first < b.first; });
+    std::vector<const dNode*> candidates{};
+    dd::fp sum = 0;
+    for (const auto& [mass, p] : masses) {
+      if (sum + mass >= maxDiscardedProbability * total) {
+        break;
+      }
+      sum += mass;
+      candidates.emplace_back(p);
+    }
+    if (candidates.size() > removed.size()) {
+      removed = {candidates.begin(), candidates.end()};
+      discarded = sum;
+    }
+  }
+  if (removed.empty()) {
+    return 0;
+  }
+
+  std::unordered_map<const dNode*, dd::mEdge> memo{};
+  const auto projector = diagonalProjector(aligned, levels, removed, memo);
+
+  dEdge::setDensityMatrixTrue(aligned);
+  const auto tmp =
+      multiply(aligned, dd::ddsim::densityFromMatrixEdge(projector), false);
+  auto projected =
+      multiply(dd::ddsim::densityFromMatrixEdge(projector), tmp, true);
+  // renormalize to the original trace
+  projected.w = pkg->cn.lookup(projected.w / (1 - (discarded / total)));
+  incRef(projected);
+  dEdge::alignDensityEdge(e);
+  decRef(e);
+  e = projected;
+  dEdge::setDensityMatrixTrue(e);
+  return discarded / total;
+}
+
+dd::mEdge DensityDDPackage::diagonalProjector(
+    const dEdge& a, const std::size_t level,
+    const std::unordered_set<const dNode*>& removed,
+    std::unordered_map<const dNode*, dd::mEdge>& memo) {
+  if (level == 0) {
+    return dd::mEdge::one();
+  }
+  const auto nextLevel = static_cast<dd::Qubit>(level - 1U);
+  if (a.isTerminal() || a.p->v < nextLevel) {
+    // the qubit is not represented, i.e., both of its states remain
+    const auto r = diagonalProjector(a, level - 1U, removed, memo);
+    return pkg->makeDDNode(
+        nextLevel, std::array{r, dd::mEdge::zero(), dd::mEdge::zero(), r});
+  }
+  if (removed.contains(a.p)) {
+    return dd::mEdge::zero();
+  }
+  if (const auto it = memo.find(a.p); it != memo.end()) {
+    return it->second;
+  }
+  std::array edges{dd::mEdge::zero(), dd::mEdge::zero(), dd::mEdge::zero(),
+                   dd::mEdge::zero()};
+  for (const auto i : {0U, 3U}) {
+    if (!a.p->e[i].w.exactlyZero()) {
+      edges[i] = diagonalProjector(a.p->e[i], level - 1U, removed, memo);
+    }
+  }
+  const auto r = pkg->makeDDNode(nextLevel, edges);
+  memo.emplace(a.p, r);
+  return r;
+}
+
 ///-----------------------------------------------------------------------------
 ///                     \n High-level operations \n
 ///-----------------------------------------------------------------------------
@@ -384,8 +892,15 @@ dEdge DensityDDPackage::makeZeroDensityOperator(const std::size_t n) {
 
 dEdge DensityDDPackage::applyOperationToDensity(dEdge& e,
                                                 const dd::mEdge& operation) {
-  const auto tmp0 = pkg->conjugateTranspose(operation);
-  const auto tmp1 = multiply(e, dd::ddsim::densityFromMatrixEdge(tmp0), false);
+  return applyOperationToDensity(e, operation,
+                                 pkg->conjugateTranspose(operation));
+}
+
+dEdge DensityDDPackage::applyOperationToDensity(dEdge& e,
+                                                const dd::mEdge& operation,
+                                                const dd::mEdge& adjoint) {
+  const auto tmp1 =
+      multiply(e, dd::ddsim::densityFromMatrixEdge(adjoint), false);
   const auto tmp2 =
       multiply(dd::ddsim::densityFromMatrixEdge(operation), tmp1, true);
   incRef(tmp2);
@@ -422,7 +937,8 @@ char DensityDDPackage::measureOneCollapsing(dEdge& e, const dd::Qubit index,
   }
 
   dEdge::alignDensityEdge(e);
-  tmp2.w = pkg->cn.lookup(e.w / densityMatrixTrace); // Normalize density matrix
+  tmp2.w =
+      pkg->cn.lookup(tmp2.w / densityMatrixTrace); // Normalize density matrix
   incRef(tmp2);
   decRef(e);
   e = tmp2;
@@ -460,6 +976,7 @@ bool DensityDDPackage::garbageCollect(const bool force) {
   if (!force && !dUniqueTable.possiblyNeedsCollection()) {
     return false;
   }
+  const auto start = std::chrono::steady_clock::now();
   for (const auto& edge : dRoots) {
     edge.first.mark();
   }
@@ -471,10 +988,39 @@ bool DensityDDPackage::garbageCollect(const bool force) {
     densityAdd.clear();
     densityDensityMultiplication.clear();
     densityTrace.clear();
+    densityNoise.clear();
   }
+  ++gcRuns;
+  gcSeconds +=
+      std::chrono::duration<double>(std::chrono::steady_clock::now() - start)
+          .count();
   return collected;
 }
 
+nlohmann::json DensityDDPackage::getStatistics() const {
+  dd::UniqueTableStatistics uniqueTable{};
+  for (const auto& stat : dUniqueTable.getStats()) {
+    uniqueTable.entrySize = stat.entrySize;
+    uniqueTable.numBuckets += stat.numBuckets;
+    uniqueTable.numEntries += stat.numEntries;
+    uniqueTable.peakNumEntries += stat.peakNumEntries;
+    uniqueTable.collisions += stat.collisions;
+    uniqueTable.hits += stat.hits;
+    uniqueTable.lookups += stat.lookups;
+    uniqueTable.inserts += stat.inserts;
+    uniqueTable.gcRuns = std::max(uniqueTable.gcRuns, stat.gcRuns);
+  }
+
+  nlohmann::json j{};
+  j["unique_table"] = uniqueTable.json();
+  j["add_table"] = densityAdd.getStats().json();
+  j["multiplication_table"] = densityDensityMultiplication.getStats().json();
+  j["trace_table"] = densityTrace.getStats().json();
+  j["noise_table"] = densityNoise.getStats().json();
+  j["garbage_collection"] = {{"runs", gcRuns}, {"seconds", gcSeconds}};
+  return j;
+}
+
 std::size_t DensityDDPackage::computeActiveNodeCount() const {
   for (const auto& edge : dRoots) {
     edge.first.mark();
@@ -26,8 +26,12 @@
 #include <cstdint>
 #include <functional>
 #include <optional>
+#include <stdexcept>
+#include <string>
+#include <unordered_map>
 #include <unordered_set>
 #include <utility>
+#include <vector>
 
 namespace dd::ddsim {
 
@@ -255,6 +259,137 @@ auto dEdge::getSparseProbabilityVectorStrKeys(const std::size_t numQubits,
   return probabilities;
 }
 
+auto dEdge::getSparseProbabilityVector(const std::size_t numQubits,
+                                       const dd::fp threshold) const
+    -> dd::SparsePVec {
+  if (numQubits == 0U) {
+    return {{0, static_cast<std::complex<dd::fp>>(w).real()}};
+  }
+
+  auto e = *this;
+  dEdge::alignDensityEdge(e);
+
+  auto probabilities = dd::SparsePVec{};
+  e.traverseDiagonal(
+      1, 0,
+      [&probabilities](const std::size_t i, const dd::fp& prob) {
+        probabilities[i] = prob;
+      },
+      numQubits, threshold);
+  return probabilities;
+}
+
+void dEdge::forEachProbability(const dd::ProbabilityFunc& f,
+                               const std::size_t numQubits,
+                               const dd::fp threshold) const {
+  if (numQubits == 0U) {
+    f(0, static_cast<std::complex<dd::fp>>(w).real());
+    return;
+  }
+
+  auto e = *this;
+  dEdge::alignDensityEdge(e);
+  e.traverseDiagonal(1, 0, f, numQubits, threshold);
+}
+
+auto dEdge::getMarginalProbabilities(
+    const std::size_t numQubits, const std::vector<std::size_t>& qubits) const
+    -> std::vector<dd::fp> {
+  std::vector<bool> keep(numQubits, false);
+  for (const auto qubit : qubits) {
+    if (qubit >= numQubits) {
+      throw std::invalid_argument("Qubit " + std::to_string(qubit) +
+                                  " is out of range.");
+    }
+    if (keep[qubit]) {
+      throw std::invalid_argument("Qubit " + std::to_string(qubit) +
+                                  " is given more than once.");
+    }
+    keep[qubit] = true;
+  }
+
+  auto e = *this;
+  dEdge::alignDensityEdge(e);
+  std::unordered_map<const dNode*, std::vector<dd::fp>> memo;
+  // bit r of the index is the r-th kept qubit in ascending order
+  const auto sorted = e.marginalizeDiagonal(numQubits, keep, memo);
+
+  std::vector<std::size_t> position(numQubits);
+  for (std::size_t j = 0; j < qubits.size(); ++j) {
+    position[qubits[j]] = j;
+  }
+  std::vector<std::size_t> bitPosition;
+  for (std::size_t q = 0; q < numQubits; ++q) {
+    if (keep[q]) {
+      bitPosition.emplace_back(position[q]);
+    }
+  }
+  std::vector<dd::fp> probabilities(sorted.size());
+  for (std::size_t i = 0; i < sorted.size(); ++i) {
+    std::size_t index = 0;
+    for (std::size_t r = 0; r < bitPosition.size(); ++r) {
+      index |= ((i >> r) & 1U) << bitPosition[r];
+    }
+    probabilities[index] = sorted[i];
+  }
+  return probabilities;
+}
+
+auto dEdge::marginalizeDiagonal(
+    const std::size_t level, const std::vector<bool>& keep,
+    std::unordered_map<const dNode*, std::vector<dd::fp>>& memo) const
+    -> std::vector<dd::fp> {
+  const auto weight = static_cast<std::complex<dd::fp>>(w).real();
+  if (level == 0) {
+    return {weight};
+  }
+
+  const auto nextLevel = level - 1U;
+  if (isTerminal() || static_cast<std::size_t>(p->v) < nextLevel) {
+    // the qubit at this level is not represented by a node (identity)
+    auto result = marginalizeDiagonal(nextLevel, keep, memo);
+    if (keep[nextLevel]) {
+      result.insert(result.end(), result.begin(), result.end());
+    } else {
+      for (auto& probability : result) {
+        probability *= 2;
+      }
+    }
+    return result;
+  }
+
+  auto it = memo.find(p);
+  if (it == memo.end()) {
+    const auto kept = static_cast<std::size_t>(std::count(
+        keep.begin(), keep.begin() + static_cast<std::ptrdiff_t>(nextLevel),
+        true));
+    std::array<std::vector<dd::fp>, 2> successors{};
+    for (std::size_t k = 0; k < successors.size(); ++k) {
+      const auto& successor = p->e[3 * k];
+      if (successor.w.exactlyZero()) {
+        successors[k] = std::vector<dd::fp>(1ULL << kept, 0.);
+      } else {
+        successors[k] = successor.marginalizeDiagonal(nextLevel, keep, memo);
+      }
+    }
+    auto& [zero, one] = successors;
+    if (keep[nextLevel]) {
+      zero.insert(zero.end(), one.begin(), one.end());
+    } else {
+      for (std::size_t i = 0; i < zero.size(); ++i) {
+        zero[i] += one[i];
+      }
+    }
+    it = memo.emplace(p, std::move(zero)).first;
+  }
+
+  auto result = it->second;
+  for (auto& probability : result) {
+    probability *= weight;
+  }
+  return result;
+}
+
 void dEdge::traverseDiagonal(const dd::fp& prob, const std::size_t i,
                              const dd::ProbabilityFunc& f,
                              const std::size_t level,
@@ -10,12 +10,14 @@
 
 #include "DensityUniqueTable.hpp"
 
+#include "DensityNode.hpp"
 #include "dd/MemoryManager.hpp"
 #include "dd/Node.hpp"
 #include "dd/statistics/UniqueTableStatistics.hpp"
 
 #include <cstddef>
 #include <numeric>
+#include <utility>
 
 namespace dd::ddsim {
 
@@ -39,6 +41,25 @@ void DensityUniqueTable::resize(const std::size_t nVars) {
   }
 }
 
+void DensityUniqueTable::rehash(const std::size_t nBuckets) {
+  cfg.nBuckets = nBuckets;
+  for (std::size_t v = 0U; v < tables.size(); ++v) {
+    Table table(nBuckets);
+    for (auto* bucket : tables[v]) {
+      auto* p = bucket;
+      while (p != nullptr) {
+        auto* next = p->next();
+        const auto key = hash(*static_cast<dNode*>(p));
+        p->setNext(table[key]);
+        table[key] = p;
+        p = next;
+      }
+    }
+    tables[v] = std::move(table);
+    stats[v].numBuckets = nBuckets;
+  }
+}
+
 bool DensityUniqueTable::possiblyNeedsCollection() const {
   return getNumEntries() >= gcLimit;
 }
@@ -10,55 +10,498 @@
 
 #include "DeterministicNoiseSimulator.hpp"
 
+#include "CircuitSimulator.hpp"
+#include "DensityNode.hpp"
+#include "NoiseFunctionality.hpp"
+#include "NoiseModel.hpp"
 #include "Simulator.hpp"
 #include "dd/ComplexNumbers.hpp"
 #include "dd/DDDefinitions.hpp"
+#include "dd/FunctionalityConstruction.hpp"
 #include "dd/Operations.hpp"
+#include "ir/Definitions.hpp"
+#include "ir/QuantumComputation.hpp"
+#include "ir/operations/Control.hpp"
 #include "ir/operations/NonUnitaryOperation.hpp"
 #include "ir/operations/OpType.hpp"
 #include "ir/operations/Operation.hpp"
+#include "ir/operations/StandardOperation.hpp"
 
+#include <algorithm>
+#include <cmath>
 #include <cstddef>
 #include <cstdint>
+#include <functional>
 #include <iterator>
 #include <map>
 #include <memory>
+#include <optional>
 #include <random>
+#include <stdexcept>
 #include <string>
+#include <taskflow/core/async.hpp> // IWYU pragma: keep
+#include <taskflow/core/executor.hpp>
+#include <utility>
 #include <vector>
 
 using CN = dd::ComplexNumbers;
 
+std::map<std::string, std::size_t>
+DeterministicNoiseSimulator::simulate(const std::size_t shots) {
+  if (!nonSelectiveMeasurements || !analyseCircuit().isDynamic ||
+      std::ranges::any_of(
+          *qc, [](const auto& op) { return op->isIfElseOperation(); })) {
+    if (nthreads > 1 && shots > 1 && analyseCircuit().isDynamic) {
+      return simulateShotsInParallel(shots);
+    }
+    return CircuitSimulator::simulate(shots);
+  }
+  // without classical feedback, a single run suffices
+  return sampleFromProbabilityMap(simulateNonSelectively(), shots);
+}
+
+DeterministicNoiseSimulator::DeterministicNoiseSimulator(
+    const DeterministicNoiseSimulator& other, const std::size_t seed_,
+    const std::size_t tableMemoryBudget)
+    : CircuitSimulator(other.qc, other.approximationInfo, seed_,
+                       dd::ddsim::DENSITY_MATRIX_SIMULATOR_DD_PACKAGE_CONFIG),
+      maxGateCacheSize(other.maxGateCacheSize),
+      noiseEffects(other.noiseEffects), noiseModel(other.noiseModel),
+      measurementThreshold(other.measurementThreshold),
+      traceDistanceBudget(other.traceDistanceBudget),
+      layeredNoise(other.layeredNoise),
+      densityDD(*dd, CircuitSimulator::getNumberOfQubits(),
+                dd::ddsim::DensityDDPackageConfig::autoSized(
+                    CircuitSimulator::getNumberOfQubits(), tableMemoryBudget)),
+      deterministicNoiseFunctionality(densityDD,
+                                      CircuitSimulator::getNumberOfQubits(),
+                                      noiseModel, noiseEffects) {}
+
+std::map<std::string, std::size_t>
+DeterministicNoiseSimulator::simulateShotsInParallel(const std::size_t shots) {
+  // the DD packages are not thread-safe, so every worker but the first one
+  // simulates its shots on its own simulator, which only pays off if it gets
+  // enough shots to amortize warming up its gate cache
+  const auto workers =
+      std::clamp(shots / MIN_SHOTS_PER_WORKER, std::size_t{1}, nthreads);
+  if (workers == 1) {
+    return CircuitSimulator::simulate(shots);
+  }
+
+  // the additional workers share the circuit and the noise model, and the
+  // tables of all of them are limited to the budget of a single simulator
+  const auto tableMemoryBudget =
+      dd::ddsim::DensityDDPackageConfig::DEFAULT_TABLE_MEMORY_BUDGET /
+      (workers - 1);
+  std::vector<std::unique_ptr<DeterministicNoiseSimulator>> copies;
+  copies.reserve(workers - 1);
+  for (std::size_t i = 1; i < workers; ++i) {
+    copies.emplace_back(std::unique_ptr<DeterministicNoiseSimulator>(
+        new DeterministicNoiseSimulator(*this, mt(), tableMemoryBudget)));
+  }
+
+  std::vector<std::map<std::string, std::size_t>> counts(workers);
+  tf::Executor executor(workers);
+  for (std::size_t i = 0; i < workers; ++i) {
+    auto* simulator = i == 0 ? this : copies[i - 1].get();
+    const auto workerShots = (shots / workers) + (i < shots % workers ? 1 : 0);
+    executor.silent_async([simulator, workerShots, &result = counts[i]] {
+      result = simulator->CircuitSimulator::simulate(workerShots);
+    });
+  }
+  executor.wait_for_all();
+
+  auto measurementCounter = std::move(counts.front());
+  for (std::size_t i = 1; i < workers; ++i) {
+    for (const auto& [bitstring, count] : counts[i]) {
+      measurementCounter[bitstring] += count;
+    }
+    const auto& copy = *copies[i - 1];
+    singleShots += copy.singleShots;
+    approximationRuns += copy.approximationRuns;
+    finalFidelity *= copy.finalFidelity;
+    gateCacheHits += copy.gateCacheHits;
+    gateCacheMisses += copy.gateCacheMisses;
+    noisePasses += copy.noisePasses;
+  }
+  return measurementCounter;
+}
+
+void DeterministicNoiseSimulator::setNumberOfThreads(
+    const std::size_t threads) {
+  if (threads == 0) {
+    throw std::invalid_argument("At least one thread is required.");
+  }
+  nthreads = threads;
+}
+
+dd::SparsePVecStrKeys DeterministicNoiseSimulator::simulateNonSelectively() {
+  const auto nQubits = static_cast<std::size_t>(qc->getNqubits());
+  const auto nCbits = static_cast<std::size_t>(qc->getNcbits());
+
+  // index of the last operation (other than measurements) acting on a qubit
+  std::vector<std::optional<std::size_t>> lastModification(nQubits);
+  // index of the final measurement writing a classical bit and its qubit
+  std::vector<std::optional<std::pair<std::size_t, qc::Qubit>>>
+      finalMeasurement(nCbits);
+  std::size_t opIndex = 0;
+  for (const auto& op : *qc) {
+    if (op->getType() == qc::Measure) {
+      const auto* measure = dynamic_cast<qc::NonUnitaryOperation*>(op.get());
+      const auto& qubits = measure->getTargets();
+      const auto& classics = measure->getClassics();
+      for (std::size_t i = 0; i < qubits.size(); ++i) {
+        finalMeasurement.at(classics[i]) = std::pair{opIndex, qubits[i]};
+      }
+    } else if (op->getType() != qc::Barrier) {
+      // a barrier does not modify a measured qubit, so it needs no record
+      for (const auto qubit : op->getUsedQubits()) {
+        lastModification.at(qubit) = opIndex;
+      }
+    }
+    ++opIndex;
+  }
+
+  // qubit holding the value of each classical bit at the end of the circuit
+  std::map<std::size_t, std::size_t> records;
+  std::size_t recordQubits = 0;
+  for (std::size_t cbit = 0; cbit < nCbits; ++cbit) {
+    if (!finalMeasurement[cbit]) {
+      continue;
+    }
+    const auto [index, qubit] = *finalMeasurement[cbit];
+    const auto& modified = lastModification[qubit];
+    if (modified && *modified > index) {
+      records[cbit] = nQubits + recordQubits++;
+    } else {
+      records[cbit] = qubit;
+    }
+  }
+
+  const auto totalQubits = nQubits + recordQubits;
+  if (recordQubits > 0) {
+    dd->resize(totalQubits);
+    densityDD.resize(totalQubits);
+  }
+  initializeSimulation(totalQubits);
+
+  // non-selective measurements fully dephase, resets fully damp a qubit
+  auto dephasing = dd::ddsim::DeterministicNoiseFunctionality(
+      densityDD, totalQubits, NoiseModel(0.5, 0., 1.), "P");
+  auto damping = dd::ddsim::DeterministicNoiseFunctionality(
+      densityDD, totalQubits, NoiseModel(0., 1., 1.), "A");
+
+  opIndex = 0;
+  for (auto& op : *qc) {
+    if (op->getType() == qc::Measure) {
+      applyPendingNoise();
+      const auto* measure = dynamic_cast<qc::NonUnitaryOperation*>(op.get());
+      const auto& qubits = measure->getTargets();
+      const auto& classics = measure->getClassics();
+      std::map<qc::Qubit, NoiseParameters> dephased;
+      for (std::size_t i = 0; i < qubits.size(); ++i) {
+        const auto qubit = qubits[i];
+        const auto cbit = classics[i];
+        if (finalMeasurement[cbit] == std::pair{opIndex, qubit} &&
+            records[cbit] >= nQubits) {
+          // copy the outcome to the record qubit, which decoheres the qubit
+          applyGateToDensity(qc::StandardOperation(
+              qc::Control{qubit}, static_cast<qc::Qubit>(records[cbit]),
+              qc::X));
+        } else {
+          dephased.emplace(qubit, NoiseParameters{.noiseProbability = 0.5});
+        }
+      }
+      dephasing.applyNoiseEffects(rootEdge, dephased);
+    } else if (op->getType() == qc::Reset) {
+      applyPendingNoise();
+      std::map<qc::Qubit, NoiseParameters> reset;
+      for (const auto qubit : op->getTargets()) {
+        reset.emplace(qubit, NoiseParameters{.amplitudeDampingProbability = 1});
+      }
+      damping.applyNoiseEffects(rootEdge, reset);
+    } else if (op->getType() != qc::Barrier) {
+      applyOperationToState(op);
+      approximateAfterOperation(opIndex);
+    }
+    dd->garbageCollect();
+    ++opIndex;
+  }
+  applyPendingNoise();
+
+  // marginalize onto the qubits holding the classical record before applying
+  // the threshold, which would otherwise discard every basis state of a wide
+  // register with many unmeasured qubits
+  std::vector<std::size_t> recordedQubits;
+  std::map<std::size_t, std::size_t> recordBits;
+  for (const auto& [cbit, qubit] : records) {
+    const auto it = std::ranges::find(recordedQubits, qubit);
+    recordBits[cbit] =
+        static_cast<std::size_t>(std::distance(recordedQubits.begin(), it));
+    if (it == recordedQubits.end()) {
+      recordedQubits.emplace_back(qubit);
+    }
+  }
+  const auto marginal =
+      rootEdge.getMarginalProbabilities(totalQubits, recordedQubits);
+
+  dd::SparsePVecStrKeys outcomes;
+  for (std::size_t state = 0; state < marginal.size(); ++state) {
+    const auto probability = marginal[state];
+    if (probability <= 0 || probability < measurementThreshold) {
+      continue;
+    }
+    std::string outcome(nCbits, '0');
+    for (const auto& [cbit, bit] : recordBits) {
+      if (((state >> bit) & 1U) != 0U) {
+        outcome[nCbits - cbit - 1] = '1';
+      }
+    }
+    outcomes[outcome] += probability;
+  }
+
+  if (recordQubits > 0) {
+    auto reduced = densityDD.partialTrace(rootEdge, nQubits);
+    densityDD.incRef(reduced);
+    dd::ddsim::DensityMatrixDD::alignDensityEdge(rootEdge);
+    densityDD.decRef(rootEdge);
+    rootEdge = reduced;
+    dd::ddsim::DensityMatrixDD::setDensityMatrixTrue(rootEdge);
+
+    // shrink the packages back to the circuit, which requires dropping the
+    // cached gates acting on the record qubits and the nodes above the circuit
+    clearGateCache();
+    dd->garbageCollect(true);
+    densityDD.garbageCollect(true);
+    dd->resize(nQubits);
+    densityDD.resize(nQubits);
+  }
+  return outcomes;
+}
+
+void DeterministicNoiseSimulator::setMeasurementThreshold(
+    const double threshold) {
+  if (threshold < 0 || threshold > 1) {
+    throw std::invalid_argument("Measurement threshold " +
+                                std::to_string(threshold) +
+                                " is not a probability.");
+  }
+  measurementThreshold = threshold;
+}
+
+dd::fp DeterministicNoiseSimulator::expectationValue(
+    const qc::QuantumComputation& observable) {
+  if (observable.getNqubits() != getNumberOfQubits()) {
+    throw std::invalid_argument(
+        "Observables must act on the same number of qubits as the circuit.");
+  }
+  singleShot(true);
+  const auto observableDD = dd::buildFunctionality(observable, *dd);
+  const auto value =
+      densityDD.expectationValue(rootEdge, observableDD, getNumberOfQubits());
+  dd->decRef(observableDD);
+  return value;
+}
+
+std::vector<dd::fp> DeterministicNoiseSimulator::expectationValues(
+    const std::vector<std::string>& pauliStrings) {
+  for (const auto& pauli : pauliStrings) {
+    if (pauli.size() != getNumberOfQubits()) {
+      throw std::invalid_argument("Pauli strings must act on the same number "
+                                  "of qubits as the circuit.");
+    }
+  }
+  singleShot(true);
+  std::vector<dd::fp> values;
+  values.reserve(pauliStrings.size());
+  for (const auto& pauli : pauliStrings) {
+    values.emplace_back(densityDD.expectationValue(rootEdge, pauli));
+  }
+  return values;
+}
+
+void DeterministicNoiseSimulator::setApproximationTraceDistance(
+    const double budget) {
+  if (budget < 0) {
+    throw std::invalid_argument("The trace distance budget must not be "
+                                "negative.");
+  }
+  traceDistanceBudget = budget;
+}
+
+double
+DeterministicNoiseSimulator::approximateState(const double targetFidelity) {
+  applyPendingNoise();
+  const auto remaining = traceDistanceBudget - traceDistanceBound;
+  if (remaining <= 0) {
+    return 1;
+  }
+  const auto budget = std::min(1 - targetFidelity, remaining * remaining);
+  const auto discarded =
+      densityDD.approximate(rootEdge, getNumberOfQubits(), budget);
+  traceDistanceBound += std::sqrt(discarded);
+  return 1 - discarded;
+}
+
+bool DeterministicNoiseSimulator::stateMemoryExhausted() const {
+  return densityDD.possiblyNeedsCollection();
+}
+
+void DeterministicNoiseSimulator::forEachProbability(
+    const dd::ProbabilityFunc& f, const dd::fp threshold) const {
+  rootEdge.forEachProbability(f, getNumberOfQubits(), threshold);
+}
+
+std::vector<dd::fp> DeterministicNoiseSimulator::getMarginalProbabilities(
+    const std::vector<qc::Qubit>& qubits) const {
+  return rootEdge.getMarginalProbabilities(
+      getNumberOfQubits(),
+      std::vector<std::size_t>(qubits.begin(), qubits.end()));
+}
+
 void DeterministicNoiseSimulator::initializeSimulation(
     const std::size_t nQubits) {
   rootEdge = densityDD.makeZeroDensityOperator(static_cast<dd::Qubit>(nQubits));
+  traceDistanceBound = 0.;
+  pendingNoise.clear();
+}
+
+std::map<std::size_t, bool>
+DeterministicNoiseSimulator::singleShot(const bool ignoreNonUnitaries) {
+  auto classicValues = CircuitSimulator::singleShot(ignoreNonUnitaries);
+  applyPendingNoise();
+  return classicValues;
 }
 
 void DeterministicNoiseSimulator::applyOperationToState(
     std::unique_ptr<qc::Operation>& op) {
-  auto operation = dd::getDD(*op, *Simulator::dd);
-  densityDD.applyOperationToDensity(DeterministicNoiseSimulator::rootEdge,
-                                    operation);
-  deterministicNoiseFunctionality.applyNoiseEffects(
-      DeterministicNoiseSimulator::rootEdge, op);
+  if (!layeredNoise) {
+    applyGateToDensity(*op);
+    deterministicNoiseFunctionality.applyNoiseEffects(
+        DeterministicNoiseSimulator::rootEdge, op);
+    ++noisePasses;
+    densityDD.garbageCollect();
+    return;
+  }
+
+  // the gate has to be applied after the pending noise on its qubits, which
+  // then ends the current layer
+  auto noise = deterministicNoiseFunctionality.getNoise(*op);
+  if (std::ranges::any_of(noise, [this](const auto& entry) {
+        return pendingNoise.contains(entry.first);
+      })) {
+    applyPendingNoise();
+  }
+  applyGateToDensity(*op);
+  pendingNoise.merge(noise);
+  densityDD.garbageCollect();
+}
+
+void DeterministicNoiseSimulator::applyPendingNoise() {
+  if (pendingNoise.empty()) {
+    return;
+  }
+  deterministicNoiseFunctionality.applyNoiseEffects(rootEdge, pendingNoise);
+  pendingNoise.clear();
+  ++noisePasses;
   densityDD.garbageCollect();
 }
 
 char DeterministicNoiseSimulator::measure(const dd::Qubit i) {
+  applyPendingNoise();
   return densityDD.measureOneCollapsing(rootEdge, static_cast<dd::Qubit>(i),
                                         Simulator::mt);
 }
 
 void DeterministicNoiseSimulator::reset(qc::NonUnitaryOperation* nonUnitaryOp) {
+  applyPendingNoise();
   for (const auto& qubit : nonUnitaryOp->getTargets()) {
     auto const result = densityDD.measureOneCollapsing(
         rootEdge, static_cast<dd::Qubit>(qubit), mt);
     if (result == '1') {
-      const auto x = qc::StandardOperation(qubit, qc::X);
-      const auto operation = dd::getDD(x, *dd);
-      rootEdge = densityDD.applyOperationToDensity(rootEdge, operation);
+      applyGateToDensity(qc::StandardOperation(qubit, qc::X));
+    }
+  }
+}
+
+std::size_t DeterministicNoiseSimulator::GateSignatureHash::operator()(
+    const GateSignature& signature) const noexcept {
+  std::size_t seed = std::hash<qc::OpType>{}(signature.type);
+  for (const auto& control : signature.controls) {
+    qc::hashCombine(seed, std::hash<qc::Qubit>{}(control.qubit));
+    if (control.type == qc::Control::Type::Neg) {
+      seed ^= 1ULL;
+    }
+  }
+  for (const auto& target : signature.targets) {
+    qc::hashCombine(seed, std::hash<qc::Qubit>{}(target));
+  }
+  for (const auto& parameter : signature.parameters) {
+    qc::hashCombine(seed, std::hash<qc::fp>{}(parameter));
+  }
+  return seed;
+}
+
+void DeterministicNoiseSimulator::applyGateToDensity(const qc::Operation& op) {
+  if (maxGateCacheSize == 0U || !op.isStandardOperation()) {
+    const auto operation = dd::getDD(op, *dd);
+    densityDD.applyOperationToDensity(rootEdge, operation);
+    return;
+  }
+
+  auto signature = GateSignature(op);
+  auto it = gateCache.find(signature);
+  if (it == gateCache.end()) {
+    ++gateCacheMisses;
+    if (gateCache.size() >= maxGateCacheSize) {
+      clearGateCache();
     }
+    const auto operation = dd::getDD(op, *dd);
+    const auto adjoint = dd->conjugateTranspose(operation);
+    // referenced gate DDs survive the garbage collection between operations
+    dd->incRef(operation);
+    dd->incRef(adjoint);
+    it = gateCache
+             .emplace(std::move(signature),
+                      CachedGate{.operation = operation, .adjoint = adjoint})
+             .first;
+  } else {
+    ++gateCacheHits;
+  }
+  densityDD.applyOperationToDensity(rootEdge, it->second.operation,
+                                    it->second.adjoint);
+}
+
+void DeterministicNoiseSimulator::clearGateCache() {
+  for (const auto& [signature, gate] : gateCache) {
+    dd->decRef(gate.operation);
+    dd->decRef(gate.adjoint);
   }
+  gateCache.clear();
+}
+
+void DeterministicNoiseSimulator::setGateCacheSize(const std::size_t size) {
+  maxGateCacheSize = size;
+  if (gateCache.size() > maxGateCacheSize) {
+    clearGateCache();
+  }
+}
+
+std::map<std::string, std::string>
+DeterministicNoiseSimulator::additionalStatistics() {
+  auto statistics = CircuitSimulator::additionalStatistics();
+  statistics["gate_cache_hits"] = std::to_string(gateCacheHits);
+  statistics["gate_cache_misses"] = std::to_string(gateCacheMisses);
+  statistics["gate_cache_size"] = std::to_string(gateCache.size());
+  statistics["noise_passes"] = std::to_string(noisePasses);
+  statistics["approximation_trace_distance"] =
+      std::to_string(traceDistanceBound);
+  const auto& noiseTable = densityDD.getNoiseTableStatistics();
+  statistics["noise_table_lookups"] = std::to_string(noiseTable.lookups);
+  statistics["noise_table_hits"] = std::to_string(noiseTable.hits);
+  statistics["noise_table_hit_ratio"] = std::to_string(noiseTable.hitRatio());
+  statistics["density_tables"] = densityDD.getStatistics().dump();
+  return statistics;
 }
 
 std::map<std::string, std::size_t>
@@ -67,8 +510,15 @@ DeterministicNoiseSimulator::sampleFromProbabilityMap(
     const std::size_t shots) {
   std::vector<dd::fp> weights;
   weights.reserve(resultProbabilityMap.size());
+  dd::fp total = 0;
   for (const auto& [state, prob] : resultProbabilityMap) {
     weights.emplace_back(prob);
+    total += prob;
+  }
+  if (!(total > 0)) {
+    throw std::runtime_error(
+        "No outcome has a non-zero probability to sample from. Consider "
+        "lowering the measurement threshold.");
   }
   std::discrete_distribution<std::size_t> d(
       weights.begin(),
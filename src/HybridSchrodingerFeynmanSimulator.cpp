@@ -13,113 +13,846 @@
 #include "Simulator.hpp"
 #include "dd/DDDefinitions.hpp"
 #include "dd/Export.hpp"
+#include "dd/GateMatrixDefinitions.hpp"
 #include "dd/Node.hpp"
 #include "dd/Operations.hpp"
 #include "dd/Package.hpp"
 #include "ir/Definitions.hpp"
+#include "ir/Permutation.hpp"
 #include "ir/operations/Control.hpp"
 #include "ir/operations/OpType.hpp"
 #include "ir/operations/Operation.hpp"
 #include "ir/operations/StandardOperation.hpp"
 
 #include <algorithm>
+#include <array>
+#include <atomic>
+#include <bit>
 #include <cassert>
 #include <cmath>
 #include <complex>
 #include <cstddef>
 #include <cstdint>
-#include <cstdio>
+#include <cstdlib>
+#include <cstring>
+#include <filesystem>
 #include <functional>
+#include <iterator>
+#include <limits>
 #include <map>
 #include <memory>
+#include <mutex>
+#include <numeric>
+#include <optional>
+#include <random>
+#include <set>
+#include <span>
+#include <sstream>
 #include <stdexcept>
 #include <string>
+#include <system_error>
 #include <taskflow/core/async.hpp> // IWYU pragma: keep
 #include <taskflow/core/executor.hpp>
+#include <unordered_set>
 #include <utility>
 #include <vector>
 
+#if defined(_WIN32)
+#ifndef NOMINMAX
+#define NOMINMAX
+#endif
+#include <windows.h>
+#elif defined(__APPLE__)
+#include <mach/mach.h>
+#else
+#include <fstream>
+#include <unistd.h>
+#endif
+
+namespace {
+// `Edge::size` relies on a static set of visited nodes and must not be called
+// concurrently
+std::size_t countNodes(const dd::VectorDD& edge) {
+  std::unordered_set<const dd::vNode*> visited{};
+  std::vector<const dd::vNode*> stack{edge.p};
+  while (!stack.empty()) {
+    const auto* node = stack.back();
+    stack.pop_back();
+    if (dd::vNode::isTerminal(node) || !visited.emplace(node).second) {
+      continue;
+    }
+    for (const auto& child : node->e) {
+      stack.emplace_back(child.p);
+    }
+  }
+  return visited.size();
+}
+
+using Matrix = std::vector<std::vector<std::complex<dd::fp>>>;
+
+constexpr dd::fp SCHMIDT_TOLERANCE = 1e-12;
+
+// Matrix of an operation acting on the given qubits, where the i-th qubit is
+// bit i of the row and column indices
+Matrix localMatrix(const qc::Operation& op,
+                   const std::vector<qc::Qubit>& qubits) {
+  const auto bitOf = [&qubits](const qc::Qubit qubit) {
+    return static_cast<std::size_t>(
+        std::find(qubits.begin(), qubits.end(), qubit) - qubits.begin());
+  };
+  const auto dim = 1ULL << qubits.size();
+  Matrix matrix(dim, std::vector<std::complex<dd::fp>>(dim, 0));
+  const auto& targets = op.getTargets();
+  const auto isActive = [&op, &bitOf](const std::size_t col) {
+    return std::all_of(op.getControls().begin(), op.getControls().end(),
+                       [&bitOf, col](const qc::Control& control) {
+                         const bool one =
+                             ((col >> bitOf(control.qubit)) & 1U) == 1U;
+                         return one == (control.type == qc::Control::Type::Pos);
+                       });
+  };
+
+  if (targets.size() == 1) {
+    const auto gate =
+        dd::opToSingleQubitGateMatrix(op.getType(), op.getParameter());
+    const auto bit = bitOf(targets.front());
+    for (std::size_t col = 0; col < dim; ++col) {
+      if (!isActive(col)) {
+        matrix[col][col] = 1;
+        continue;
+      }
+      const auto in = (col >> bit) & 1U;
+      const auto base = col & ~(1ULL << bit);
+      for (std::size_t out = 0; out < 2; ++out) {
+        matrix[base | (out << bit)][col] = gate[(2 * out) + in];
+      }
+    }
+    return matrix;
+  }
+
+  // the first target is the most significant bit of a two-qubit gate matrix
+  const auto gate = dd::opToTwoQubitGateMatrix(op.getType(), op.getParameter());
+  const auto high = bitOf(targets[0]);
+  const auto low = bitOf(targets[1]);
+  for (std::size_t col = 0; col < dim; ++col) {
+    if (!isActive(col)) {
+      matrix[col][col] = 1;
+      continue;
+    }
+    const auto in = (((col >> high) & 1U) << 1U) | ((col >> low) & 1U);
+    const auto base = col & ~(1ULL << high) & ~(1ULL << low);
+    for (std::size_t out = 0; out < 4; ++out) {
+      matrix[base | ((out >> 1U) << high) | ((out & 1U) << low)][col] =
+          gate[out][in];
+    }
+  }
+  return matrix;
+}
+
+// Operator Schmidt decomposition of a matrix acting on `nLower` lower and
+// `nUpper` upper qubits into terms A_k (x) B_k, given as row-major matrices.
+// Gaussian elimination with full pivoting yields the minimal number of terms.
+std::vector<std::pair<std::vector<std::complex<dd::fp>>,
+                      std::vector<std::complex<dd::fp>>>>
+schmidtDecomposition(const Matrix& matrix, const std::size_t nLower,
+                     const std::size_t nUpper) {
+  const auto dimLower = 1ULL << nLower;
+  const auto dimUpper = 1ULL << nUpper;
+  // rows of the realigned matrix belong to the lower qubits and its columns to
+  // the upper ones
+  Matrix realigned(dimLower * dimLower,
+                   std::vector<std::complex<dd::fp>>(dimUpper * dimUpper, 0));
+  for (std::size_t row = 0; row < matrix.size(); ++row) {
+    for (std::size_t col = 0; col < matrix.size(); ++col) {
+      const auto lower =
+          ((row & (dimLower - 1)) * dimLower) + (col & (dimLower - 1));
+      const auto upper = ((row >> nLower) * dimUpper) + (col >> nLower);
+      realigned[lower][upper] = matrix[row][col];
+    }
+  }
+
+  std::vector<std::pair<std::vector<std::complex<dd::fp>>,
+                        std::vector<std::complex<dd::fp>>>>
+      terms{};
+  const auto maxRank = std::min(realigned.size(), realigned.front().size());
+  while (terms.size() < maxRank) {
+    std::size_t pivotRow = 0;
+    std::size_t pivotCol = 0;
+    for (std::size_t r = 0; r < realigned.size(); ++r) {
+      for (std::size_t c = 0; c < realigned[r].size(); ++c) {
+        if (std::abs(realigned[r][c]) >
+            std::abs(realigned[pivotRow][pivotCol])) {
+          pivotRow = r;
+          pivotCol = c;
+        }
+      }
+    }
+    const auto pivot = realigned[pivotRow][pivotCol];
+    if (std::abs(pivot) < SCHMIDT_TOLERANCE) {
+      break;
+    }
+    std::vector<std::complex<dd::fp>> lower(realigned.size());
+    for (std::size_t r = 0; r < realigned.size(); ++r) {
+      lower[r] = realigned[r][pivotCol] / pivot;
+    }
+    auto upper = realigned[pivotRow];
+    for (std::size_t r = 0; r < realigned.size(); ++r) {
+      for (std::size_t c = 0; c < upper.size(); ++c) {
+        realigned[r][c] -= lower[r] * upper[c];
+      }
+    }
+    terms.emplace_back(std::move(lower), std::move(upper));
+  }
+  return terms;
+}
+
+/// A directory for the spilled partial results of a single simulation, which
+/// is created on first use and removed with its contents when the simulation
+/// ends or throws. Its name is random and the directory is created
+/// exclusively, so concurrent simulations (e.g., in forked worker processes)
+/// never share it.
+class SpillDirectory {
+public:
+  explicit SpillDirectory(std::filesystem::path parent_)
+      : parent(std::move(parent_)) {}
+  SpillDirectory(const SpillDirectory&) = delete;
+  SpillDirectory& operator=(const SpillDirectory&) = delete;
+  SpillDirectory(SpillDirectory&&) = delete;
+  SpillDirectory& operator=(SpillDirectory&&) = delete;
+  ~SpillDirectory() {
+    if (!path.empty()) {
+      std::error_code error;
+      std::filesystem::remove_all(path, error);
+    }
+  }
+
+  /// The directory, which is created by the first call
+  const std::filesystem::path& get() {
+    constexpr std::size_t attempts = 16;
+    std::random_device device;
+    for (std::size_t i = 0; i < attempts && path.empty(); ++i) {
+      const auto suffix = (static_cast<std::uint64_t>(device()) << 32U) |
+                          static_cast<std::uint64_t>(device());
+      std::ostringstream name;
+      name << "ddsim_spill_" << std::hex << suffix;
+      if (auto candidate = parent / name.str();
+          std::filesystem::create_directory(candidate)) {
+        path = std::move(candidate);
+      }
+    }
+    if (path.empty()) {
+      throw std::runtime_error("Could not create a directory for spilled "
+                               "partial results in " +
+                               parent.string() + ".");
+    }
+    return path;
+  }
+
+private:
+  std::filesystem::path parent;
+  std::filesystem::path path;
+};
+
+#if !defined(_WIN32) && !defined(__APPLE__)
+// Number of bytes in the given file (none if unreadable or unlimited)
+std::optional<std::size_t> readBytes(const char* path) {
+  std::ifstream file(path);
+  std::size_t bytes = 0;
+  if (file >> bytes) {
+    return bytes;
+  }
+  return std::nullopt;
+}
+
+// Memory left within the limit of the cgroup of the process (none if the
+// cgroup is unknown or unlimited)
+std::optional<std::size_t> cgroupAvailableMemory() {
+  // cgroup v2 and v1, respectively
+  constexpr std::array<std::pair<const char*, const char*>, 2> files{
+      {{"/sys/fs/cgroup/memory.max", "/sys/fs/cgroup/memory.current"},
+       {"/sys/fs/cgroup/memory/memory.limit_in_bytes",
+        "/sys/fs/cgroup/memory/memory.usage_in_bytes"}}};
+  for (const auto& [limitFile, usageFile] : files) {
+    const auto limit = readBytes(limitFile);
+    const auto usage = readBytes(usageFile);
+    if (limit && usage) {
+      return *limit > *usage ? *limit - *usage : 0;
+    }
+  }
+  return std::nullopt;
+}
+#endif
+} // namespace
+
 std::size_t
 HybridSchrodingerFeynmanSimulator::getNDecisions(qc::Qubit splitQubit) {
+  return getNDecisions(std::vector{splitQubit});
+}
+
+std::size_t HybridSchrodingerFeynmanSimulator::getNDecisions(
+    const std::vector<qc::Qubit>& cuts) {
+  std::vector<qc::Qubit> identity(getNumberOfQubits());
+  std::iota(identity.begin(), identity.end(), 0);
+  return getNDecisions(cuts, identity);
+}
+
+std::size_t HybridSchrodingerFeynmanSimulator::getNDecisions(
+    const std::vector<qc::Qubit>& cuts,
+    const std::vector<qc::Qubit>& layout) const {
   std::size_t ndecisions = 0;
   // calculate number of decisions
   for (const auto& op : *qc) {
-    if (op->getType() == qc::Barrier) {
-      continue;
+    if (const auto crossing = crossingOp(*op, cuts, layout);
+        crossing.has_value()) {
+      ndecisions += crossing->nDecisions;
+    }
+  }
+  return ndecisions;
+}
+
+HybridSchrodingerFeynmanSimulator::SplitOps
+HybridSchrodingerFeynmanSimulator::getSplitOps(
+    const std::vector<qc::Qubit>& cuts) const {
+  std::vector<qc::Qubit> identity(getNumberOfQubits());
+  std::iota(identity.begin(), identity.end(), 0);
+  SplitOps splitOps{};
+  splitOps.reserve(qc->getNops());
+  for (const auto& op : *qc) {
+    splitOps.emplace_back(crossingOp(*op, cuts, identity));
+  }
+  return splitOps;
+}
+
+std::optional<HybridSchrodingerFeynmanSimulator::CrossingOp>
+HybridSchrodingerFeynmanSimulator::crossingOp(
+    const qc::Operation& op, const std::vector<qc::Qubit>& cuts,
+    const std::vector<qc::Qubit>& layout) {
+  if (op.getType() == qc::Barrier) {
+    return std::nullopt;
+  }
+
+  assert(op.isStandardOperation());
+
+  const auto sliceOf = [&cuts, &layout](const qc::Qubit qubit) {
+    return static_cast<std::size_t>(
+        std::upper_bound(cuts.begin(), cuts.end(), layout[qubit]) -
+        cuts.begin());
+  };
+
+  std::set<std::size_t> targetSlices{};
+  for (const auto& target : op.getTargets()) {
+    targetSlices.emplace(sliceOf(target));
+  }
+  if (targetSlices.size() == 1) {
+    const auto targetSlice = *targetSlices.begin();
+    std::optional<std::size_t> controlSlice;
+    std::size_t nControlsInOtherSlices = 0;
+    for (const auto& control : op.getControls()) {
+      if (const auto slice = sliceOf(control.qubit); slice != targetSlice) {
+        controlSlice = slice;
+        nControlsInOtherSlices++;
+      }
     }
+    if (nControlsInOtherSlices == 0) {
+      return std::nullopt;
+    }
+    if (nControlsInOtherSlices == 1) {
+      // the single control across the cut is decided by projecting it
+      return CrossingOp{{targetSlice, *controlSlice}, 1, {}};
+    }
+  }
+
+  // otherwise, the gate is decomposed into its operator Schmidt terms
+  std::map<std::size_t, std::vector<qc::Qubit>> qubitsPerSlice{};
+  for (const auto qubit : op.getUsedQubits()) {
+    qubitsPerSlice[sliceOf(qubit)].emplace_back(qubit);
+  }
+  if (qubitsPerSlice.size() > 2) {
+    throw std::invalid_argument(
+        "Gates spanning more than two slices of the circuit are not supported "
+        "at the moment.");
+  }
+  const auto& [lowerSlice, lowerQubits] = *qubitsPerSlice.begin();
+  const auto& [upperSlice, upperQubits] = *qubitsPerSlice.rbegin();
+  if (op.getTargets().size() > 2 || lowerQubits.size() > 2 ||
+      upperQubits.size() > 2) {
+    throw std::invalid_argument(
+        "Gates acting on more than two qubits on either side of the cut are "
+        "not supported at the moment as their operator Schmidt decomposition "
+        "is not computed.");
+  }
+
+  auto qubits = lowerQubits;
+  qubits.insert(qubits.end(), upperQubits.begin(), upperQubits.end());
+  const auto terms = schmidtDecomposition(
+      localMatrix(op, qubits), lowerQubits.size(), upperQubits.size());
+  CrossingOp crossing{
+      {lowerSlice, upperSlice},
+      static_cast<std::size_t>(std::bit_width(terms.size() - 1)),
+      {}};
+  for (const auto& [lower, upper] : terms) {
+    crossing.schmidtTerms.emplace_back(SchmidtFactor{lowerQubits, lower},
+                                       SchmidtFactor{upperQubits, upper});
+  }
+  return crossing;
+}
+
+double HybridSchrodingerFeynmanSimulator::estimateCost(
+    const qc::Qubit splitQubit, const std::size_t nDecisions) const {
+  return estimateCost(std::vector{splitQubit}, nDecisions);
+}
+
+double HybridSchrodingerFeynmanSimulator::estimateCost(
+    const std::vector<qc::Qubit>& cuts, const std::size_t nDecisions) const {
+  const auto nqubits = static_cast<int>(getNumberOfQubits());
+  const auto slices = std::ldexp(1., static_cast<int>(nDecisions));
+  auto sliceSizes = 0.;
+  auto start = 0;
+  for (const auto cut : cuts) {
+    sliceSizes += std::ldexp(1., static_cast<int>(cut) - start);
+    start = static_cast<int>(cut);
+  }
+  sliceSizes += std::ldexp(1., nqubits - start);
+  auto cost = slices * sliceSizes;
+  if (mode == Mode::Amplitude) {
+    // every thread adds its slices to its own amplitude vector
+    cost += std::min(slices, static_cast<double>(nthreads)) *
+            std::ldexp(1., nqubits);
+  }
+  return cost;
+}
+
+std::vector<qc::Qubit>
+HybridSchrodingerFeynmanSimulator::interactionLayout() const {
+  const auto nqubits = getNumberOfQubits();
+  std::vector<std::vector<std::size_t>> interactions(
+      nqubits, std::vector<std::size_t>(nqubits, 0));
+  for (const auto& op : *qc) {
+    const auto usedQubits = op->getUsedQubits();
+    for (const auto q : usedQubits) {
+      for (const auto p : usedQubits) {
+        if (p != q) {
+          ++interactions[q][p];
+        }
+      }
+    }
+  }
+
+  // greedily place the qubit interacting most with the already placed ones,
+  // starting from the qubit with the most interactions overall
+  std::vector<std::size_t> weight(nqubits, 0);
+  for (std::size_t q = 0; q < nqubits; ++q) {
+    for (std::size_t p = 0; p < nqubits; ++p) {
+      weight[q] += interactions[q][p];
+    }
+  }
+  std::vector<qc::Qubit> layout(nqubits);
+  std::vector<bool> placed(nqubits, false);
+  for (std::size_t position = 0; position < nqubits; ++position) {
+    std::size_t next = nqubits;
+    for (std::size_t q = 0; q < nqubits; ++q) {
+      if (!placed[q] && (next == nqubits || weight[q] > weight[next])) {
+        next = q;
+      }
+    }
+    placed[next] = true;
+    layout[next] = static_cast<qc::Qubit>(position);
+    if (position == 0) {
+      std::fill(weight.begin(), weight.end(), 0);
+    }
+    for (std::size_t q = 0; q < nqubits; ++q) {
+      weight[q] += interactions[q][next];
+    }
+  }
+  return layout;
+}
+
+HybridSchrodingerFeynmanSimulator::CutPlan
+HybridSchrodingerFeynmanSimulator::planCut() const {
+  const auto nqubits = static_cast<qc::Qubit>(getNumberOfQubits());
+  std::vector<qc::Qubit> identity(nqubits);
+  std::iota(identity.begin(), identity.end(), 0);
 
-    assert(op->isStandardOperation());
-
-    bool targetInLowerSlice = false;
-    bool targetInUpperSlice = false;
-    bool controlInLowerSlice = false;
-    size_t nControlsInLowerSlice = 0;
-    bool controlInUpperSlice = false;
-    size_t nControlsInUpperSlice = 0;
-    for (const auto& target : op->getTargets()) {
-      targetInLowerSlice = targetInLowerSlice || target < splitQubit;
-      targetInUpperSlice = targetInUpperSlice || target >= splitQubit;
-    }
-    for (const auto& control : op->getControls()) {
-      if (control.qubit < splitQubit) {
-        controlInLowerSlice = true;
-        nControlsInLowerSlice++;
-      } else {
-        controlInUpperSlice = true;
-        nControlsInUpperSlice++;
+  if (!cutsOverride.empty()) {
+    for (const auto cut : cutsOverride) {
+      if (cut == 0 || cut >= nqubits) {
+        throw std::invalid_argument("The cut at qubit " + std::to_string(cut) +
+                                    " does not split the circuit.");
       }
     }
+    const auto ndecisions = getNDecisions(cutsOverride, identity);
+    return {cutsOverride.front(),
+            ndecisions,
+            estimateCost(cutsOverride, ndecisions),
+            identity,
+            false,
+            cutsOverride};
+  }
+
+  std::vector<std::vector<qc::Qubit>> layouts{identity};
+  if (qubitRelabeling) {
+    if (auto layout = interactionLayout(); layout != identity) {
+      layouts.emplace_back(std::move(layout));
+    }
+  }
+
+  // among equally expensive plans, prefer the original order
+  std::optional<CutPlan> best;
+  for (const auto& layout : layouts) {
+    auto plan = planCuts(layout, layout != identity);
+    if (plan.has_value() && (!best.has_value() || plan->cost < best->cost)) {
+      best = std::move(plan);
+    }
+  }
+  if (best.has_value()) {
+    return *best;
+  }
+
+  // no cut can be decomposed; this reports why the balanced one fails
+  const auto splitQubit = nqubits / 2;
+  const auto ndecisions = getNDecisions(std::vector{splitQubit}, identity);
+  if (maxSliceQubits > 0) {
+    throw std::invalid_argument(
+        "The planner could not cut the circuit into slices of at most " +
+        std::to_string(maxSliceQubits) + " qubits.");
+  }
+  return {splitQubit, ndecisions, estimateCost(splitQubit, ndecisions),
+          identity,   false,      {splitQubit}};
+}
 
-    if (targetInLowerSlice && targetInUpperSlice) {
-      throw std::invalid_argument(
-          "Multiple targets spread across the cut through the circuit are not "
-          "supported at the moment as this would require actually computing "
-          "the Schmidt decomposition of the gate being cut.");
+std::optional<HybridSchrodingerFeynmanSimulator::CutPlan>
+HybridSchrodingerFeynmanSimulator::planCuts(
+    const std::vector<qc::Qubit>& layout, const bool relabeled) const {
+  const auto nqubits = static_cast<qc::Qubit>(getNumberOfQubits());
+  const auto largestSlice = [nqubits](const std::vector<qc::Qubit>& cuts) {
+    qc::Qubit largest = 0;
+    qc::Qubit start = 0;
+    for (const auto cut : cuts) {
+      largest = std::max(largest, cut - start);
+      start = cut;
     }
+    return std::max(largest, nqubits - start);
+  };
 
-    if (targetInLowerSlice && controlInUpperSlice) {
-      if (nControlsInUpperSlice > 1) {
-        throw std::invalid_argument(
-            "Multiple controls in the control part of the gate being cut are "
-            "not supported at the moment as this would require actually "
-            "computing the Schmidt decomposition of the gate being cut.");
+  std::optional<CutPlan> plan;
+  do {
+    // cut one of the slices that are too large (any slice for the first cut),
+    // preferring balanced cuts among equally expensive ones
+    std::optional<CutPlan> next;
+    std::int64_t nextImbalance = 0;
+    const auto cuts = plan.has_value() ? plan->cuts : std::vector<qc::Qubit>{};
+    for (qc::Qubit splitQubit = 1; splitQubit < nqubits; ++splitQubit) {
+      const auto it = std::lower_bound(cuts.begin(), cuts.end(), splitQubit);
+      if (it != cuts.end() && *it == splitQubit) {
+        continue;
+      }
+      const auto start = it == cuts.begin() ? 0 : *std::prev(it);
+      const auto end = it == cuts.end() ? nqubits : *it;
+      if (plan.has_value() && end - start <= maxSliceQubits) {
+        continue;
+      }
+      auto candidate = cuts;
+      candidate.insert(candidate.begin() + (it - cuts.begin()), splitQubit);
+      std::size_t ndecisions = 0;
+      try {
+        ndecisions = getNDecisions(candidate, layout);
+      } catch (const std::invalid_argument&) {
+        continue;
       }
-      ++ndecisions;
-    } else if (targetInUpperSlice && controlInLowerSlice) {
-      if (nControlsInLowerSlice > 1) {
-        throw std::invalid_argument(
-            "Multiple controls in the control part of the gate being cut are "
-            "not supported at the moment as this would require actually "
-            "computing the Schmidt decomposition of the gate being cut.");
+      const auto cost = estimateCost(candidate, ndecisions);
+      const auto imbalance =
+          std::abs((2 * static_cast<std::int64_t>(splitQubit)) - start - end);
+      if (next.has_value() &&
+          (cost > next->cost ||
+           (cost == next->cost && imbalance >= nextImbalance))) {
+        continue;
       }
-      ++ndecisions;
+      next = CutPlan{candidate.front(), ndecisions,          cost, layout,
+                     relabeled,         std::move(candidate)};
+      nextImbalance = imbalance;
     }
+    if (!next.has_value()) {
+      return std::nullopt;
+    }
+    plan = std::move(next);
+  } while (maxSliceQubits > 0 && largestSlice(plan->cuts) > maxSliceQubits);
+  return plan;
+}
+
+void HybridSchrodingerFeynmanSimulator::relabelCircuit(
+    const std::vector<qc::Qubit>& layout) {
+  qc::Permutation permutation{};
+  for (std::size_t q = 0; q < layout.size(); ++q) {
+    permutation[static_cast<qc::Qubit>(q)] = layout[q];
+  }
+  for (auto& op : *qc) {
+    op->apply(permutation);
+  }
+}
+
+void HybridSchrodingerFeynmanSimulator::restoreQubitOrder(
+    const std::vector<qc::Qubit>& layout) {
+  // the probabilities of the blocks do not survive the permutation
+  blockProbabilities.clear();
+  const auto nqubits = layout.size();
+  // swap the qubits back to their original positions one by one
+  auto position = layout;
+  std::vector<qc::Qubit> qubitAt(nqubits);
+  for (std::size_t q = 0; q < nqubits; ++q) {
+    qubitAt[layout[q]] = static_cast<qc::Qubit>(q);
+  }
+  for (qc::Qubit q = 0; q < nqubits; ++q) {
+    const auto p = position[q];
+    if (p == q) {
+      continue;
+    }
+    const auto other = qubitAt[q];
+    qubitAt[q] = q;
+    qubitAt[p] = other;
+    position[q] = q;
+    position[other] = p;
+
+    if (mode == Mode::DD) {
+      const qc::StandardOperation swap({q, p}, qc::SWAP);
+      auto tmp = dd->multiply(dd::getDD(swap, *dd), rootEdge);
+      dd->incRef(tmp);
+      dd->decRef(rootEdge);
+      rootEdge = tmp;
+      dd->garbageCollect();
+    } else {
+      // the buffer was just allocated by this simulation and is not shared yet
+      auto& amplitudes = *finalAmplitudes;
+      const auto low = std::min(q, p);
+      const auto high = std::max(q, p);
+      for (std::size_t i = 0; i < amplitudes.size(); ++i) {
+        if (((i >> low) & 1U) == 1U && ((i >> high) & 1U) == 0U) {
+          std::swap(amplitudes[i],
+                    amplitudes[i ^ (1ULL << low) ^ (1ULL << high)]);
+        }
+      }
+    }
+  }
+}
+
+void HybridSchrodingerFeynmanSimulator::applyToSlice(
+    std::unique_ptr<dd::Package>& sliceDD, Slice& slice,
+    const std::size_t sliceIdx, const std::unique_ptr<qc::Operation>& op,
+    const std::optional<CrossingOp>& split) {
+  if (!split.has_value()) {
+    slice.apply(sliceDD, op);
+  } else if (split->slices.first != sliceIdx &&
+             split->slices.second != sliceIdx) {
+    slice.skipDecisions(split->nDecisions);
+  } else if (!split->schmidtTerms.empty()) {
+    slice.applySchmidtTerm(sliceDD, *split, split->slices.first == sliceIdx);
+  } else {
+    [[maybe_unused]] const auto isSplitOp = slice.apply(sliceDD, op);
+    assert(isSplitOp);
   }
-  return ndecisions;
 }
 
 dd::VectorDD HybridSchrodingerFeynmanSimulator::simulateSlicing(
-    std::unique_ptr<dd::Package>& sliceDD, unsigned int splitQubit,
-    size_t controls) {
-  Slice lower(sliceDD, 0, splitQubit - 1, controls);
-  Slice upper(sliceDD, splitQubit,
-              static_cast<qc::Qubit>(getNumberOfQubits() - 1), controls);
+    std::unique_ptr<dd::Package>& sliceDD, const std::vector<qc::Qubit>& cuts,
+    const SplitOps& splitOps, size_t controls) {
+  std::vector<Slice> slices{};
+  slices.reserve(cuts.size() + 1);
+  qc::Qubit start = 0;
+  for (const auto cut : cuts) {
+    slices.emplace_back(sliceDD, start, cut - 1, controls);
+    start = cut;
+  }
+  slices.emplace_back(sliceDD, start,
+                      static_cast<qc::Qubit>(getNumberOfQubits() - 1),
+                      controls);
 
-  for (const auto& op : *qc) {
+  for (std::size_t i = 0; i < qc->getNops(); ++i) {
+    const auto& op = qc->at(i);
     assert(op->isUnitary());
-    [[maybe_unused]] auto l = lower.apply(sliceDD, op);
-    [[maybe_unused]] auto u = upper.apply(sliceDD, op);
-    assert(l == u);
+    for (std::size_t s = 0; s < slices.size(); ++s) {
+      applyToSlice(sliceDD, slices[s], s, op, splitOps[i]);
+    }
     sliceDD->garbageCollect();
   }
 
-  auto result =
-      sliceDD->kronecker(upper.edge, lower.edge, lower.nqubits, false);
+  auto result = slices.front().edge;
+  auto lowerQubits = slices.front().nqubits;
+  for (std::size_t i = 1; i < slices.size(); ++i) {
+    result = sliceDD->kronecker(slices[i].edge, result, lowerQubits, false);
+    lowerQubits += slices[i].nqubits;
+  }
   sliceDD->incRef(result);
 
   return result;
 }
 
+void HybridSchrodingerFeynmanSimulator::simulateSlicesMemoized(
+    std::unique_ptr<dd::Package>& sliceDD, const std::vector<qc::Qubit>& cuts,
+    const SplitOps& splitOps, const std::size_t firstControl,
+    const std::size_t lastControl,
+    const std::function<void(const dd::VectorDD&)>& onSlice) {
+  const auto nqubits = static_cast<qc::Qubit>(getNumberOfQubits());
+  const auto nslices = cuts.size() + 1;
+  // decisions involving each of the slices
+  std::vector<std::size_t> masks(nslices, 0);
+  std::size_t ndecisions = 0;
+  for (const auto& split : splitOps) {
+    if (split.has_value()) {
+      const auto bits = ((1ULL << split->nDecisions) - 1) << ndecisions;
+      masks[split->slices.first] |= bits;
+      masks[split->slices.second] |= bits;
+      ndecisions += split->nDecisions;
+    }
+  }
+
+  // the slices see the first decision in their least significant bit
+  std::vector<std::size_t> controls{};
+  controls.reserve(lastControl - firstControl);
+  for (auto control = firstControl; control < lastControl; ++control) {
+    std::size_t sliceControls = 0;
+    for (std::size_t decision = 0; decision < ndecisions; ++decision) {
+      if (((control >> (ndecisions - 1 - decision)) & 1U) == 1U) {
+        sliceControls |= 1ULL << decision;
+      }
+    }
+    controls.emplace_back(sliceControls);
+  }
+  const auto neededControls = [&controls](const std::size_t mask) {
+    std::vector<std::size_t> needed{};
+    needed.reserve(controls.size());
+    for (const auto control : controls) {
+      needed.emplace_back(control & mask);
+    }
+    std::sort(needed.begin(), needed.end());
+    needed.erase(std::unique(needed.begin(), needed.end()), needed.end());
+    return needed;
+  };
+
+  std::vector<qc::Qubit> starts{0};
+  starts.insert(starts.end(), cuts.begin(), cuts.end());
+  starts.emplace_back(nqubits);
+
+  // cache the leaves of all but the topmost slice
+  std::vector<std::map<std::size_t, dd::VectorDD>> leaves(nslices - 1);
+  for (std::size_t s = 0; s + 1 < nslices; ++s) {
+    const Slice slice(sliceDD, starts[s], starts[s + 1] - 1, 0);
+    walkSlice(sliceDD, slice, s, 0, 0, neededControls(masks[s]), splitOps,
+              [&sliceDD, &cached = leaves[s]](const Slice& leaf) {
+                cached.emplace(leaf.controls, leaf.edge);
+                sliceDD->incRef(leaf.edge);
+              });
+  }
+
+  // and combine them with the leaves of the topmost slice one by one
+  const Slice top(sliceDD, starts[nslices - 1], nqubits - 1, 0);
+  walkSlice(sliceDD, top, nslices - 1, 0, 0, neededControls(masks.back()),
+            splitOps, [&](const Slice& leaf) {
+              for (const auto control : controls) {
+                if ((control & masks.back()) != leaf.controls) {
+                  continue;
+                }
+                auto slice = leaves.front().at(control & masks.front());
+                for (std::size_t s = 1; s + 1 < nslices; ++s) {
+                  slice = sliceDD->kronecker(leaves[s].at(control & masks[s]),
+                                             slice, starts[s], false);
+                }
+                slice = sliceDD->kronecker(leaf.edge, slice,
+                                           starts[nslices - 1], false);
+                sliceDD->incRef(slice);
+                onSlice(slice);
+                sliceDD->decRef(slice);
+              }
+            });
+
+  for (const auto& cached : leaves) {
+    for (const auto& [control, edge] : cached) {
+      sliceDD->decRef(edge);
+    }
+  }
+}
+
+void HybridSchrodingerFeynmanSimulator::walkSlice(
+    std::unique_ptr<dd::Package>& sliceDD, Slice slice,
+    const std::size_t sliceIdx, std::size_t opIdx,
+    const std::size_t assignedMask,
+    const std::vector<std::size_t>& neededControls, const SplitOps& splitOps,
+    const std::function<void(const Slice&)>& onLeaf) {
+  // `slice` holds its own reference, which is released once it is done
+  for (; opIdx < qc->getNops(); ++opIdx) {
+    const auto& op = qc->at(opIdx);
+    const auto& split = splitOps[opIdx];
+    if (!split.has_value() ||
+        (split->slices.first != sliceIdx && split->slices.second != sliceIdx)) {
+      applyToSlice(sliceDD, slice, sliceIdx, op, split);
+      sliceDD->garbageCollect();
+      continue;
+    }
+
+    // all branches of the decisions share the slice simulated so far
+    const auto depth = slice.nDecisionsExecuted;
+    const auto nbranches = 1ULL << split->nDecisions;
+    const auto mask = assignedMask | ((nbranches - 1) << depth);
+    for (std::size_t decisions = 0; decisions < nbranches; ++decisions) {
+      const auto branchControls = slice.controls | (decisions << depth);
+      if (std::none_of(neededControls.begin(), neededControls.end(),
+                       [mask, branchControls](const std::size_t control) {
+                         return (control & mask) == branchControls;
+                       })) {
+        continue;
+      }
+      Slice branch = slice;
+      sliceDD->incRef(branch.edge);
+      branch.controls = branchControls;
+      applyToSlice(sliceDD, branch, sliceIdx, op, split);
+      sliceDD->garbageCollect();
+      walkSlice(sliceDD, branch, sliceIdx, opIdx + 1, mask, neededControls,
+                splitOps, onLeaf);
+    }
+    sliceDD->decRef(slice.edge);
+    return;
+  }
+  onLeaf(slice);
+  sliceDD->decRef(slice.edge);
+}
+
+void HybridSchrodingerFeynmanSimulator::Slice::applySchmidtTerm(
+    std::unique_ptr<dd::Package>& sliceDD, const CrossingOp& op,
+    const bool lowerSlice) {
+  std::size_t term = 0;
+  for (std::size_t i = 0; i < op.nDecisions; ++i) {
+    if (getNextControl() != 0) {
+      term |= 1ULL << i;
+    }
+  }
+  nDecisionsExecuted += op.nDecisions;
+
+  auto tmp = edge;
+  if (term >= op.schmidtTerms.size()) {
+    // the number of terms is not a power of two
+    edge = dd::VectorDD::zero();
+  } else {
+    const auto& [qubits, matrix] =
+        lowerSlice ? op.schmidtTerms[term].first : op.schmidtTerms[term].second;
+    dd::MatrixDD factor{};
+    if (qubits.size() == 1) {
+      factor = sliceDD->makeGateDD(
+          dd::GateMatrix{matrix[0], matrix[1], matrix[2], matrix[3]},
+          qubits.front());
+    } else {
+      dd::TwoQubitGateMatrix gate{};
+      for (std::size_t row = 0; row < 4; ++row) {
+        for (std::size_t col = 0; col < 4; ++col) {
+          gate[row][col] = matrix[(4 * row) + col];
+        }
+      }
+      // the first target is the most significant bit of the gate matrix
+      factor = sliceDD->makeTwoQubitGateDD(gate, qubits[1], qubits[0]);
+    }
+    edge = sliceDD->multiply(factor, edge);
+  }
+  sliceDD->incRef(edge);
+  sliceDD->decRef(tmp);
+}
+
 bool HybridSchrodingerFeynmanSimulator::Slice::apply(
     std::unique_ptr<dd::Package>& sliceDD,
     const std::unique_ptr<qc::Operation>& op) {
@@ -170,10 +903,11 @@ bool HybridSchrodingerFeynmanSimulator::Slice::apply(
     isSplitOp = true;
     const bool control = getNextControl() != 0;
     for (const auto& c : opControls) {
+      // the decision is the value of the control qubit regardless of the
+      // type of the control, so the other value is removed
       auto tmp = edge;
-      edge = sliceDD->deleteEdge(
-          edge, static_cast<dd::Qubit>(c.qubit),
-          control != (c.type == qc::Control::Type::Neg) ? 0 : 1);
+      edge = sliceDD->deleteEdge(edge, static_cast<dd::Qubit>(c.qubit),
+                                 control ? 0 : 1);
       // TODO incref and decref could be integrated in delete edge
       sliceDD->incRef(edge);
       sliceDD->decRef(tmp);
@@ -195,8 +929,7 @@ bool HybridSchrodingerFeynmanSimulator::Slice::apply(
   return isSplitOp;
 }
 
-std::map<std::string, std::size_t>
-HybridSchrodingerFeynmanSimulator::simulate(std::size_t shots) {
+void HybridSchrodingerFeynmanSimulator::checkCircuit() const {
   if (qc->isDynamic()) {
     throw std::invalid_argument(
         "Dynamic quantum circuits containing mid-circuit measurements, resets, "
@@ -210,199 +943,502 @@ HybridSchrodingerFeynmanSimulator::simulate(std::size_t shots) {
                                   op->getName() + "\" is not supported.");
     }
   }
+}
+
+std::map<std::string, std::size_t>
+HybridSchrodingerFeynmanSimulator::simulate(std::size_t shots) {
+  checkCircuit();
+
+  cutPlan = planCut();
+
+  // moves the qubits of the circuit to their positions in the layout for as
+  // long as it exists, such that the circuit is restored even if the
+  // simulation throws
+  class Relabeling {
+  public:
+    Relabeling(HybridSchrodingerFeynmanSimulator& simulator_,
+               const std::vector<qc::Qubit>& layout)
+        : simulator(simulator_), inverse(layout.size()) {
+      for (std::size_t q = 0; q < layout.size(); ++q) {
+        inverse[layout[q]] = static_cast<qc::Qubit>(q);
+      }
+      simulator.relabelCircuit(layout);
+    }
+    Relabeling(const Relabeling&) = delete;
+    Relabeling& operator=(const Relabeling&) = delete;
+    ~Relabeling() { simulator.relabelCircuit(inverse); }
+
+  private:
+    HybridSchrodingerFeynmanSimulator& simulator;
+    std::vector<qc::Qubit> inverse;
+  };
+  std::optional<Relabeling> relabeling;
+  if (cutPlan.relabeled) {
+    relabeling.emplace(*this, cutPlan.layout);
+  }
 
-  auto nqubits = getNumberOfQubits();
-  auto splitQubit = static_cast<qc::Qubit>(nqubits / 2);
+  const auto maxControl = 1ULL << cutPlan.nDecisions;
+  if (mode == Mode::DD) {
+    simulateHybridTaskflow(cutPlan.cuts, 0, maxControl);
+  } else {
+    simulateHybridAmplitudes(cutPlan.cuts, 0, maxControl);
+  }
+  if (relabeling) {
+    restoreQubitOrder(cutPlan.layout);
+    relabeling.reset();
+  }
+  return sampleFinalState(shots);
+}
+
+std::string HybridSchrodingerFeynmanSimulator::simulateRange(
+    const std::vector<qc::Qubit>& cuts, const std::size_t firstControl,
+    const std::size_t lastControl) {
+  checkCircuit();
+
+  if (cuts.empty()) {
+    throw std::invalid_argument("At least one cut is required.");
+  }
+  auto previousCuts = std::exchange(cutsOverride, {});
+  setCuts(cuts);
+  try {
+    cutPlan = planCut();
+  } catch (...) {
+    cutsOverride = std::move(previousCuts);
+    throw;
+  }
+  cutsOverride = std::move(previousCuts);
+  const auto maxControl = 1ULL << cutPlan.nDecisions;
+  if (firstControl >= lastControl || lastControl > maxControl) {
+    throw std::invalid_argument(
+        "The range [" + std::to_string(firstControl) + ", " +
+        std::to_string(lastControl) + ") is not a non-empty range of the " +
+        std::to_string(maxControl) + " paths through the cuts.");
+  }
+
+  if (mode == Mode::DD) {
+    simulateHybridTaskflow(cutPlan.cuts, firstControl, lastControl);
+    std::ostringstream oss;
+    dd::serialize(rootEdge, oss, true);
+    return oss.str();
+  }
+  simulateHybridAmplitudes(cutPlan.cuts, firstControl, lastControl);
+  return {reinterpret_cast<const char*>(finalAmplitudes->data()),
+          finalAmplitudes->size() * sizeof(std::complex<dd::fp>)};
+}
+
+std::map<std::string, std::size_t>
+HybridSchrodingerFeynmanSimulator::combinePartialResults(
+    const std::vector<std::string>& partials, const std::size_t shots) {
+  if (mode == Mode::DD) {
+    dd->decRef(rootEdge);
+    rootEdge = dd::VectorDD::zero();
+    for (const auto& partial : partials) {
+      std::istringstream iss(partial);
+      const auto edge = dd->deserialize<dd::vNode>(iss, true);
+      auto tmp = dd->add(rootEdge, edge);
+      dd->incRef(tmp);
+      dd->decRef(rootEdge);
+      rootEdge = tmp;
+      dd->garbageCollect();
+    }
+  } else {
+    const auto nqubits = getNumberOfQubits();
+    if (nqubits >= 60) {
+      throw std::range_error("The amplitude mode only supports less than 60 "
+                             "qubits.");
+    }
+    // a new buffer, as the previous one may still be shared
+    auto combined = std::make_shared<dd::CVec>(1ULL << nqubits, 0);
+    blockProbabilities.clear();
+    const auto bytes = combined->size() * sizeof(std::complex<dd::fp>);
+    for (const auto& partial : partials) {
+      if (partial.size() != bytes) {
+        throw std::invalid_argument("A partial result of " +
+                                    std::to_string(partial.size()) +
+                                    " bytes does not hold the amplitudes of " +
+                                    std::to_string(nqubits) + " qubits.");
+      }
+      // the buffer is not necessarily aligned for complex numbers
+      for (std::size_t i = 0; i < combined->size(); ++i) {
+        std::complex<dd::fp> amplitude{};
+        std::memcpy(&amplitude,
+                    partial.data() + (i * sizeof(std::complex<dd::fp>)),
+                    sizeof(std::complex<dd::fp>));
+        (*combined)[i] += amplitude;
+      }
+    }
+    finalAmplitudes = std::move(combined);
+    amplitudesFreed = false;
+  }
+  return sampleFinalState(shots);
+}
+
+void HybridSchrodingerFeynmanSimulator::writeStateVector(
+    const std::span<std::complex<dd::fp>> amplitudes) const {
+  if (mode == Mode::DD) {
+    CircuitSimulator::writeStateVector(amplitudes);
+    return;
+  }
+  const auto& final = getFinalAmplitudes();
+  if (amplitudes.size() != final.size()) {
+    throw std::invalid_argument(
+        "A buffer of " + std::to_string(amplitudes.size()) +
+        " amplitudes does not match the " + std::to_string(final.size()) +
+        " final amplitudes.");
+  }
+  std::ranges::copy(final, amplitudes.begin());
+}
+
+std::map<std::string, std::size_t>
+HybridSchrodingerFeynmanSimulator::sampleFinalState(const std::size_t shots) {
   if (mode == Mode::DD) {
-    simulateHybridTaskflow(splitQubit);
     return measureAllNonCollapsing(shots);
   }
-  simulateHybridAmplitudes(splitQubit);
 
-  if (shots > 0) {
-    return Simulator::sampleFromAmplitudeVectorInPlace(finalAmplitudes, shots);
+  if (shots == 0) {
+    // in case no shots were requested, the final amplitudes remain untouched
+    return {};
+  }
+  auto results = sampleAmplitudesBlockwise(shots);
+  if (!retainAmplitudes) {
+    // only drops this reference if the amplitudes are shared
+    finalAmplitudes = std::make_shared<dd::CVec>();
+    amplitudesFreed = true;
+    blockProbabilities.clear();
   }
-  // in case no shots were requested, the final amplitudes remain untouched
-  return {};
+  return results;
+}
+
+std::map<std::string, std::size_t>
+HybridSchrodingerFeynmanSimulator::sampleAmplitudesBlockwise(
+    const std::size_t shots) {
+  if (blockProbabilities.empty()) {
+    // e.g., the amplitudes were permuted or combined after their reduction
+    amplitudeBlockSize = finalAmplitudes->size();
+    blockProbabilities = {std::transform_reduce(
+        finalAmplitudes->begin(), finalAmplitudes->end(), dd::fp{0},
+        std::plus<>(),
+        [](const auto& amplitude) { return std::norm(amplitude); })};
+  }
+
+  // the counts do not depend on the order of the random numbers, which allows
+  // a single pass over the amplitudes
+  std::uniform_real_distribution<dd::fp> dist(0.0L, 1.0L);
+  std::vector<dd::fp> randomNumbers(shots);
+  for (auto& p : randomNumbers) {
+    p = dist(mt);
+  }
+  std::ranges::sort(randomNumbers);
+
+  const auto nqubits = getNumberOfQubits();
+  std::map<std::string, std::size_t> results;
+  auto next = randomNumbers.begin();
+  const auto& amplitudes = *finalAmplitudes;
+  std::size_t lastNonZero = amplitudes.size() - 1;
+  dd::fp prefix = 0;
+  for (std::size_t block = 0;
+       block < blockProbabilities.size() && next != randomNumbers.end();
+       ++block) {
+    const auto blockEnd = prefix + blockProbabilities[block];
+    if (*next >= blockEnd && block + 1 < blockProbabilities.size()) {
+      // no random number falls into this block
+      prefix = blockEnd;
+      continue;
+    }
+    const auto begin = block * amplitudeBlockSize;
+    const auto end = std::min(begin + amplitudeBlockSize, amplitudes.size());
+    for (auto i = begin; i < end && next != randomNumbers.end(); ++i) {
+      const auto probability = std::norm(amplitudes[i]);
+      if (probability == 0) {
+        continue;
+      }
+      lastNonZero = i;
+      prefix += probability;
+      std::size_t count = 0;
+      for (; next != randomNumbers.end() && *next < prefix; ++next) {
+        ++count;
+      }
+      if (count > 0) {
+        results[dd::intToBinaryString(i, nqubits)] += count;
+      }
+    }
+  }
+  // random numbers beyond the accumulated probability due to rounding errors
+  if (const auto remaining =
+          static_cast<std::size_t>(std::distance(next, randomNumbers.end()));
+      remaining > 0) {
+    results[dd::intToBinaryString(lastNonZero, nqubits)] += remaining;
+  }
+  return results;
 }
 
 void HybridSchrodingerFeynmanSimulator::simulateHybridTaskflow(
-    unsigned int splitQubit) {
-  const auto ndecisions = getNDecisions(splitQubit);
-  const auto maxControl = 1ULL << ndecisions;
+    const std::vector<qc::Qubit>& cuts, const std::size_t firstControl,
+    const std::size_t lastControl) {
+  const auto splitOps = getSplitOps(cuts);
+  // the slices are indexed relative to the first one of the range
+  const auto maxControl = lastControl - firstControl;
   const auto actuallyUsedThreads = std::min<std::size_t>(maxControl, nthreads);
   const auto chunkSize = static_cast<std::size_t>(
       std::ceil(static_cast<double>(maxControl) /
                 static_cast<double>(actuallyUsedThreads)));
   const auto nslicesOnOneCpu = std::min<std::size_t>(16, chunkSize);
   const auto nqubits = getNumberOfQubits();
-  const auto nresults = static_cast<std::size_t>(std::ceil(
-      static_cast<double>(maxControl) / static_cast<double>(nslicesOnOneCpu)));
-  const auto lastLevel =
-      static_cast<std::size_t>(std::ceil(std::log2(nresults)));
   rootEdge = dd::VectorDD::zero();
+  spilledSlices = 0;
 
-  std::vector<std::vector<bool>> computed(ndecisions,
-                                          std::vector<bool>(maxControl, false));
+  // every running task adds its slices to one of the partial results, which
+  // are never used by two tasks at the same time, so at most one partial
+  // result per thread is held in memory
+  std::vector<PartialResult> partials(actuallyUsedThreads);
+  std::vector<std::size_t> freePartials(actuallyUsedThreads);
+  std::iota(freePartials.begin(), freePartials.end(), 0U);
+  std::vector<std::filesystem::path> spillFiles;
+  std::mutex partialsMutex;
+  std::atomic<std::size_t> residentBytes = 0;
+  auto budget = memoryBudget;
+  if (budget == 0) {
+    // leave the other half for the packages the slices are simulated in
+    const auto available = getAvailableMemory();
+    budget =
+        available > 0 ? available / 2 : std::numeric_limits<std::size_t>::max();
+  }
+  SpillDirectory spills(spillDirectory.empty()
+                            ? std::filesystem::temp_directory_path()
+                            : spillDirectory);
 
-  tf::Executor executor(actuallyUsedThreads);
+  // moves the sum of the given slices into a partial result as soon as they
+  // are computed, which releases the package they were simulated in
+  const auto simulateChunk = [&](const std::size_t first) {
+    std::size_t idx = 0;
+    {
+      const std::scoped_lock lock(partialsMutex);
+      idx = freePartials.back();
+      freePartials.pop_back();
+    }
+    auto& partial = partials[idx];
+    if (!partial.package) {
+      partial.package = std::make_unique<dd::Package>(nqubits);
+      partial.edge = dd::VectorDD::zero();
+    }
+    const auto accumulate = [&partial](dd::VectorDD slice) {
+      auto& package = *partial.package;
+      auto sum = package.add(partial.edge, package.transfer(slice));
+      package.incRef(sum);
+      package.decRef(partial.edge);
+      partial.edge = sum;
+      package.garbageCollect();
+    };
 
-  std::function<void(std::pair<std::size_t, std::size_t>)> computePair =
-      [this, &computePair, &computed, &executor, nslicesOnOneCpu, splitQubit,
-       maxControl, nqubits,
-       lastLevel](std::pair<std::size_t, std::size_t> current) {
-        if (current.first == 0) {
-          // slice
-          std::unique_ptr<dd::Package> oldDD;
-          dd::VectorDD edge{};
-          for (std::size_t i = 0; i < nslicesOnOneCpu; ++i) {
-            const auto totalControl = current.second + i;
-            if (totalControl >= maxControl) {
-              break;
-            }
-            auto sliceDD = std::make_unique<dd::Package>(nqubits);
-            auto result = simulateSlicing(sliceDD, splitQubit, totalControl);
-            if (i > 0) {
-              edge = sliceDD->add(sliceDD->transfer(edge), result);
-            } else {
-              edge = result;
-            }
-            oldDD = std::move(
-                sliceDD); // this might seem unused, but it keeps the DD package
-            // alive for the serialization below
-          }
-          dd::serialize(edge,
-                        "slice_" + std::to_string(current.first) + "_" +
-                            std::to_string(current.second) + ".dd",
-                        true);
-        } else {
-          // adding
-          const std::string filename =
-              "slice_" + std::to_string(current.first - 1) + "_";
-          const std::string filenameLeft =
-              filename + std::to_string(current.second) + ".dd";
-          const auto offset = (1ULL << (current.first - 1)) * nslicesOnOneCpu;
-          const auto idx = current.second + offset;
-          if (idx >= maxControl) {
-            return;
-          }
-          const std::string filenameRight =
-              filename + std::to_string(idx) + ".dd";
-
-          auto sliceDD = std::make_unique<dd::Package>(nqubits);
-          auto result =
-              sliceDD->template deserialize<dd::vNode>(filenameLeft, true);
-          auto result2 =
-              sliceDD->template deserialize<dd::vNode>(filenameRight, true);
-          result = sliceDD->add(result, result2);
-          dd::serialize(result,
-                        "slice_" + std::to_string(current.first) + "_" +
-                            std::to_string(current.second) + ".dd",
-                        true);
-
-          std::remove(filenameLeft.c_str());
-          std::remove(filenameRight.c_str());
-        }
+    const auto last =
+        std::min<std::size_t>(first + nslicesOnOneCpu, maxControl);
+    if (halfSliceMemoization) {
+      // slices sharing their halves
+      auto sliceDD = std::make_unique<dd::Package>(nqubits);
+      simulateSlicesMemoized(sliceDD, cuts, splitOps, firstControl + first,
+                             firstControl + last, accumulate);
+    } else {
+      for (auto control = first; control < last; ++control) {
+        auto sliceDD = std::make_unique<dd::Package>(nqubits);
+        accumulate(
+            simulateSlicing(sliceDD, cuts, splitOps, firstControl + control));
+      }
+    }
 
-        if (current.first < lastLevel) {
-          computed.at(current.first).at(current.second) = true;
-
-          auto offset = (1ULL << current.first) * nslicesOnOneCpu;
-          auto chunk = current.second / offset;
-          auto secondResult = (chunk % 2 == 0) ? (current.second + offset)
-                                               : (current.second - offset);
-          if (secondResult >= maxControl) {
-            // lonely result, promote to next level
-            const auto filename = "slice_" + std::to_string(current.first) +
-                                  "_" + std::to_string(current.second) + ".dd";
-            const auto newFilename = "slice_" +
-                                     std::to_string(current.first + 1) + "_" +
-                                     std::to_string(current.second) + ".dd";
-            rename(filename.c_str(), newFilename.c_str());
-            current.first += 1;
-            computed.at(current.first).at(current.second) = true;
-            // compute new second result
-            offset *= 2;
-            chunk = current.second / offset;
-            secondResult = (chunk % 2 == 0) ? (current.second + offset)
-                                            : (current.second - offset);
-          }
-          if (computed.at(current.first).at(secondResult)) {
-            current.first += 1;
-            current.second = std::min(current.second,
-                                      static_cast<std::size_t>(secondResult));
-            executor.silent_async(
-                [&computePair, current]() { computePair(current); });
-          }
-        }
-      };
+    const auto bytes = countNodes(partial.edge) * sizeof(dd::vNode);
+    residentBytes -= partial.bytes;
+    if (residentBytes + bytes > budget) {
+      std::filesystem::path file;
+      {
+        const std::scoped_lock lock(partialsMutex);
+        file = spills.get() / (std::to_string(first) + ".dd");
+        spillFiles.emplace_back(file);
+      }
+      dd::serialize(partial.edge, file.string(), true);
+      partial = PartialResult{};
+    } else {
+      residentBytes += bytes;
+      partial.bytes = bytes;
+    }
+    const std::scoped_lock lock(partialsMutex);
+    freePartials.emplace_back(idx);
+  };
 
-  for (std::uint64_t i = 0U; i < maxControl; i += nslicesOnOneCpu) {
-    executor.silent_async(
-        [&computePair, i]() { computePair(std::make_pair(0, i)); });
+  tf::Executor executor(actuallyUsedThreads);
+  for (std::size_t first = 0U; first < maxControl; first += nslicesOnOneCpu) {
+    executor.silent_async([&simulateChunk, first] { simulateChunk(first); });
   }
   executor.wait_for_all();
+  spilledSlices = spillFiles.size();
 
-  const auto filename = "slice_" + std::to_string(lastLevel) + "_0.dd";
-  rootEdge = dd->deserialize<dd::vNode>(filename, true);
-  dd->incRef(rootEdge);
-  std::remove(filename.c_str());
+  const auto accumulate = [this](const dd::VectorDD& edge) {
+    auto sum = dd->add(rootEdge, edge);
+    dd->incRef(sum);
+    dd->decRef(rootEdge);
+    rootEdge = sum;
+  };
+  for (auto& partial : partials) {
+    if (partial.package) {
+      accumulate(dd->transfer(partial.edge));
+      partial = PartialResult{};
+    }
+  }
+  for (const auto& file : spillFiles) {
+    accumulate(dd->deserialize<dd::vNode>(file.string(), true));
+    std::filesystem::remove(file);
+  }
 }
 
 void HybridSchrodingerFeynmanSimulator::simulateHybridAmplitudes(
-    qc::Qubit splitQubit) {
-  const auto ndecisions = getNDecisions(splitQubit);
-  const auto maxControl = 1ULL << ndecisions;
-  const auto actuallyUsedThreads = std::min<std::size_t>(maxControl, nthreads);
+    const std::vector<qc::Qubit>& cuts, const std::size_t firstControl,
+    const std::size_t lastControl) {
+  const auto splitOps = getSplitOps(cuts);
+  const auto maxControl = lastControl - firstControl;
+  const auto nqubits = getNumberOfQubits();
+  const auto nthreadsFittingMemory =
+      getAmplitudeAccumulatorLimit(getAvailableMemory());
+  if (nthreadsFittingMemory == 0) {
+    throw std::runtime_error(
+        "Not enough memory available to hold the amplitudes of " +
+        std::to_string(nqubits) + " qubits.");
+  }
+  const auto actuallyUsedThreads = std::min(
+      {static_cast<std::size_t>(maxControl), nthreads, nthreadsFittingMemory});
   const auto chunkSize = static_cast<std::size_t>(
       std::ceil(static_cast<double>(maxControl) /
                 static_cast<double>(actuallyUsedThreads)));
   const auto nslicesOnOneCpu = std::min<std::size_t>(64, chunkSize);
-  const auto nqubits = getNumberOfQubits();
-  const auto requiredVectors = static_cast<std::size_t>(std::ceil(
-      static_cast<double>(maxControl) / static_cast<double>(nslicesOnOneCpu)));
   rootEdge = dd::VectorDD::zero();
+  amplitudeAccumulators = actuallyUsedThreads;
 
-  std::vector<dd::CVec> amplitudes(requiredVectors,
+  // every worker adds the slices of the chunks it takes to its own vector
+  std::vector<dd::CVec> amplitudes(actuallyUsedThreads,
                                    dd::CVec(1ULL << nqubits, 0));
+  std::atomic<std::size_t> nextControl = firstControl;
 
   tf::Executor executor(actuallyUsedThreads);
-  for (std::size_t control = 0, i = 0; control < maxControl;
-       control += nslicesOnOneCpu, i++) {
-    executor.silent_async([this, i, &amplitudes, nslicesOnOneCpu, control,
-                           splitQubit, maxControl]() {
-      const auto currentThread = i;
-      std::vector<std::complex<dd::fp>>& threadAmplitudes =
-          amplitudes.at(currentThread);
-
-      for (std::size_t localControl = 0; localControl < nslicesOnOneCpu;
-           localControl++) {
-        const std::size_t totalControl = control + localControl;
-        if (totalControl >= maxControl) {
-          break;
+  for (std::size_t i = 0; i < actuallyUsedThreads; ++i) {
+    executor.silent_async([this, &threadAmplitudes = amplitudes[i],
+                           &nextControl, &cuts, &splitOps, nslicesOnOneCpu,
+                           lastControl]() {
+      for (auto control = nextControl.fetch_add(nslicesOnOneCpu);
+           control < lastControl;
+           control = nextControl.fetch_add(nslicesOnOneCpu)) {
+        const auto lastChunkControl =
+            std::min<std::size_t>(control + nslicesOnOneCpu, lastControl);
+        if (halfSliceMemoization) {
+          auto sliceDD = std::make_unique<dd::Package>(getNumberOfQubits());
+          simulateSlicesMemoized(
+              sliceDD, cuts, splitOps, control, lastChunkControl,
+              [&threadAmplitudes](const dd::VectorDD& slice) {
+                slice.addToVector(threadAmplitudes);
+              });
+          continue;
         }
-        std::unique_ptr<dd::Package> sliceDD =
-            std::make_unique<dd::Package>(getNumberOfQubits());
-        auto result = simulateSlicing(sliceDD, splitQubit, totalControl);
-        result.addToVector(threadAmplitudes);
+        for (auto totalControl = control; totalControl < lastChunkControl;
+             ++totalControl) {
+          std::unique_ptr<dd::Package> sliceDD =
+              std::make_unique<dd::Package>(getNumberOfQubits());
+          auto result = simulateSlicing(sliceDD, cuts, splitOps, totalControl);
+          result.addToVector(threadAmplitudes);
+        }
+      }
+    });
+  }
+  executor.wait_for_all();
+
+  // sum up the vectors of all workers in parallel over ranges of amplitudes
+  auto& result = amplitudes.front();
+  const auto rangeSize = static_cast<std::size_t>(
+      std::ceil(static_cast<double>(result.size()) /
+                static_cast<double>(actuallyUsedThreads)));
+  // while a range is in the cache, also sum up its probability for sampling
+  amplitudeBlockSize = rangeSize;
+  blockProbabilities.assign((result.size() + rangeSize - 1) / rangeSize, 0);
+  for (std::size_t begin = 0; begin < result.size(); begin += rangeSize) {
+    const auto end = std::min(begin + rangeSize, result.size());
+    executor.silent_async([this, &amplitudes, &result, begin, end,
+                           rangeSize]() {
+      const auto first = result.begin() + static_cast<std::ptrdiff_t>(begin);
+      const auto last = result.begin() + static_cast<std::ptrdiff_t>(end);
+      for (std::size_t i = 1; i < amplitudes.size(); ++i) {
+        std::transform(first, last,
+                       amplitudes[i].begin() +
+                           static_cast<std::ptrdiff_t>(begin),
+                       first, std::plus<>());
       }
+      blockProbabilities[begin / rangeSize] = std::transform_reduce(
+          first, last, dd::fp{0}, std::plus<>(),
+          [](const auto& amplitude) { return std::norm(amplitude); });
     });
   }
   executor.wait_for_all();
+  finalAmplitudes = std::make_shared<dd::CVec>(std::move(result));
+  amplitudesFreed = false;
+}
+
+std::size_t HybridSchrodingerFeynmanSimulator::getAmplitudeAccumulatorLimit(
+    const std::size_t availableMemory) const {
+  const auto nqubits = getNumberOfQubits();
+  if (nqubits >= 60) {
+    // not even a single vector can be addressed
+    return 0;
+  }
+  if (availableMemory == 0) {
+    // the available memory is unknown
+    return nthreads;
+  }
+  const auto vectorBytes = (1ULL << nqubits) * sizeof(std::complex<dd::fp>);
+  return availableMemory / vectorBytes;
+}
 
-  std::size_t oldIncrement = 1;
-  const auto nAdditionLevels =
-      static_cast<std::uint16_t>(std::ceil(std::log2(requiredVectors)));
-  for (std::uint16_t level = 0; level < nAdditionLevels; ++level) {
-    const std::size_t increment = 2ULL << level;
-    for (std::size_t idx = 0; idx + oldIncrement < requiredVectors;
-         idx += increment) {
-      // in-place addition of amplitudes
-      std::transform(amplitudes[idx].begin(), amplitudes[idx].end(),
-                     amplitudes[idx + oldIncrement].begin(),
-                     amplitudes[idx].begin(), std::plus<>());
-    }
-    oldIncrement = increment;
-  }
-  finalAmplitudes = std::move(amplitudes[0]);
+std::size_t HybridSchrodingerFeynmanSimulator::getAvailableMemory() {
+#if defined(_WIN32)
+  MEMORYSTATUSEX status{};
+  status.dwLength = sizeof(status);
+  if (GlobalMemoryStatusEx(&status) != 0) {
+    return static_cast<std::size_t>(status.ullAvailPhys);
+  }
+#elif defined(__APPLE__)
+  vm_statistics64_data_t stats{};
+  mach_msg_type_number_t count = HOST_VM_INFO64_COUNT;
+  if (host_statistics64(mach_host_self(), HOST_VM_INFO64,
+                        reinterpret_cast<host_info64_t>(&stats),
+                        &count) == KERN_SUCCESS) {
+    return static_cast<std::size_t>(stats.free_count + stats.inactive_count) *
+           static_cast<std::size_t>(vm_page_size);
+  }
+#else
+  // unlike the free pages, MemAvailable accounts for reclaimable caches
+  std::size_t available = 0;
+  std::ifstream meminfo("/proc/meminfo");
+  std::string line;
+  while (available == 0 && std::getline(meminfo, line)) {
+    if (line.starts_with("MemAvailable:")) {
+      std::istringstream iss(line.substr(line.find(':') + 1));
+      std::size_t kibibytes = 0;
+      if (iss >> kibibytes) {
+        available = kibibytes * 1024;
+      }
+    }
+  }
+#if defined(_SC_AVPHYS_PAGES)
+  if (available == 0) {
+    const auto pages = sysconf(_SC_AVPHYS_PAGES);
+    const auto pageSize = sysconf(_SC_PAGESIZE);
+    if (pages > 0 && pageSize > 0) {
+      available =
+          static_cast<std::size_t>(pages) * static_cast<std::size_t>(pageSize);
+    }
+  }
+#endif
+  // the memory of the host is not available to a process in a container
+  if (const auto cgroup = cgroupAvailableMemory(); cgroup.has_value()) {
+    // at least one byte, since zero means unknown
+    const auto remaining = std::max<std::size_t>(*cgroup, 1);
+    available = available == 0 ? remaining : std::min(available, remaining);
+  }
+  return available;
+#endif
+  return 0;
 }
@@ -26,13 +26,20 @@
 #include <algorithm>
 #include <array>
 #include <cmath>
+#include <complex>
 #include <cstddef>
 #include <cstdint>
+#include <functional>
+#include <map>
 #include <memory>
+#include <optional>
 #include <random>
 #include <set>
 #include <stdexcept>
 #include <string>
+#include <tuple>
+#include <unordered_map>
+#include <utility>
 #include <vector>
 
 namespace {
@@ -62,39 +69,203 @@ initializeNoiseEffects(const std::string& cNoiseEffects) {
   }
   return noiseOperationVector;
 }
+
+/**
+ * @brief Recursively compute the joint probabilities of the given (sorted)
+ * qubits below a vector node
+ * @details Bit `j` of the index corresponds to `qubits[j]`. The result for each
+ * node is memoized, so that every node is visited only once.
+ */
+const std::vector<dd::fp>& jointProbabilities(
+    const dd::vNode* node, const std::vector<qc::Qubit>& qubits,
+    std::unordered_map<const dd::vNode*, std::vector<dd::fp>>& memo) {
+  static const std::vector<dd::fp> TERMINAL{1.};
+  if (dd::vNode::isTerminal(node)) {
+    return TERMINAL;
+  }
+  if (const auto it = memo.find(node); it != memo.end()) {
+    return it->second;
+  }
+
+  const auto level = static_cast<qc::Qubit>(node->v);
+  const auto below = static_cast<std::size_t>(
+      std::lower_bound(qubits.begin(), qubits.end(), level) - qubits.begin());
+  const bool isQubit = std::binary_search(qubits.begin(), qubits.end(), level);
+  std::vector<dd::fp> probabilities(1ULL << (below + (isQubit ? 1U : 0U)), 0.);
+  for (std::size_t i = 0; i < node->e.size(); ++i) {
+    const auto& successor = node->e[i];
+    if (successor.w.exactlyZero()) {
+      continue;
+    }
+    const auto weight = dd::ComplexNumbers::mag2(successor.w);
+    const auto offset = isQubit ? (i << below) : 0U;
+    const auto& successorProbabilities =
+        jointProbabilities(successor.p, qubits, memo);
+    for (std::size_t x = 0; x < successorProbabilities.size(); ++x) {
+      probabilities[offset + x] += weight * successorProbabilities[x];
+    }
+  }
+  return memo.emplace(node, std::move(probabilities)).first->second;
+}
+
+/// Joint probabilities of the given (sorted) qubits in a normalized state
+std::vector<dd::fp> jointProbabilities(const dd::vEdge& state,
+                                       const std::vector<qc::Qubit>& qubits) {
+  std::unordered_map<const dd::vNode*, std::vector<dd::fp>> memo;
+  return jointProbabilities(state.p, qubits, memo);
+}
+
+using DensityBlock = std::vector<std::complex<dd::fp>>;
+using NodePair = std::pair<const dd::vNode*, const dd::vNode*>;
+
+struct NodePairHash {
+  std::size_t operator()(const NodePair& nodes) const noexcept {
+    const auto first = std::hash<const dd::vNode*>{}(nodes.first);
+    return first ^ (std::hash<const dd::vNode*>{}(nodes.second) + 0x9e3779b9U +
+                    (first << 6U) + (first >> 2U));
+  }
+};
+
+/**
+ * @brief Recursively compute the reduced density matrix of the given (sorted)
+ * qubits below a pair of vector nodes
+ * @details Entry `(x, y)` (row-major) sums the products of the amplitudes
+ * below the first node with the qubits set to `x` and the conjugated
+ * amplitudes below the second node with the qubits set to `y`. Both nodes are
+ * reached by the same path except for the given qubits.
+ */
+const DensityBlock& reducedDensityMatrix(
+    const dd::vNode* lhs, const dd::vNode* rhs,
+    const std::vector<qc::Qubit>& qubits,
+    std::unordered_map<NodePair, DensityBlock, NodePairHash>& memo) {
+  static const DensityBlock TERMINAL{1.};
+  if (dd::vNode::isTerminal(lhs) || dd::vNode::isTerminal(rhs)) {
+    return TERMINAL;
+  }
+  if (const auto it = memo.find({lhs, rhs}); it != memo.end()) {
+    return it->second;
+  }
+
+  const auto level = static_cast<qc::Qubit>(lhs->v);
+  const auto below = static_cast<std::size_t>(
+      std::lower_bound(qubits.begin(), qubits.end(), level) - qubits.begin());
+  const bool isQubit = std::binary_search(qubits.begin(), qubits.end(), level);
+  const auto subDim = std::size_t{1} << below;
+  const auto dim = subDim << (isQubit ? 1U : 0U);
+  DensityBlock rho(dim * dim, 0.);
+  for (std::size_t i = 0; i < lhs->e.size(); ++i) {
+    for (std::size_t j = 0; j < rhs->e.size(); ++j) {
+      // the paths only differ on the given qubits
+      if (!isQubit && i != j) {
+        continue;
+      }
+      const auto& left = lhs->e[i];
+      const auto& right = rhs->e[j];
+      if (left.w.exactlyZero() || right.w.exactlyZero()) {
+        continue;
+      }
+      const auto weight = static_cast<std::complex<dd::fp>>(left.w) *
+                          std::conj(static_cast<std::complex<dd::fp>>(right.w));
+      const auto& sub = reducedDensityMatrix(left.p, right.p, qubits, memo);
+      const auto row = isQubit ? (i << below) : 0U;
+      const auto col = isQubit ? (j << below) : 0U;
+      for (std::size_t r = 0; r < subDim; ++r) {
+        for (std::size_t c = 0; c < subDim; ++c) {
+          rho[((row + r) * dim) + col + c] += weight * sub[(r * subDim) + c];
+        }
+      }
+    }
+  }
+  return memo.emplace(NodePair{lhs, rhs}, std::move(rho)).first->second;
+}
+
+/**
+ * @brief Joint probabilities of the given (sorted) qubits after applying an
+ * operation that only acts on these qubits
+ * @details The reduced density matrix of the qubits evolves independently of
+ * the other qubits, so the state itself does not have to be multiplied.
+ */
+std::vector<dd::fp>
+jointProbabilitiesAfter(const dd::vEdge& state, const dd::mEdge& operation,
+                        const std::vector<qc::Qubit>& qubits,
+                        const std::size_t nQubits) {
+  std::unordered_map<NodePair, DensityBlock, NodePairHash> memo;
+  const auto& rho = reducedDensityMatrix(state.p, state.p, qubits, memo);
+  const auto norm = dd::ComplexNumbers::mag2(state.w);
+
+  const auto dim = std::size_t{1} << qubits.size();
+  const auto fullIndex = [&qubits](const std::size_t x) {
+    std::size_t index = 0U;
+    for (std::size_t j = 0; j < qubits.size(); ++j) {
+      index |= ((x >> j) & 1U) << qubits[j];
+    }
+    return index;
+  };
+  DensityBlock matrix(dim * dim);
+  for (std::size_t x = 0; x < dim; ++x) {
+    for (std::size_t y = 0; y < dim; ++y) {
+      matrix[(x * dim) + y] =
+          operation.getValueByIndex(nQubits, fullIndex(x), fullIndex(y));
+    }
+  }
+
+  std::vector<dd::fp> probabilities(dim, 0.);
+  for (std::size_t x = 0; x < dim; ++x) {
+    std::complex<dd::fp> probability = 0.;
+    for (std::size_t y = 0; y < dim; ++y) {
+      for (std::size_t z = 0; z < dim; ++z) {
+        probability += matrix[(x * dim) + y] * rho[(y * dim) + z] *
+                       std::conj(matrix[(x * dim) + z]);
+      }
+    }
+    probabilities[x] = std::max(0., probability.real() * norm);
+  }
+  return probabilities;
+}
 } // namespace
 
 namespace dd::ddsim {
 StochasticNoiseFunctionality::StochasticNoiseFunctionality(
-    dd::Package& dd, const std::size_t nq, const double gateNoiseProbability,
-    const double amplitudeDampingProb, const double multiQubitGateFactor,
+    dd::Package& dd, const std::size_t nq, const NoiseModel& model,
     const std::string& cNoiseEffects)
-    : package(&dd), nQubits(nq), dist(0.0, 1.0L),
-      noiseProbability(gateNoiseProbability),
-      noiseProbabilityMulti(gateNoiseProbability * multiQubitGateFactor),
-      sqrtAmplitudeDampingProbability(std::sqrt(amplitudeDampingProb)),
-      oneMinusSqrtAmplitudeDampingProbability(
-          std::sqrt(1 - amplitudeDampingProb)),
-      sqrtAmplitudeDampingProbabilityMulti(std::sqrt(gateNoiseProbability) *
-                                           multiQubitGateFactor),
-      oneMinusSqrtAmplitudeDampingProbabilityMulti(
-          std::sqrt(1 - (multiQubitGateFactor * amplitudeDampingProb))),
-      ampDampingTrue({0, sqrtAmplitudeDampingProbability, 0, 0}),
-      ampDampingTrueMulti({0, sqrtAmplitudeDampingProbabilityMulti, 0, 0}),
-      ampDampingFalse({1, 0, 0, oneMinusSqrtAmplitudeDampingProbability}),
-      ampDampingFalseMulti(
-          {1, 0, 0, oneMinusSqrtAmplitudeDampingProbabilityMulti}),
+    : package(&dd), nQubits(nq), dist(0.0, 1.0L), noiseModel(model),
       noiseEffects(initializeNoiseEffects(cNoiseEffects)),
       identityDD(dd::Package::makeIdent()),
       stochasticNoiseOperationCache(nq, StochasticNoiseKindEnd) {
-  sanityCheckOfNoiseProbabilities(gateNoiseProbability, amplitudeDampingProb,
-                                  multiQubitGateFactor);
+  qubitNoise.reserve(nq);
+  for (std::size_t q = 0; q < nq; ++q) {
+    const auto single = model.getQubitNoise(static_cast<qc::Qubit>(q), false);
+    const auto multi = model.getQubitNoise(static_cast<qc::Qubit>(q), true);
+    qubitNoise.emplace_back(QubitNoiseOperations{
+        .noiseProbability = single.noiseProbability,
+        .noiseProbabilityMulti = multi.noiseProbability,
+        .ampDampingTrue = {0, std::sqrt(single.amplitudeDampingProbability), 0,
+                           0},
+        .ampDampingTrueMulti = {0, std::sqrt(multi.amplitudeDampingProbability),
+                                0, 0},
+        .ampDampingFalse = {1, 0, 0,
+                            std::sqrt(1 - single.amplitudeDampingProbability)},
+        .ampDampingFalseMulti = {
+            1, 0, 0, std::sqrt(1 - multi.amplitudeDampingProbability)}});
+  }
   package->incRef(identityDD);
 }
 
+StochasticNoiseFunctionality::StochasticNoiseFunctionality(
+    dd::Package& dd, const std::size_t nq, const double gateNoiseProbability,
+    const double amplitudeDampingProb, const double multiQubitGateFactor,
+    const std::string& cNoiseEffects)
+    : StochasticNoiseFunctionality(dd, nq,
+                                   NoiseModel(gateNoiseProbability,
+                                              amplitudeDampingProb,
+                                              multiQubitGateFactor),
+                                   cNoiseEffects) {}
+
 double StochasticNoiseFunctionality::getNoiseProbability(
-    const bool multiQubitNoiseFlag) const {
-  return multiQubitNoiseFlag ? noiseProbabilityMulti : noiseProbability;
+    const qc::Qubit target, const bool multiQubitNoiseFlag) const {
+  const auto& noise = qubitNoise[target];
+  return multiQubitNoiseFlag ? noise.noiseProbabilityMulti
+                             : noise.noiseProbability;
 }
 
 StochasticNoiseFunctionality::StochasticNoiseKind
@@ -107,42 +278,190 @@ StochasticNoiseFunctionality::getAmplitudeDampingOperationType(
 }
 
 dd::GateMatrix StochasticNoiseFunctionality::getAmplitudeDampingOperationMatrix(
-    const bool multiQubitNoiseFlag, const bool amplitudeDampingFlag) const {
+    const qc::Qubit target, const bool multiQubitNoiseFlag,
+    const bool amplitudeDampingFlag) const {
+  const auto& noise = qubitNoise[target];
   if (amplitudeDampingFlag) {
-    return multiQubitNoiseFlag ? ampDampingTrueMulti : ampDampingTrue;
+    return multiQubitNoiseFlag ? noise.ampDampingTrueMulti
+                               : noise.ampDampingTrue;
   }
-  return multiQubitNoiseFlag ? ampDampingFalseMulti : ampDampingFalse;
+  return multiQubitNoiseFlag ? noise.ampDampingFalseMulti
+                             : noise.ampDampingFalse;
 }
 
 void StochasticNoiseFunctionality::applyNoiseOperation(
-    const std::set<qc::Qubit>& targets, dd::mEdge operation, dd::vEdge& state,
-    std::mt19937_64& generator) {
+    const std::set<qc::Qubit>& targets, const dd::mEdge operation,
+    dd::vEdge& state, std::mt19937_64& generator) {
+  applyNoiseOperation(targets, std::nullopt, operation, state, generator);
+}
+
+void StochasticNoiseFunctionality::applyNoiseOperation(
+    const qc::Operation& qcOperation, const dd::mEdge operation,
+    dd::vEdge& state, std::mt19937_64& generator) {
+  applyNoiseOperation(qcOperation.getUsedQubits(),
+                      noiseModel.getGateNoise(qcOperation), operation, state,
+                      generator);
+}
+
+void StochasticNoiseFunctionality::applyNoiseOperation(
+    const std::set<qc::Qubit>& targets,
+    const std::optional<double> gateNoiseProbability, dd::mEdge operation,
+    dd::vEdge& state, std::mt19937_64& generator) {
   const bool multiQubitOperation = targets.size() > 1;
+  const auto noiseProbability = [&](const qc::Qubit target) {
+    return gateNoiseProbability.value_or(
+        getNoiseProbability(target, multiQubitOperation));
+  };
+
+  if (std::find(noiseEffects.begin(), noiseEffects.end(), AmplitudeDamping) ==
+      noiseEffects.end()) {
+    // Without amplitude damping, the noise does not depend on the state. Hence,
+    // the noise of all targets is stacked onto the operation and applied with
+    // a single multiplication.
+    for (const auto& target : targets) {
+      operation = stackNoiseOperations(
+          operation, target,
+          sampleNoiseKinds(generator, noiseProbability(target),
+                           multiQubitOperation),
+          false, multiQubitOperation);
+    }
+    applyToState(operation, state);
+    return;
+  }
 
-  for (const auto& target : targets) {
-    auto stackedOperation = generateNoiseOperation(operation, target, generator,
-                                                   false, multiQubitOperation);
-    auto tmp = package->multiply(stackedOperation, state);
+  // The probability of amplitude damping on a target depends on the state and
+  // on the amplitude damping decisions for the previous targets. All of them
+  // follow from the joint probabilities of the targets after the operation.
+  const std::vector<qc::Qubit> targetList(targets.begin(), targets.end());
+  if (targetList.size() <= MAX_JOINT_NOISE_TARGETS) {
+    // The operation only acts on the targets, so their joint probabilities
+    // follow from the state before the operation. Hence, the noise is stacked
+    // onto the operation and applied with a single multiplication.
+    const auto weights = [&] {
+      return jointProbabilitiesAfter(state, operation, targetList, nQubits);
+    };
+    applyToState(stackDampedNoise(operation, targetList, weights,
+                                  gateNoiseProbability, multiQubitOperation,
+                                  generator),
+                 state);
+    return;
+  }
 
-    if (dd::ComplexNumbers::mag2(tmp.w) < dist(generator)) {
-      // The probability of amplitude damping does not only depend on the
-      // noise probability, but also the quantum state. Due to the
-      // normalization constraint of decision diagrams the probability for
-      // applying amplitude damping stands in the root edge weight, of the dd
-      // after the noise has been applied
-      stackedOperation = generateNoiseOperation(operation, target, generator,
-                                                true, multiQubitOperation);
-      tmp = package->multiply(stackedOperation, state);
+  // For larger operations, the size of the joint distribution is bounded by
+  // applying the operation first and the noise in groups of targets
+  applyToState(operation, state);
+  for (std::size_t start = 0; start < targetList.size();
+       start += MAX_JOINT_NOISE_TARGETS) {
+    const auto end =
+        std::min(start + MAX_JOINT_NOISE_TARGETS, targetList.size());
+    const std::vector<qc::Qubit> group(
+        targetList.begin() + static_cast<std::ptrdiff_t>(start),
+        targetList.begin() + static_cast<std::ptrdiff_t>(end));
+    applyToState(stackDampedNoise(
+                     identityDD, group,
+                     [&] { return jointProbabilities(state, group); },
+                     gateNoiseProbability, multiQubitOperation, generator),
+                 state);
+  }
+}
+
+dd::mEdge StochasticNoiseFunctionality::stackDampedNoise(
+    dd::mEdge operation, const std::vector<qc::Qubit>& group,
+    const std::function<std::vector<dd::fp>()>& computeWeights,
+    const std::optional<double> gateNoiseProbability,
+    const bool multiQubitOperation, std::mt19937_64& generator) {
+  // Condition the joint probabilities on the decision for target `i`
+  const auto condition = [](std::vector<dd::fp>& weights, const std::size_t i,
+                            const std::size_t flip,
+                            const dd::fp survivalProbability,
+                            const bool amplitudeDamping) {
+    for (std::size_t x = 0; x < weights.size(); ++x) {
+      const bool excited = (((x >> i) & 1U) ^ flip) != 0U;
+      if (amplitudeDamping) {
+        weights[x] = excited ? weights[x] : 0.;
+      } else if (excited) {
+        weights[x] *= survivalProbability;
+      }
+    }
+  };
+
+  // The joint probabilities are only computed once a decision depends on
+  // them. Until then, all decisions were against amplitude damping and are
+  // recorded to condition the probabilities later on.
+  std::optional<std::vector<dd::fp>> weights;
+  std::vector<std::tuple<std::size_t, std::size_t, dd::fp>> undamped;
+  for (std::size_t i = 0; i < group.size(); ++i) {
+    const auto kinds =
+        sampleNoiseKinds(generator,
+                         gateNoiseProbability.value_or(getNoiseProbability(
+                             group[i], multiQubitOperation)),
+                         multiQubitOperation);
+    const auto survivalProbability =
+        std::norm(getAmplitudeDampingOperationMatrix(
+            group[i], multiQubitOperation, false)[3]);
+
+    // Bit-flips applied before the amplitude damping change the state it
+    // acts on
+    std::size_t flip = 0U;
+    for (const auto kind : kinds) {
+      if (kind == StochATrue || kind == StochMultiATrue ||
+          kind == StochAFalse || kind == StochMultiAFalse) {
+        break;
+      }
+      if (kind == StochX || kind == StochY) {
+        flip ^= 1U;
+      }
+    }
+
+    // The probability that no amplitude damping happens is at least the
+    // survival probability, so most random numbers decide against it without
+    // looking at the state
+    const auto random = dist(generator);
+    bool amplitudeDamping = false;
+    if (random > survivalProbability) {
+      if (!weights) {
+        weights = computeWeights();
+        for (const auto& [j, jFlip, jSurvival] : undamped) {
+          condition(*weights, j, jFlip, jSurvival, false);
+        }
+      }
+      // Probability that no amplitude damping happens, i.e., the squared norm
+      // of the state after applying the "false" branch of amplitude damping
+      dd::fp total = 0.;
+      dd::fp noDamping = 0.;
+      for (std::size_t x = 0; x < weights->size(); ++x) {
+        total += (*weights)[x];
+        if ((((x >> i) & 1U) ^ flip) == 0U) {
+          noDamping += (*weights)[x];
+        } else {
+          noDamping += (*weights)[x] * survivalProbability;
+        }
+      }
+      amplitudeDamping = (total > 0. ? noDamping / total : 1.) < random;
     }
-    tmp.w = dd::Complex::one();
 
-    package->incRef(tmp);
-    package->decRef(state);
-    state = tmp;
+    if (weights) {
+      condition(*weights, i, flip, survivalProbability, amplitudeDamping);
+    } else {
+      undamped.emplace_back(i, flip, survivalProbability);
+    }
 
-    // I only need to apply the operations once
-    operation = identityDD;
+    operation = stackNoiseOperations(operation, group[i], kinds,
+                                     amplitudeDamping, multiQubitOperation);
   }
+  return operation;
+}
+
+void StochasticNoiseFunctionality::applyToState(const dd::mEdge& operation,
+                                                dd::vEdge& state) {
+  auto tmp = package->multiply(operation, state);
+  // Due to the normalization of decision diagrams, the root edge weight holds
+  // the norm of the state, which is reset after non-unitary noise operations
+  tmp.w = dd::Complex::one();
+
+  package->incRef(tmp);
+  package->decRef(state);
+  state = tmp;
 }
 
 dd::mEdge StochasticNoiseFunctionality::stackOperation(
@@ -154,57 +473,69 @@ dd::mEdge StochasticNoiseFunctionality::stackOperation(
     return package->multiply(*op, operation);
   }
   const auto gateDD = package->makeGateDD(matrix, target);
+  // the package is shared by all trajectories of a worker, so the cached gate
+  // has to survive garbage collections
+  package->incRef(gateDD);
   stochasticNoiseOperationCache.insert(kind, target, gateDD);
   return package->multiply(gateDD, operation);
 }
 
-dd::mEdge StochasticNoiseFunctionality::generateNoiseOperation(
-    dd::mEdge operation, const qc::Qubit target, std::mt19937_64& generator,
-    const bool amplitudeDamping, const bool multiQubitOperation) {
+std::vector<StochasticNoiseFunctionality::StochasticNoiseKind>
+StochasticNoiseFunctionality::sampleNoiseKinds(std::mt19937_64& generator,
+                                               const double noiseProbability,
+                                               const bool multiQubitOperation) {
+  std::vector<StochasticNoiseKind> kinds;
+  kinds.reserve(noiseEffects.size());
   for (const auto& noiseType : noiseEffects) {
-    const auto effect = noiseType == AmplitudeDamping
-                            ? getAmplitudeDampingOperationType(
-                                  multiQubitOperation, amplitudeDamping)
-                            : returnNoiseOperation(noiseType, dist(generator),
-                                                   multiQubitOperation);
-    switch (effect) {
+    kinds.emplace_back(
+        noiseType == AmplitudeDamping
+            ? getAmplitudeDampingOperationType(multiQubitOperation, false)
+            : returnNoiseOperation(noiseType, dist(generator),
+                                   noiseProbability));
+  }
+  return kinds;
+}
+
+dd::mEdge StochasticNoiseFunctionality::stackNoiseOperations(
+    dd::mEdge operation, const qc::Qubit target,
+    const std::vector<StochasticNoiseKind>& kinds, const bool amplitudeDamping,
+    const bool multiQubitOperation) {
+  for (const auto kind : kinds) {
+    switch (kind) {
     case StochIdentity: {
       continue;
     }
     case StochMultiATrue:
-    case StochATrue: {
-      const dd::GateMatrix amplitudeDampingMatrix =
-          getAmplitudeDampingOperationMatrix(multiQubitOperation, true);
-      operation =
-          stackOperation(operation, target, effect, amplitudeDampingMatrix);
-      break;
-    }
+    case StochATrue:
     case StochMultiAFalse:
     case StochAFalse: {
       const dd::GateMatrix amplitudeDampingMatrix =
-          getAmplitudeDampingOperationMatrix(multiQubitOperation, false);
-      operation =
-          stackOperation(operation, target, effect, amplitudeDampingMatrix);
+          getAmplitudeDampingOperationMatrix(target, multiQubitOperation,
+                                             amplitudeDamping);
+      operation = stackOperation(operation, target,
+                                 getAmplitudeDampingOperationType(
+                                     multiQubitOperation, amplitudeDamping),
+                                 amplitudeDampingMatrix);
       break;
     }
     case StochX: {
-      operation = stackOperation(operation, target, effect,
+      operation = stackOperation(operation, target, kind,
                                  dd::opToSingleQubitGateMatrix(qc::X));
       break;
     }
     case StochY: {
-      operation = stackOperation(operation, target, effect,
+      operation = stackOperation(operation, target, kind,
                                  dd::opToSingleQubitGateMatrix(qc::Y));
       break;
     }
     case StochZ: {
-      operation = stackOperation(operation, target, effect,
+      operation = stackOperation(operation, target, kind,
                                  dd::opToSingleQubitGateMatrix(qc::Z));
       break;
     }
     default: {
       throw std::runtime_error("Unknown noise operation '" +
-                               std::to_string(effect) + "'\n");
+                               std::to_string(kind) + "'\n");
     }
     }
   }
@@ -214,20 +545,20 @@ dd::mEdge StochasticNoiseFunctionality::generateNoiseOperation(
 StochasticNoiseFunctionality::StochasticNoiseKind
 StochasticNoiseFunctionality::returnNoiseOperation(
     const NoiseOperations noiseOperation, const double prob,
-    const bool multiQubitNoiseFlag) const {
+    const double noiseProbability) {
   switch (noiseOperation) {
   case Depolarization: {
-    if (prob >= (getNoiseProbability(multiQubitNoiseFlag) * 0.75)) {
+    if (prob >= (noiseProbability * 0.75)) {
       // prob > prob apply StochIdentity, also 25 % of the time when
       // depolarization is applied nothing happens
       return StochIdentity;
     }
-    if (prob < (getNoiseProbability(multiQubitNoiseFlag) * 0.25)) {
+    if (prob < (noiseProbability * 0.25)) {
       // if 0 < prob < 0.25 (25 % of the time when applying depolarization)
       // apply StochX
       return StochX;
     }
-    if (prob < (getNoiseProbability(multiQubitNoiseFlag) * 0.5)) {
+    if (prob < (noiseProbability * 0.5)) {
       // if 0.25 < prob < 0.5 (25 % of the time when applying depolarization)
       // apply StochY
       return StochY;
@@ -237,7 +568,7 @@ StochasticNoiseFunctionality::returnNoiseOperation(
     return StochZ;
   }
   case PhaseFlip: {
-    if (prob > getNoiseProbability(multiQubitNoiseFlag)) {
+    if (prob > noiseProbability) {
       return StochIdentity;
     }
     return StochZ;
@@ -251,6 +582,27 @@ StochasticNoiseFunctionality::returnNoiseOperation(
   }
 }
 
+DeterministicNoiseFunctionality::DeterministicNoiseFunctionality(
+    DensityDDPackage& dd, const std::size_t nq, const NoiseModel& model,
+    const std::string& cNoiseEffects)
+    : DeterministicNoiseFunctionality(
+          dd, nq, std::make_shared<const NoiseModel>(model), cNoiseEffects) {}
+
+DeterministicNoiseFunctionality::DeterministicNoiseFunctionality(
+    DensityDDPackage& dd, const std::size_t nq,
+    std::shared_ptr<const NoiseModel> model, const std::string& cNoiseEffects)
+    : package(&dd), nQubits(nq), noiseModel(std::move(model)),
+      noiseEffects(initializeNoiseEffects(cNoiseEffects)) {
+  singleQubitNoise.reserve(nq);
+  multiQubitNoise.reserve(nq);
+  for (std::size_t q = 0; q < nq; ++q) {
+    singleQubitNoise.emplace_back(
+        noiseModel->getQubitNoise(static_cast<qc::Qubit>(q), false));
+    multiQubitNoise.emplace_back(
+        noiseModel->getQubitNoise(static_cast<qc::Qubit>(q), true));
+  }
+}
+
 DeterministicNoiseFunctionality::DeterministicNoiseFunctionality(
     DensityDDPackage& dd, const std::size_t nq,
     const double noiseProbabilitySingleQubit,
@@ -258,10 +610,15 @@ DeterministicNoiseFunctionality::DeterministicNoiseFunctionality(
     const double ampDampProbSingleQubit, const double ampDampProbMultiQubit,
     const std::string& cNoiseEffects)
     : package(&dd), nQubits(nq),
-      noiseProbSingleQubit(noiseProbabilitySingleQubit),
-      noiseProbMultiQubit(noiseProbabilityMultiQubit),
-      ampDampingProbSingleQubit(ampDampProbSingleQubit),
-      ampDampingProbMultiQubit(ampDampProbMultiQubit),
+      noiseModel(std::make_shared<const NoiseModel>()),
+      singleQubitNoise(
+          nq, NoiseParameters{.noiseProbability = noiseProbabilitySingleQubit,
+                              .amplitudeDampingProbability =
+                                  ampDampProbSingleQubit}),
+      multiQubitNoise(
+          nq, NoiseParameters{.noiseProbability = noiseProbabilityMultiQubit,
+                              .amplitudeDampingProbability =
+                                  ampDampProbMultiQubit}),
       noiseEffects(initializeNoiseEffects(cNoiseEffects)) {
   sanityCheckOfNoiseProbabilities(noiseProbabilitySingleQubit,
                                   ampDampProbSingleQubit, 1);
@@ -269,13 +626,44 @@ DeterministicNoiseFunctionality::DeterministicNoiseFunctionality(
                                   ampDampProbMultiQubit, 1);
 }
 
+std::map<qc::Qubit, NoiseParameters> DeterministicNoiseFunctionality::getNoise(
+    const qc::Operation& qcOperation) const {
+  const auto usedQubits = qcOperation.getUsedQubits();
+  const auto& qubitNoise =
+      usedQubits.size() == 1 ? singleQubitNoise : multiQubitNoise;
+  const auto gateNoiseProbability = noiseModel->getGateNoise(qcOperation);
+  std::map<qc::Qubit, NoiseParameters> noise;
+  for (const auto qubit : usedQubits) {
+    auto parameters = qubitNoise[qubit];
+    if (gateNoiseProbability) {
+      parameters.noiseProbability = *gateNoiseProbability;
+    }
+    noise.emplace_hint(noise.end(), qubit, parameters);
+  }
+  return noise;
+}
+
 void DeterministicNoiseFunctionality::applyNoiseEffects(
     dEdge& originalEdge, const std::unique_ptr<qc::Operation>& qcOperation) {
-  const auto usedQubits = qcOperation->getUsedQubits();
+  applyNoiseEffects(originalEdge, getNoise(*qcOperation));
+}
+
+void DeterministicNoiseFunctionality::applyNoiseEffects(
+    dEdge& originalEdge, const std::map<qc::Qubit, NoiseParameters>& noise) {
+  if (noise.empty()) {
+    return;
+  }
   dCachedEdge nodeAfterNoise = {};
   dEdge::applyDmChangesToEdge(originalEdge);
-  nodeAfterNoise = applyNoiseEffects(originalEdge, usedQubits, false,
-                                     static_cast<dd::Qubit>(nQubits));
+  // the density matrix may span more qubits than the circuit (e.g., when
+  // classical bits are recorded in additional qubits)
+  const auto levels =
+      originalEdge.isTerminal()
+          ? nQubits
+          : std::max(nQubits, static_cast<std::size_t>(originalEdge.p->v) + 1U);
+  nodeAfterNoise =
+      applyNoiseEffects(originalEdge, noise, getNoiseChannel(noise), false,
+                        static_cast<dd::Qubit>(levels));
   dEdge::revertDmChangesToEdge(originalEdge);
   const auto r = dEdge{.p = nodeAfterNoise.p,
                        .w = package->package().cn.lookup(nodeAfterNoise.w)};
@@ -286,23 +674,53 @@ void DeterministicNoiseFunctionality::applyNoiseEffects(
   dEdge::setDensityMatrixTrue(originalEdge);
 }
 
+std::size_t DeterministicNoiseFunctionality::getNoiseChannel(
+    const std::map<qc::Qubit, NoiseParameters>& noise) {
+  std::vector<std::tuple<qc::Qubit, double, double>> signature;
+  signature.reserve(noise.size());
+  for (const auto& [qubit, parameters] : noise) {
+    signature.emplace_back(qubit, parameters.noiseProbability,
+                           parameters.amplitudeDampingProbability);
+  }
+  const auto [it, inserted] = noiseChannels.try_emplace(std::move(signature));
+  if (inserted) {
+    it->second = package->registerNoiseChannel();
+  }
+  return it->second;
+}
+
 dCachedEdge DeterministicNoiseFunctionality::applyNoiseEffects(
-    dEdge& originalEdge, const std::set<qc::Qubit>& usedQubits,
-    const bool firstPathEdge, const dd::Qubit level) {
+    dEdge& originalEdge, const std::map<qc::Qubit, NoiseParameters>& noise,
+    const std::size_t channel, const bool firstPathEdge,
+    const dd::Qubit level) {
 
   const auto originalWeight = static_cast<dd::ComplexValue>(originalEdge.w);
-  if (originalEdge.isZeroTerminal() || level <= *usedQubits.begin()) {
+  if (originalEdge.isZeroTerminal() || level <= noise.begin()->first) {
     return {originalEdge.p, originalWeight};
   }
 
+  // the result only depends on the node (including its density-matrix flags),
+  // not on the weight of the incoming edge
+  const auto key = NoiseComputeKey{
+      .channel = channel, .level = level, .firstPathEdge = firstPathEdge};
+  if (const auto* cached = package->lookupNoise(originalEdge.p, key);
+      cached != nullptr) {
+    auto e = *cached;
+    if (!e.w.exactlyZero()) {
+      e.w = e.w * originalWeight;
+    }
+    return e;
+  }
+
   auto originalCopy = dEdge{.p = originalEdge.p, .w = dd::Complex::one()};
   ArrayOfEdges newEdges{};
   const auto nextLevel = static_cast<dd::Qubit>(level - 1U);
-  if (originalEdge.isIdentity()) {
-    newEdges[0] =
-        applyNoiseEffects(originalCopy, usedQubits, firstPathEdge, nextLevel);
-    newEdges[3] =
-        applyNoiseEffects(originalCopy, usedQubits, firstPathEdge, nextLevel);
+  if (originalEdge.isIdentity() || originalEdge.p->v < nextLevel) {
+    // the qubit at this level is not represented by a node (identity)
+    newEdges[0] = applyNoiseEffects(originalCopy, noise, channel, firstPathEdge,
+                                    nextLevel);
+    newEdges[3] = applyNoiseEffects(originalCopy, noise, channel, firstPathEdge,
+                                    nextLevel);
   } else {
     for (std::size_t i = 0; i < newEdges.size(); i++) {
       auto& successor = originalCopy.p->e[i];
@@ -310,7 +728,8 @@ dCachedEdge DeterministicNoiseFunctionality::applyNoiseEffects(
         // If I am to the firstPathEdge I cannot minimize the necessary
         // operations anymore
         dEdge::applyDmChangesToEdge(successor);
-        newEdges[i] = applyNoiseEffects(successor, usedQubits, true, nextLevel);
+        newEdges[i] =
+            applyNoiseEffects(successor, noise, channel, true, nextLevel);
         dEdge::revertDmChangesToEdge(successor);
       } else if (i == 2) {
         // Since e[1] == e[2] (due to density matrix representation), I can skip
@@ -319,30 +738,25 @@ dCachedEdge DeterministicNoiseFunctionality::applyNoiseEffects(
       } else {
         dEdge::applyDmChangesToEdge(successor);
         newEdges[i] =
-            applyNoiseEffects(successor, usedQubits, false, nextLevel);
+            applyNoiseEffects(successor, noise, channel, false, nextLevel);
         dEdge::revertDmChangesToEdge(successor);
       }
     }
   }
-  if (std::ranges::any_of(usedQubits, [&nextLevel](const qc::Qubit qubit) {
-        return nextLevel == qubit;
-      })) {
+  if (const auto it = noise.find(static_cast<qc::Qubit>(nextLevel));
+      it != noise.end()) {
+    const auto& parameters = it->second;
     for (auto const& type : noiseEffects) {
       switch (type) {
       case AmplitudeDamping:
-        applyAmplitudeDampingToEdges(newEdges, (usedQubits.size() == 1)
-                                                   ? ampDampingProbSingleQubit
-                                                   : ampDampingProbMultiQubit);
+        applyAmplitudeDampingToEdges(newEdges,
+                                     parameters.amplitudeDampingProbability);
         break;
       case PhaseFlip:
-        applyPhaseFlipToEdges(newEdges, (usedQubits.size() == 1)
-                                            ? noiseProbSingleQubit
-                                            : noiseProbMultiQubit);
+        applyPhaseFlipToEdges(newEdges, parameters.noiseProbability);
         break;
       case Depolarization:
-        applyDepolarisationToEdges(newEdges, (usedQubits.size() == 1)
-                                                 ? noiseProbSingleQubit
-                                                 : noiseProbMultiQubit);
+        applyDepolarisationToEdges(newEdges, parameters.noiseProbability);
         break;
       case Identity:
         continue;
@@ -351,6 +765,7 @@ dCachedEdge DeterministicNoiseFunctionality::applyNoiseEffects(
   }
 
   auto e = package->makeDDNode(nextLevel, newEdges, firstPathEdge);
+  package->insertNoise(originalEdge.p, key, e);
   if (e.w.exactlyZero()) {
     return e;
   }
@@ -0,0 +1,209 @@
+/*
+ * Copyright (c) 2023 - 2026 Chair for Design Automation, TUM
+ * Copyright (c) 2025 - 2026 Munich Quantum Software Company GmbH
+ * All rights reserved.
+ *
+ * SPDX-License-Identifier: MIT
+ *
+ * Licensed under the MIT License
+ */
+
+#include "NoiseModel.hpp"
+
+#include "NoiseFunctionality.hpp"
+#include "ir/Definitions.hpp"
+#include "ir/operations/OpType.hpp"
+#include "ir/operations/Operation.hpp"
+
+#include <cmath>
+#include <map>
+#include <nlohmann/json.hpp>
+#include <optional>
+#include <stdexcept>
+#include <string>
+#include <utility>
+#include <vector>
+
+NoiseModel::NoiseModel(const double noiseProbability_,
+                       const std::optional<double> amplitudeDampingProbability_,
+                       const double multiQubitGateFactor_)
+    : noiseProbability(noiseProbability_),
+      amplitudeDampingProbability(amplitudeDampingProbability_
+                                      ? amplitudeDampingProbability_.value()
+                                      : noiseProbability_ * 2),
+      multiQubitGateFactor(multiQubitGateFactor_) {
+  dd::ddsim::sanityCheckOfNoiseProbabilities(
+      noiseProbability, amplitudeDampingProbability, multiQubitGateFactor);
+}
+
+void NoiseModel::setQubitNoise(
+    const qc::Qubit qubit, const std::optional<double> noiseProbability_,
+    const std::optional<double> amplitudeDampingProbability_) {
+  auto& noise = qubitNoise[qubit];
+  if (noiseProbability_) {
+    noise.noiseProbability = noiseProbability_;
+  }
+  if (amplitudeDampingProbability_) {
+    noise.amplitudeDampingProbability = amplitudeDampingProbability_;
+  }
+  const auto parameters = getQubitNoise(qubit, false);
+  dd::ddsim::sanityCheckOfNoiseProbabilities(
+      parameters.noiseProbability, parameters.amplitudeDampingProbability,
+      multiQubitGateFactor);
+}
+
+void NoiseModel::setQubitRelaxation(const qc::Qubit qubit, const double t1,
+                                    const double t2, const double gateTime) {
+  if (t1 <= 0 || t2 <= 0 || gateTime < 0) {
+    throw std::invalid_argument(
+        "Relaxation times must be positive and the gate time non-negative.");
+  }
+  if (t2 > 2 * t1) {
+    throw std::invalid_argument("T2 must not exceed 2 * T1 (qubit " +
+                                std::to_string(qubit) + ").");
+  }
+  const auto amplitudeDamping = 1 - std::exp(-gateTime / t1);
+  const auto dephasingRate = (1 / t2) - (1 / (2 * t1));
+  const auto phaseFlip = (1 - std::exp(-gateTime * dephasingRate)) / 2;
+  setQubitNoise(qubit, phaseFlip, amplitudeDamping);
+}
+
+void NoiseModel::setGateNoise(const qc::OpType type,
+                              std::vector<qc::Qubit> qubits,
+                              const double noiseProbability_) {
+  if (noiseProbability_ < 0 || noiseProbability_ > 1) {
+    throw std::invalid_argument("Gate noise probability " +
+                                std::to_string(noiseProbability_) +
+                                " is not a probability.");
+  }
+  if (qubits.empty()) {
+    throw std::invalid_argument("Gate noise requires at least one qubit.");
+  }
+  gateNoise[{type, std::move(qubits)}] = noiseProbability_;
+}
+
+NoiseParameters NoiseModel::getQubitNoise(const qc::Qubit qubit,
+                                          const bool multiQubitGate) const {
+  auto parameters = NoiseParameters{.noiseProbability = noiseProbability,
+                                    .amplitudeDampingProbability =
+                                        amplitudeDampingProbability};
+  if (const auto it = qubitNoise.find(qubit); it != qubitNoise.end()) {
+    parameters.noiseProbability =
+        it->second.noiseProbability.value_or(noiseProbability);
+    parameters.amplitudeDampingProbability =
+        it->second.amplitudeDampingProbability.value_or(
+            amplitudeDampingProbability);
+  }
+  if (multiQubitGate) {
+    parameters.noiseProbability *= multiQubitGateFactor;
+    parameters.amplitudeDampingProbability *= multiQubitGateFactor;
+  }
+  return parameters;
+}
+
+std::map<qc::Qubit, NoiseParameters>
+NoiseModel::getNoise(const qc::Operation& op) const {
+  const auto usedQubits = op.getUsedQubits();
+  const bool multiQubitGate = usedQubits.size() > 1;
+  const auto gateNoiseProbability = getGateNoise(op);
+  std::map<qc::Qubit, NoiseParameters> noise;
+  for (const auto qubit : usedQubits) {
+    auto parameters = getQubitNoise(qubit, multiQubitGate);
+    if (gateNoiseProbability) {
+      parameters.noiseProbability = *gateNoiseProbability;
+    }
+    noise.emplace(qubit, parameters);
+  }
+  return noise;
+}
+
+std::optional<double> NoiseModel::getGateNoise(const qc::Operation& op) const {
+  if (gateNoise.empty()) {
+    return std::nullopt;
+  }
+  if (const auto it = gateNoise.find({op.getType(), gateQubits(op)});
+      it != gateNoise.end()) {
+    return it->second;
+  }
+  return std::nullopt;
+}
+
+std::vector<qc::Qubit> NoiseModel::gateQubits(const qc::Operation& op) {
+  std::vector<qc::Qubit> qubits;
+  qubits.reserve(op.getNqubits());
+  for (const auto& control : op.getControls()) {
+    qubits.emplace_back(control.qubit);
+  }
+  for (const auto& target : op.getTargets()) {
+    qubits.emplace_back(target);
+  }
+  return qubits;
+}
+
+NoiseModel NoiseModel::fromJson(const nlohmann::json& j) {
+  auto model = NoiseModel(
+      j.value("noise_probability", DEFAULT_NOISE_PROBABILITY),
+      j.contains("amp_damping_probability")
+          ? std::optional{j["amp_damping_probability"].get<double>()}
+          : std::nullopt,
+      j.value("multi_qubit_gate_factor", DEFAULT_MULTI_QUBIT_GATE_FACTOR));
+
+  for (const auto& qubit : j.value("qubits", nlohmann::json::array())) {
+    const auto q = qubit.at("qubit").get<qc::Qubit>();
+    if (qubit.contains("t1") || qubit.contains("t2")) {
+      model.setQubitRelaxation(q, qubit.at("t1").get<double>(),
+                               qubit.at("t2").get<double>(),
+                               qubit.at("gate_time").get<double>());
+    }
+    std::optional<double> noise;
+    std::optional<double> amplitudeDamping;
+    if (qubit.contains("noise_probability")) {
+      noise = qubit["noise_probability"].get<double>();
+    }
+    if (qubit.contains("amp_damping_probability")) {
+      amplitudeDamping = qubit["amp_damping_probability"].get<double>();
+    }
+    if (noise || amplitudeDamping) {
+      model.setQubitNoise(q, noise, amplitudeDamping);
+    }
+  }
+
+  for (const auto& gate : j.value("gates", nlohmann::json::array())) {
+    model.setGateNoise(qc::opTypeFromString(gate.at("gate").get<std::string>()),
+                       gate.at("qubits").get<std::vector<qc::Qubit>>(),
+                       gate.at("noise_probability").get<double>());
+  }
+  return model;
+}
+
+nlohmann::json NoiseModel::json() const {
+  nlohmann::json j{};
+  j["noise_probability"] = noiseProbability;
+  j["amp_damping_probability"] = amplitudeDampingProbability;
+  j["multi_qubit_gate_factor"] = multiQubitGateFactor;
+  if (!qubitNoise.empty()) {
+    auto& qubits = j["qubits"];
+    for (const auto& [qubit, noise] : qubitNoise) {
+      nlohmann::json entry{};
+      entry["qubit"] = qubit;
+      if (noise.noiseProbability) {
+        entry["noise_probability"] = *noise.noiseProbability;
+      }
+      if (noise.amplitudeDampingProbability) {
+        entry["amp_damping_probability"] = *noise.amplitudeDampingProbability;
+      }
+      qubits.emplace_back(entry);
+    }
+  }
+  if (!gateNoise.empty()) {
+    auto& gates = j["gates"];
+    for (const auto& [key, probability] : gateNoise) {
+      nlohmann::json entry{};
+      entry["gate"] = qc::toString(key.first);
+      entry["qubits"] = key.second;
+      entry["noise_probability"] = probability;
+      gates.emplace_back(entry);
+    }
+  }
+  return j;
+}
@@ -11,25 +11,303 @@
 #include "PathSimulator.hpp"
 
 #include "dd/DDDefinitions.hpp"
+#include "dd/Edge.hpp"
 #include "dd/Node.hpp"
 #include "dd/Operations.hpp"
 #include "dd/Package.hpp"
 #include "dd/StateGeneration.hpp"
 #include "ir/Definitions.hpp"
 #include "ir/QuantumComputation.hpp"
+#include "ir/operations/OpType.hpp"
 
+#include <algorithm>
+#include <array>
+#include <chrono>
 #include <cmath>
 #include <cstddef>
 #include <iterator>
+#include <limits>
 #include <list>
 #include <map>
+#include <memory>
+#include <mutex>
+#include <numeric>
+#include <optional>
+#include <queue>
+#include <random>
 #include <set>
 #include <stdexcept>
 #include <string>
+#include <tuple>
+#include <unordered_map>
 #include <utility>
 #include <variant>
 #include <vector>
 
+namespace {
+/// Copy a DD into another package, creating every node only once (unlike
+/// `Package::transfer`, this also supports matrix DDs)
+template <class Node>
+dd::Edge<Node>
+copyToPackage(const dd::Edge<Node>& edge, dd::Package& package,
+              std::unordered_map<const Node*, dd::Edge<Node>>& copies) {
+  if (edge.isTerminal()) {
+    return {edge.p, package.cn.lookup(edge.w)};
+  }
+  auto it = copies.find(edge.p);
+  if (it == copies.end()) {
+    std::array<dd::Edge<Node>, std::tuple_size_v<decltype(Node::e)>> edges{};
+    for (std::size_t i = 0; i < edges.size(); ++i) {
+      edges[i] = copyToPackage(edge.p->e[i], package, copies);
+    }
+    it = copies.emplace(edge.p, package.makeDDNode(edge.p->v, edges)).first;
+  }
+  return {it->second.p, package.cn.lookup(edge.w * it->second.w)};
+}
+
+constexpr auto NO_BLOCK = std::numeric_limits<std::size_t>::max();
+
+/// Qubits entangled by the gates of a part of the circuit together with an
+/// estimate of the logarithm of the number of nodes per level of their DD
+struct CostBlock {
+  std::vector<qc::Qubit> qubits;
+  double rank{};
+  double size{};
+};
+
+/// Estimated structure of the DD of a part of the simulation path
+struct CostSummary {
+  std::vector<CostBlock> blocks;
+  bool isVector{};
+  double size{};
+};
+
+/// Estimate the number of nodes of a DD over `nqubits` qubits, assuming that
+/// every level holds at most `2^rank` (vectors) or `4^rank` (matrices) nodes
+double estimateBlockSize(const std::size_t nqubits, const double rank,
+                         const bool isVector) {
+  // nodes of matrices have four successors, nodes of vectors only two
+  const auto base = isVector ? 2. : 4.;
+  double size = 0.;
+  for (std::size_t level = 0; level < nqubits; ++level) {
+    size += std::pow(base, std::min(static_cast<double>(level), rank));
+  }
+  return size;
+}
+
+CostSummary leafSummary(const qc::QuantumComputation& qc,
+                        const std::size_t id) {
+  CostSummary summary{};
+  if (id == 0) {
+    // the initial state is a product state
+    summary.isVector = true;
+    for (qc::Qubit qubit = 0; qubit < qc.getNqubits(); ++qubit) {
+      summary.blocks.push_back({.qubits = {qubit}, .rank = 0., .size = 1.});
+    }
+    summary.size = static_cast<double>(qc.getNqubits());
+    return summary;
+  }
+
+  const auto& op = qc.at(id - 1);
+  if (!op->isUnitary() || op->getType() == qc::Barrier) {
+    return summary;
+  }
+  const auto usedQubits = op->getUsedQubits();
+  if (usedQubits.empty()) {
+    return summary;
+  }
+  // single-qubit gates do not entangle and controls only add a linear number
+  // of nodes
+  auto rank = 0.;
+  if (usedQubits.size() > 1) {
+    rank = static_cast<double>(op->isStandardOperation() ? op->getNtargets()
+                                                         : usedQubits.size());
+  }
+  summary.size = estimateBlockSize(usedQubits.size(), rank, false);
+  summary.blocks.push_back({.qubits = {usedQubits.begin(), usedQubits.end()},
+                            .rank = rank,
+                            .size = summary.size});
+  return summary;
+}
+
+/// Join the summaries of two parts of the path and add the estimated cost of
+/// multiplying their DDs. `owner` maps every qubit to `NO_BLOCK` and is
+/// restored before returning.
+CostSummary joinSummaries(const CostSummary& left, const CostSummary& right,
+                          std::vector<std::size_t>& owner, double& cost) {
+  const auto nleft = left.blocks.size();
+  std::vector<std::size_t> parent(nleft + right.blocks.size());
+  std::iota(parent.begin(), parent.end(), 0U);
+  const auto find = [&parent](std::size_t i) {
+    while (parent[i] != i) {
+      parent[i] = parent[parent[i]];
+      i = parent[i];
+    }
+    return i;
+  };
+
+  for (std::size_t i = 0; i < nleft; ++i) {
+    for (const auto qubit : left.blocks[i].qubits) {
+      owner[qubit] = i;
+    }
+  }
+  for (std::size_t j = 0; j < right.blocks.size(); ++j) {
+    for (const auto qubit : right.blocks[j].qubits) {
+      if (owner[qubit] != NO_BLOCK) {
+        parent[find(nleft + j)] = find(owner[qubit]);
+      }
+    }
+  }
+  for (const auto& block : left.blocks) {
+    for (const auto qubit : block.qubits) {
+      owner[qubit] = NO_BLOCK;
+    }
+  }
+
+  CostSummary result{
+      .blocks = {}, .isVector = left.isVector || right.isVector, .size = 0.};
+  std::vector<std::size_t> blockOf(parent.size(), NO_BLOCK);
+  std::vector<std::pair<double, double>> operandSizes{};
+  for (std::size_t i = 0; i < parent.size(); ++i) {
+    const auto root = find(i);
+    if (blockOf[root] == NO_BLOCK) {
+      blockOf[root] = result.blocks.size();
+      result.blocks.emplace_back();
+      operandSizes.emplace_back(0., 0.);
+    }
+    const auto& block = i < nleft ? left.blocks[i] : right.blocks[i - nleft];
+    auto& joined = result.blocks[blockOf[root]];
+    joined.qubits.insert(joined.qubits.end(), block.qubits.begin(),
+                         block.qubits.end());
+    joined.rank += block.rank;
+    auto& [leftSize, rightSize] = operandSizes[blockOf[root]];
+    (i < nleft ? leftSize : rightSize) += block.size;
+  }
+
+  for (std::size_t b = 0; b < result.blocks.size(); ++b) {
+    auto& block = result.blocks[b];
+    std::ranges::sort(block.qubits);
+    const auto [first, last] = std::ranges::unique(block.qubits);
+    block.qubits.erase(first, last);
+    block.rank = std::min(block.rank, static_cast<double>(block.qubits.size()));
+    block.size =
+        estimateBlockSize(block.qubits.size(), block.rank, result.isVector);
+    result.size += block.size;
+    // blocks only present in one of the operands are left untouched
+    cost += operandSizes[b].first * operandSizes[b].second;
+  }
+  return result;
+}
+
+double
+estimatePathCost(const std::vector<CostSummary>& leaves,
+                 const PathSimulator::SimulationPath::Components& components,
+                 std::vector<std::size_t>& owner) {
+  std::vector<CostSummary> summaries(leaves);
+  summaries.resize(leaves.size() + components.size());
+  double cost = 0.;
+  for (std::size_t i = 0; i < components.size(); ++i) {
+    const auto [leftID, rightID] = components[i];
+    summaries[leaves.size() + i] =
+        joinSummaries(summaries.at(leftID), summaries.at(rightID), owner, cost);
+    summaries[leftID] = {};
+    summaries[rightID] = {};
+  }
+  return cost;
+}
+
+/// Contract neighboring parts of the circuit, always choosing the pair with
+/// the smallest estimated cost plus growth of the DD. With `randomize`, the
+/// scores are perturbed to explore different paths. Returns nothing if the
+/// deadline passes before the path is complete.
+std::optional<std::pair<PathSimulator::SimulationPath::Components, double>>
+contractGreedily(const std::vector<CostSummary>& leaves,
+                 std::vector<std::size_t>& owner, std::mt19937_64& mt,
+                 const bool randomize,
+                 const std::chrono::steady_clock::time_point deadline) {
+  // contractions between two looks at the clock
+  constexpr std::size_t deadlineCheckInterval = 64;
+  const auto nleaves = leaves.size();
+  std::vector<CostSummary> parts(leaves);
+  std::vector<std::size_t> ids(nleaves);
+  std::iota(ids.begin(), ids.end(), 0U);
+  std::vector<std::size_t> next(nleaves);
+  std::vector<std::size_t> prev(nleaves);
+  for (std::size_t i = 0; i < nleaves; ++i) {
+    next[i] = i + 1 < nleaves ? i + 1 : NO_BLOCK;
+    prev[i] = i > 0 ? i - 1 : NO_BLOCK;
+  }
+  // pairs become stale once one of their parts has been joined
+  std::vector<std::size_t> version(nleaves, 0);
+
+  struct Candidate {
+    double score;
+    std::size_t left;
+    std::size_t leftVersion;
+    std::size_t rightVersion;
+  };
+  const auto worse = [](const Candidate& a, const Candidate& b) {
+    return a.score > b.score || (a.score == b.score && a.left > b.left);
+  };
+  std::priority_queue<Candidate, std::vector<Candidate>, decltype(worse)>
+      candidates(worse);
+  std::uniform_real_distribution<double> noise(0., 1.);
+  const auto addCandidate = [&](const std::size_t left) {
+    const auto right = next[left];
+    double cost = 0.;
+    const auto joined = joinSummaries(parts[left], parts[right], owner, cost);
+    const auto growth = joined.size - parts[left].size - parts[right].size;
+    auto score = cost + growth;
+    if (randomize) {
+      score += noise(mt) * (cost + joined.size);
+    }
+    candidates.push({score, left, version[left], version[right]});
+  };
+  for (std::size_t i = 0; i + 1 < nleaves; ++i) {
+    addCandidate(i);
+  }
+
+  PathSimulator::SimulationPath::Components components{};
+  components.reserve(nleaves - 1);
+  double totalCost = 0.;
+  auto nextID = nleaves;
+  while (components.size() + 1 < nleaves) {
+    if (components.size() % deadlineCheckInterval ==
+            deadlineCheckInterval - 1 &&
+        std::chrono::steady_clock::now() >= deadline) {
+      return std::nullopt;
+    }
+    const auto candidate = candidates.top();
+    candidates.pop();
+    const auto left = candidate.left;
+    const auto right = next[left];
+    if (version[left] != candidate.leftVersion || right == NO_BLOCK ||
+        version[right] != candidate.rightVersion) {
+      continue;
+    }
+
+    parts[left] = joinSummaries(parts[left], parts[right], owner, totalCost);
+    parts[right] = {};
+    components.emplace_back(ids[left], ids[right]);
+    ids[left] = nextID++;
+    next[left] = next[right];
+    if (next[left] != NO_BLOCK) {
+      prev[next[left]] = left;
+    }
+    ++version[left];
+    ++version[right];
+
+    if (prev[left] != NO_BLOCK) {
+      addCandidate(prev[left]);
+    }
+    if (next[left] != NO_BLOCK) {
+      addCandidate(left);
+    }
+  }
+  return std::pair{std::move(components), totalCost};
+}
+} // namespace
+
 PathSimulator::SimulationPath::SimulationPath(std::size_t nleaves_,
                                               Components components_,
                                               const qc::QuantumComputation* qc_,
@@ -410,6 +688,125 @@ void PathSimulator::generateGatecostSimulationPath(
   setSimulationPath(components, true);
 }
 
+void PathSimulator::generateOptimizedSimulationPath(const double planningTime,
+                                                    const std::size_t seed) {
+  // randomized restarts without an improvement before the search gives up
+  constexpr std::size_t maxStaleRestarts = 32;
+  // randomized restarts with a seed, which keeps the path reproducible unless
+  // the planning time runs out first
+  constexpr std::size_t maxSeededRestarts = 256;
+  const auto deadline =
+      std::chrono::steady_clock::now() +
+      std::chrono::duration_cast<std::chrono::steady_clock::duration>(
+          std::chrono::duration<double>(planningTime));
+
+  const std::size_t nleaves = qc->getNops() + 1;
+  if (nleaves == 1) {
+    setSimulationPath(SimulationPath::Components{}, true);
+    return;
+  }
+  std::vector<CostSummary> leaves{};
+  leaves.reserve(nleaves);
+  for (std::size_t id = 0; id < nleaves; ++id) {
+    leaves.emplace_back(leafSummary(*qc, id));
+  }
+  std::vector<std::size_t> owner(qc->getNqubits(), NO_BLOCK);
+
+  // the fixed strategies serve as a baseline
+  generateSequentialSimulationPath();
+  auto best = simulationPath.components;
+  auto bestCost = estimatePathCost(leaves, best, owner);
+  generatePairwiseRecursiveGroupingSimulationPath();
+  if (const auto cost =
+          estimatePathCost(leaves, simulationPath.components, owner);
+      cost < bestCost) {
+    best = simulationPath.components;
+    bestCost = cost;
+  }
+
+  // the deterministic greedy run always completes
+  std::mt19937_64 mt(seed);
+  if (auto greedy =
+          contractGreedily(leaves, owner, mt, false,
+                           std::chrono::steady_clock::time_point::max());
+      greedy && greedy->second < bestCost) {
+    best = std::move(greedy->first);
+    bestCost = greedy->second;
+  }
+
+  const auto maxRestarts =
+      seed != 0 ? maxSeededRestarts : std::numeric_limits<std::size_t>::max();
+  for (std::size_t restart = 0, stale = 0;
+       restart < maxRestarts && stale < maxStaleRestarts &&
+       std::chrono::steady_clock::now() < deadline;
+       ++restart) {
+    auto randomized = contractGreedily(leaves, owner, mt, true, deadline);
+    if (!randomized) {
+      break;
+    }
+    if (randomized->second < bestCost) {
+      best = std::move(randomized->first);
+      bestCost = randomized->second;
+      stale = 0;
+    } else {
+      ++stale;
+    }
+  }
+  setSimulationPath(best, true);
+}
+
+double PathSimulator::estimateSimulationPathCost() const {
+  std::vector<CostSummary> leaves{};
+  leaves.reserve(simulationPath.nleaves);
+  for (std::size_t id = 0; id < simulationPath.nleaves; ++id) {
+    leaves.emplace_back(leafSummary(*qc, id));
+  }
+  std::vector<std::size_t> owner(qc->getNqubits(), NO_BLOCK);
+  return estimatePathCost(leaves, simulationPath.components, owner);
+}
+
+void PathSimulator::assignPackages() {
+  const auto& steps = simulationPath.steps;
+  packageOf.assign(steps.size(), 0);
+  packages.clear();
+  // the first package is the one of the simulator
+  packages.emplace_back();
+
+  if (nthreads > 1) {
+    const auto nleaves = simulationPath.nleaves;
+    // number of contractions in the subtree of every step
+    std::vector<std::size_t> subtreeSize(steps.size(), 0);
+    for (auto id = nleaves; id < steps.size(); ++id) {
+      const auto [leftID, rightID] = steps.at(id).children;
+      subtreeSize[id] = 1 + subtreeSize.at(leftID) + subtreeSize.at(rightID);
+    }
+    const auto minSubtreeSize =
+        std::max<std::size_t>(2, (steps.size() - nleaves) / (4 * nthreads));
+    const auto maxPackages = 2 * nthreads;
+
+    // parents have larger IDs than their children
+    for (auto id = steps.size(); id-- > nleaves;) {
+      const auto [leftID, rightID] = steps.at(id).children;
+      packageOf.at(leftID) = packageOf.at(id);
+      // only subtrees that can run concurrently to each other are separated
+      if (subtreeSize.at(leftID) >= minSubtreeSize &&
+          subtreeSize.at(rightID) >= minSubtreeSize &&
+          packages.size() < maxPackages) {
+        packageOf.at(rightID) = packages.size();
+        packages.emplace_back(std::make_unique<dd::Package>(qc->getNqubits()));
+      } else {
+        packageOf.at(rightID) = packageOf.at(id);
+      }
+    }
+  }
+  packageMutexes = std::vector<std::mutex>(packages.size());
+}
+
+dd::Package& PathSimulator::getPackage(const std::size_t stepID) {
+  const auto idx = packageOf.at(stepID);
+  return idx == 0 ? *dd : *packages.at(idx);
+}
+
 void PathSimulator::constructTaskGraph() {
   const auto& path = simulationPath.components;
   const auto& steps = simulationPath.steps;
@@ -420,23 +817,26 @@ void PathSimulator::constructTaskGraph() {
   }
 
   const std::size_t nleaves = qc->getNops() + 1;
+  assignPackages();
 
   for (std::size_t i = 0; i < path.size(); ++i) {
     const auto [leftID, rightID] = path.at(i);
     const auto& resultStep = steps.at(nleaves + i);
+    // the operands are constructed in the package of the step using them
+    auto& package = getPackage(resultStep.id);
 
     // basic construction steps of matrices and initial state
     if (leftID < nleaves) {
       if (leftID == 0) {
         // initial state
-        dd::VectorDD zeroState =
-            dd::makeZeroState(static_cast<dd::Qubit>(qc->getNqubits()), *dd);
-        dd->incRef(zeroState);
+        dd::VectorDD zeroState = dd::makeZeroState(
+            static_cast<dd::Qubit>(qc->getNqubits()), package);
+        package.incRef(zeroState);
         results.emplace(leftID, zeroState);
       } else {
         const auto& op = qc->at(leftID - 1);
-        dd::MatrixDD opDD = dd::getDD(*op, *dd);
-        dd->incRef(opDD);
+        dd::MatrixDD opDD = dd::getDD(*op, package);
+        package.incRef(opDD);
         results.emplace(leftID, opDD);
       }
     }
@@ -447,8 +847,8 @@ void PathSimulator::constructTaskGraph() {
                                  "of the simulation path member.");
       }
       const auto& op = qc->at(rightID - 1);
-      dd::MatrixDD opDD = dd::getDD(*op, *dd);
-      dd->incRef(opDD);
+      dd::MatrixDD opDD = dd::getDD(*op, package);
+      package.incRef(opDD);
       results.emplace(rightID, opDD);
     }
 
@@ -490,8 +890,38 @@ void PathSimulator::addSimulationTask(std::size_t leftID, std::size_t rightID,
     /// Enable the following statement for printing execution order
     //            std::cout << "Executing " << leftID << " " << rightID << " ->
     //            " << resultID << std::endl;
-    const auto& leftDD = results.at(leftID);
-    const auto& rightDD = results.at(rightID);
+    auto& package = getPackage(resultID);
+    const std::scoped_lock packageLock(
+        packageMutexes.at(packageOf.at(resultID)));
+
+    std::variant<dd::VectorDD, dd::MatrixDD> leftDD;
+    std::variant<dd::VectorDD, dd::MatrixDD> rightDD;
+    {
+      const std::scoped_lock lock(resultsMutex);
+      leftDD = results.at(leftID);
+      rightDD = results.at(rightID);
+    }
+
+    // move the result of a subtree contracted in its own package into the
+    // package of this step and release the other package
+    const auto adopt = [this, &package, resultID](
+                           const std::size_t id,
+                           std::variant<dd::VectorDD, dd::MatrixDD>& operand) {
+      const auto idx = packageOf.at(id);
+      if (idx == packageOf.at(resultID)) {
+        return;
+      }
+      std::visit(
+          [&package]<class Node>(dd::Edge<Node>& edge) {
+            std::unordered_map<const Node*, dd::Edge<Node>> copies;
+            edge = copyToPackage(edge, package, copies);
+            package.incRef(edge);
+          },
+          operand);
+      packages.at(idx).reset();
+    };
+    adopt(leftID, leftDD);
+    adopt(rightID, rightDD);
 
     const auto leftIsVector = std::holds_alternative<dd::VectorDD>(leftDD);
     const auto rightIsVector = std::holds_alternative<dd::VectorDD>(rightDD);
@@ -501,26 +931,30 @@ void PathSimulator::addSimulationTask(std::size_t leftID, std::size_t rightID,
                                "is a vector. This should not happen!");
     }
 
+    std::variant<dd::VectorDD, dd::MatrixDD> result;
     if (leftIsVector) {
       // matrix-vector multiplication
       const auto& vector = *std::get_if<dd::VectorDD>(&leftDD);
       const auto& matrix = *std::get_if<dd::MatrixDD>(&rightDD);
-      auto resultDD = dd->multiply(matrix, vector);
-      dd->incRef(resultDD);
-      dd->decRef(vector);
-      dd->decRef(matrix);
-      results.emplace(resultID, resultDD);
+      auto resultDD = package.multiply(matrix, vector);
+      package.incRef(resultDD);
+      package.decRef(vector);
+      package.decRef(matrix);
+      result = resultDD;
     } else {
       // matrix-matrix multiplication
       const auto& leftMatrix = *std::get_if<dd::MatrixDD>(&leftDD);
       const auto& rightMatrix = *std::get_if<dd::MatrixDD>(&rightDD);
-      auto resultDD = dd->multiply(rightMatrix, leftMatrix);
-      dd->incRef(resultDD);
-      dd->decRef(leftMatrix);
-      dd->decRef(rightMatrix);
-      results.emplace(resultID, resultDD);
+      auto resultDD = package.multiply(rightMatrix, leftMatrix);
+      package.incRef(resultDD);
+      package.decRef(leftMatrix);
+      package.decRef(rightMatrix);
+      result = resultDD;
     }
-    dd->garbageCollect();
+    package.garbageCollect();
+
+    const std::scoped_lock lock(resultsMutex);
+    results.emplace(resultID, result);
     results.erase(leftID);
     results.erase(rightID);
   };
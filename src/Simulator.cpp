@@ -17,6 +17,7 @@
 #include "dd/Node.hpp"
 #include "dd/Package.hpp"
 #include "dd/RealNumber.hpp"
+#include "ir/Definitions.hpp"
 
 #include <algorithm>
 #include <array>
@@ -33,6 +34,7 @@
 #include <queue>
 #include <random>
 #include <set>
+#include <span>
 #include <stdexcept>
 #include <string>
 #include <utility>
@@ -40,6 +42,150 @@
 
 using CN = dd::ComplexNumbers;
 
+namespace {
+using DenseMatrix = std::vector<std::complex<dd::fp>>;
+
+/// The contribution of two sub-vectors to the reduced density matrix, where
+/// bit `r` of the row and column indices corresponds to the `r`-th kept qubit
+/// (in ascending order) below the given level
+DenseMatrix contract(const dd::vEdge& x, const dd::vEdge& y,
+                     const std::size_t level, const std::vector<bool>& keep,
+                     std::map<std::pair<const dd::vNode*, const dd::vNode*>,
+                              DenseMatrix>& memo) {
+  const auto kept = static_cast<std::size_t>(std::count(
+      keep.begin(), keep.begin() + static_cast<std::ptrdiff_t>(level), true));
+  const auto dim = std::size_t{1} << kept;
+  if (x.w.exactlyZero() || y.w.exactlyZero()) {
+    return DenseMatrix(dim * dim);
+  }
+  const auto weight = static_cast<std::complex<dd::fp>>(x.w) *
+                      std::conj(static_cast<std::complex<dd::fp>>(y.w));
+  if (level == 0) {
+    return {weight};
+  }
+
+  auto it = memo.find({x.p, y.p});
+  if (it == memo.end()) {
+    const auto nextLevel = level - 1U;
+    DenseMatrix result(dim * dim);
+    if (keep[nextLevel]) {
+      // the kept qubit is the highest bit of the indices
+      const auto half = dim / 2;
+      for (std::size_t i = 0; i < dd::RADIX; ++i) {
+        for (std::size_t j = 0; j < dd::RADIX; ++j) {
+          const auto block =
+              contract(x.p->e[i], y.p->e[j], nextLevel, keep, memo);
+          for (std::size_t r = 0; r < half; ++r) {
+            std::copy_n(
+                block.begin() + static_cast<std::ptrdiff_t>(r * half), half,
+                result.begin() + static_cast<std::ptrdiff_t>(
+                                     ((i * half) + r) * dim + (j * half)));
+          }
+        }
+      }
+    } else {
+      for (std::size_t i = 0; i < dd::RADIX; ++i) {
+        const auto block =
+            contract(x.p->e[i], y.p->e[i], nextLevel, keep, memo);
+        std::transform(result.begin(), result.end(), block.begin(),
+                       result.begin(), std::plus<>{});
+      }
+    }
+    it = memo.emplace(std::pair{x.p, y.p}, std::move(result)).first;
+  }
+
+  auto result = it->second;
+  for (auto& entry : result) {
+    entry *= weight;
+  }
+  return result;
+}
+
+/// Write the amplitudes of a sub-vector to its block of the buffer, which is
+/// expected to be zero-initialized
+void writeAmplitudes(const dd::vEdge& edge, const std::size_t level,
+                     const std::complex<dd::fp>& amplitude,
+                     const std::size_t index,
+                     std::span<std::complex<dd::fp>> amplitudes) {
+  if (edge.w.exactlyZero()) {
+    return;
+  }
+  const auto weight = amplitude * static_cast<std::complex<dd::fp>>(edge.w);
+  if (level == 0 || edge.isTerminal()) {
+    amplitudes[index] = weight;
+    return;
+  }
+  const auto nextLevel = level - 1U;
+  writeAmplitudes(edge.p->e[0], nextLevel, weight, index, amplitudes);
+  writeAmplitudes(edge.p->e[1], nextLevel, weight,
+                  index | (std::size_t{1} << nextLevel), amplitudes);
+}
+} // namespace
+
+void Simulator::writeStateVector(
+    const std::span<std::complex<dd::fp>> amplitudes) const {
+  const auto numQubits = getNumberOfQubits();
+  if (numQubits >= 60) {
+    throw std::range_error("The state vector only supports less than 60 "
+                           "qubits.");
+  }
+  if (amplitudes.size() != (std::size_t{1} << numQubits)) {
+    throw std::invalid_argument("A buffer of " +
+                                std::to_string(amplitudes.size()) +
+                                " amplitudes does not match the state of " +
+                                std::to_string(numQubits) + " qubits.");
+  }
+  std::ranges::fill(amplitudes, std::complex<dd::fp>{0., 0.});
+  writeAmplitudes(rootEdge, numQubits, {1., 0.}, 0, amplitudes);
+}
+
+std::vector<std::complex<dd::fp>>
+Simulator::reducedDensityMatrix(const std::vector<qc::Qubit>& qubits) const {
+  const auto numQubits = getNumberOfQubits();
+  std::vector<bool> keep(numQubits, false);
+  for (const auto qubit : qubits) {
+    if (qubit >= numQubits) {
+      throw std::invalid_argument("Qubit " + std::to_string(qubit) +
+                                  " is out of range.");
+    }
+    if (keep[qubit]) {
+      throw std::invalid_argument("Qubit " + std::to_string(qubit) +
+                                  " is given more than once.");
+    }
+    keep[qubit] = true;
+  }
+  if (rootEdge.isTerminal() && numQubits > 0) {
+    throw std::runtime_error("The state is not available as a DD.");
+  }
+
+  std::map<std::pair<const dd::vNode*, const dd::vNode*>, DenseMatrix> memo;
+  const auto sorted = contract(rootEdge, rootEdge, numQubits, keep, memo);
+
+  // bit r of the sorted indices is the r-th kept qubit in ascending order
+  std::vector<qc::Qubit> ascending(qubits);
+  std::ranges::sort(ascending);
+  std::vector<std::size_t> bitPosition;
+  for (const auto qubit : ascending) {
+    bitPosition.emplace_back(static_cast<std::size_t>(
+        std::ranges::find(qubits, qubit) - qubits.begin()));
+  }
+  const auto toIndex = [&bitPosition](const std::size_t i) {
+    std::size_t index = 0;
+    for (std::size_t r = 0; r < bitPosition.size(); ++r) {
+      index |= ((i >> r) & 1U) << bitPosition[r];
+    }
+    return index;
+  };
+  const auto dim = std::size_t{1} << qubits.size();
+  DenseMatrix result(dim * dim);
+  for (std::size_t r = 0; r < dim; ++r) {
+    for (std::size_t c = 0; c < dim; ++c) {
+      result[(toIndex(r) * dim) + toIndex(c)] = sorted[(r * dim) + c];
+    }
+  }
+  return result;
+}
+
 std::map<std::string, std::size_t> Simulator::sampleFromAmplitudeVectorInPlace(
     std::vector<std::complex<dd::fp>>& amplitudes, size_t shots) {
   // in-place prefix-sum calculation of probabilities
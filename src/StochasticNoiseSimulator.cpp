@@ -13,6 +13,7 @@
 #include "DensityDDPackage.hpp"
 #include "StochasticNoiseOperationTable.hpp"
 #include "dd/DDDefinitions.hpp"
+#include "dd/FunctionalityConstruction.hpp"
 #include "dd/Node.hpp"
 #include "dd/Operations.hpp"
 #include "dd/Package.hpp"
@@ -22,6 +23,7 @@
 #include "ir/operations/NonUnitaryOperation.hpp"
 #include "ir/operations/OpType.hpp"
 
+#include <algorithm>
 #include <cassert>
 #include <chrono>
 #include <cmath>
@@ -33,20 +35,90 @@
 #include <stdexcept>
 #include <string>
 #include <thread>
+#include <utility>
 #include <vector>
 
 std::map<std::string, std::size_t>
 StochasticNoiseSimulator::simulate(const size_t nshots) {
-  stochasticRuns = nshots;
+  runStochasticTrajectories(nshots, {});
+
+  for (const auto& classicalMeasurementsMap : classicalMeasurementsMaps) {
+    for (const auto& [state, count] : classicalMeasurementsMap) {
+      finalClassicalMeasurementsMap[state] += count;
+    }
+  }
+
+  return finalClassicalMeasurementsMap;
+}
+
+void StochasticNoiseSimulator::setSamplesPerTrajectory(
+    const std::size_t samples) {
+  if (samples == 0U) {
+    throw std::invalid_argument("At least one sample per trajectory is "
+                                "required.");
+  }
+  samplesPerTrajectory = samples;
+}
+
+std::vector<std::pair<dd::fp, dd::fp>>
+StochasticNoiseSimulator::expectationValues(
+    const std::vector<qc::QuantumComputation>& observables,
+    const std::size_t trajectories) {
+  if (trajectories == 0U) {
+    throw std::invalid_argument(
+        "At least one trajectory is required to estimate expectation values.");
+  }
+  for (const auto& observable : observables) {
+    if (observable.getNqubits() != getNumberOfQubits()) {
+      throw std::invalid_argument(
+          "Observables must act on the same number of qubits as the circuit.");
+    }
+  }
+
+  runStochasticTrajectories(trajectories, observables);
+
+  std::vector<std::pair<dd::fp, dd::fp>> results(observables.size());
+  const auto n = static_cast<dd::fp>(trajectories);
+  for (std::size_t i = 0U; i < observables.size(); ++i) {
+    dd::fp sum = 0.;
+    dd::fp sumOfSquares = 0.;
+    for (const auto& threadSums : expectationValueSums) {
+      sum += threadSums[i].first;
+      sumOfSquares += threadSums[i].second;
+    }
+    const auto mean = sum / n;
+    auto standardError = 0.;
+    if (trajectories > 1U) {
+      const auto variance =
+          std::max(0., (sumOfSquares - (n * mean * mean)) / (n - 1.));
+      standardError = std::sqrt(variance / n);
+    }
+    results[i] = {mean, standardError};
+  }
+  return results;
+}
+
+void StochasticNoiseSimulator::runStochasticTrajectories(
+    const std::size_t trajectories,
+    const std::vector<qc::QuantumComputation>& observables) {
+  stochasticRuns = trajectories;
+  // Circuits without any measurement are sampled on their final state
+  const bool sampleFinalState =
+      observables.empty() && !analyseCircuit().hasMeasurements;
+
   classicalMeasurementsMaps.resize(maxInstances);
+  expectationValueSums.assign(
+      maxInstances, std::vector<std::pair<dd::fp, dd::fp>>(observables.size()));
   std::vector<std::thread> threadArray;
   threadArray.reserve(maxInstances);
   // The stochastic runs are applied in parallel
   const auto t1Stoch = std::chrono::steady_clock::now();
   for (std::size_t runID = 0U; runID < maxInstances; runID++) {
-    threadArray.emplace_back(&StochasticNoiseSimulator::runStochSimulationForId,
-                             this, runID, getNumberOfQubits(),
-                             std::ref(classicalMeasurementsMaps[runID]), mt());
+    threadArray.emplace_back(
+        &StochasticNoiseSimulator::runStochSimulationForId, this, runID,
+        getNumberOfQubits(), std::ref(classicalMeasurementsMaps[runID]),
+        std::cref(observables), std::ref(expectationValueSums[runID]),
+        sampleFinalState, mt());
   }
   // wait for threads to finish
   for (auto& thread : threadArray) {
@@ -54,20 +126,14 @@ StochasticNoiseSimulator::simulate(const size_t nshots) {
   }
   const auto t2Stoch = std::chrono::steady_clock::now();
   stochRunTime = std::chrono::duration<double>(t2Stoch - t1Stoch).count();
-
-  for (const auto& classicalMeasurementsMap : classicalMeasurementsMaps) {
-    for (const auto& [state, count] : classicalMeasurementsMap) {
-      finalClassicalMeasurementsMap[state] += count;
-    }
-  }
-
-  return finalClassicalMeasurementsMap;
 }
 
 void StochasticNoiseSimulator::runStochSimulationForId(
     std::size_t stochRun, qc::Qubit nQubits,
     std::map<std::string, size_t>& classicalMeasurementsMap,
-    std::uint64_t localSeed) {
+    const std::vector<qc::QuantumComputation>& observables,
+    std::vector<std::pair<dd::fp, dd::fp>>& observableSums,
+    const bool sampleFinalState, std::uint64_t localSeed) {
   std::mt19937_64 generator(localSeed);
 
   const std::uint64_t numberOfRuns =
@@ -77,16 +143,27 @@ void StochasticNoiseSimulator::runStochSimulationForId(
       std::ceil(static_cast<double>(qc->getNops()) /
                 (static_cast<double>(approximationInfo.stepNumber + 1))));
 
-  for (std::size_t currentRun = 0U; currentRun < numberOfRuns; currentRun++) {
-    auto localDD = std::make_unique<dd::Package>(
-        getNumberOfQubits(),
-        dd::ddsim::STOCHASTIC_NOISE_SIMULATOR_DD_PACKAGE_CONFIG);
-    auto stochasticNoiseFunctionality = dd::ddsim::StochasticNoiseFunctionality(
-        *localDD, static_cast<dd::Qubit>(nQubits), noiseProbability,
-        amplitudeDampingProb, multiQubitGateFactor, noiseEffects);
-    dd::ddsim::StochasticNoiseOperationTable<dd::mEdge> gateCache(
-        getNumberOfQubits(), qc::OpType::OpTypeEnd);
+  // all trajectories of this worker share a package, so the cached gates and
+  // the observables are only built once
+  auto localDD = std::make_unique<dd::Package>(
+      getNumberOfQubits(),
+      dd::ddsim::STOCHASTIC_NOISE_SIMULATOR_DD_PACKAGE_CONFIG);
+  auto stochasticNoiseFunctionality = dd::ddsim::StochasticNoiseFunctionality(
+      *localDD, static_cast<dd::Qubit>(nQubits), noiseModel, noiseEffects);
+  dd::ddsim::StochasticNoiseOperationTable<dd::mEdge> gateCache(
+      getNumberOfQubits(), qc::OpType::OpTypeEnd);
+  // cached gates are kept alive across garbage collections
+  std::vector<dd::mEdge> cachedGates{};
+
+  std::vector<dd::mEdge> observableDDs{};
+  observableDDs.reserve(observables.size());
+  for (const auto& observable : observables) {
+    auto observableDD = dd::buildFunctionality(observable, *localDD);
+    localDD->incRef(observableDD);
+    observableDDs.emplace_back(observableDD);
+  }
 
+  for (std::size_t currentRun = 0U; currentRun < numberOfRuns; currentRun++) {
     std::vector<bool> classicValues(qc->getNcbits(), false);
 
     std::size_t opCount = 0U;
@@ -126,6 +203,8 @@ void StochasticNoiseSimulator::runStochSimulationForId(
             op->getType(), static_cast<dd::Qubit>(targets.front()));
         if (oper == nullptr) {
           operation = getDD(*op, *localDD);
+          localDD->incRef(operation);
+          cachedGates.emplace_back(operation);
           gateCache.insert(op->getType(),
                            static_cast<dd::Qubit>(targets.front()), operation);
         } else {
@@ -136,7 +215,7 @@ void StochasticNoiseSimulator::runStochSimulationForId(
       }
 
       stochasticNoiseFunctionality.applyNoiseOperation(
-          op->getUsedQubits(), operation, localRootEdge, generator);
+          *op, operation, localRootEdge, generator);
       if (approximationInfo.stepFidelity < 1. && (opCount % approxMod == 0U)) {
         approximateByFidelity(localDD, localRootEdge,
                               approximationInfo.stepFidelity, false, true);
@@ -144,6 +223,27 @@ void StochasticNoiseSimulator::runStochSimulationForId(
       }
       localDD->garbageCollect();
     }
+
+    if (!observables.empty()) {
+      for (std::size_t i = 0U; i < observables.size(); ++i) {
+        const auto value =
+            localDD->expectationValue(observableDDs[i], localRootEdge);
+        observableSums[i].first += value;
+        observableSums[i].second += value * value;
+      }
+      localDD->decRef(localRootEdge);
+      continue;
+    }
+
+    if (sampleFinalState) {
+      // Without measurements, the final state of the trajectory is sampled
+      for (std::size_t sample = 0U; sample < samplesPerTrajectory; ++sample) {
+        classicalMeasurementsMap[localDD->measureAll(localRootEdge, false,
+                                                     generator)] += 1U;
+      }
+      localDD->decRef(localRootEdge);
+      continue;
+    }
     localDD->decRef(localRootEdge);
 
     if (!classicValues.empty()) {
@@ -156,6 +256,13 @@ void StochasticNoiseSimulator::runStochSimulationForId(
       classicalMeasurementsMap[classicRegisterString] += 1U;
     }
   }
+
+  for (const auto& observableDD : observableDDs) {
+    localDD->decRef(observableDD);
+  }
+  for (const auto& gate : cachedGates) {
+    localDD->decRef(gate);
+  }
 }
 
 std::map<std::string, std::string>
@@ -164,6 +271,7 @@ StochasticNoiseSimulator::additionalStatistics() {
       {"approximation_runs", std::to_string(approximationRuns)},
       {"stoch_wall_time", std::to_string(stochRunTime)},
       {"stoch_runs", std::to_string(stochasticRuns)},
+      {"samples_per_trajectory", std::to_string(samplesPerTrajectory)},
       {"threads", std::to_string(maxInstances)},
   };
 }
@@ -77,6 +77,36 @@ class MQTHybridQasmSimulatorTest(unittest.TestCase):
         assert counts_1 == {"0": shots}
         assert counts_2 == {"11": shots}
 
+    def test_cut_options(self) -> None:
+        """Test fixing the cut and relabeling the qubits."""
+        shots = 1024
+        for mode in ("dd", "amplitude"):
+            for options in (
+                {"split_qubit": 3},
+                {"cuts": [2, 4]},
+                {"max_slice_qubits": 2},
+                {"qubit_relabeling": True},
+                {"memoize_half_slices": True},
+            ):
+                counts = self.backend.run(self.circuit, shots=shots, mode=mode, **options).result().get_counts()
+                assert sum(counts.values()) == shots
+                for key in counts:
+                    d, c = key.split(" ")
+                    assert c == d
+
+    def test_two_qubit_gates_across_cut(self) -> None:
+        """Test gates whose targets straddle the cut."""
+        circ = QuantumCircuit(4)
+        circ.x(0)
+        circ.swap(0, 3)
+        circ.rzz(0.5, 1, 2)
+        circ.iswap(3, 1)
+        circ.measure_all()
+        shots = 1024
+        for mode in ("dd", "amplitude"):
+            result = self.backend.run(circ, shots=shots, mode=mode, split_qubit=2).result()
+            assert result.get_counts() == {"0010": shots}
+
     @pytest.mark.xdist_group("dd_mode")
     def test_dd_mode_simulation(self) -> None:
         """Test running a single circuit."""
@@ -0,0 +1,68 @@
+# Copyright (c) 2023 - 2026 Chair for Design Automation, TUM
+# Copyright (c) 2025 - 2026 Munich Quantum Software Company GmbH
+# All rights reserved.
+#
+# SPDX-License-Identifier: MIT
+#
+# Licensed under the MIT License
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+from mqt.core.ir import QuantumComputation
+
+from mqt.ddsim import CircuitSimulator, HybridSimulator, HybridSimulatorMode
+from mqt.ddsim.hybrid_sharding import shard_ranges, simulate_sharded
+
+
+@pytest.fixture
+def circuit() -> QuantumComputation:
+    """A circuit with several gates crossing the cut between qubits 1 and 2."""
+    circ = QuantumComputation(4)
+    for i in range(4):
+        circ.h(i)
+        circ.t(i)
+    circ.cx(1, 2)
+    circ.cz(2, 0)
+    circ.rx(0.3, 2)
+    circ.cx(3, 1)
+    circ.cx(1, 2)
+    return circ
+
+
+def test_shard_ranges() -> None:
+    assert shard_ranges(8, 3) == [(0, 3), (3, 6), (6, 8)]
+    assert shard_ranges(2, 4) == [(0, 1), (1, 2)]
+    with pytest.raises(ValueError, match="positive"):
+        shard_ranges(8, 0)
+
+
+@pytest.mark.parametrize("mode", [HybridSimulatorMode.amplitude, HybridSimulatorMode.DD])
+def test_sharded_simulation_matches_reference(circuit: QuantumComputation, mode: HybridSimulatorMode) -> None:
+    reference = CircuitSimulator(circuit)
+    reference.simulate(0)
+    expected = np.array(reference.get_constructed_dd().get_vector())
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        sim, counts = simulate_sharded(circuit, mode=mode, cuts=[2], shards=3, executor=executor)
+    assert sim.get_number_of_decisions([2]) == 4
+    assert counts == {}
+    np.testing.assert_allclose(sim.get_final_amplitudes(), expected, atol=1e-10)
+
+
+def test_sharded_simulation_in_process_pool(circuit: QuantumComputation) -> None:
+    circuit.measure_all()
+    shots = 1000
+    _, counts = simulate_sharded(circuit, shots, mode=HybridSimulatorMode.DD, shards=2, seed=42)
+    assert sum(counts.values()) == shots
+
+
+def test_partial_results_must_cover_the_state(circuit: QuantumComputation) -> None:
+    sim = HybridSimulator(circuit, mode=HybridSimulatorMode.amplitude)
+    with pytest.raises(ValueError, match="does not hold the amplitudes"):
+        sim.combine_partial_results([b"\x00" * 16], 0)
+    with pytest.raises(ValueError, match="range"):
+        sim.simulate_range([2], 0, 17)
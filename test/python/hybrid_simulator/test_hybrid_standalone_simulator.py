@@ -8,8 +8,11 @@
 
 from __future__ import annotations
 
+import tempfile
 import unittest
+from pathlib import Path
 
+import numpy as np
 import pytest
 from mqt.core.ir import QuantumComputation
 
@@ -32,6 +35,18 @@ class MQTStandaloneHybridSimulatorTest(unittest.TestCase):
         result = sim.simulate(2048)
         assert len(result.keys()) == self.non_zeros_in_matrix
 
+    def test_standalone_amplitude_mode_accumulators(self) -> None:
+        assert HybridSimulator.get_available_memory() > 0
+        sim = HybridSimulator(self.circuit, mode=HybridSimulatorMode.amplitude, nthreads=2)
+        sim.set_split_qubit(2)
+        result = sim.simulate(2048)
+        assert len(result.keys()) == self.non_zeros_in_matrix
+        assert sim.statistics()["amplitude_accumulators"] == "2"
+        # a vector of four qubits takes 16 * 16 bytes
+        assert sim.get_amplitude_accumulator_limit(1024) == 4
+        assert sim.get_amplitude_accumulator_limit(255) == 0
+        assert sim.get_amplitude_accumulator_limit(0) == 2
+
     def test_standalone_amplitude_mode_with_seed(self) -> None:
         sim = HybridSimulator(self.circuit, seed=1337, mode=HybridSimulatorMode.amplitude)
         result = sim.simulate(2048)
@@ -48,3 +63,102 @@ class MQTStandaloneHybridSimulatorTest(unittest.TestCase):
         sim = HybridSimulator(self.circuit, seed=1337, mode=HybridSimulatorMode.DD)
         result = sim.simulate(2048)
         assert len(result.keys()) == self.non_zeros_in_matrix
+
+    def test_standalone_dd_mode_spills_beyond_memory_budget(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            sim = HybridSimulator(self.circuit, seed=1337, mode=HybridSimulatorMode.DD)
+            sim.set_memory_budget(1)
+            sim.set_spill_directory(directory)
+            assert sim.get_memory_budget() == 1
+            assert sim.get_spill_directory() == Path(directory)
+            result = sim.simulate(2048)
+            assert len(result.keys()) == self.non_zeros_in_matrix
+            assert sim.get_spilled_slices() > 0
+            assert sim.statistics()["spilled_slices"] == str(sim.get_spilled_slices())
+            assert not any(Path(directory).iterdir())
+
+    def test_standalone_cut_planning(self) -> None:
+        sim = HybridSimulator(self.circuit, mode=HybridSimulatorMode.DD)
+        result = sim.simulate(2048)
+        assert len(result.keys()) == self.non_zeros_in_matrix
+        # the cut above qubit 0 only crosses one of the two gates
+        assert sim.statistics()["split_qubit"] == "1"
+        assert sim.statistics()["decisions"] == "1"
+
+        sim.set_split_qubit(2)
+        assert sim.get_split_qubit() == 2
+        result = sim.simulate(2048)
+        assert len(result.keys()) == self.non_zeros_in_matrix
+        assert sim.statistics()["split_qubit"] == "2"
+        assert sim.statistics()["decisions"] == "2"
+
+        sim.set_split_qubit(None)
+        sim.set_qubit_relabeling(True)
+        result = sim.simulate(2048)
+        assert len(result.keys()) == self.non_zeros_in_matrix
+        assert sim.statistics()["relabeled"] == "true"
+        assert sim.statistics()["decisions"] == "0"
+
+    def test_standalone_multiple_cuts(self) -> None:
+        for mode in (HybridSimulatorMode.DD, HybridSimulatorMode.amplitude):
+            sim = HybridSimulator(self.circuit, mode=mode)
+            sim.set_cuts([3, 1, 2])
+            assert sim.get_cuts() == [1, 2, 3]
+            result = sim.simulate(2048)
+            assert len(result.keys()) == self.non_zeros_in_matrix
+            assert sim.statistics()["slices"] == "4"
+            assert sim.statistics()["decisions"] == "2"
+
+            sim.set_cuts([])
+            sim.set_max_slice_qubits(1)
+            assert sim.get_max_slice_qubits() == 1
+            result = sim.simulate(2048)
+            assert len(result.keys()) == self.non_zeros_in_matrix
+            assert sim.statistics()["slices"] == "4"
+
+    def test_standalone_half_slice_memoization(self) -> None:
+        for mode in (HybridSimulatorMode.DD, HybridSimulatorMode.amplitude):
+            sim = HybridSimulator(self.circuit, mode=mode)
+            sim.set_split_qubit(2)
+            sim.set_half_slice_memoization(True)
+            assert sim.get_half_slice_memoization()
+            result = sim.simulate(2048)
+            assert len(result.keys()) == self.non_zeros_in_matrix
+
+    def test_standalone_final_amplitudes_share_memory(self) -> None:
+        sim = HybridSimulator(self.circuit, mode=HybridSimulatorMode.amplitude)
+        sim.simulate(0)
+        amplitudes = sim.get_final_amplitudes()
+        assert not amplitudes.flags.writeable
+        assert np.shares_memory(amplitudes, sim.get_final_amplitudes())
+        assert np.allclose(np.abs(amplitudes) ** 2, 1 / 16)
+
+        out = np.empty(16, dtype=np.complex128)
+        sim.get_state_vector(out)
+        assert np.allclose(out, amplitudes)
+
+        sim = HybridSimulator(self.circuit, mode=HybridSimulatorMode.DD)
+        sim.simulate(0)
+        assert np.allclose(sim.get_final_amplitudes(), out)
+
+    def test_standalone_final_amplitudes_outlive_simulation(self) -> None:
+        sim = HybridSimulator(self.circuit, mode=HybridSimulatorMode.amplitude)
+        sim.simulate(0)
+        amplitudes = sim.get_final_amplitudes()
+        expected = amplitudes.copy()
+
+        sim.simulate(0)
+        assert not np.shares_memory(amplitudes, sim.get_final_amplitudes())
+        sim.simulate(2048)
+        del sim
+        np.testing.assert_array_equal(amplitudes, expected)
+
+    def test_standalone_final_amplitudes_freed_after_sampling(self) -> None:
+        sim = HybridSimulator(self.circuit, mode=HybridSimulatorMode.amplitude)
+        sim.simulate(2048)
+        with pytest.raises(RuntimeError, match="freed after sampling"):
+            sim.get_final_amplitudes()
+
+        sim.set_retain_amplitudes(True)
+        sim.simulate(2048)
+        assert np.allclose(np.abs(sim.get_final_amplitudes()) ** 2, 1 / 16)
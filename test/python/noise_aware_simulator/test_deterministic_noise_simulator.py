@@ -8,16 +8,17 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import json
+import math
 
+import numpy as np
 import pytest
-from qiskit import qasm2
+from mqt.core.ir import QuantumComputation
+from qiskit import ClassicalRegister, QuantumCircuit, QuantumRegister, qasm2
 
+from mqt.ddsim import DeterministicNoiseSimulator, NoiseModel
 from mqt.ddsim.deterministic_noise_simulator_backend import DeterministicNoiseSimulatorBackend
 
-if TYPE_CHECKING:
-    from qiskit import QuantumCircuit
-
 
 @pytest.fixture
 def circuit() -> QuantumCircuit:
@@ -101,3 +102,166 @@ def test_custom_config(circuit: QuantumCircuit) -> None:
         ).result()
         counts = result.get_counts()
         assert abs(counts["1001"] - 936) < tolerance
+
+
+def test_noise_model(circuit: QuantumCircuit, backend: DeterministicNoiseSimulatorBackend) -> None:
+    tolerance = 100
+    noise_model = NoiseModel(noise_probability=0.01, amp_damping_probability=0.02, multi_qubit_gate_factor=2)
+    result = backend.run(circuit, shots=1000, noise_model=noise_model).result()
+    counts = result.get_counts()
+    assert abs(counts["0001"] - 173) < tolerance
+    assert abs(counts["1001"] - 414) < tolerance
+
+
+def test_noise_model_from_dict() -> None:
+    noise_model = NoiseModel.from_dict({
+        "noise_probability": 0.001,
+        "qubits": [{"qubit": 1, "t1": 100.0, "t2": 80.0, "gate_time": 0.5}],
+        "gates": [{"gate": "cx", "qubits": [0, 1], "noise_probability": 0.01}],
+    })
+    loaded = noise_model.json()
+    assert loaded["amp_damping_probability"] == pytest.approx(0.002)
+    assert loaded["qubits"][0]["qubit"] == 1
+    assert loaded["qubits"][0]["amp_damping_probability"] == pytest.approx(1 - math.exp(-0.005))
+    assert loaded["gates"] == [{"gate": "x", "qubits": [0, 1], "noise_probability": 0.01}]
+    assert NoiseModel.from_json(repr(noise_model)).json() == loaded
+
+
+def test_noise_model_defaults() -> None:
+    defaults = NoiseModel().json()
+    assert NoiseModel.from_dict({}).json() == defaults
+    assert defaults["noise_probability"] == pytest.approx(NoiseModel.DEFAULT_NOISE_PROBABILITY)
+    assert defaults["amp_damping_probability"] == pytest.approx(2 * NoiseModel.DEFAULT_NOISE_PROBABILITY)
+    assert defaults["multi_qubit_gate_factor"] == pytest.approx(NoiseModel.DEFAULT_MULTI_QUBIT_GATE_FACTOR)
+
+
+def test_measurement_threshold(backend: DeterministicNoiseSimulatorBackend) -> None:
+    circ = qasm2.loads(
+        """OPENQASM 2.0;
+            include "qelib1.inc";
+            qreg q[1];
+            creg c[1];
+            x q[0];
+            measure q->c;
+            """
+    )
+    options = {"noise_effects": "A", "noise_probability": 0, "amp_damping_probability": 0.005}
+    counts = backend.run(circ, shots=10000, **options).result().get_counts()
+    assert "0" not in counts
+    counts = backend.run(circ, shots=10000, measurement_threshold=0, **options).result().get_counts()
+    assert 10 < counts["0"] < 90
+
+
+def test_probability_extraction() -> None:
+    qc = QuantumComputation(3)
+    for q in reversed(range(3)):
+        qc.h(q)
+    sim = DeterministicNoiseSimulator(
+        qc, noise_effects="A", noise_probability=0, amp_damping_probability=0.1, multi_qubit_gate_factor=1
+    )
+    sim.simulate(shots=1)
+
+    indices = np.zeros(8, dtype=np.uint64)
+    probabilities = np.zeros(8, dtype=np.float64)
+    assert sim.get_probabilities(indices, probabilities) == 8
+    dense = np.zeros(8)
+    dense[indices.astype(np.int64)] = probabilities
+    assert dense[0b001] == pytest.approx(0.45 * 0.55**2)
+
+    streamed: dict[int, float] = {}
+    sim.for_each_probability(streamed.__setitem__)
+    assert streamed == pytest.approx(dict(zip(indices.tolist(), probabilities.tolist(), strict=True)))
+
+    with pytest.raises(ValueError, match="8 are required"):
+        sim.get_probabilities(np.zeros(4, dtype=np.uint64), np.zeros(4, dtype=np.float64))
+
+    marginal = sim.get_marginal_probabilities([2, 0])
+    assert marginal == pytest.approx([0.55**2, 0.45 * 0.55, 0.55 * 0.45, 0.45**2])
+    assert marginal[0b01] == pytest.approx(dense[[0b100, 0b110]].sum())
+
+
+def test_approximation() -> None:
+    qc = QuantumComputation(3)
+    qc.ry(2 * np.arcsin(np.sqrt(0.02)), 2)
+    qc.ch(2, 1)
+    qc.ch(2, 0)
+    qc.x(1)
+
+    sim = DeterministicNoiseSimulator(
+        qc, approximation_step_fidelity=0.95, approximation_steps=1, noise_effects="", noise_probability=0
+    )
+    assert sim.get_approximation_trace_distance() == 1
+    sim.simulate(shots=1)
+    statistics = sim.statistics()
+    assert statistics["approximation_runs"] == "1"
+    assert float(statistics["final_fidelity"]) == pytest.approx(0.98)
+    assert sim.get_marginal_probabilities([2]) == pytest.approx([1, 0])
+
+    sim = DeterministicNoiseSimulator(
+        qc, approximation_step_fidelity=0.95, approximation_steps=1, noise_effects="", noise_probability=0
+    )
+    sim.set_approximation_trace_distance(0.1)
+    sim.simulate(shots=1)
+    assert sim.get_marginal_probabilities([2]) == pytest.approx([0.98, 0.02])
+
+
+def test_layered_noise(circuit: QuantumCircuit, backend: DeterministicNoiseSimulatorBackend) -> None:
+    options = {"shots": 1000, "simulator_seed": 42, "noise_probability": 0.1, "measurement_threshold": 0}
+    counts = backend.run(circuit, **options).result().get_counts()
+    layered = backend.run(circuit, layered_noise=True, **options).result().get_counts()
+    assert layered == counts
+
+
+def test_reduced_density_matrix() -> None:
+    qc = QuantumComputation(2)
+    qc.h(0)
+    qc.cx(0, 1)
+
+    sim = DeterministicNoiseSimulator(qc, noise_effects="P", noise_probability=0.1, multi_qubit_gate_factor=1)
+    sim.simulate(shots=1)
+    rho = sim.reduced_density_matrix([0, 1])
+    assert rho.shape == (4, 4)
+    assert np.trace(rho) == pytest.approx(1)
+    # the coherence of the Bell state is dephased by all three noise channels
+    assert rho[0b00, 0b11] == pytest.approx(0.5 * 0.8**3)
+    assert np.allclose(sim.reduced_density_matrix([1]), np.diag([0.5, 0.5]))
+
+
+def test_table_statistics() -> None:
+    qc = QuantumComputation(5)
+    for qubit in range(5):
+        qc.h(qubit)
+
+    sim = DeterministicNoiseSimulator(qc, noise_effects="A", noise_probability=0, amp_damping_probability=0.1)
+    sim.simulate(shots=1)
+    tables = json.loads(sim.statistics()["density_tables"])
+    assert set(tables) == {
+        "unique_table",
+        "add_table",
+        "multiplication_table",
+        "trace_table",
+        "noise_table",
+        "garbage_collection",
+    }
+    assert tables["garbage_collection"]["seconds"] >= 0
+    assert tables["multiplication_table"]["lookups"] > 0
+    # the tables of a five-qubit simulation start out small
+    assert tables["multiplication_table"]["num_buckets"] == 512
+
+
+def test_parallel_shots(backend: DeterministicNoiseSimulatorBackend) -> None:
+    qreg = QuantumRegister(2)
+    creg = ClassicalRegister(2)
+    circ = QuantumCircuit(qreg, creg)
+    circ.h(0)
+    circ.measure(0, 0)
+    with circ.if_test((creg[0], 1)):
+        circ.x(1)
+    circ.measure(1, 1)
+
+    shots = 1000
+    result = backend.run(circ, shots=shots, noise_effects="", noise_probability=0, nthreads=3).result()
+    counts = result.get_counts()
+    assert set(counts) == {"00", "11"}
+    assert sum(counts.values()) == shots
+    assert abs(counts["11"] - shots / 2) < 100
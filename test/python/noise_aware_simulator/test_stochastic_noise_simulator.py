@@ -11,8 +11,10 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 import pytest
+from mqt.core.ir import QuantumComputation
 from qiskit import qasm2
 
+from mqt.ddsim import StochasticNoiseSimulator
 from mqt.ddsim.stochastic_noise_simulator_backend import StochasticNoiseSimulatorBackend
 
 if TYPE_CHECKING:
@@ -79,7 +81,7 @@ def test_no_noise(circuit: QuantumCircuit, backend: StochasticNoiseSimulatorBack
 
 
 def test_def_config(circuit: QuantumCircuit, backend: StochasticNoiseSimulatorBackend) -> None:
-    tolerance = 100
+    tolerance = 50
     result = backend.run(
         circuit,
         shots=1000,
@@ -89,5 +91,56 @@ def test_def_config(circuit: QuantumCircuit, backend: StochasticNoiseSimulatorBa
         multi_qubit_gate_factor=2,
     ).result()
     counts = result.get_counts()
-    assert abs(counts["0000"] - 211) < tolerance
-    assert abs(counts["1000"] - 146) < tolerance
+    assert abs(counts["0000"] - 151) < tolerance
+    assert abs(counts["1000"] - 127) < tolerance
+
+
+def test_unmeasured_circuit(backend: StochasticNoiseSimulatorBackend) -> None:
+    circ = qasm2.loads(
+        """OPENQASM 2.0;
+            include "qelib1.inc";
+            qreg q[2];
+            x q[0];
+            """
+    )
+    shots = 100
+    result = backend.run(circ, shots=shots, noise_probability=0, noise_effects="").result()
+    counts = result.get_counts()
+    assert len(counts) == 1
+    assert sum(counts.values()) == shots
+
+
+def test_samples_per_trajectory() -> None:
+    circ = QuantumComputation(2)
+    circ.x(0)
+    circ.h(1)
+    sim = StochasticNoiseSimulator(circ, seed=42, noise_effects="D", noise_probability=0.1)
+    assert sim.get_samples_per_trajectory() == 1
+    sim.set_samples_per_trajectory(8)
+    trajectories = 250
+    counts = sim.simulate(trajectories)
+    assert sum(counts.values()) == trajectories * 8
+    assert sim.statistics()["samples_per_trajectory"] == "8"
+
+
+def test_noise_model(backend: StochasticNoiseSimulatorBackend) -> None:
+    circ = qasm2.loads(
+        """OPENQASM 2.0;
+            include "qelib1.inc";
+            qreg q[2];
+            creg c[2];
+            x q[0];
+            x q[1];
+            measure q->c;
+            """
+    )
+    noise_model = {
+        "noise_probability": 0,
+        "amp_damping_probability": 0,
+        "multi_qubit_gate_factor": 1,
+        "qubits": [{"qubit": 0, "amp_damping_probability": 1}],
+    }
+    shots = 100
+    result = backend.run(circ, shots=shots, noise_effects="A", noise_model=noise_model).result()
+    counts = result.get_counts()
+    assert counts["10"] == shots
@@ -146,3 +146,28 @@ class MQTQasmSimulatorTest(unittest.TestCase):
         for key, value in target.items():
             assert key in counts
             assert abs(value - counts[key]) < threshold
+
+    def test_qasm_simulator_optimized(self) -> None:
+        """Test data counts output for single circuit run against reference."""
+        shots = 8192
+        result = self.backend.run(
+            self.circuit, shots=shots, mode=PathSimulatorMode.optimized, planning_time=0.01
+        ).result()
+
+        threshold = 0.04 * shots
+        counts = result.get_counts()
+        target = {
+            "100 100": shots / 8,
+            "011 011": shots / 8,
+            "101 101": shots / 8,
+            "111 111": shots / 8,
+            "000 000": shots / 8,
+            "010 010": shots / 8,
+            "110 110": shots / 8,
+            "001 001": shots / 8,
+        }
+
+        assert len(target) == len(counts)
+        for key, value in target.items():
+            assert key in counts
+            assert abs(value - counts[key]) < threshold
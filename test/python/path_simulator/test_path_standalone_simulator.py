@@ -10,6 +10,7 @@ from __future__ import annotations
 
 import unittest
 
+import numpy as np
 from mqt.core.ir import QuantumComputation
 
 from mqt.ddsim import PathSimulator, PathSimulatorConfiguration, PathSimulatorMode
@@ -100,3 +101,36 @@ class MQTStandaloneSimulatorTests(unittest.TestCase):
         assert len(result.keys()) == self.nonzero_states_ghz
         assert "000" in result
         assert "111" in result
+
+
+def test_standalone_multithreaded() -> None:
+    circ = QuantumComputation(6)
+    for _ in range(4):
+        for i in range(6):
+            circ.h(i)
+            circ.t(i)
+        for i in range(5):
+            circ.cx(i, i + 1)
+
+    reference = PathSimulator(circ)
+    reference.simulate(0)
+    sim = PathSimulator(circ, mode=PathSimulatorMode.pairwise_recursive, nthreads=4)
+    sim.simulate(0)
+    assert int(sim.statistics()["packages"]) > 1
+    assert np.allclose(sim.get_state_vector(), reference.get_state_vector())
+
+
+def test_standalone_optimized() -> None:
+    circ = QuantumComputation(6)
+    for layer in range(4):
+        for i in range(6):
+            circ.h(i)
+            circ.t(i)
+        circ.cx(layer % 3, layer % 3 + 3)
+
+    reference = PathSimulator(circ)
+    reference.simulate(0)
+    sim = PathSimulator(circ, mode=PathSimulatorMode.optimized, planning_time=0.01, seed=42)
+    assert sim.estimate_simulation_path_cost() <= reference.estimate_simulation_path_cost()
+    sim.simulate(0)
+    assert np.allclose(sim.get_state_vector(), reference.get_state_vector())
@@ -0,0 +1,55 @@
+# Copyright (c) 2023 - 2026 Chair for Design Automation, TUM
+# Copyright (c) 2025 - 2026 Munich Quantum Software Company GmbH
+# All rights reserved.
+#
+# SPDX-License-Identifier: MIT
+#
+# Licensed under the MIT License
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+from qiskit.circuit import Parameter, QuantumCircuit
+from qiskit.circuit.library import RealAmplitudes
+from qiskit.quantum_info import SparsePauliOp
+
+from mqt.ddsim import NoiseModel
+from mqt.ddsim.primitives import Estimator, NoiseAwareEstimator
+
+
+def test_noiseless_matches_estimator() -> None:
+    circuit = RealAmplitudes(num_qubits=2, reps=2)
+    observable = SparsePauliOp.from_list([("II", -1.05), ("IZ", 0.39), ("ZI", -0.39), ("ZZ", -0.01), ("XX", 0.18)])
+    parameter_values = [0, 1, 1, 2, 3, 5]
+
+    expected = Estimator().run([(circuit, observable, parameter_values)]).result()
+    result = (
+        NoiseAwareEstimator(noise_effects="", noise_probability=0)
+        .run([(circuit, observable, parameter_values)])
+        .result()
+    )
+    np.testing.assert_allclose(result[0].data.evs, expected[0].data.evs, rtol=1e-9)
+
+
+def test_noisy_expectation_values() -> None:
+    theta = Parameter("theta")
+    circuit = QuantumCircuit(1)
+    circuit.ry(theta, 0)
+    observables = [[SparsePauliOp("X")], [SparsePauliOp("Z")]]
+
+    # a single dephasing gate shrinks <X> by 1 - 2p and leaves <Z> unchanged
+    estimator = NoiseAwareEstimator(noise_effects="P", noise_probability=0.1)
+    result = estimator.run([(circuit, observables, [[np.pi / 2], [np.pi]])]).result()
+    np.testing.assert_allclose(result[0].data.evs, [[0.8, 0], [0, -1]], atol=1e-12)
+
+
+def test_noise_model() -> None:
+    circuit = QuantumCircuit(2)
+    circuit.x([0, 1])
+    noise_model = NoiseModel(noise_probability=0, amp_damping_probability=0)
+    noise_model.set_qubit_noise(0, amp_damping_probability=0.1)
+
+    estimator = NoiseAwareEstimator(noise_effects="A", noise_model=noise_model)
+    result = estimator.run([(circuit, [SparsePauliOp("IZ"), SparsePauliOp("ZI")])]).result()
+    assert result[0].data.evs == pytest.approx([-0.8, -1])
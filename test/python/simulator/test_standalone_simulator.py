@@ -12,6 +12,7 @@ import pathlib
 import unittest
 
 import numpy as np
+import pytest
 from mqt.core import load
 from mqt.core.ir import QuantumComputation
 
@@ -126,3 +127,50 @@ class MQTStandaloneSimulatorTests(unittest.TestCase):
             assert sim.expectation_value(x_observable) == 0
             assert sim.expectation_value(z_observable) == 1
             assert np.allclose(sim.expectation_value(h_observable), (1 / np.sqrt(2)) ** qubits)
+
+    @staticmethod
+    def test_reduced_density_matrix() -> None:
+        qc = QuantumComputation(3)
+        qc.h(0)
+        qc.ry(0.4, 1)
+        qc.cx(0, 2)
+        qc.s(2)
+        sim = CircuitSimulator(qc)
+        sim.simulate(1)
+
+        # the tensor axes of the state vector are qubits 2, 1, 0
+        state = np.array(sim.get_constructed_dd().get_vector()).reshape(2, 2, 2)
+        # bit 0 of the indices corresponds to qubit 2, bit 1 to qubit 0
+        reduced_state = state.transpose(1, 2, 0).reshape(2, 4)
+        expected = reduced_state.T @ reduced_state.conj()
+        rho = sim.reduced_density_matrix([2, 0])
+        assert rho.shape == (4, 4)
+        assert np.allclose(rho, expected)
+        assert np.allclose(
+            sim.reduced_density_matrix([1]),
+            [[np.cos(0.2) ** 2, np.cos(0.2) * np.sin(0.2)], [np.cos(0.2) * np.sin(0.2), np.sin(0.2) ** 2]],
+        )
+
+    @staticmethod
+    def test_state_vector_export() -> None:
+        qc = QuantumComputation(3)
+        qc.h(0)
+        qc.ry(0.4, 1)
+        qc.cx(0, 2)
+        sim = CircuitSimulator(qc)
+        sim.simulate(1)
+        expected = np.array(sim.get_constructed_dd().get_vector())
+
+        state = sim.get_state_vector()
+        assert state.dtype == np.complex128
+        assert np.allclose(state, expected)
+
+        # the amplitudes are written directly into a preallocated array
+        out = np.full(8, 1 + 1j)
+        assert sim.get_state_vector(out) is out
+        assert np.allclose(out, expected)
+
+        with pytest.raises(ValueError, match="does not match"):
+            sim.get_state_vector(np.zeros(4, dtype=np.complex128))
+        with pytest.raises(TypeError):
+            sim.get_state_vector(np.zeros(8, dtype=np.float64))
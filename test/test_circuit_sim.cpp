@@ -20,13 +20,17 @@
 #include "ir/operations/StandardOperation.hpp"
 
 #include <cmath>
+#include <complex>
 #include <cstddef>
 #include <cstdlib>
 #include <gtest/gtest.h>
 #include <iostream>
 #include <memory>
+#include <stdexcept>
 #include <string>
+#include <tuple>
 #include <utility>
+#include <vector>
 
 TEST(CircuitSimTest, SingleOneQubitGateOnTwoQubitCircuit) {
   auto quantumComputation = std::make_unique<qc::QuantumComputation>(2);
@@ -446,3 +450,73 @@ TEST(CircuitSimTest, GetVectorBeforeSimulate) {
   const auto vec = ddsim.getCurrentDD().getVector();
   EXPECT_EQ(vec[0], 1.);
 }
+
+TEST(CircuitSimTest, ReducedDensityMatrix) {
+  auto qc = std::make_unique<qc::QuantumComputation>(4);
+  qc->h(0);
+  qc->ry(0.3, 1);
+  qc->cx(0, 2);
+  qc->t(2);
+  qc->cry(1.1, 2, 3);
+  qc->cx(1, 0);
+  qc->s(3);
+  CircuitSimulator ddsim(std::move(qc));
+  ddsim.simulate(1);
+  const auto vec = ddsim.getCurrentDD().getVector();
+
+  // bit 0 of the indices corresponds to qubit 3, bit 1 to qubit 0
+  const std::vector<qc::Qubit> qubits{3, 0};
+  const auto rho = ddsim.reducedDensityMatrix(qubits);
+  ASSERT_EQ(rho.size(), 16);
+  std::vector<std::complex<dd::fp>> expected(16);
+  for (std::size_t i = 0; i < vec.size(); ++i) {
+    for (std::size_t j = 0; j < vec.size(); ++j) {
+      // the traced out qubits 1 and 2 have to agree
+      if ((i & 0b0110U) != (j & 0b0110U)) {
+        continue;
+      }
+      const auto row = ((i >> 3) & 1U) | ((i & 1U) << 1);
+      const auto column = ((j >> 3) & 1U) | ((j & 1U) << 1);
+      expected[(row * 4) + column] += vec[i] * std::conj(vec[j]);
+    }
+  }
+  for (std::size_t k = 0; k < expected.size(); ++k) {
+    EXPECT_NEAR(rho[k].real(), expected[k].real(), 1e-12) << k;
+    EXPECT_NEAR(rho[k].imag(), expected[k].imag(), 1e-12) << k;
+  }
+
+  // the full state and no qubits at all
+  const auto full = ddsim.reducedDensityMatrix({0, 1, 2, 3});
+  EXPECT_NEAR(std::abs(full[(5 * 16) + 12] - (vec[5] * std::conj(vec[12]))), 0.,
+              1e-12);
+  const auto none = ddsim.reducedDensityMatrix({});
+  ASSERT_EQ(none.size(), 1);
+  EXPECT_NEAR(none.front().real(), 1., 1e-12);
+
+  EXPECT_THROW(std::ignore = ddsim.reducedDensityMatrix({4}),
+               std::invalid_argument);
+  EXPECT_THROW(std::ignore = ddsim.reducedDensityMatrix({1, 1}),
+               std::invalid_argument);
+}
+
+TEST(CircuitSimTest, WriteStateVector) {
+  auto qc = std::make_unique<qc::QuantumComputation>(4);
+  qc->h(0);
+  qc->ry(0.3, 1);
+  qc->cx(0, 2);
+  qc->t(2);
+  qc->x(3);
+  CircuitSimulator ddsim(std::move(qc));
+  ddsim.simulate(1);
+  const auto expected = ddsim.getCurrentDD().getVector();
+
+  // the buffer is overwritten entirely
+  std::vector<std::complex<dd::fp>> amplitudes(16, {1., 1.});
+  ddsim.writeStateVector(amplitudes);
+  for (std::size_t i = 0; i < expected.size(); ++i) {
+    EXPECT_NEAR(std::abs(amplitudes[i] - expected[i]), 0., 1e-12) << i;
+  }
+
+  std::vector<std::complex<dd::fp>> tooSmall(8);
+  EXPECT_THROW(ddsim.writeStateVector(tooSmall), std::invalid_argument);
+}
@@ -18,6 +18,7 @@
 #include "dd/Operations.hpp"
 #include "dd/Package.hpp"
 #include "ir/Definitions.hpp"
+#include "ir/operations/Control.hpp"
 #include "ir/operations/OpType.hpp"
 #include "ir/operations/StandardOperation.hpp"
 
@@ -25,6 +26,7 @@
 #include <cstdint>
 #include <gtest/gtest.h>
 #include <memory>
+#include <stdexcept>
 #include <vector>
 
 namespace {
@@ -100,6 +102,11 @@ TEST(DensityDDPackageTest, ReferenceCountingKeepsNodesAliveDuringCollection) {
   EXPECT_EQ(densityDD.computeActiveNodeCount(), 0U);
   EXPECT_TRUE(densityDD.garbageCollect(true));
   EXPECT_EQ(densityDD.computeActiveNodeCount(), 0U);
+
+  // both forced collections are timed, whether they collected nodes or not
+  const auto gc = densityDD.getStatistics()["garbage_collection"];
+  EXPECT_EQ(gc["runs"].get<std::size_t>(), 2U);
+  EXPECT_GE(gc["seconds"].get<double>(), 0.);
 }
 
 TEST(DensityDDPackageTest, ComputeTableDiscriminatesDensityMatrixResults) {
@@ -141,6 +148,105 @@ TEST(DensityDDPackageTest, ComputeTableDiscriminatesDensityMatrixResults) {
 
   computeTable.clear();
   EXPECT_EQ(computeTable.lookup(state.p, operation.p, false), nullptr);
+  EXPECT_EQ(computeTable.getStats().numEntries, 0U);
+
+  // the table is usable again after clearing
+  computeTable.insert(state.p, operation.p,
+                      dd::ddsim::dCachedEdge{state.p, dd::ComplexValue(1.)});
+  EXPECT_NE(computeTable.lookup(state.p, operation.p, false), nullptr);
+  EXPECT_EQ(computeTable.getStats().numEntries, 1U);
+}
+
+TEST(DensityDDPackageTest, ComputeTableGrowsUnderCollisions) {
+  constexpr std::size_t nrQubits = 1U;
+  const auto pkg = makePackage(nrQubits);
+  dd::ddsim::DensityDDPackage densityDD(*pkg, nrQubits);
+  const auto state = densityDD.makeZeroDensityOperator(nrQubits);
+
+  using NoiseTable = dd::ddsim::DensityComputeTable<
+      dd::ddsim::dNode*, dd::ddsim::NoiseComputeKey, dd::ddsim::dCachedEdge>;
+  NoiseTable fixed(4U);
+  NoiseTable growing(4U, 64U);
+  for (std::size_t channel = 0; channel < 256U; ++channel) {
+    const auto key = dd::ddsim::NoiseComputeKey{.channel = channel};
+    const auto result = dd::ddsim::dCachedEdge{state.p, dd::ComplexValue(1.)};
+    fixed.insert(state.p, key, result);
+    growing.insert(state.p, key, result);
+  }
+  EXPECT_EQ(fixed.getStats().numBuckets, 4U);
+  EXPECT_EQ(growing.getStats().numBuckets, 64U);
+  EXPECT_EQ(growing.getMaxNumBuckets(), 64U);
+
+  // growing clears the table, but the latest entry has been inserted since
+  const auto last = dd::ddsim::NoiseComputeKey{.channel = 255U};
+  const auto* const result = growing.lookup(state.p, last);
+  ASSERT_NE(result, nullptr);
+  EXPECT_EQ(result->p, state.p);
+
+  EXPECT_THROW(growing.resize(48U), std::invalid_argument);
+  growing.resize(8U);
+  EXPECT_EQ(growing.getStats().numBuckets, 8U);
+  EXPECT_EQ(growing.lookup(state.p, last), nullptr);
+}
+
+TEST(DensityDDPackageTest, UniqueTableRehashesUnderLoad) {
+  constexpr std::size_t nrQubits = 4U;
+  const auto pkg = makePackage(nrQubits);
+  dd::ddsim::DensityDDPackageConfig config{};
+  config.utDmNumBucket = 2U;
+  config.utDmMaxNumBucket = 1024U;
+  config.utDmMaxLoadFactor = 1.;
+  dd::ddsim::DensityDDPackage densityDD(*pkg, nrQubits, config);
+
+  auto state = densityDD.makeZeroDensityOperator(nrQubits);
+  densityDD.incRef(state);
+  for (qc::Qubit q = 0; q < nrQubits; ++q) {
+    densityDD.applyOperationToDensity(
+        state,
+        dd::getDD(qc::StandardOperation(q, qc::RY, {0.1 * (q + 1)}), *pkg));
+    if (q > 0) {
+      densityDD.applyOperationToDensity(
+          state,
+          dd::getDD(qc::StandardOperation(qc::Control{q - 1}, q, qc::X), *pkg));
+    }
+  }
+
+  const auto statistics = densityDD.getStatistics();
+  EXPECT_GT(statistics["unique_table"]["num_buckets"].get<std::size_t>(),
+            2U * nrQubits);
+
+  // nodes created before the rehash are still found afterwards
+  const auto probabilities =
+      state.getSparseProbabilityVectorStrKeys(nrQubits, 0.);
+  dd::fp sum = 0.;
+  for (const auto& [bitstring, probability] : probabilities) {
+    sum += probability;
+  }
+  EXPECT_NEAR(sum, 1., 1e-10);
+  EXPECT_EQ(densityDD.makeZeroDensityOperator(nrQubits).p,
+            densityDD.makeZeroDensityOperator(nrQubits).p);
+  dd::ddsim::dEdge::alignDensityEdge(state);
+  densityDD.decRef(state);
+}
+
+TEST(DensityDDPackageTest, AutoSizedConfig) {
+  const auto small = dd::ddsim::DensityDDPackageConfig::autoSized(2U);
+  // a density matrix on two qubits has at most five nodes
+  EXPECT_EQ(small.utDmNumBucket, 256U);
+  EXPECT_EQ(small.ctDmAddNumBucket, 256U);
+
+  const auto large = dd::ddsim::DensityDDPackageConfig::autoSized(20U);
+  const auto defaults = dd::ddsim::DensityDDPackageConfig{};
+  EXPECT_EQ(large.utDmNumBucket, defaults.utDmNumBucket);
+  EXPECT_EQ(large.ctDmNoiseNumBucket, defaults.ctDmNoiseNumBucket);
+  EXPECT_GE(large.utDmMaxNumBucket, large.utDmNumBucket);
+  EXPECT_GE(large.ctDmMaxNumBucket, large.ctDmAddNumBucket);
+
+  // a larger budget allows for larger tables
+  const auto larger = dd::ddsim::DensityDDPackageConfig::autoSized(
+      20U, 4 * dd::ddsim::DensityDDPackageConfig::DEFAULT_TABLE_MEMORY_BUDGET);
+  EXPECT_EQ(larger.utDmMaxNumBucket, 4 * large.utDmMaxNumBucket);
+  EXPECT_EQ(larger.ctDmMaxNumBucket, 4 * large.ctDmMaxNumBucket);
 }
 
 TEST(StochasticNoiseOperationTableTest, InsertLookupAndClear) {
@@ -181,3 +287,33 @@ TEST(StochasticNoiseOperationTableTest, InsertLookupAndClear) {
     }
   }
 }
+
+TEST(StochasticNoiseOperationTableTest, ReuseAfterClear) {
+  constexpr std::size_t nrQubits = 2U;
+  const auto pkg = makePackage(nrQubits + 1);
+  const auto x = dd::getDD(qc::StandardOperation(0, qc::X), *pkg);
+  const auto z = dd::getDD(qc::StandardOperation(0, qc::Z), *pkg);
+
+  dd::ddsim::StochasticNoiseOperationTable<dd::mEdge> table(nrQubits, 2U);
+  table.insert(0U, 1U, x);
+  EXPECT_EQ(table.getStats().numEntries, 1U);
+
+  // entries of a previous generation are neither found nor counted
+  for (std::size_t run = 0; run < 3U; ++run) {
+    table.clear();
+    EXPECT_EQ(table.getStats().numEntries, 0U);
+    EXPECT_EQ(table.lookup(0U, 1U), nullptr);
+    table.insert(1U, 1U, z);
+    table.insert(1U, 1U, z);
+    EXPECT_EQ(table.getStats().numEntries, 1U);
+    ASSERT_NE(table.lookup(1U, 1U), nullptr);
+    EXPECT_EQ(table.lookup(1U, 1U)->p, z.p);
+  }
+
+  table.resize(nrQubits + 1);
+  EXPECT_EQ(table.getTable().size(), 2U * (nrQubits + 1));
+  EXPECT_EQ(table.lookup(1U, 2U), nullptr);
+  table.insert(1U, 2U, x);
+  EXPECT_EQ(table.lookup(1U, 2U)->p, x.p);
+  EXPECT_EQ(table.lookup(1U, 1U)->p, z.p);
+}
@@ -8,11 +8,17 @@
  * Licensed under the MIT License
  */
 
+#include "CircuitSimulator.hpp"
 #include "DeterministicNoiseSimulator.hpp"
+#include "NoiseModel.hpp"
+#include "dd/DDDefinitions.hpp"
+#include "ir/Definitions.hpp"
 #include "ir/QuantumComputation.hpp"
 #include "ir/operations/OpType.hpp"
 
 #include <array>
+#include <cmath>
+#include <complex>
 #include <cstddef>
 #include <gtest/gtest.h>
 #include <iomanip>
@@ -22,7 +28,9 @@
 #include <optional>
 #include <stdexcept>
 #include <string>
+#include <tuple>
 #include <utility>
+#include <vector>
 
 using namespace qc::literals;
 
@@ -336,6 +344,9 @@ TEST(DeterministicNoiseSimTest, TestFunctionsOptimized) {
 
   EXPECT_EQ(ddsim->getNumberOfQubits(), 4);
   EXPECT_EQ(ddsim->getActiveNodeCount(), 22);
+  EXPECT_GT(ddsim->getMatrixActiveNodeCount(), 0);
+  // releasing the cached gate DDs leaves no active matrix nodes
+  ddsim->setGateCacheSize(0);
   EXPECT_EQ(ddsim->getMatrixActiveNodeCount(), 0);
   EXPECT_EQ(ddsim->countNodesFromRoot(), 23);
 }
@@ -389,3 +400,542 @@ TEST(DeterministicNoiseSimTest, TestSimulateInterfaceWithMeasurements) {
                 expectedValues.at(i), tolerance);
   }
 }
+
+TEST(DeterministicNoiseSimTest, GateCacheReusesRepeatedGates) {
+  const auto buildCircuit = []() {
+    auto quantumComputation = std::make_unique<qc::QuantumComputation>(3);
+    for (std::size_t layer = 0; layer < 5; ++layer) {
+      for (qc::Qubit q = 0; q < 3; ++q) {
+        quantumComputation->rx(0.3, q);
+      }
+      quantumComputation->cx(0, 1);
+      quantumComputation->cx(1, 2);
+    }
+    return quantumComputation;
+  };
+
+  auto cached = std::make_unique<DeterministicNoiseSimulator>(
+      buildCircuit(), std::string("APD"), 0.01, std::optional<double>{}, 2);
+  auto uncached = std::make_unique<DeterministicNoiseSimulator>(
+      buildCircuit(), std::string("APD"), 0.01, std::optional<double>{}, 2);
+  uncached->setGateCacheSize(0);
+  cached->simulate(1);
+  uncached->simulate(1);
+
+  const auto statistics = cached->additionalStatistics();
+  EXPECT_EQ(statistics.at("gate_cache_misses"), "5");
+  EXPECT_EQ(statistics.at("gate_cache_hits"), "20");
+  EXPECT_EQ(statistics.at("gate_cache_size"), "5");
+  EXPECT_EQ(uncached->additionalStatistics().at("gate_cache_hits"), "0");
+
+  const auto expected = uncached->rootEdge.getSparseProbabilityVectorStrKeys(
+      uncached->getNumberOfQubits(), 0.);
+  const auto actual = cached->rootEdge.getSparseProbabilityVectorStrKeys(
+      cached->getNumberOfQubits(), 0.);
+  ASSERT_EQ(expected.size(), actual.size());
+  for (const auto& [state, probability] : expected) {
+    ASSERT_TRUE(actual.contains(state));
+    EXPECT_NEAR(actual.at(state), probability, 1e-12);
+  }
+}
+
+TEST(DeterministicNoiseSimTest, GateCacheAcrossShotsOfDynamicCircuit) {
+  auto quantumComputation = std::make_unique<qc::QuantumComputation>(2, 2);
+  quantumComputation->h(0);
+  quantumComputation->x(0);
+  quantumComputation->h(0);
+  quantumComputation->measure(0, 0);
+  quantumComputation->if_(qc::X, 1U, {0, 1});
+  quantumComputation->measure(1, 1);
+
+  auto ddsim = std::make_unique<DeterministicNoiseSimulator>(
+      std::move(quantumComputation), std::string("A"), 0, 0, 1);
+  // smaller than the number of distinct gates to exercise eviction
+  ddsim->setGateCacheSize(2);
+  const auto m = ddsim->simulate(100);
+
+  ASSERT_EQ(m.size(), 1);
+  EXPECT_EQ(m.at("00"), 100);
+  EXPECT_NE(ddsim->additionalStatistics().at("gate_cache_hits"), "0");
+}
+
+TEST(DeterministicNoiseSimTest, NonSelectiveMeasurementAndReset) {
+  auto quantumComputation = std::make_unique<qc::QuantumComputation>(2, 2);
+  quantumComputation->h(0);
+  quantumComputation->cx(0, 1);
+  quantumComputation->measure(0, 0);
+  quantumComputation->reset(0);
+  quantumComputation->cx(1, 0);
+  quantumComputation->measure(1, 1);
+
+  auto ddsim = std::make_unique<DeterministicNoiseSimulator>(
+      std::move(quantumComputation), std::string("A"), 0, 0, 1);
+  const auto m = ddsim->simulate(1000);
+
+  // the outcomes are perfectly correlated
+  ASSERT_EQ(m.size(), 2);
+  EXPECT_NEAR(static_cast<double>(m.at("00")), 500., 100.);
+  EXPECT_NEAR(static_cast<double>(m.at("11")), 500., 100.);
+
+  // the state only covers the circuit qubits after the simulation
+  const auto state = ddsim->rootEdge.getSparseProbabilityVectorStrKeys(
+      ddsim->getNumberOfQubits(), 0.);
+  ASSERT_EQ(state.size(), 2);
+  EXPECT_NEAR(state.at("00"), 0.5, 1e-12);
+  EXPECT_NEAR(state.at("11"), 0.5, 1e-12);
+}
+
+TEST(DeterministicNoiseSimTest, NonSelectiveMeasurementWithNoise) {
+  const auto buildCircuit = []() {
+    auto quantumComputation = std::make_unique<qc::QuantumComputation>(1, 2);
+    quantumComputation->x(0);
+    quantumComputation->measure(0, 0);
+    quantumComputation->x(0);
+    quantumComputation->measure(0, 1);
+    return quantumComputation;
+  };
+
+  // the first outcome is 1 with probability 0.8, the second X gate then
+  // yields 0; otherwise, the second outcome is 1 with probability 0.8
+  const auto expectedEntries = std::array{"01", "10", "00"};
+  const auto expectedValues = std::array{8000., 1600., 400.};
+  const double tolerance = 200;
+
+  for (const auto nonSelective : {true, false}) {
+    auto ddsim = std::make_unique<DeterministicNoiseSimulator>(
+        buildCircuit(), std::string("A"), 0, 0.2, 1);
+    ddsim->setNonSelectiveMeasurements(nonSelective);
+    const auto m = ddsim->simulate(10000);
+    ASSERT_EQ(m.size(), expectedEntries.size());
+    for (std::size_t i = 0; i < expectedEntries.size(); ++i) {
+      EXPECT_NEAR(static_cast<double>(m.at(expectedEntries.at(i))),
+                  expectedValues.at(i), tolerance);
+    }
+  }
+}
+
+TEST(DeterministicNoiseSimTest, NonSelectiveMeasurementOnWideRegister) {
+  // every basis state of the full register is below the measurement
+  // threshold, while the outcomes of the measured qubit are not
+  const std::size_t nQubits = 9;
+  auto quantumComputation =
+      std::make_unique<qc::QuantumComputation>(nQubits, 1);
+  for (qc::Qubit q = 0; q < nQubits; ++q) {
+    quantumComputation->h(q);
+  }
+  quantumComputation->measure(0, 0);
+  quantumComputation->reset(8);
+  quantumComputation->h(0);
+
+  auto ddsim = std::make_unique<DeterministicNoiseSimulator>(
+      std::move(quantumComputation), std::string("A"), 0, 0, 1);
+  ASSERT_DOUBLE_EQ(ddsim->getMeasurementThreshold(), 0.01);
+  const auto m = ddsim->simulate(1000);
+  ASSERT_EQ(m.size(), 2);
+  EXPECT_NEAR(static_cast<double>(m.at("0")), 500., 100.);
+  EXPECT_NEAR(static_cast<double>(m.at("1")), 500., 100.);
+}
+
+TEST(DeterministicNoiseSimTest, NonSelectiveMeasurementRecordQubits) {
+  // a barrier after the final measurement does not require a record qubit,
+  // which would be copied into by an additional gate
+  auto quantumComputation = std::make_unique<qc::QuantumComputation>(2, 1);
+  quantumComputation->h(0);
+  quantumComputation->measure(0, 0);
+  quantumComputation->barrier();
+  quantumComputation->reset(1);
+
+  auto ddsim = std::make_unique<DeterministicNoiseSimulator>(
+      std::move(quantumComputation), std::string("A"), 0, 0, 1);
+  const auto m = ddsim->simulate(1000);
+  ASSERT_EQ(m.size(), 2);
+  EXPECT_EQ(ddsim->additionalStatistics().at("gate_cache_misses"), "1");
+
+  // a qubit modified after its measurement is recorded on an additional
+  // qubit, which is removed from the packages after the run
+  quantumComputation = std::make_unique<qc::QuantumComputation>(2, 1);
+  quantumComputation->h(0);
+  quantumComputation->measure(0, 0);
+  quantumComputation->h(0);
+  quantumComputation->reset(1);
+  ddsim = std::make_unique<DeterministicNoiseSimulator>(
+      std::move(quantumComputation), std::string("A"), 0, 0, 1);
+  EXPECT_EQ(ddsim->simulate(1000).size(), 2);
+  EXPECT_EQ(ddsim->dd->qubits(), 2);
+  EXPECT_EQ(ddsim->getNumberOfQubits(), 2);
+}
+
+TEST(DeterministicNoiseSimTest, NonSelectiveMeasurementBelowThreshold) {
+  // all 128 outcomes are below the measurement threshold
+  const std::size_t nQubits = 7;
+  auto quantumComputation =
+      std::make_unique<qc::QuantumComputation>(nQubits, nQubits);
+  for (qc::Qubit q = 0; q < nQubits; ++q) {
+    quantumComputation->h(q);
+    quantumComputation->measure(q, q);
+    quantumComputation->reset(q);
+  }
+
+  auto ddsim = std::make_unique<DeterministicNoiseSimulator>(
+      std::move(quantumComputation), std::string("A"), 0, 0, 1);
+  EXPECT_THROW(ddsim->simulate(10), std::runtime_error);
+  ddsim->setMeasurementThreshold(0);
+  EXPECT_EQ(ddsim->simulate(10000).size(), 1U << nQubits);
+}
+
+TEST(DeterministicNoiseSimTest, NoiseTableReusesSharedNodes) {
+  // in a product state, all successors of a node point to the same node, so
+  // the noise on the lower qubits is applied to shared nodes
+  const std::size_t nQubits = 5;
+  auto quantumComputation = std::make_unique<qc::QuantumComputation>(nQubits);
+  for (auto q = static_cast<qc::Qubit>(nQubits); q > 0; --q) {
+    quantumComputation->h(q - 1);
+  }
+
+  auto ddsim = std::make_unique<DeterministicNoiseSimulator>(
+      std::move(quantumComputation), std::string("A"), 0, 0.1, 1);
+  ddsim->simulate(1);
+
+  const auto statistics = ddsim->additionalStatistics();
+  EXPECT_NE(statistics.at("noise_table_hits"), "0");
+  const auto tables = nlohmann::json::parse(statistics.at("density_tables"));
+  EXPECT_EQ(std::to_string(tables["noise_table"]["hits"].get<std::size_t>()),
+            statistics.at("noise_table_hits"));
+  EXPECT_GT(tables["unique_table"]["num_entries"].get<std::size_t>(), 0U);
+
+  const auto m = ddsim->rootEdge.getSparseProbabilityVectorStrKeys(
+      ddsim->getNumberOfQubits(), 0.);
+  EXPECT_NEAR(m.at("11111"), std::pow(0.45, 5), 1e-12);
+  EXPECT_NEAR(m.at("00000"), std::pow(0.55, 5), 1e-12);
+  EXPECT_NEAR(m.at("10000"), 0.45 * std::pow(0.55, 4), 1e-12);
+}
+
+TEST(DeterministicNoiseSimTest, MeasurementThreshold) {
+  auto quantumComputation = std::make_unique<qc::QuantumComputation>(1);
+  quantumComputation->x(0);
+
+  // the outcome 0 has a probability of 0.005
+  auto ddsim = std::make_unique<DeterministicNoiseSimulator>(
+      std::move(quantumComputation), std::string("A"), 0, 0.005, 1);
+  EXPECT_DOUBLE_EQ(ddsim->getMeasurementThreshold(), 0.01);
+  auto m = ddsim->simulate(10000);
+  EXPECT_FALSE(m.contains("0"));
+
+  ddsim->setMeasurementThreshold(0);
+  m = ddsim->simulate(10000);
+  ASSERT_TRUE(m.contains("0"));
+  EXPECT_NEAR(static_cast<double>(m.at("0")), 50., 40.);
+
+  EXPECT_THROW(ddsim->setMeasurementThreshold(-0.1), std::invalid_argument);
+  EXPECT_THROW(ddsim->setMeasurementThreshold(1.1), std::invalid_argument);
+}
+
+TEST(DeterministicNoiseSimTest, StreamedAndMarginalProbabilities) {
+  const std::size_t nQubits = 4;
+  auto quantumComputation = std::make_unique<qc::QuantumComputation>(nQubits);
+  for (auto q = static_cast<qc::Qubit>(nQubits); q > 0; --q) {
+    quantumComputation->h(q - 1);
+  }
+
+  auto ddsim = std::make_unique<DeterministicNoiseSimulator>(
+      std::move(quantumComputation), std::string("A"), 0, 0.1, 1);
+  ddsim->simulate(1);
+
+  std::vector<dd::fp> probabilities(1ULL << nQubits, 0.);
+  std::size_t entries = 0;
+  ddsim->forEachProbability(
+      [&](const std::size_t index, const dd::fp& probability) {
+        probabilities.at(index) = probability;
+        ++entries;
+      });
+  EXPECT_EQ(entries, probabilities.size());
+  // every qubit is 1 with probability 0.45
+  EXPECT_NEAR(probabilities.at(0b0001), 0.45 * std::pow(0.55, 3), 1e-12);
+
+  const auto marginal = ddsim->getMarginalProbabilities({3, 0});
+  ASSERT_EQ(marginal.size(), 4);
+  EXPECT_NEAR(marginal.at(0b00), 0.55 * 0.55, 1e-12);
+  EXPECT_NEAR(marginal.at(0b01), 0.45 * 0.55, 1e-12);
+  EXPECT_NEAR(marginal.at(0b10), 0.55 * 0.45, 1e-12);
+  EXPECT_NEAR(marginal.at(0b11), 0.45 * 0.45, 1e-12);
+
+  // the marginal agrees with summing up the streamed probabilities
+  std::array<dd::fp, 2> expected{};
+  for (std::size_t i = 0; i < probabilities.size(); ++i) {
+    expected.at((i >> 2) & 1U) += probabilities.at(i);
+  }
+  const auto single = ddsim->getMarginalProbabilities({2});
+  EXPECT_NEAR(single.at(0), expected.at(0), 1e-12);
+  EXPECT_NEAR(single.at(1), expected.at(1), 1e-12);
+
+  EXPECT_THROW(std::ignore = ddsim->getMarginalProbabilities({4}),
+               std::invalid_argument);
+  EXPECT_THROW(std::ignore = ddsim->getMarginalProbabilities({1, 1}),
+               std::invalid_argument);
+}
+
+TEST(DeterministicNoiseSimTest, MarginalProbabilitiesOfMixedQubit) {
+  auto quantumComputation = std::make_unique<qc::QuantumComputation>(2);
+  quantumComputation->h(1);
+
+  // full dephasing leaves the identity on qubit 1, which is not represented by
+  // a node in the DD
+  auto ddsim = std::make_unique<DeterministicNoiseSimulator>(
+      std::move(quantumComputation), std::string("P"), 0.5, 0, 1);
+  ddsim->simulate(1);
+
+  const auto marginal = ddsim->getMarginalProbabilities({0, 1});
+  ASSERT_EQ(marginal.size(), 4);
+  EXPECT_NEAR(marginal.at(0b00), 0.5, 1e-12);
+  EXPECT_NEAR(marginal.at(0b01), 0., 1e-12);
+  EXPECT_NEAR(marginal.at(0b10), 0.5, 1e-12);
+  EXPECT_NEAR(marginal.at(0b11), 0., 1e-12);
+  const auto mixed = ddsim->getMarginalProbabilities({1});
+  EXPECT_NEAR(mixed.at(0), 0.5, 1e-12);
+  EXPECT_NEAR(mixed.at(1), 0.5, 1e-12);
+  EXPECT_NEAR(ddsim->getMarginalProbabilities({}).at(0), 1., 1e-12);
+}
+
+namespace {
+// qubit 2 is |1> with probability 0.02, in which case qubits 0 and 1 are |+>
+std::unique_ptr<qc::QuantumComputation> getSmallBranchCircuit() {
+  auto quantumComputation = std::make_unique<qc::QuantumComputation>(3);
+  quantumComputation->ry(2 * std::asin(std::sqrt(0.02)), 2);
+  quantumComputation->ch(2, 1);
+  quantumComputation->ch(2, 0);
+  quantumComputation->x(1);
+  return quantumComputation;
+}
+} // namespace
+
+TEST(DeterministicNoiseSimTest, FidelityDrivenApproximation) {
+  auto ddsim = std::make_unique<DeterministicNoiseSimulator>(
+      getSmallBranchCircuit(),
+      ApproximationInfo{0.95, 1, ApproximationInfo::FidelityDriven},
+      NoiseModel(0, 0, 1), "");
+  ddsim->simulate(1);
+
+  // the unlikely branch is removed and the remaining state renormalized
+  const auto m = ddsim->rootEdge.getSparseProbabilityVectorStrKeys(
+      ddsim->getNumberOfQubits(), 0.);
+  ASSERT_EQ(m.size(), 1);
+  EXPECT_NEAR(m.at("010"), 1., 1e-12);
+  EXPECT_EQ(ddsim->getActiveNodeCount(), 3);
+
+  const auto statistics = ddsim->additionalStatistics();
+  EXPECT_EQ(statistics.at("approximation_runs"), "1");
+  EXPECT_NEAR(std::stod(statistics.at("final_fidelity")), 0.98, 1e-6);
+  EXPECT_NEAR(std::stod(statistics.at("approximation_trace_distance")),
+              std::sqrt(0.02), 1e-6);
+}
+
+TEST(DeterministicNoiseSimTest, ApproximationRespectsTraceDistanceBudget) {
+  auto ddsim = std::make_unique<DeterministicNoiseSimulator>(
+      getSmallBranchCircuit(),
+      ApproximationInfo{0.95, 1, ApproximationInfo::FidelityDriven},
+      NoiseModel(0, 0, 1), "");
+  // discarding the branch would exceed a trace distance of 0.1
+  ddsim->setApproximationTraceDistance(0.1);
+  EXPECT_DOUBLE_EQ(ddsim->getApproximationTraceDistance(), 0.1);
+  ddsim->simulate(1);
+
+  const auto m = ddsim->rootEdge.getSparseProbabilityVectorStrKeys(
+      ddsim->getNumberOfQubits(), 0.);
+  EXPECT_NEAR(m.at("010"), 0.98, 1e-12);
+  EXPECT_NEAR(m.at("111"), 0.02 / 4, 1e-12);
+  EXPECT_NEAR(std::stod(ddsim->additionalStatistics().at("final_fidelity")), 1.,
+              1e-12);
+
+  EXPECT_THROW(ddsim->setApproximationTraceDistance(-1.),
+               std::invalid_argument);
+}
+
+TEST(DeterministicNoiseSimTest, MemoryDrivenApproximationOfNoisyState) {
+  auto quantumComputation = std::make_unique<qc::QuantumComputation>(3);
+  quantumComputation->x(2);
+  quantumComputation->ch(2, 1);
+  quantumComputation->ch(2, 0);
+  // the memory-driven strategy only approximates once the unique table is
+  // filled, which this small circuit never does
+  auto ddsim = std::make_unique<DeterministicNoiseSimulator>(
+      std::move(quantumComputation),
+      ApproximationInfo{0.9, 1, ApproximationInfo::MemoryDriven},
+      NoiseModel(0.01, 0.02, 1), "APD");
+  ddsim->simulate(1);
+  EXPECT_EQ(ddsim->additionalStatistics().at("approximation_runs"), "0");
+  const auto marginal = ddsim->getMarginalProbabilities({2});
+  EXPECT_NEAR(marginal.at(0) + marginal.at(1), 1., 1e-12);
+}
+
+TEST(DeterministicNoiseSimTest, ParallelShotsOfDynamicCircuit) {
+  const auto simulate = [](const std::size_t threads,
+                           const std::size_t shots = 1001) {
+    auto quantumComputation = std::make_unique<qc::QuantumComputation>(2, 2);
+    quantumComputation->h(0);
+    quantumComputation->measure(0, 0);
+    quantumComputation->if_(qc::X, 1U, {0, 1});
+    quantumComputation->measure(1, 1);
+    auto ddsim = std::make_unique<DeterministicNoiseSimulator>(
+        std::move(quantumComputation), ApproximationInfo{}, 42U,
+        NoiseModel(0, 0, 1), "");
+    ddsim->setNumberOfThreads(threads);
+    EXPECT_EQ(ddsim->getNumberOfThreads(), threads);
+    auto m = ddsim->simulate(shots);
+    EXPECT_EQ(ddsim->additionalStatistics().at("single_shots"),
+              std::to_string(shots));
+    return m;
+  };
+
+  const auto m = simulate(3);
+  ASSERT_EQ(m.size(), 2);
+  EXPECT_EQ(m.at("00") + m.at("11"), 1001);
+  EXPECT_NEAR(static_cast<double>(m.at("11")), 500., 75.);
+  // the shots of the worker threads are seeded from the simulator
+  EXPECT_EQ(simulate(3), m);
+  // too few shots to be worth additional workers
+  EXPECT_EQ(simulate(3, 20), simulate(1, 20));
+
+  auto quantumComputation = std::make_unique<qc::QuantumComputation>(1);
+  auto ddsim = std::make_unique<DeterministicNoiseSimulator>(
+      std::move(quantumComputation));
+  EXPECT_THROW(ddsim->setNumberOfThreads(0), std::invalid_argument);
+}
+
+TEST(DeterministicNoiseSimTest, ExpectationValuesOfPauliStrings) {
+  auto quantumComputation = std::make_unique<qc::QuantumComputation>(2);
+  quantumComputation->h(0);
+  quantumComputation->h(1);
+  quantumComputation->s(1);
+
+  // every gate dephases its qubit with probability 0.1
+  auto ddsim = std::make_unique<DeterministicNoiseSimulator>(
+      std::move(quantumComputation), std::string("P"), 0.1, 0, 1);
+  const auto values = ddsim->expectationValues({"II", "IX", "YI", "XI", "ZZ"});
+  ASSERT_EQ(values.size(), 5);
+  EXPECT_NEAR(values[0], 1., 1e-12);
+  EXPECT_NEAR(values[1], 0.8, 1e-12);
+  EXPECT_NEAR(values[2], 0.8 * 0.8, 1e-12);
+  EXPECT_NEAR(values[3], 0., 1e-12);
+  EXPECT_NEAR(values[4], 0., 1e-12);
+
+  EXPECT_THROW(std::ignore = ddsim->expectationValues({"X"}),
+               std::invalid_argument);
+  EXPECT_THROW(std::ignore = ddsim->expectationValues({"IA"}),
+               std::invalid_argument);
+}
+
+TEST(DeterministicNoiseSimTest, PauliStringsMatchObservableCircuits) {
+  const std::vector<std::string> paulis{"IIII", "ZIII", "IIIZ", "XXII",
+                                        "YZXI", "IYIY", "ZZZZ", "XIIX"};
+  auto ddsim = std::make_unique<DeterministicNoiseSimulator>(
+      detGetAdder4Circuit(), ApproximationInfo{}, 42U, std::string("APD"), 0.01,
+      std::optional<double>{}, 2);
+  const auto values = ddsim->expectationValues(paulis);
+
+  for (std::size_t i = 0; i < paulis.size(); ++i) {
+    qc::QuantumComputation observable(4);
+    for (qc::Qubit q = 0; q < 4; ++q) {
+      switch (paulis[i][3 - q]) {
+      case 'X':
+        observable.x(q);
+        break;
+      case 'Y':
+        observable.y(q);
+        break;
+      case 'Z':
+        observable.z(q);
+        break;
+      default:
+        break;
+      }
+    }
+    EXPECT_NEAR(ddsim->expectationValue(observable), values[i], 1e-9)
+        << paulis[i];
+  }
+  EXPECT_NEAR(values[0], 1., 1e-9);
+}
+
+TEST(DeterministicNoiseSimTest, LayeredNoiseMatchesNoiseAfterEveryGate) {
+  const auto simulate = [](std::unique_ptr<qc::QuantumComputation> qc,
+                           const bool layered) {
+    auto ddsim = std::make_unique<DeterministicNoiseSimulator>(
+        std::move(qc), ApproximationInfo{}, 42U, std::string("APD"), 0.01,
+        std::optional<double>{}, 2);
+    ddsim->setLayeredNoise(layered);
+    EXPECT_EQ(ddsim->getLayeredNoise(), layered);
+    ddsim->setMeasurementThreshold(0.);
+    ddsim->simulate(1);
+    return std::pair{
+        ddsim->rootEdge.getSparseProbabilityVectorStrKeys(
+            ddsim->getNumberOfQubits(), 0.),
+        std::stoull(ddsim->additionalStatistics().at("noise_passes"))};
+  };
+
+  const auto withMeasurements = [] {
+    auto qc = detGetAdder4Circuit();
+    qc->addClassicalRegister(2);
+    qc->measure(0, 0);
+    qc->h(0);
+    qc->h(1);
+    qc->reset(2);
+    qc->cx(2, 3);
+    qc->measure(1, 1);
+    return qc;
+  };
+
+  for (const auto& circuit : {detGetAdder4Circuit, +withMeasurements}) {
+    const auto [expected, passesPerGate] = simulate(circuit(), false);
+    const auto [actual, passesPerLayer] = simulate(circuit(), true);
+    EXPECT_LT(passesPerLayer, passesPerGate);
+    ASSERT_EQ(actual.size(), expected.size());
+    for (const auto& [state, probability] : expected) {
+      ASSERT_TRUE(actual.contains(state)) << state;
+      EXPECT_NEAR(actual.at(state), probability, 1e-12) << state;
+    }
+  }
+}
+
+TEST(DeterministicNoiseSimTest, ReducedDensityMatrix) {
+  const auto circuit = [] {
+    auto qc = std::make_unique<qc::QuantumComputation>(3);
+    qc->h(0);
+    qc->ry(0.7, 2);
+    qc->cx(0, 1);
+    qc->s(1);
+    qc->cx(2, 0);
+    return qc;
+  };
+
+  // without noise, the result agrees with the state vector simulation
+  auto noiseless = std::make_unique<DeterministicNoiseSimulator>(
+      circuit(), std::string(""), 0, 0, 1);
+  noiseless->simulate(1);
+  CircuitSimulator vectorSimulator(circuit());
+  vectorSimulator.simulate(1);
+  for (const auto& qubits : std::vector<std::vector<qc::Qubit>>{
+           {0}, {1, 0}, {2, 1}, {0, 1, 2}, {}}) {
+    const auto expected = vectorSimulator.reducedDensityMatrix(qubits);
+    const auto actual = noiseless->reducedDensityMatrix(qubits);
+    ASSERT_EQ(actual.size(), expected.size());
+    for (std::size_t k = 0; k < expected.size(); ++k) {
+      EXPECT_NEAR(std::abs(actual[k] - expected[k]), 0., 1e-12);
+    }
+  }
+
+  // dephasing damps the coherences of the kept qubit
+  auto quantumComputation = std::make_unique<qc::QuantumComputation>(2);
+  quantumComputation->h(0);
+  quantumComputation->x(1);
+  auto noisy = std::make_unique<DeterministicNoiseSimulator>(
+      std::move(quantumComputation), std::string("P"), 0.1, 0, 1);
+  noisy->simulate(1);
+  const auto rho = noisy->reducedDensityMatrix({0});
+  EXPECT_NEAR(rho[0].real(), 0.5, 1e-12);
+  EXPECT_NEAR(rho[3].real(), 0.5, 1e-12);
+  EXPECT_NEAR(rho[1].real(), 0.5 * 0.8, 1e-12);
+  EXPECT_NEAR(rho[2].real(), 0.5 * 0.8, 1e-12);
+  const auto other = noisy->reducedDensityMatrix({1});
+  EXPECT_NEAR(other[3].real(), 1., 1e-12);
+  EXPECT_THROW(std::ignore = noisy->reducedDensityMatrix({2}),
+               std::invalid_argument);
+}
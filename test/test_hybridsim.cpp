@@ -10,18 +10,91 @@
 
 #include "CircuitSimulator.hpp"
 #include "HybridSchrodingerFeynmanSimulator.hpp"
+#include "dd/DDDefinitions.hpp"
+#include "ir/Definitions.hpp"
 #include "ir/QuantumComputation.hpp"
+#include "ir/operations/Control.hpp"
 #include "ir/operations/OpType.hpp"
 
+#include <cmath>
+#include <complex>
+#include <cstddef>
 #include <cstdlib>
+#include <filesystem>
 #include <gtest/gtest.h>
 #include <iostream>
 #include <memory>
+#include <optional>
 #include <stdexcept>
+#include <string>
+#include <thread>
+#include <tuple>
 #include <utility>
+#include <vector>
 
 using namespace qc::literals;
 
+namespace {
+std::unique_ptr<qc::QuantumComputation> getCrossingCircuit() {
+  // six gates cross the cut between qubits 1 and 2
+  auto qc = std::make_unique<qc::QuantumComputation>(4);
+  for (qc::Qubit q = 0; q < 4; ++q) {
+    qc->h(q);
+    qc->t(q);
+  }
+  qc->cx(0, 2);
+  qc->cx(3, 1);
+  qc->cx(1, 2);
+  qc->cz(0, 3);
+  qc->ry(0.3, 2);
+  qc->cx(2, 0);
+  qc->cx(1, 3);
+  return qc;
+}
+
+std::unique_ptr<qc::QuantumComputation> getPairedCircuit() {
+  // qubits 0 and 2 as well as 1 and 3 interact with each other
+  auto qc = std::make_unique<qc::QuantumComputation>(4);
+  for (qc::Qubit q = 0; q < 4; ++q) {
+    qc->h(q);
+    qc->t(q);
+  }
+  qc->cx(0, 2);
+  qc->cx(1, 3);
+  qc->ry(0.4, 2);
+  qc->rx(0.7, 1);
+  qc->cx(2, 0);
+  qc->cx(3, 1);
+  return qc;
+}
+
+std::unique_ptr<qc::QuantumComputation> getChainCircuit() {
+  // gates crossing one or both of the cuts at qubits 2 and 4
+  auto qc = std::make_unique<qc::QuantumComputation>(6);
+  for (qc::Qubit q = 0; q < 6; ++q) {
+    qc->h(q);
+    qc->t(q);
+  }
+  qc->cx(1, 2);
+  qc->cx(3, 4);
+  qc->ry(0.3, 2);
+  qc->cx(0, 5);
+  qc->cx(qc::Control{5, qc::Control::Type::Neg}, 1);
+  qc->rx(0.6, 4);
+  qc->mcx({0, 3}, 2);
+  qc->cz(4, 3);
+  qc->cx(2, 0);
+  return qc;
+}
+
+void expectStatesMatch(const dd::CVec& actual, const dd::CVec& expected) {
+  ASSERT_EQ(actual.size(), expected.size());
+  for (std::size_t i = 0; i < expected.size(); ++i) {
+    EXPECT_NEAR(std::abs(actual[i] - expected[i]), 0., 1e-10);
+  }
+}
+} // namespace
+
 TEST(HybridSimTest, TrivialParallelDD) {
   auto quantumComputation = [] {
     auto qc = std::make_unique<qc::QuantumComputation>(4);
@@ -216,27 +289,425 @@ TEST(HybridSimTest, DynamicCircuitSupport) {
 
 TEST(HybridSimTest, TwoTargetGateSupport) {
   auto qc = std::make_unique<qc::QuantumComputation>(2);
+  qc->h(0);
+  qc->h(1);
   qc->rzz(1., 0, 1);
   std::cout << *qc << "\n";
 
+  CircuitSimulator reference(std::make_unique<qc::QuantumComputation>(*qc));
+  reference.simulate(0);
   HybridSchrodingerFeynmanSimulator sim(std::move(qc));
-  EXPECT_THROW(sim.simulate(1024), std::invalid_argument);
+  // RZZ decomposes into two Schmidt terms, i.e., a single decision
+  EXPECT_EQ(sim.getNDecisions(1), 1);
+  sim.simulate(0);
+  expectStatesMatch(sim.getVectorFromHybridSimulation(),
+                    reference.rootEdge.getVector());
 }
 
 TEST(HybridSimTest, TwoControlGateSupportLowerHalf) {
   auto qc = std::make_unique<qc::QuantumComputation>(4);
+  for (qc::Qubit q = 0; q < 4; ++q) {
+    qc->h(q);
+  }
   qc->mcx({0, 1}, 2);
   std::cout << *qc << "\n";
 
+  CircuitSimulator reference(std::make_unique<qc::QuantumComputation>(*qc));
+  reference.simulate(0);
+  const auto expected = reference.rootEdge.getVector();
   HybridSchrodingerFeynmanSimulator sim(std::move(qc));
-  EXPECT_THROW(sim.simulate(1024), std::invalid_argument);
+  // both controls across the cut form a single Schmidt decision
+  sim.setSplitQubit(2);
+  sim.simulate(0);
+  EXPECT_EQ(sim.getCutPlan().nDecisions, 1);
+  expectStatesMatch(sim.getVectorFromHybridSimulation(), expected);
+
+  // the planner avoids the cut through the controls
+  sim.setSplitQubit(std::nullopt);
+  EXPECT_NO_THROW(sim.simulate(0));
+  EXPECT_NE(sim.getCutPlan().splitQubit, 2);
 }
 
 TEST(HybridSimTest, TwoControlGateSupportUpperHalf) {
   auto qc = std::make_unique<qc::QuantumComputation>(4);
+  for (qc::Qubit q = 0; q < 4; ++q) {
+    qc->h(q);
+  }
   qc->mcx({3, 2}, 1);
   std::cout << *qc << "\n";
 
+  CircuitSimulator reference(std::make_unique<qc::QuantumComputation>(*qc));
+  reference.simulate(0);
+  const auto expected = reference.rootEdge.getVector();
   HybridSchrodingerFeynmanSimulator sim(std::move(qc));
-  EXPECT_THROW(sim.simulate(1024), std::invalid_argument);
+  // both controls across the cut form a single Schmidt decision
+  sim.setSplitQubit(2);
+  sim.simulate(0);
+  EXPECT_EQ(sim.getCutPlan().nDecisions, 1);
+  expectStatesMatch(sim.getVectorFromHybridSimulation(), expected);
+
+  // the planner avoids the cut through the controls
+  sim.setSplitQubit(std::nullopt);
+  EXPECT_NO_THROW(sim.simulate(0));
+  EXPECT_NE(sim.getCutPlan().splitQubit, 2);
+}
+
+TEST(HybridSimTest, DDModeCombinesSlicesInMemory) {
+  CircuitSimulator reference(getCrossingCircuit());
+  reference.simulate(0);
+  const auto expected = reference.rootEdge.getVector();
+
+  HybridSchrodingerFeynmanSimulator ddsim(
+      getCrossingCircuit(), HybridSchrodingerFeynmanSimulator::Mode::DD, 8);
+  ASSERT_EQ(ddsim.getNDecisions(2), 6);
+  ddsim.simulate(0);
+  EXPECT_EQ(ddsim.getSpilledSlices(), 0);
+  EXPECT_EQ(ddsim.additionalStatistics().at("spilled_slices"), "0");
+
+  expectStatesMatch(ddsim.getVectorFromHybridSimulation(), expected);
+  // no intermediate files are written to the working directory
+  for (const auto& entry : std::filesystem::directory_iterator(".")) {
+    EXPECT_FALSE(entry.path().filename().string().starts_with("slice_"));
+  }
+}
+
+TEST(HybridSimTest, DDModeSpillsBeyondMemoryBudget) {
+  CircuitSimulator reference(getCrossingCircuit());
+  reference.simulate(0);
+  const auto expected = reference.rootEdge.getVector();
+
+  const auto directory =
+      std::filesystem::temp_directory_path() / "ddsim_hybrid_spill_test";
+  std::filesystem::create_directories(directory);
+
+  HybridSchrodingerFeynmanSimulator ddsim(
+      getCrossingCircuit(), HybridSchrodingerFeynmanSimulator::Mode::DD, 8);
+  ddsim.setMemoryBudget(1);
+  ddsim.setSpillDirectory(directory);
+  ddsim.simulate(0);
+  EXPECT_GT(ddsim.getSpilledSlices(), 0);
+
+  expectStatesMatch(ddsim.getVectorFromHybridSimulation(), expected);
+  // spilled results are removed once they have been combined
+  EXPECT_TRUE(std::filesystem::is_empty(directory));
+
+  // concurrent simulations spilling to the same directory do not interfere
+  std::vector<std::unique_ptr<HybridSchrodingerFeynmanSimulator>> simulators;
+  for (std::size_t i = 0; i < 4; ++i) {
+    auto& sim = simulators.emplace_back(
+        std::make_unique<HybridSchrodingerFeynmanSimulator>(
+            getCrossingCircuit(), HybridSchrodingerFeynmanSimulator::Mode::DD,
+            4));
+    sim->setMemoryBudget(1);
+    sim->setSpillDirectory(directory);
+  }
+  std::vector<std::thread> threads;
+  for (const auto& sim : simulators) {
+    threads.emplace_back([&sim] { sim->simulate(0); });
+  }
+  for (auto& thread : threads) {
+    thread.join();
+  }
+  for (const auto& sim : simulators) {
+    EXPECT_GT(sim->getSpilledSlices(), 0);
+    expectStatesMatch(sim->getVectorFromHybridSimulation(), expected);
+  }
+  EXPECT_TRUE(std::filesystem::is_empty(directory));
+  std::filesystem::remove_all(directory);
+}
+
+TEST(HybridSimTest, PlannerChoosesCheapestCut) {
+  CircuitSimulator reference(getPairedCircuit());
+  reference.simulate(0);
+  const auto expected = reference.rootEdge.getVector();
+
+  for (const auto mode : {HybridSchrodingerFeynmanSimulator::Mode::DD,
+                          HybridSchrodingerFeynmanSimulator::Mode::Amplitude}) {
+    HybridSchrodingerFeynmanSimulator ddsim(getPairedCircuit(), mode);
+    ASSERT_EQ(ddsim.getNDecisions(2), 4);
+    ASSERT_EQ(ddsim.getNDecisions(1), 2);
+
+    const auto plan = ddsim.planCut();
+    EXPECT_EQ(plan.splitQubit, 1);
+    EXPECT_EQ(plan.nDecisions, 2);
+    EXPECT_FALSE(plan.relabeled);
+    EXPECT_LT(plan.cost, ddsim.estimateCost(2, 4));
+
+    ddsim.simulate(0);
+    EXPECT_EQ(ddsim.additionalStatistics().at("split_qubit"), "1");
+    EXPECT_EQ(ddsim.additionalStatistics().at("decisions"), "2");
+    expectStatesMatch(ddsim.getVectorFromHybridSimulation(), expected);
+  }
+}
+
+TEST(HybridSimTest, PlannerRelabelsInteractingQubits) {
+  CircuitSimulator reference(getPairedCircuit());
+  reference.simulate(0);
+  const auto expected = reference.rootEdge.getVector();
+
+  for (const auto mode : {HybridSchrodingerFeynmanSimulator::Mode::DD,
+                          HybridSchrodingerFeynmanSimulator::Mode::Amplitude}) {
+    HybridSchrodingerFeynmanSimulator ddsim(getPairedCircuit(), mode);
+    ddsim.setQubitRelabeling(true);
+
+    const auto plan = ddsim.planCut();
+    EXPECT_TRUE(plan.relabeled);
+    EXPECT_EQ(plan.nDecisions, 0);
+    EXPECT_EQ(plan.layout[0] < 2, plan.layout[2] < 2);
+    EXPECT_EQ(plan.layout[1] < 2, plan.layout[3] < 2);
+
+    ddsim.simulate(0);
+    EXPECT_EQ(ddsim.additionalStatistics().at("relabeled"), "true");
+    expectStatesMatch(ddsim.getVectorFromHybridSimulation(), expected);
+
+    // the circuit itself is left untouched
+    EXPECT_EQ(ddsim.getNDecisions(2), 4);
+  }
+}
+
+TEST(HybridSimTest, RelabelingIsUndoneOnFailure) {
+  // qubits q and q + 30 interact, which relabeling places next to each other
+  const qc::Qubit half = 30;
+  auto qc = std::make_unique<qc::QuantumComputation>(2 * half);
+  for (qc::Qubit q = 0; q < half; ++q) {
+    qc->h(q);
+    qc->cx(q, q + half);
+  }
+
+  // the amplitudes of 60 qubits never fit into memory
+  HybridSchrodingerFeynmanSimulator ddsim(
+      std::move(qc), HybridSchrodingerFeynmanSimulator::Mode::Amplitude);
+  ddsim.setQubitRelabeling(true);
+  ASSERT_EQ(ddsim.getNDecisions(half), half);
+  EXPECT_THROW(ddsim.simulate(0), std::runtime_error);
+  EXPECT_TRUE(ddsim.getCutPlan().relabeled);
+  EXPECT_EQ(ddsim.getNDecisions(half), half);
+}
+
+TEST(HybridSimTest, FixedSplitQubit) {
+  CircuitSimulator reference(getPairedCircuit());
+  reference.simulate(0);
+  const auto expected = reference.rootEdge.getVector();
+
+  HybridSchrodingerFeynmanSimulator ddsim(
+      getPairedCircuit(), HybridSchrodingerFeynmanSimulator::Mode::DD);
+  ddsim.setQubitRelabeling(true);
+  ddsim.setSplitQubit(2);
+  ddsim.simulate(0);
+  EXPECT_EQ(ddsim.getCutPlan().splitQubit, 2);
+  EXPECT_EQ(ddsim.getCutPlan().nDecisions, 4);
+  EXPECT_FALSE(ddsim.getCutPlan().relabeled);
+  expectStatesMatch(ddsim.getVectorFromHybridSimulation(), expected);
+
+  ddsim.setSplitQubit(4);
+  EXPECT_THROW(ddsim.simulate(0), std::invalid_argument);
+}
+
+TEST(HybridSimTest, HalfSliceMemoization) {
+  CircuitSimulator reference(getCrossingCircuit());
+  reference.simulate(0);
+  const auto expected = reference.rootEdge.getVector();
+
+  for (const auto mode : {HybridSchrodingerFeynmanSimulator::Mode::DD,
+                          HybridSchrodingerFeynmanSimulator::Mode::Amplitude}) {
+    // uneven chunks of slices per thread as well as single slices
+    for (const std::size_t nthreads : {1U, 3U, 64U}) {
+      HybridSchrodingerFeynmanSimulator ddsim(getCrossingCircuit(), mode,
+                                              nthreads);
+      ddsim.setSplitQubit(2);
+      ddsim.setHalfSliceMemoization(true);
+      ddsim.simulate(0);
+      EXPECT_EQ(ddsim.getCutPlan().nDecisions, 6);
+      expectStatesMatch(ddsim.getVectorFromHybridSimulation(), expected);
+    }
+  }
+}
+
+TEST(HybridSimTest, AmplitudeAccumulatorsFitIntoMemory) {
+  EXPECT_GT(HybridSchrodingerFeynmanSimulator::getAvailableMemory(), 0);
+
+  HybridSchrodingerFeynmanSimulator ddsim(
+      getCrossingCircuit(), HybridSchrodingerFeynmanSimulator::Mode::Amplitude,
+      3);
+  // a vector of four qubits takes 16 * 16 bytes
+  EXPECT_EQ(ddsim.getAmplitudeAccumulatorLimit(1024), 4);
+  EXPECT_EQ(ddsim.getAmplitudeAccumulatorLimit(255), 0);
+  EXPECT_EQ(ddsim.getAmplitudeAccumulatorLimit(0), 3);
+
+  // too wide for a vector, even if the available memory is unknown
+  const HybridSchrodingerFeynmanSimulator wide(
+      std::make_unique<qc::QuantumComputation>(64),
+      HybridSchrodingerFeynmanSimulator::Mode::Amplitude, 3);
+  EXPECT_EQ(wide.getAmplitudeAccumulatorLimit(0), 0);
+  EXPECT_EQ(wide.getAmplitudeAccumulatorLimit(1024), 0);
+
+  CircuitSimulator reference(getCrossingCircuit());
+  reference.simulate(0);
+  ddsim.setSplitQubit(2);
+  ddsim.simulate(0);
+  EXPECT_EQ(ddsim.additionalStatistics().at("amplitude_accumulators"), "3");
+  expectStatesMatch(ddsim.getVectorFromHybridSimulation(),
+                    reference.rootEdge.getVector());
+}
+
+TEST(HybridSimTest, MultipleCuts) {
+  CircuitSimulator reference(getChainCircuit());
+  reference.simulate(0);
+  const auto expected = reference.rootEdge.getVector();
+
+  for (const auto mode : {HybridSchrodingerFeynmanSimulator::Mode::DD,
+                          HybridSchrodingerFeynmanSimulator::Mode::Amplitude}) {
+    for (const bool memoization : {false, true}) {
+      for (const std::size_t nthreads : {1U, 3U}) {
+        HybridSchrodingerFeynmanSimulator ddsim(getChainCircuit(), mode,
+                                                nthreads);
+        ASSERT_EQ(ddsim.getNDecisions(std::vector<qc::Qubit>{2, 4}), 7);
+        ddsim.setCuts({4, 2});
+        EXPECT_EQ(ddsim.getCuts(), (std::vector<qc::Qubit>{2, 4}));
+        ddsim.setHalfSliceMemoization(memoization);
+        ddsim.simulate(0);
+        EXPECT_EQ(ddsim.getCutPlan().nDecisions, 7);
+        EXPECT_EQ(ddsim.additionalStatistics().at("slices"), "3");
+        expectStatesMatch(ddsim.getVectorFromHybridSimulation(), expected);
+      }
+    }
+  }
+}
+
+TEST(HybridSimTest, PlannerCutsIntoSmallSlices) {
+  CircuitSimulator reference(getChainCircuit());
+  reference.simulate(0);
+  const auto expected = reference.rootEdge.getVector();
+
+  HybridSchrodingerFeynmanSimulator ddsim(
+      getChainCircuit(), HybridSchrodingerFeynmanSimulator::Mode::DD);
+  ddsim.setMaxSliceQubits(3);
+  const auto plan = ddsim.planCut();
+  ASSERT_GE(plan.cuts.size(), 1);
+  EXPECT_EQ(plan.splitQubit, plan.cuts.front());
+  EXPECT_EQ(plan.nDecisions, ddsim.getNDecisions(plan.cuts));
+  EXPECT_DOUBLE_EQ(plan.cost, ddsim.estimateCost(plan.cuts, plan.nDecisions));
+  qc::Qubit start = 0;
+  for (const auto cut : plan.cuts) {
+    EXPECT_LE(cut - start, 3);
+    start = cut;
+  }
+  EXPECT_LE(6 - start, 3);
+
+  ddsim.simulate(0);
+  expectStatesMatch(ddsim.getVectorFromHybridSimulation(), expected);
+
+  // a gate spanning three slices cannot be decomposed
+  auto qc = std::make_unique<qc::QuantumComputation>(3);
+  qc->mcx({0, 2}, 1);
+  HybridSchrodingerFeynmanSimulator toffoli(std::move(qc));
+  toffoli.setMaxSliceQubits(1);
+  EXPECT_THROW(toffoli.planCut(), std::invalid_argument);
+  toffoli.setMaxSliceQubits(2);
+  EXPECT_EQ(toffoli.planCut().cuts.size(), 1);
+}
+
+TEST(HybridSimTest, SchmidtDecompositionAcrossCut) {
+  const auto getCircuit = []() {
+    auto qc = std::make_unique<qc::QuantumComputation>(4);
+    for (qc::Qubit q = 0; q < 4; ++q) {
+      qc->h(q);
+      qc->t(q);
+    }
+    qc->swap(1, 2);
+    qc->iswap(0, 3);
+    qc->ry(0.4, 1);
+    qc->ecr(2, 1);
+    qc->rzz(0.7, 0, 2);
+    qc->cswap(0, 1, 3);
+    qc->rx(0.2, 2);
+    qc->cx(3, 0);
+    return qc;
+  };
+  CircuitSimulator reference(getCircuit());
+  reference.simulate(0);
+  const auto expected = reference.rootEdge.getVector();
+
+  for (const auto mode : {HybridSchrodingerFeynmanSimulator::Mode::DD,
+                          HybridSchrodingerFeynmanSimulator::Mode::Amplitude}) {
+    for (const bool memoization : {false, true}) {
+      HybridSchrodingerFeynmanSimulator ddsim(getCircuit(), mode, 3);
+      ddsim.setSplitQubit(2);
+      ddsim.setHalfSliceMemoization(memoization);
+      ddsim.simulate(0);
+      // SWAP, iSWAP and the controlled SWAP have four Schmidt terms, ECR and
+      // RZZ two, and the CX is decided by its control
+      EXPECT_EQ(ddsim.getCutPlan().nDecisions, 2 + 2 + 1 + 1 + 2 + 1);
+      expectStatesMatch(ddsim.getVectorFromHybridSimulation(), expected);
+    }
+  }
+}
+
+TEST(HybridSimTest, SimulateRangesIndependently) {
+  CircuitSimulator reference(getChainCircuit());
+  reference.simulate(0);
+  const auto expected = reference.rootEdge.getVector();
+
+  const std::vector<qc::Qubit> cuts{2, 4};
+  for (const auto mode : {HybridSchrodingerFeynmanSimulator::Mode::DD,
+                          HybridSchrodingerFeynmanSimulator::Mode::Amplitude}) {
+    // every range is simulated by its own simulator, as in separate processes
+    std::vector<std::string> partials;
+    for (const auto& [begin, end] :
+         std::vector<std::pair<std::size_t, std::size_t>>{
+             {0, 5}, {5, 64}, {64, 128}}) {
+      HybridSchrodingerFeynmanSimulator shard(getChainCircuit(), mode, 2);
+      partials.emplace_back(shard.simulateRange(cuts, begin, end));
+    }
+
+    HybridSchrodingerFeynmanSimulator ddsim(getChainCircuit(), mode);
+    EXPECT_THROW(static_cast<void>(ddsim.simulateRange(cuts, 0, 129)),
+                 std::invalid_argument);
+    EXPECT_THROW(static_cast<void>(ddsim.simulateRange(cuts, 3, 3)),
+                 std::invalid_argument);
+    EXPECT_THROW(static_cast<void>(ddsim.simulateRange({}, 0, 1)),
+                 std::invalid_argument);
+    ddsim.combinePartialResults(partials, 0);
+    expectStatesMatch(ddsim.getVectorFromHybridSimulation(), expected);
+  }
+
+  HybridSchrodingerFeynmanSimulator ddsim(getChainCircuit());
+  EXPECT_THROW(ddsim.combinePartialResults({"not amplitudes"}, 0),
+               std::invalid_argument);
+}
+
+TEST(HybridSimTest, AmplitudeModeSamplesBlockwise) {
+  CircuitSimulator reference(getChainCircuit());
+  reference.simulate(0);
+  const auto expected = reference.rootEdge.getVector();
+
+  for (const bool retain : {false, true}) {
+    HybridSchrodingerFeynmanSimulator ddsim(
+        getChainCircuit(), ApproximationInfo{}, 42U,
+        HybridSchrodingerFeynmanSimulator::Mode::Amplitude, 3);
+    ddsim.setCuts({2, 4});
+    ddsim.setRetainAmplitudes(retain);
+    const std::size_t shots = 20000;
+    const auto counts = ddsim.simulate(shots);
+
+    std::size_t total = 0;
+    for (const auto& [state, count] : counts) {
+      const auto probability =
+          std::norm(expected.at(std::stoull(state, nullptr, 2)));
+      EXPECT_GT(probability, 0.);
+      EXPECT_NEAR(static_cast<double>(count) / static_cast<double>(shots),
+                  probability, 0.02);
+      total += count;
+    }
+    EXPECT_EQ(total, shots);
+
+    if (retain) {
+      // sampling does not modify the amplitudes
+      expectStatesMatch(ddsim.getVectorFromHybridSimulation(), expected);
+    } else {
+      // the amplitudes were freed after sampling
+      EXPECT_THROW(std::ignore = ddsim.getVectorFromHybridSimulation(),
+                   std::runtime_error);
+    }
+  }
 }
@@ -0,0 +1,225 @@
+/*
+ * Copyright (c) 2023 - 2026 Chair for Design Automation, TUM
+ * Copyright (c) 2025 - 2026 Munich Quantum Software Company GmbH
+ * All rights reserved.
+ *
+ * SPDX-License-Identifier: MIT
+ *
+ * Licensed under the MIT License
+ */
+
+#include "CircuitSimulator.hpp"
+#include "DeterministicNoiseSimulator.hpp"
+#include "NoiseModel.hpp"
+#include "StochasticNoiseSimulator.hpp"
+#include "ir/QuantumComputation.hpp"
+#include "ir/operations/Control.hpp"
+#include "ir/operations/OpType.hpp"
+#include "ir/operations/StandardOperation.hpp"
+
+#include <cmath>
+#include <cstddef>
+#include <gtest/gtest.h>
+#include <memory>
+#include <nlohmann/json.hpp>
+#include <optional>
+#include <stdexcept>
+#include <string>
+#include <utility>
+
+namespace {
+
+std::unique_ptr<qc::QuantumComputation> getAdder4Circuit() {
+  // circuit taken from https://github.com/pnnl/qasmbench
+  auto quantumComputation = std::make_unique<qc::QuantumComputation>(4);
+  quantumComputation->x(0);
+  quantumComputation->x(1);
+  quantumComputation->h(3);
+  quantumComputation->cx(2, 3);
+  quantumComputation->t(0);
+  quantumComputation->t(1);
+  quantumComputation->t(2);
+  quantumComputation->tdg(3);
+  quantumComputation->cx(0, 1);
+  quantumComputation->cx(2, 3);
+  quantumComputation->cx(3, 0);
+  quantumComputation->cx(1, 2);
+  quantumComputation->cx(0, 1);
+  quantumComputation->cx(2, 3);
+  quantumComputation->tdg(0);
+  quantumComputation->tdg(1);
+  quantumComputation->tdg(2);
+  quantumComputation->t(3);
+  quantumComputation->cx(0, 1);
+  quantumComputation->cx(2, 3);
+  quantumComputation->s(3);
+  quantumComputation->cx(3, 0);
+  quantumComputation->h(3);
+  return quantumComputation;
+}
+
+} // namespace
+
+TEST(NoiseModelTest, UniformModel) {
+  const auto model = NoiseModel(0.01, std::nullopt, 3);
+  EXPECT_DOUBLE_EQ(model.getAmplitudeDampingProbability(), 0.02);
+
+  const auto single = model.getQubitNoise(1, false);
+  EXPECT_DOUBLE_EQ(single.noiseProbability, 0.01);
+  EXPECT_DOUBLE_EQ(single.amplitudeDampingProbability, 0.02);
+  const auto multi = model.getQubitNoise(1, true);
+  EXPECT_DOUBLE_EQ(multi.noiseProbability, 0.03);
+  EXPECT_DOUBLE_EQ(multi.amplitudeDampingProbability, 0.06);
+
+  const auto cx = qc::StandardOperation(qc::Control{0}, 1, qc::X);
+  const auto noise = model.getNoise(cx);
+  ASSERT_EQ(noise.size(), 2);
+  EXPECT_EQ(noise.at(0), multi);
+  EXPECT_EQ(noise.at(1), multi);
+}
+
+TEST(NoiseModelTest, QubitRelaxation) {
+  auto model = NoiseModel(0.001);
+  const auto t1 = 100.;
+  const auto t2 = 80.;
+  const auto gateTime = 0.5;
+  model.setQubitRelaxation(2, t1, t2, gateTime);
+
+  const auto parameters = model.getQubitNoise(2, false);
+  const auto tPhi = 1 / ((1 / t2) - (1 / (2 * t1)));
+  EXPECT_NEAR(parameters.amplitudeDampingProbability,
+              1 - std::exp(-gateTime / t1), 1e-12);
+  EXPECT_NEAR(parameters.noiseProbability, (1 - std::exp(-gateTime / tPhi)) / 2,
+              1e-12);
+
+  // other qubits are unaffected
+  EXPECT_DOUBLE_EQ(model.getQubitNoise(0, false).noiseProbability, 0.001);
+
+  EXPECT_THROW(model.setQubitRelaxation(0, 10, 30, 1), std::invalid_argument);
+  EXPECT_THROW(model.setQubitRelaxation(0, 0, 1, 1), std::invalid_argument);
+}
+
+TEST(NoiseModelTest, GateNoise) {
+  auto model = NoiseModel(0.01, 0.02, 2);
+  model.setGateNoise(qc::X, {0, 1}, 0.05);
+  ASSERT_TRUE(model.hasGateNoise());
+
+  const auto cx = qc::StandardOperation(qc::Control{0}, 1, qc::X);
+  const auto noise = model.getNoise(cx);
+  EXPECT_DOUBLE_EQ(noise.at(0).noiseProbability, 0.05);
+  EXPECT_DOUBLE_EQ(noise.at(1).noiseProbability, 0.05);
+  // amplitude damping is still determined by the qubits
+  EXPECT_DOUBLE_EQ(noise.at(1).amplitudeDampingProbability, 0.04);
+
+  // the direction of the gate matters
+  const auto xc = qc::StandardOperation(qc::Control{1}, 0, qc::X);
+  EXPECT_FALSE(model.getGateNoise(xc).has_value());
+  EXPECT_DOUBLE_EQ(model.getNoise(xc).at(0).noiseProbability, 0.02);
+
+  EXPECT_THROW(model.setGateNoise(qc::X, {0}, 1.5), std::invalid_argument);
+  EXPECT_THROW(model.setGateNoise(qc::X, {}, 0.1), std::invalid_argument);
+}
+
+TEST(NoiseModelTest, JsonRoundTrip) {
+  const auto j = nlohmann::json::parse(R"({
+    "noise_probability": 0.002,
+    "amp_damping_probability": 0.004,
+    "multi_qubit_gate_factor": 1.5,
+    "qubits": [
+      {"qubit": 0, "t1": 50.0, "t2": 70.0, "gate_time": 0.05},
+      {"qubit": 3, "noise_probability": 0.01}
+    ],
+    "gates": [{"gate": "cx", "qubits": [0, 1], "noise_probability": 0.03}]
+  })");
+  const auto model = NoiseModel::fromJson(j);
+  EXPECT_DOUBLE_EQ(model.getMultiQubitGateFactor(), 1.5);
+  EXPECT_NEAR(model.getQubitNoise(0, false).amplitudeDampingProbability,
+              1 - std::exp(-0.05 / 50.), 1e-12);
+  EXPECT_DOUBLE_EQ(model.getQubitNoise(3, false).noiseProbability, 0.01);
+  EXPECT_DOUBLE_EQ(model.getQubitNoise(3, false).amplitudeDampingProbability,
+                   0.004);
+  const auto cx = qc::StandardOperation(qc::Control{0}, 1, qc::X);
+  EXPECT_DOUBLE_EQ(model.getGateNoise(cx).value(), 0.03);
+
+  const auto reloaded = NoiseModel::fromJson(model.json());
+  EXPECT_EQ(reloaded.json(), model.json());
+  for (qc::Qubit q = 0; q < 4; ++q) {
+    EXPECT_EQ(reloaded.getQubitNoise(q, true), model.getQubitNoise(q, true));
+  }
+  EXPECT_DOUBLE_EQ(reloaded.getGateNoise(cx).value(), 0.03);
+}
+
+TEST(NoiseModelTest, DeterministicUniformModelMatchesGlobalProbabilities) {
+  auto legacy = std::make_unique<DeterministicNoiseSimulator>(
+      getAdder4Circuit(), std::string("APD"), 0.01, std::optional<double>{}, 2);
+  auto modelled = std::make_unique<DeterministicNoiseSimulator>(
+      getAdder4Circuit(), ApproximationInfo{}, NoiseModel(0.01, 0.02, 2),
+      "APD");
+  legacy->simulate(1);
+  modelled->simulate(1);
+
+  const auto expected = legacy->rootEdge.getSparseProbabilityVectorStrKeys(
+      legacy->getNumberOfQubits(), 0.);
+  const auto actual = modelled->rootEdge.getSparseProbabilityVectorStrKeys(
+      modelled->getNumberOfQubits(), 0.);
+  ASSERT_EQ(expected.size(), actual.size());
+  for (const auto& [state, probability] : expected) {
+    ASSERT_TRUE(actual.contains(state));
+    EXPECT_NEAR(actual.at(state), probability, 1e-12);
+  }
+}
+
+TEST(NoiseModelTest, DeterministicPerQubitDamping) {
+  auto quantumComputation = std::make_unique<qc::QuantumComputation>(2);
+  quantumComputation->x(0);
+  quantumComputation->x(1);
+
+  auto model = NoiseModel(0, 0, 1);
+  model.setQubitNoise(0, std::nullopt, 0.3);
+  auto ddsim = std::make_unique<DeterministicNoiseSimulator>(
+      std::move(quantumComputation), ApproximationInfo{}, model, "A");
+  ddsim->simulate(1);
+
+  const auto m = ddsim->rootEdge.getSparseProbabilityVectorStrKeys(
+      ddsim->getNumberOfQubits(), 0.);
+  EXPECT_NEAR(m.at("11"), 0.7, 1e-12);
+  EXPECT_NEAR(m.at("10"), 0.3, 1e-12);
+  EXPECT_FALSE(m.contains("01"));
+}
+
+TEST(NoiseModelTest, DeterministicGateNoise) {
+  auto quantumComputation = std::make_unique<qc::QuantumComputation>(2);
+  quantumComputation->cx(0, 1);
+
+  // depolarization with probability p leaves |00> with probability 1 - p/2
+  auto model = NoiseModel(0, 0, 1);
+  model.setGateNoise(qc::X, {0, 1}, 0.2);
+  auto ddsim = std::make_unique<DeterministicNoiseSimulator>(
+      std::move(quantumComputation), ApproximationInfo{}, model, "D");
+  ddsim->simulate(1);
+
+  const auto m = ddsim->rootEdge.getSparseProbabilityVectorStrKeys(
+      ddsim->getNumberOfQubits(), 0.);
+  EXPECT_NEAR(m.at("00"), 0.9 * 0.9, 1e-12);
+  EXPECT_NEAR(m.at("11"), 0.1 * 0.1, 1e-12);
+}
+
+TEST(NoiseModelTest, StochasticPerQubitDamping) {
+  auto quantumComputation = std::make_unique<qc::QuantumComputation>(2, 2);
+  quantumComputation->x(0);
+  quantumComputation->x(1);
+  quantumComputation->measure(0, 0);
+  quantumComputation->measure(1, 1);
+
+  auto model = NoiseModel(0, 0, 1);
+  model.setQubitNoise(0, std::nullopt, 0.3);
+  auto ddsim = std::make_unique<StochasticNoiseSimulator>(
+      std::move(quantumComputation), ApproximationInfo{}, 42U, model, "A");
+  const std::size_t shots = 1000;
+  const auto m = ddsim->simulate(shots);
+
+  const auto tolerance = 60.;
+  EXPECT_NEAR(static_cast<double>(m.at("11")), 700., tolerance);
+  EXPECT_NEAR(static_cast<double>(m.at("10")), 300., tolerance);
+  EXPECT_FALSE(m.contains("01"));
+}
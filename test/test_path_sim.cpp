@@ -12,15 +12,19 @@
 #include "algorithms/Grover.hpp"
 #include "dd/DDDefinitions.hpp"
 #include "dd/Export.hpp"
+#include "ir/Definitions.hpp"
 #include "ir/QuantumComputation.hpp"
 #include "ir/operations/OpType.hpp"
 
 #include <complex>
+#include <cstddef>
 #include <gtest/gtest.h>
 #include <iostream>
 #include <memory>
 #include <stdexcept>
+#include <string>
 #include <utility>
+#include <vector>
 
 using namespace qc::literals;
 
@@ -40,6 +44,9 @@ TEST(TaskBasedSimTest, Configuration) {
   EXPECT_EQ(PathSimulator::Configuration::modeToString(
                 PathSimulator::Configuration::Mode::GateCost),
             "gate_cost");
+  EXPECT_EQ(PathSimulator::Configuration::modeToString(
+                PathSimulator::Configuration::Mode::Optimized),
+            "optimized");
   EXPECT_THROW(
       PathSimulator::Configuration::modeToString(
           // NOLINTNEXTLINE(clang-analyzer-optin.core.EnumCastOutOfRange)
@@ -56,6 +63,10 @@ TEST(TaskBasedSimTest, Configuration) {
             PathSimulator::Configuration::Mode::Alternating);
   EXPECT_EQ(PathSimulator::Configuration::modeFromString("gate_cost"),
             PathSimulator::Configuration::Mode::GateCost);
+  EXPECT_EQ(PathSimulator::Configuration::modeFromString("optimized"),
+            PathSimulator::Configuration::Mode::Optimized);
+  EXPECT_EQ(PathSimulator::Configuration::modeFromString("5"),
+            PathSimulator::Configuration::Mode::Optimized);
   EXPECT_THROW(PathSimulator::Configuration::modeFromString("invalid argument"),
                std::invalid_argument);
 
@@ -74,6 +85,11 @@ TEST(TaskBasedSimTest, Configuration) {
   config.startingPoint = 2;
   config.gateCost = {2, 2, 1, 1};
   std::cout << config.toString() << "\n";
+
+  config.mode = PathSimulator::Configuration::Mode::Optimized;
+  config.planningTime = 0.5;
+  EXPECT_EQ(config.json().at("planning_time"), 0.5);
+  std::cout << config.toString() << "\n";
 }
 
 TEST(TaskBasedSimTest, SimpleCircuit) {
@@ -308,3 +324,131 @@ TEST(TaskBasedSimTest, DynamicCircuitSupport) {
   PathSimulator sim(std::move(qc));
   EXPECT_THROW(sim.simulate(1024), std::invalid_argument);
 }
+
+TEST(TaskBasedSimTest, MultithreadedContraction) {
+  const auto targetValue = qc::GroverBitString{"1011"};
+  PathSimulator reference(std::make_unique<qc::QuantumComputation>(
+                              qc::createGrover(4, targetValue)),
+                          PathSimulator::Configuration{});
+  reference.simulate(1);
+  const auto expected = reference.rootEdge.getVector();
+  EXPECT_EQ(reference.additionalStatistics().at("packages"), "1");
+
+  for (const auto mode :
+       {PathSimulator::Configuration::Mode::PairwiseRecursiveGrouping,
+        PathSimulator::Configuration::Mode::BracketGrouping,
+        PathSimulator::Configuration::Mode::Alternating}) {
+    auto config = PathSimulator::Configuration{};
+    config.mode = mode;
+    config.bracketSize = 3;
+    config.nthreads = 4;
+    EXPECT_EQ(config.json().at("nthreads"), 4);
+    PathSimulator tbs(std::make_unique<qc::QuantumComputation>(
+                          qc::createGrover(4, targetValue)),
+                      config);
+    tbs.simulate(1);
+    if (mode == PathSimulator::Configuration::Mode::PairwiseRecursiveGrouping) {
+      // independent subtrees are contracted in packages of their own
+      EXPECT_GT(std::stoul(tbs.additionalStatistics().at("packages")), 1U);
+    }
+
+    const auto actual = tbs.rootEdge.getVector();
+    ASSERT_EQ(actual.size(), expected.size());
+    for (std::size_t i = 0; i < expected.size(); ++i) {
+      EXPECT_NEAR(std::abs(actual[i] - expected[i]), 0., 1e-10);
+    }
+  }
+}
+
+TEST(TaskBasedSimTest, OptimizedPath) {
+  const auto targetValue = qc::GroverBitString{"1011"};
+  const auto createCircuits = [&targetValue]() {
+    std::vector<qc::QuantumComputation> circuits{};
+    circuits.emplace_back(qc::createGrover(4, targetValue));
+    // layers of single-qubit gates between sparse entangling gates
+    auto& layered = circuits.emplace_back(6);
+    for (std::size_t layer = 0; layer < 4; ++layer) {
+      for (qc::Qubit q = 0; q < 6; ++q) {
+        layered.h(q);
+        layered.t(q);
+      }
+      layered.cx(static_cast<qc::Qubit>(layer % 3),
+                 static_cast<qc::Qubit>((layer % 3) + 3));
+    }
+    return circuits;
+  };
+
+  for (const auto& circuit : createCircuits()) {
+    PathSimulator reference(std::make_unique<qc::QuantumComputation>(circuit));
+    reference.simulate(1);
+    const auto expected = reference.rootEdge.getVector();
+    const auto sequentialCost = reference.estimateSimulationPathCost();
+
+    auto config = PathSimulator::Configuration{};
+    config.mode = PathSimulator::Configuration::Mode::PairwiseRecursiveGrouping;
+    const PathSimulator pairwise(
+        std::make_unique<qc::QuantumComputation>(circuit), config);
+    const auto pairwiseCost = pairwise.estimateSimulationPathCost();
+
+    config.mode = PathSimulator::Configuration::Mode::Optimized;
+    config.planningTime = 0.05;
+    config.seed = 42U;
+    PathSimulator tbs(std::make_unique<qc::QuantumComputation>(circuit),
+                      config);
+    const auto& path = tbs.getSimulationPath();
+    EXPECT_EQ(path.components.size(), path.nleaves - 1);
+    // the fixed strategies are part of the search
+    EXPECT_LE(tbs.estimateSimulationPathCost(), sequentialCost);
+    EXPECT_LE(tbs.estimateSimulationPathCost(), pairwiseCost);
+
+    tbs.simulate(1);
+    const auto actual = tbs.rootEdge.getVector();
+    ASSERT_EQ(actual.size(), expected.size());
+    for (std::size_t i = 0; i < expected.size(); ++i) {
+      EXPECT_NEAR(std::abs(actual[i] - expected[i]), 0., 1e-10);
+    }
+  }
+}
+
+TEST(TaskBasedSimTest, OptimizedPathIsReproducibleWithSeed) {
+  auto qc = qc::QuantumComputation(8);
+  for (std::size_t layer = 0; layer < 6; ++layer) {
+    for (qc::Qubit q = 0; q < 8; ++q) {
+      qc.h(q);
+      qc.t(q);
+    }
+    for (qc::Qubit q = static_cast<qc::Qubit>(layer % 2); q + 1 < 8; q += 2) {
+      qc.cx(q, q + 1);
+    }
+  }
+
+  auto config = PathSimulator::Configuration{};
+  config.mode = PathSimulator::Configuration::Mode::Optimized;
+  config.planningTime = 60.;
+  config.seed = 1234U;
+  const PathSimulator first(std::make_unique<qc::QuantumComputation>(qc),
+                            config);
+  const PathSimulator second(std::make_unique<qc::QuantumComputation>(qc),
+                             config);
+  EXPECT_EQ(first.getSimulationPath().components,
+            second.getSimulationPath().components);
+}
+
+TEST(TaskBasedSimTest, OptimizedPathWithoutPlanningTime) {
+  auto config = PathSimulator::Configuration{};
+  config.mode = PathSimulator::Configuration::Mode::Optimized;
+  config.planningTime = 0.;
+
+  // a single deterministic greedy run
+  auto qc = std::make_unique<qc::QuantumComputation>(2);
+  qc->h(0);
+  qc->cx(0, 1);
+  PathSimulator tbs(std::move(qc), config);
+  const auto counts = tbs.simulate(1024);
+  EXPECT_EQ(counts.size(), 2);
+  EXPECT_EQ(counts.at("00") + counts.at("11"), 1024);
+
+  PathSimulator empty(std::make_unique<qc::QuantumComputation>(2), config);
+  EXPECT_TRUE(empty.getSimulationPath().components.empty());
+  EXPECT_EQ(empty.simulate(16).at("00"), 16);
+}
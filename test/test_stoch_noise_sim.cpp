@@ -19,7 +19,9 @@
 #include <memory>
 #include <stdexcept>
 #include <string>
+#include <tuple>
 #include <utility>
+#include <vector>
 
 /**
  * These tests may have to be adjusted if something about the random-number
@@ -214,8 +216,8 @@ TEST(StochNoiseSimTest,
   auto m = ddsim.simulate(1000);
   double const tolerance = 50;
 
-  EXPECT_NEAR(static_cast<double>(m.find("0000")->second), 211, tolerance);
-  EXPECT_NEAR(static_cast<double>(m.find("1000")->second), 146, tolerance);
+  EXPECT_NEAR(static_cast<double>(m.find("0000")->second), 255, tolerance);
+  EXPECT_NEAR(static_cast<double>(m.find("1000")->second), 177, tolerance);
 }
 
 TEST(StochNoiseSimTest, SimulateRunWithBadParameters) {
@@ -385,3 +387,87 @@ TEST(StochNoiseSimTest, TestingSimulatorFunctionality) {
   EXPECT_EQ(ddsim.countNodesFromRoot(), 0);
   std::cout << ddsim.getName() << "\n";
 }
+
+TEST(StochNoiseSimTest, SampleFinalStateOfUnmeasuredCircuit) {
+  auto quantumComputation = std::make_unique<qc::QuantumComputation>(2);
+  quantumComputation->x(0);
+  quantumComputation->h(1);
+  StochasticNoiseSimulator ddsim(std::move(quantumComputation), {}, 42U,
+                                 std::string(""), 0.);
+
+  const auto m = ddsim.simulate(1000);
+
+  ASSERT_EQ(m.size(), 2);
+  EXPECT_EQ(m.find("01")->second + m.find("11")->second, 1000);
+  EXPECT_NEAR(static_cast<double>(m.find("01")->second), 500, 50);
+}
+
+TEST(StochNoiseSimTest, SampleFinalStateSeveralTimesPerTrajectory) {
+  auto quantumComputation = std::make_unique<qc::QuantumComputation>(2);
+  quantumComputation->x(0);
+  quantumComputation->h(1);
+  StochasticNoiseSimulator ddsim(std::move(quantumComputation), {}, 42U, "D",
+                                 0.1);
+  EXPECT_EQ(ddsim.getSamplesPerTrajectory(), 1U);
+  EXPECT_THROW(ddsim.setSamplesPerTrajectory(0U), std::invalid_argument);
+  ddsim.setSamplesPerTrajectory(8U);
+
+  const auto m = ddsim.simulate(250);
+
+  std::size_t total = 0U;
+  for (const auto& [state, count] : m) {
+    total += count;
+  }
+  EXPECT_EQ(total, 250U * 8U);
+  EXPECT_EQ(ddsim.additionalStatistics().at("samples_per_trajectory"), "8");
+}
+
+TEST(StochNoiseSimTest, ExpectationValues) {
+  auto quantumComputation = std::make_unique<qc::QuantumComputation>(2);
+  quantumComputation->x(0);
+  quantumComputation->h(1);
+
+  auto z0 = qc::QuantumComputation(2);
+  z0.z(0);
+  auto x1 = qc::QuantumComputation(2);
+  x1.x(1);
+  const std::vector observables{z0, x1};
+
+  StochasticNoiseSimulator noiseless(
+      std::make_unique<qc::QuantumComputation>(*quantumComputation), {}, 42U,
+      std::string(""), 0.);
+  const auto exact = noiseless.expectationValues(observables, 100);
+  ASSERT_EQ(exact.size(), 2);
+  EXPECT_NEAR(exact[0].first, -1., 1e-9);
+  EXPECT_NEAR(exact[0].second, 0., 1e-9);
+  EXPECT_NEAR(exact[1].first, 1., 1e-9);
+  EXPECT_NEAR(exact[1].second, 0., 1e-9);
+
+  StochasticNoiseSimulator noisy(std::move(quantumComputation), {}, 42U, "D",
+                                 0.1);
+  const auto estimated = noisy.expectationValues(observables, 1000);
+  EXPECT_LT(estimated[1].first, 1.);
+  EXPECT_GT(estimated[1].first, 0.5);
+  EXPECT_GT(estimated[1].second, 0.);
+
+  EXPECT_THROW(std::ignore = noisy.expectationValues(observables, 0),
+               std::invalid_argument);
+  EXPECT_THROW(std::ignore =
+                   noisy.expectationValues({qc::QuantumComputation(1)}, 10),
+               std::invalid_argument);
+}
+
+TEST(StochNoiseSimTest, AmplitudeDampingAfterGateError) {
+  auto quantumComputation = std::make_unique<qc::QuantumComputation>(1, 1);
+  quantumComputation->x(0);
+  quantumComputation->measure(0, 0);
+  StochasticNoiseSimulator ddsim(std::move(quantumComputation), {}, 42U,
+                                 std::string("DA"), 0.1, 0.2);
+
+  const auto m = ddsim.simulate(1000);
+
+  // a bit-flip happens with probability 0.05 and amplitude damping of the
+  // excited state with probability 0.2
+  EXPECT_NEAR(static_cast<double>(m.find("0")->second), 240, 50);
+  EXPECT_NEAR(static_cast<double>(m.find("1")->second), 760, 50);
+}